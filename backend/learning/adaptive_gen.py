@@ -0,0 +1,184 @@
+"""
+Phase 2-2: 적응형 콘텐츠 3레벨 생성 헬퍼 (View 아님)
+레벨별 GPT-4o 변형을 요청 스레드 밖의 공유 스레드 풀에서 병렬로 생성한다.
+- 교안 1개: 3레벨 동시 생성, 강의 일괄 모드: 교안 × 3레벨 작업을 같은 풀에 넣어 동시 실행 수 제한
+  (풀 크기 = settings.ADAPTIVE_GEN_CONCURRENCY)
+- 스트리밍 응답을 받으며 AdaptiveContent.progress(0~100)와 생성 중 본문을 주기적으로 저장 → 상태 조회 API로 폴링
+- 실패한 레벨은 error에 사유를 남기고, 다시 요청하면 그 레벨만 재생성
+- 작업자가 시작한 생성은 heartbeat_at을 시작/진행 저장마다 갱신 (풀 대기 중인 행은 None)
+  프로세스 재시작 등으로 중단된 생성(heartbeat_at이 STALE_AFTER 넘게 갱신 안 된 GENERATING 행)은
+  조회/재요청 시 실패로 정리 → 폴링이 끝나고, 다시 요청하면 재생성. 대기 중인 행은 만료시키지 않음
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import openai
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from .models import AdaptiveContent, LectureMaterial
+from .material_text import get_material_text
+from .prompts import ADAPTIVE_LEVELS, describe
+
+MAX_TOKENS = 4000
+SOURCE_CHARS = 6000
+PROGRESS_EVERY = 50  # 스트리밍 청크 N개마다 진행률/본문 저장
+STALE_AFTER = timedelta(minutes=5)  # 시작 후 진행 저장 간격(청크 50개)보다 충분히 길게
+STALE_ERROR = '생성이 중단되었습니다 (서버 재시작 등). 다시 요청하면 재생성합니다.'
+
+_lock = threading.Lock()
+_executor = None
+
+
+LEVELS = {
+    1: {'label': 'Level 1 - 쉽게 이해하기', 'prompt': ADAPTIVE_LEVELS[1]},
+    2: {'label': 'Level 2 - 핵심 정리', 'prompt': ADAPTIVE_LEVELS[2]},
+    3: {'label': 'Level 3 - 심화 완성', 'prompt': ADAPTIVE_LEVELS[3]},
+}
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.ADAPTIVE_GEN_CONCURRENCY, thread_name_prefix='adaptive-gen',
+            )
+    return _executor
+
+
+def expire_stale(queryset):
+    """작업자가 시작했는데 진행 저장이 STALE_AFTER 넘게 없는 GENERATING 행 → 실패 처리 (정리한 행 수)"""
+    return queryset.filter(
+        status='GENERATING', heartbeat_at__lt=timezone.now() - STALE_AFTER,
+    ).update(status='DRAFT', content=f'[생성 실패: {STALE_ERROR}]', error=STALE_ERROR)
+
+
+def prepare_levels(material):
+    """
+    생성할 레벨 행 준비 → (전체 3레벨 행, 새로 생성할 행)
+    없는 레벨은 GENERATING으로 만들고, 실패했던(중단된 생성 포함) 레벨은 GENERATING으로 되돌려 재생성
+    """
+    expire_stale(AdaptiveContent.objects.filter(source_material=material))
+    existing = {ac.level: ac for ac in AdaptiveContent.objects.filter(source_material=material)}
+    rows, pending = [], []
+    for level, config in LEVELS.items():
+        ac = existing.get(level)
+        if ac is None:
+            ac = AdaptiveContent.objects.create(
+                source_material=material,
+                level=level,
+                title=f"{material.title} ({config['label']})",
+                content='',
+                status='GENERATING',
+            )
+            pending.append(ac)
+        elif ac.error and ac.status != 'GENERATING':
+            ac.status, ac.content, ac.progress, ac.error = 'GENERATING', '', 0, ''
+            ac.heartbeat_at = None  # 다시 풀 대기
+            ac.save(update_fields=['status', 'content', 'progress', 'error', 'heartbeat_at'])
+            pending.append(ac)
+        rows.append(ac)
+    return rows, pending
+
+
+def level_status(ac):
+    return {
+        'id': ac.id, 'level': ac.level, 'status': ac.status,
+        'progress': ac.progress, 'error': ac.error,
+    }
+
+
+def start_generation(material, pending, source_text=None):
+    """
+    pending 레벨을 풀에 넣고 바로 반환
+    source_text가 없으면(일괄 모드) 풀 작업 안에서 저장된 추출 텍스트를 읽은 뒤 레벨 작업을 이어서 넣음
+    """
+    if not pending:
+        return
+    ids = [ac.id for ac in pending]
+    if source_text is None:
+        _get_executor().submit(_extract_and_fan_out, material.id, ids)
+    else:
+        for content_id in ids:
+            _get_executor().submit(generate_level, content_id, source_text)
+
+
+def start_lecture_generation(materials):
+    """강의 교안 일괄 생성 → [{material_id, title, levels}] (추출/생성은 모두 백그라운드)"""
+    result = []
+    for material in materials:
+        rows, pending = prepare_levels(material)
+        start_generation(material, pending)
+        result.append({
+            'material_id': material.id,
+            'title': material.title,
+            'levels': [level_status(ac) for ac in rows],
+        })
+    return result
+
+
+def _extract_and_fan_out(material_id, content_ids):
+    try:
+        material = LectureMaterial.objects.get(id=material_id)
+        source_text = get_material_text(material)
+        if not source_text:
+            raise ValueError(f'텍스트를 추출할 수 없습니다. ({material.file_type} 형식)')
+    except Exception as e:
+        print(f"⚠️ [Adaptive] 교안 #{material_id} 텍스트 추출 실패: {e}")
+        AdaptiveContent.objects.filter(id__in=content_ids).update(
+            status='DRAFT', content=f'[생성 실패: {str(e)}]', error=str(e)[:500],
+        )
+        return
+    finally:
+        connection.close()
+
+    for content_id in content_ids:
+        _get_executor().submit(generate_level, content_id, source_text)
+
+
+def generate_level(content_id, source_text):
+    """한 레벨 스트리밍 생성 (풀 작업자 스레드에서 실행)"""
+    try:
+        ac = AdaptiveContent.objects.get(id=content_id)
+        ac.heartbeat_at = timezone.now()  # 풀 대기 끝, 생성 시작
+        ac.save(update_fields=['heartbeat_at'])
+        prompt = LEVELS[ac.level]['prompt']
+        messages = prompt.messages(source=source_text[:SOURCE_CHARS])
+        print(f"🧾 [Adaptive] 교안 #{ac.source_material_id} L{ac.level} 프롬프트 {describe(prompt, messages)}")
+        client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        stream = client.chat.completions.create(
+            model='gpt-4o',
+            messages=messages,
+            prompt_cache_key=prompt.id,
+            temperature=0.6,
+            max_tokens=MAX_TOKENS,
+            stream=True,
+        )
+
+        parts = []
+        for count, chunk in enumerate(stream, start=1):
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+            if count % PROGRESS_EVERY == 0:
+                ac.content = ''.join(parts)
+                ac.progress = min(99, count * 100 // MAX_TOKENS)
+                ac.heartbeat_at = timezone.now()
+                ac.save(update_fields=['content', 'progress', 'heartbeat_at'])
+
+        ac.content = ''.join(parts).strip()
+        # 느리게 끝나 중단으로 정리됐던 행이어도 결과가 나왔으면 정상 완료로 덮어씀
+        ac.status, ac.progress, ac.error = 'DRAFT', 100, ''
+        ac.save(update_fields=['content', 'status', 'progress', 'error'])
+        print(f"📝 [Adaptive] 교안 #{ac.source_material_id} L{ac.level} 생성 완료 ({len(ac.content)}자)")
+
+    except Exception as e:
+        print(f"⚠️ [Adaptive] 변형 #{content_id} 생성 실패: {e}")
+        AdaptiveContent.objects.filter(id=content_id).update(
+            status='DRAFT', content=f'[생성 실패: {str(e)}]', error=str(e)[:500],
+        )
+    finally:
+        connection.close()
@@ -2,12 +2,12 @@ from django.contrib import admin
 from .models import (
     Lecture, LearningSession, STTLog, SessionSummary, 
     DailyQuiz, QuizQuestion, QuizAttempt, VectorStore,
-    LiveSession, LiveParticipant, LectureMaterial, LiveSTTLog, PulseCheck, PulseLog,
-    LiveQuiz, LiveQuizResponse, LiveQuestion, LiveSessionNote,
-    WeakZoneAlert, AdaptiveContent, ReviewRoute, SpacedRepetitionItem,
+    LiveSession, LiveParticipant, LectureMaterial, MaterialExtract, LiveSTTLog, PulseCheck, PulseLog,
+    LiveQuiz, QuizBankItem, LiveQuizResponse, LiveQuestion, LiveSessionNote,
+    WeakZoneAlert, AdaptiveContent, ReviewRoute, SpacedRepetitionItem, SpacedRepetitionReview,
     FormativeAssessment, FormativeResponse,
     NoteViewLog, GroupMessage, SkillBlock,
-    Skill, CareerGoal, PlacementQuestion, PlacementResult,
+    Skill, SkillPrerequisite, CareerGoal, PlacementQuestion, PlacementResult,
     StudentGoal, StudentSkill
 )
 
@@ -60,6 +60,12 @@ class LectureMaterialAdmin(admin.ModelAdmin):
     list_display = ('id', 'title', 'file_type', 'lecture', 'uploaded_by', 'uploaded_at')
     list_filter = ('file_type',)
 
+@admin.register(MaterialExtract)
+class MaterialExtractAdmin(admin.ModelAdmin):
+    list_display = ('id', 'material', 'status', 'extracted_at')
+    list_filter = ('status',)
+    readonly_fields = ('file_hash', 'pages')
+
 @admin.register(LiveSTTLog)
 class LiveSTTLogAdmin(admin.ModelAdmin):
     list_display = ('id', 'live_session', 'sequence_order', 'text_preview')
@@ -80,6 +86,12 @@ class LiveQuizAdmin(admin.ModelAdmin):
     def question_text_preview(self, obj):
         return obj.question_text[:50] + '...' if len(obj.question_text) > 50 else obj.question_text
 
+@admin.register(QuizBankItem)
+class QuizBankItemAdmin(admin.ModelAdmin):
+    list_display = ('id', 'live_session', 'source', 'to_seq', 'used_quiz', 'created_at')
+    list_filter = ('source',)
+    exclude = ('embedding',)
+
 @admin.register(LiveQuizResponse)
 class LiveQuizResponseAdmin(admin.ModelAdmin):
     list_display = ('id', 'quiz', 'student', 'answer', 'is_correct', 'responded_at')
@@ -123,6 +135,11 @@ class SpacedRepetitionItemAdmin(admin.ModelAdmin):
     list_display = ('id', 'student', 'concept_name', 'current_review', 'created_at')
     search_fields = ('concept_name', 'student__username')
 
+@admin.register(SpacedRepetitionReview)
+class SpacedRepetitionReviewAdmin(admin.ModelAdmin):
+    list_display = ('id', 'student', 'item', 'review_num', 'due_at', 'completed_at')
+    list_filter = ('review_num',)
+
 @admin.register(FormativeAssessment)
 class FormativeAssessmentAdmin(admin.ModelAdmin):
     list_display = ('id', 'live_session', 'status', 'total_questions', 'created_at')
@@ -139,6 +156,11 @@ class SkillAdmin(admin.ModelAdmin):
     list_display = ('name', 'category', 'difficulty_level', 'order')
     list_filter = ('category', 'difficulty_level')
 
+@admin.register(SkillPrerequisite)
+class SkillPrerequisiteAdmin(admin.ModelAdmin):
+    list_display = ('prerequisite', 'skill', 'created_at')
+    search_fields = ('skill__name', 'prerequisite__name')
+
 @admin.register(CareerGoal)
 class CareerGoalAdmin(admin.ModelAdmin):
     list_display = ('title', 'icon', 'estimated_weeks')
@@ -146,13 +168,13 @@ class CareerGoalAdmin(admin.ModelAdmin):
 
 @admin.register(PlacementQuestion)
 class PlacementQuestionAdmin(admin.ModelAdmin):
-    list_display = ('order', 'question_text', 'category', 'difficulty')
+    list_display = ('order', 'question_text', 'category', 'difficulty', 'irt_a', 'irt_b', 'irt_responses')
     list_filter = ('category', 'difficulty')
 
 @admin.register(PlacementResult)
 class PlacementResultAdmin(admin.ModelAdmin):
-    list_display = ('student', 'level', 'score', 'total_questions', 'created_at')
-    list_filter = ('level',)
+    list_display = ('student', 'level', 'mode', 'score', 'total_questions', 'ability', 'created_at')
+    list_filter = ('level', 'mode')
 
 @admin.register(StudentGoal)
 class StudentGoalAdmin(admin.ModelAdmin):
@@ -6,16 +6,17 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
-from django.db.models import Count, Q, Avg, F
+from django.db.models import Count, Q, Avg, F, Max, Subquery, OuterRef
+from django.db.models.functions import Coalesce
 from django.utils import timezone
-from collections import defaultdict
+from datetime import timedelta
 
 from .models import (
     Lecture, LiveSession, LiveParticipant, LiveQuizResponse,
     PulseLog, PlacementResult, StudentChecklist, LearningObjective,
     Syllabus, FormativeResponse, FormativeAssessment, LiveSessionNote,
     NoteViewLog, WeakZoneAlert, ReviewRoute, AdaptiveContent,
-    GroupMessage, StudentSkill, LiveQuiz,
+    GroupMessage, StudentSkill, LiveQuiz, ConceptMistake,
 )
 
 
@@ -263,116 +264,125 @@ class SendMessageView(APIView):
 # ══════════════════════════════════════════════════════════
 
 class WeakInsightsView(APIView):
-    """GET /api/learning/professor/{lecture_id}/analytics/weak-insights/"""
+    """
+    GET /api/learning/professor/{lecture_id}/analytics/weak-insights/
+    Query: ?days=N (최근 N일 윈도우, 생략 시 전체) &top=20 (상위 개념 수, 최대 100)
+    """
     permission_classes = [IsAuthenticated]
 
+    DEFAULT_TOP_N = 20
+    MAX_TOP_N = 100
+
     def get(self, request, lecture_id):
         lecture = get_object_or_404(Lecture, id=lecture_id, instructor=request.user)
-        ended_sessions = LiveSession.objects.filter(lecture=lecture, status='ENDED').order_by('created_at')
+
+        try:
+            days = int(request.query_params['days']) if request.query_params.get('days') else None
+            top_n = int(request.query_params.get('top', self.DEFAULT_TOP_N))
+        except ValueError:
+            return Response({'error': 'days와 top은 정수여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        top_n = max(1, min(top_n, self.MAX_TOP_N))
+
+        ended_sessions = LiveSession.objects.filter(lecture=lecture, status='ENDED')
+        mistakes = ConceptMistake.objects.filter(lecture=lecture, live_session__status='ENDED')
+        if days:
+            window_start = timezone.now() - timedelta(days=days)
+            ended_sessions = ended_sessions.filter(created_at__gte=window_start)
+            mistakes = mistakes.filter(created_at__gte=window_start)
+        ended_sessions = ended_sessions.order_by('created_at')
         total_students = lecture.students.count()
 
         if not ended_sessions.exists():
             return Response({'message': '아직 종료된 강의가 없습니다.', 'insights': [], 'session_comparison': []})
 
-        # 1. 퀴즈 오답 집계 (question_text 기반)
-        concept_wrong = defaultdict(lambda: {'quiz': 0, 'formative': 0, 'students': set(), 'session': '', 'wz': 0})
-
-        quiz_wrongs = LiveQuizResponse.objects.filter(
-            quiz__live_session__in=ended_sessions, is_correct=False
-        ).select_related('quiz', 'quiz__live_session')
-
-        for qr in quiz_wrongs:
-            key = qr.quiz.question_text[:50]
-            concept_wrong[key]['quiz'] += 1
-            concept_wrong[key]['students'].add(qr.student_id)
-            concept_wrong[key]['session'] = qr.quiz.live_session.title or ''
-
-        # 2. 형성평가 오답 (concept_tag 기반)
-        for fa in FormativeAssessment.objects.filter(live_session__in=ended_sessions):
-            responses = FormativeResponse.objects.filter(assessment=fa)
-            if not fa.questions:
-                continue
-            for resp in responses:
-                if not resp.answers:
-                    continue
-                for i, q in enumerate(fa.questions):
-                    q_num = str(i + 1)
-                    student_ans = resp.answers.get(q_num, '')
-                    correct_ans = q.get('correct_answer', '')
-                    if student_ans and student_ans != correct_ans:
-                        tag = q.get('concept_tag', q.get('question', '')[:50])
-                        concept_wrong[tag]['formative'] += 1
-                        concept_wrong[tag]['students'].add(resp.student_id)
-                        concept_wrong[tag]['session'] = fa.live_session.title or ''
-
-        # 3. WeakZone 빈도 반영
-        for wz in WeakZoneAlert.objects.filter(live_session__in=ended_sessions):
-            detail = (wz.trigger_detail or '')[:50]
-            if detail:
-                concept_wrong[detail]['wz'] += 1
-
-        # 정렬 (오답 학생 수 기준)
+        # 1. 개념별 오답 집계: 사전 추출된 (개념, 학생, 세션) 인덱스에 대한 GROUP BY 1회
+        rows = list(
+            mistakes.values('concept').annotate(
+                quiz_wrong=Count('id', filter=Q(source='QUIZ')),
+                formative_wrong=Count('id', filter=Q(source='FORMATIVE')),
+                wz_count=Count('id', filter=Q(source='WEAK_ZONE')),
+                affected=Count('student', distinct=True, filter=~Q(source='WEAK_ZONE')),
+                last_session_id=Max('live_session_id'),
+            ).order_by('-affected', '-quiz_wrong', '-formative_wrong', 'concept')[:top_n]
+        )
+        session_titles = dict(
+            LiveSession.objects.filter(
+                id__in={r['last_session_id'] for r in rows}
+            ).values_list('id', 'title')
+        )
+
         insights = []
-        for concept, data in sorted(concept_wrong.items(), key=lambda x: len(x[1]['students']), reverse=True):
-            wrong_rate = (len(data['students']) / total_students * 100) if total_students > 0 else 0
+        for rank, row in enumerate(rows, start=1):
+            wrong_rate = (row['affected'] / total_students * 100) if total_students > 0 else 0
+            if row['quiz_wrong'] > 0 and row['formative_wrong'] > 0:
+                source = 'QUIZ+FORMATIVE'
+            elif row['quiz_wrong'] > 0:
+                source = 'QUIZ'
+            elif row['formative_wrong'] > 0:
+                source = 'FORMATIVE'
+            else:
+                source = 'WEAK_ZONE'
             insights.append({
-                'concept': concept,
-                'session_title': data['session'],
+                'rank': rank,
+                'concept': row['concept'],
+                'session_title': session_titles.get(row['last_session_id']) or '',
                 'wrong_rate': round(wrong_rate, 1),
-                'source': ('QUIZ+FORMATIVE' if data['quiz'] > 0 and data['formative'] > 0
-                          else 'QUIZ' if data['quiz'] > 0 else 'FORMATIVE'),
-                'quiz_wrong_count': data['quiz'],
-                'formative_wrong_count': data['formative'],
-                'affected_count': len(data['students']),
+                'source': source,
+                'quiz_wrong_count': row['quiz_wrong'],
+                'formative_wrong_count': row['formative_wrong'],
+                'affected_count': row['affected'],
                 'total_students': total_students,
-                'weak_zone_count': data['wz'],
+                'weak_zone_count': row['wz_count'],
             })
 
-        # 랭크 부여
-        for i, ins in enumerate(insights[:20]):
-            ins['rank'] = i + 1
+        # 2. 차시별 비교 (세션별 지표를 서브쿼리로 한 번에)
+        sessions = ended_sessions.annotate(
+            participant_count=_session_count(LiveParticipant.objects.all()),
+            pulse_total=_session_count(PulseLog.objects.all()),
+            pulse_understand=_session_count(PulseLog.objects.filter(pulse_type='UNDERSTAND')),
+            quiz_total=_session_count(LiveQuizResponse.objects.all(), 'quiz__live_session'),
+            quiz_correct=_session_count(
+                LiveQuizResponse.objects.filter(is_correct=True), 'quiz__live_session'
+            ),
+            formative_avg=Subquery(
+                FormativeResponse.objects.filter(assessment__live_session=OuterRef('pk'))
+                .order_by().values('assessment__live_session')
+                .annotate(value=Avg('score')).values('value')[:1]
+            ),
+        )
 
-        # 차시별 비교
         session_comparison = []
-        for sess in ended_sessions:
-            participants = LiveParticipant.objects.filter(live_session=sess)
-            p_count = participants.count()
-
-            # 이해율 (펄스)
-            pulses = PulseLog.objects.filter(live_session=sess)
-            p_total = pulses.count()
-            p_understand = pulses.filter(pulse_type='UNDERSTAND').count()
-            understand_rate = (p_understand / p_total * 100) if p_total > 0 else 0
-
-            # 퀴즈 정답률
-            qr = LiveQuizResponse.objects.filter(quiz__live_session=sess)
-            qr_total = qr.count()
-            qr_correct = qr.filter(is_correct=True).count()
-            quiz_acc = (qr_correct / qr_total * 100) if qr_total > 0 else 0
-
-            # 형성평가 평균
-            fa_resps = FormativeResponse.objects.filter(assessment__live_session=sess)
-            fa_avg = 0
-            if fa_resps.exists():
-                agg = fa_resps.aggregate(avg=Avg('score'))
-                fa_avg = round(agg['avg'] or 0, 1)
-
+        for sess in sessions:
+            understand_rate = (
+                sess.pulse_understand / sess.pulse_total * 100 if sess.pulse_total > 0 else 0
+            )
+            quiz_acc = sess.quiz_correct / sess.quiz_total * 100 if sess.quiz_total > 0 else 0
             session_comparison.append({
                 'session_id': sess.id,
                 'session_title': sess.title or f'{sess.id}강',
                 'date': str(sess.started_at.date()) if sess.started_at else '',
                 'understand_rate': round(understand_rate, 1),
                 'quiz_accuracy': round(quiz_acc, 1),
-                'formative_avg': fa_avg,
-                'participants': p_count,
+                'formative_avg': round(sess.formative_avg or 0, 1),
+                'participants': sess.participant_count,
             })
 
         return Response({
-            'insights': insights[:20],
+            'insights': insights,
             'session_comparison': session_comparison,
+            'window_days': days,
         })
 
 
+def _session_count(queryset, session_field='live_session'):
+    """세션별 COUNT 상관 서브쿼리 (여러 관계를 JOIN 팬아웃 없이 집계)"""
+    return Coalesce(Subquery(
+        queryset.filter(**{session_field: OuterRef('pk')})
+        .order_by().values(session_field)
+        .annotate(count=Count('id')).values('count')[:1]
+    ), 0)
+
+
 # ══════════════════════════════════════════════════════════
 # Phase 3-3: AI 제안 승인 흐름
 # ══════════════════════════════════════════════════════════
@@ -562,8 +572,8 @@ class QualityReportView(APIView):
             else:
                 checkpoint = 0
 
-            # 형성평가 완료율
-            fa_total = FormativeAssessment.objects.filter(live_session=sess).count()
+            # 형성평가 완료율 (공개 전 초안 제외)
+            fa_total = FormativeAssessment.objects.filter(live_session=sess).exclude(status='PREPARED').count()
             fa_completed = FormativeResponse.objects.filter(assessment__live_session=sess).count()
             fa_rate = (fa_completed / (fa_total * p_count) * 100) if fa_total > 0 and p_count > 0 else 0
 
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class LearningConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "learning"
+
+    def ready(self):
+        # Skill 저장/삭제 → 스킬 태거 캐시, PlacementQuestion 저장/삭제 → 정답 키 캐시 무효화 시그널 등록
+        from . import skill_tagger  # noqa: F401
+        from . import placement_utils  # noqa: F401
+        # Skill / 선수관계 / 직무 필요 역량 변경 → 역량 그래프 캐시 무효화
+        from . import skill_graph  # noqa: F401
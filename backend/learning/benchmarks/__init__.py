@@ -0,0 +1,12 @@
+"""
+API 엔드포인트 성능 회귀 벤치마크
+=================================
+합성 코호트를 생성하고 각 엔드포인트를 APIRequestFactory로 호출하여
+쿼리 수 / 응답 시간 / 피크 메모리를 JSON 리포트로 기록한다.
+
+실행:
+  python manage.py benchmark_endpoints --scales 10,50
+  pytest -p learning.benchmarks.pytest_plugin --reboot-bench
+
+하위 모듈(cohort/endpoints/runner)은 모델을 import하므로 Django 초기화 이후에 import할 것.
+"""
@@ -0,0 +1,230 @@
+"""
+벤치마크용 합성 코호트 생성
+학생/세션/퀴즈/펄스/벡터 수를 조절해 엔드포인트가 코호트 크기에 따라
+쿼리 수가 늘어나는지(N+1) 확인할 수 있게 한다. 모든 대량 생성은 bulk_create.
+"""
+import random
+from dataclasses import dataclass, field, asdict
+from datetime import timedelta
+
+from django.utils import timezone
+
+from users.models import User, ClassGroup, Enrollment
+from learning.models import (
+    Lecture, LearningSession, DailyQuiz, QuizAttempt,
+    LiveSession, LiveParticipant, LiveSTTLog, PulseCheck, PulseLog,
+    LiveQuiz, LiveQuizResponse, LiveQuestion, LiveSessionNote, WeakZoneAlert,
+    FormativeAssessment, FormativeResponse, SpacedRepetitionItem, ReviewRoute,
+    Skill, StudentSkill, SkillBlock, VectorStore, ConceptMistake, SpacedRepetitionReview,
+)
+from learning.spaced_repetition import build_reviews
+
+EMBEDDING_DIM = 1536
+
+
+@dataclass
+class CohortSpec:
+    """코호트 크기 설정"""
+    students: int = 20
+    sessions: int = 4
+    quizzes: int = 3          # 세션당 퀴즈 수
+    pulses: int = 3           # 세션당 학생별 펄스 이력 수
+    questions: int = 2        # 세션당 학생 질문 수 (전체 학생 중 일부)
+    vectors: int = 50         # 강의 VectorStore 청크 수
+    skills: int = 8
+
+    def scaled(self, students):
+        """학생 수만 바꾼 사본"""
+        return CohortSpec(**{**asdict(self), 'students': students})
+
+    def as_dict(self):
+        return asdict(self)
+
+
+@dataclass
+class Cohort:
+    """생성된 코호트 핸들 (엔드포인트 인자 구성용)"""
+    spec: CohortSpec
+    instructor: User
+    manager: User
+    students: list
+    lecture: Lecture
+    class_group: ClassGroup
+    live_sessions: list
+    quizzes: list = field(default_factory=list)
+
+    @property
+    def student(self):
+        return self.students[0]
+
+    @property
+    def live_session(self):
+        return self.live_sessions[-1]
+
+    @property
+    def quiz(self):
+        return self.quizzes[-1]
+
+
+def seed_cohort(spec, label='bench'):
+    """
+    spec 크기의 합성 코호트 생성.
+    label은 사용자명/강의명 접두어 (같은 DB에 여러 스케일을 공존시키기 위함).
+    """
+    rng = random.Random(f'{label}-{spec.students}')
+    now = timezone.now()
+
+    instructor = User.objects.create(username=f'{label}_instructor', role='INSTRUCTOR')
+    manager = User.objects.create(username=f'{label}_manager', role='MANAGER')
+    students = [
+        User.objects.create(username=f'{label}_student_{i}', role='STUDENT')
+        for i in range(spec.students)
+    ]
+
+    lecture = Lecture.objects.create(title=f'[{label}] 벤치마크 강의', instructor=instructor)
+    lecture.students.add(*students)
+    class_group = ClassGroup.objects.create(
+        name=f'[{label}] 벤치마크 반', manager=manager,
+        start_date=now.date(), end_date=(now + timedelta(days=90)).date(),
+    )
+    Enrollment.objects.bulk_create([
+        Enrollment(student=s, class_group=class_group) for s in students
+    ])
+
+    skills = Skill.objects.bulk_create([
+        Skill(name=f'{label} 스킬 {i}', order=i) for i in range(spec.skills)
+    ])
+    StudentSkill.objects.bulk_create([
+        StudentSkill(student=s, skill=sk, status=rng.choice(['OWNED', 'GAP', 'LEARNING']),
+                     progress=rng.randint(0, 100))
+        for s in students for sk in skills
+    ])
+    SkillBlock.objects.bulk_create([
+        SkillBlock(student=s, skill=sk, lecture=lecture, is_earned=rng.random() < 0.5,
+                   total_score=rng.uniform(0, 100))
+        for s in students for sk in skills[:3]
+    ])
+
+    # 자율 학습 세션 + 일일 퀴즈 이력
+    LearningSession.objects.bulk_create([
+        LearningSession(student=s, lecture=lecture, session_order=k + 1)
+        for s in students for k in range(2)
+    ])
+    daily_quizzes = DailyQuiz.objects.bulk_create([DailyQuiz(student=s) for s in students])
+    QuizAttempt.objects.bulk_create([
+        QuizAttempt(quiz=dq, student=dq.student, score=rng.randint(0, 100))
+        for dq in daily_quizzes for _ in range(3)
+    ])
+
+    live_sessions = []
+    quizzes = []
+    for k in range(spec.sessions):
+        is_last = k == spec.sessions - 1
+        session = LiveSession.objects.create(
+            lecture=lecture, instructor=instructor, title=f'{k + 1}강',
+            status='LIVE' if is_last else 'ENDED',
+            started_at=now - timedelta(days=spec.sessions - k),
+            ended_at=None if is_last else now - timedelta(days=spec.sessions - k, hours=-2),
+        )
+        live_sessions.append(session)
+        LiveParticipant.objects.bulk_create([
+            LiveParticipant(live_session=session, student=s) for s in students
+        ])
+        LiveSTTLog.objects.bulk_create([
+            LiveSTTLog(live_session=session, sequence_order=i, text_chunk=f'{k + 1}강 설명 {i}')
+            for i in range(20)
+        ])
+        PulseCheck.objects.bulk_create([
+            PulseCheck(live_session=session, student=s, pulse_type=rng.choice(['UNDERSTAND', 'CONFUSED']))
+            for s in students
+        ])
+        PulseLog.objects.bulk_create([
+            PulseLog(live_session=session, student=s, pulse_type=rng.choice(['UNDERSTAND', 'CONFUSED']))
+            for s in students for _ in range(spec.pulses)
+        ])
+
+        session_quizzes = LiveQuiz.objects.bulk_create([
+            LiveQuiz(
+                live_session=session, question_text=f'{k + 1}강 개념 {i} 확인 문제',
+                options=['A', 'B', 'C', 'D'], correct_answer='A',
+                is_active=is_last and i == spec.quizzes - 1,
+            )
+            for i in range(spec.quizzes)
+        ])
+        quizzes.extend(session_quizzes)
+        responses = []
+        for q in session_quizzes:
+            for s in students:
+                answer = rng.choice('AABCD')
+                responses.append(LiveQuizResponse(quiz=q, student=s, answer=answer, is_correct=answer == 'A'))
+        LiveQuizResponse.objects.bulk_create(responses)
+        ConceptMistake.objects.bulk_create([
+            ConceptMistake(
+                lecture=lecture, live_session=session, student_id=r.student_id,
+                concept=r.quiz.question_text[:50], source='QUIZ', quiz=r.quiz,
+            )
+            for r in responses if not r.is_correct
+        ])
+
+        askers = students[:max(1, spec.students // 4)]
+        LiveQuestion.objects.bulk_create([
+            LiveQuestion(live_session=session, student=s, question_text=f'{s.username} 질문 {i}',
+                         upvotes=rng.randint(0, 10))
+            for s in askers for i in range(spec.questions)
+        ])
+        WeakZoneAlert.objects.bulk_create([
+            WeakZoneAlert(live_session=session, student=s, trigger_type='PULSE_CONFUSED',
+                          trigger_detail={'recent_topic': f'{k + 1}강 개념 0'})
+            for s in students[:max(1, spec.students // 5)]
+        ])
+
+        if not is_last:
+            note = LiveSessionNote.objects.create(
+                live_session=session, content=f'# {k + 1}강 노트', status='DONE',
+                is_approved=True, is_public=True,
+            )
+            assessment = FormativeAssessment.objects.create(
+                live_session=session, note=note, status='READY', total_questions=2,
+                questions=[
+                    {'id': i + 1, 'question': f'{k + 1}강 형성평가 {i}', 'options': ['A', 'B'],
+                     'correct_answer': 'A', 'concept_tag': f'개념{i}'}
+                    for i in range(2)
+                ],
+            )
+            FormativeResponse.objects.bulk_create([
+                FormativeResponse(assessment=assessment, student=s, score=rng.randint(0, 2), total=2,
+                                  answers=[{'question_id': 1, 'is_correct': True},
+                                           {'question_id': 2, 'is_correct': rng.random() < 0.5}])
+                for s in students
+            ])
+            ReviewRoute.objects.bulk_create([
+                ReviewRoute(live_session=session, student=s, total_est_minutes=15,
+                            items=[{'order': 1, 'type': 'note', 'title': '노트 복습', 'est_minutes': 15}])
+                for s in students
+            ])
+
+    sr_items = SpacedRepetitionItem.objects.bulk_create([
+        SpacedRepetitionItem(
+            student=s, concept_name=f'개념 {i}', source_session=live_sessions[0],
+            review_question='복습 문제', review_answer='A', review_options=['A', 'B'],
+            schedule=[
+                {'review_num': 1, 'label': '10분 후', 'due_at': (now - timedelta(minutes=5)).isoformat(), 'completed': False},
+                {'review_num': 2, 'label': '1일 후', 'due_at': (now + timedelta(days=1)).isoformat(), 'completed': False},
+            ],
+        )
+        for s in students for i in range(3)
+    ])
+    SpacedRepetitionReview.objects.bulk_create([r for item in sr_items for r in build_reviews(item)])
+
+    VectorStore.objects.bulk_create([
+        VectorStore(
+            lecture=lecture, source_type='material', content=f'{label} 청크 {i}',
+            embedding=[rng.random() for _ in range(EMBEDDING_DIM)],
+        )
+        for i in range(spec.vectors)
+    ])
+
+    return Cohort(
+        spec=spec, instructor=instructor, manager=manager, students=students,
+        lecture=lecture, class_group=class_group, live_sessions=live_sessions, quizzes=quizzes,
+    )
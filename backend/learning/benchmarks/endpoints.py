@@ -0,0 +1,111 @@
+"""
+벤치마크 대상 엔드포인트 레지스트리
+외부 API(OpenAI) 호출이 없는 조회(GET) 엔드포인트를 등록한다.
+새 View를 추가하면 여기에 한 줄 추가하면 된다.
+"""
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from django.utils.module_loading import import_string
+
+
+@dataclass
+class Endpoint:
+    """
+    name: 리포트 키
+    view: View/ViewSet dotted path
+    action: ViewSet이면 @action 메서드명 (APIView면 None)
+    user: 호출 사용자 ('student' | 'instructor' | 'manager')
+    kwargs: Cohort → URL kwargs
+    params: Cohort → query string dict
+    max_queries / max_ms: 엔드포인트별 임계값 (None이면 기본값)
+    """
+    name: str
+    view: str
+    user: str = 'student'
+    action: Optional[str] = None
+    kwargs: Callable = field(default=lambda c: {})
+    params: Callable = field(default=lambda c: {})
+    max_queries: Optional[int] = None
+    max_ms: Optional[float] = None
+
+    def as_view(self):
+        view_class = import_string(self.view)
+        if self.action:
+            return view_class.as_view({'get': self.action})
+        return view_class.as_view()
+
+
+_LIVE = 'learning.live_views.LiveSessionViewSet'
+
+ENDPOINTS = [
+    # 매니저 대시보드 / 시각화
+    Endpoint('manager.dashboard', 'learning.manager_views.ManagerDashboardView', user='manager'),
+    Endpoint('manager.class_monitor', 'learning.manager_views.ClassMonitorView', user='manager',
+             kwargs=lambda c: {'class_id': c.class_group.id}),
+    Endpoint('manager.at_risk', 'learning.manager_views.AtRiskStudentsView', user='manager',
+             kwargs=lambda c: {'class_id': c.class_group.id}),
+    Endpoint('viz.student_progress', 'learning.manager_views.StudentProgressVisualization', user='instructor',
+             params=lambda c: {'lecture_id': c.lecture.id}),
+    Endpoint('viz.quiz_analytics', 'learning.manager_views.QuizAnalyticsVisualization', user='instructor',
+             params=lambda c: {'lecture_id': c.lecture.id}),
+    Endpoint('viz.skill_heatmap', 'learning.manager_views.SkillHeatmapVisualization', user='instructor',
+             params=lambda c: {'lecture_id': c.lecture.id}),
+    Endpoint('viz.engagement', 'learning.manager_views.EngagementVisualization', user='instructor',
+             params=lambda c: {'lecture_id': c.lecture.id}),
+
+    # 라이브 세션 (교수자)
+    Endpoint('live.status', _LIVE, action='session_status', user='instructor',
+             kwargs=lambda c: {'pk': c.live_session.id}),
+    Endpoint('live.pulse_stats', _LIVE, action='pulse_stats', user='instructor',
+             kwargs=lambda c: {'pk': c.live_session.id}),
+    Endpoint('live.stt_feed', _LIVE, action='stt_feed', user='instructor',
+             kwargs=lambda c: {'pk': c.live_session.id}),
+    Endpoint('live.quiz_results', _LIVE, action='quiz_results', user='instructor',
+             kwargs=lambda c: {'pk': c.live_session.id, 'quiz_id': c.quiz.id}),
+    Endpoint('live.list_questions', _LIVE, action='list_questions', user='instructor',
+             kwargs=lambda c: {'pk': c.live_session.id}),
+    Endpoint('live.question_clusters', _LIVE, action='question_clusters', user='instructor',
+             kwargs=lambda c: {'pk': c.live_session.id}),
+    Endpoint('live.weak_zones', _LIVE, action='weak_zones', user='instructor',
+             kwargs=lambda c: {'pk': c.live_session.id}),
+
+    # 라이브 세션 (학생)
+    Endpoint('live.pending_quiz', _LIVE, action='pending_quiz',
+             kwargs=lambda c: {'pk': c.live_session.id}),
+    Endpoint('live.question_feed', _LIVE, action='question_feed',
+             kwargs=lambda c: {'pk': c.live_session.id}),
+    Endpoint('live.my_alerts', _LIVE, action='my_alerts',
+             kwargs=lambda c: {'pk': c.live_session.id}),
+    Endpoint('live.my_quiz_history', _LIVE, action='my_quiz_history',
+             kwargs=lambda c: {'pk': c.live_session.id}),
+    Endpoint('live.lecture_quiz_history', 'learning.live_views.LectureQuizHistoryView',
+             kwargs=lambda c: {'lecture_id': c.lecture.id}),
+    Endpoint('live.my_summary', 'learning.live_views.StudentSessionSummaryView',
+             kwargs=lambda c: {'session_id': c.live_sessions[0].id}),
+    Endpoint('live.note', 'learning.note_views.LiveNoteView',
+             kwargs=lambda c: {'pk': c.live_sessions[0].id}),
+    Endpoint('live.absent_notes', 'learning.note_views.AbsentNoteListView',
+             kwargs=lambda c: {'lecture_id': c.lecture.id}),
+
+    # 교수자 분석
+    Endpoint('analytics.overview', 'learning.analytics_views.AnalyticsOverviewView', user='instructor',
+             kwargs=lambda c: {'lecture_id': c.lecture.id}),
+    Endpoint('analytics.weak_insights', 'learning.analytics_views.WeakInsightsView', user='instructor',
+             kwargs=lambda c: {'lecture_id': c.lecture.id}),
+    Endpoint('analytics.ai_suggestions', 'learning.analytics_views.AISuggestionsView', user='instructor',
+             kwargs=lambda c: {'lecture_id': c.lecture.id}),
+    Endpoint('analytics.quality_report', 'learning.analytics_views.QualityReportView', user='instructor',
+             kwargs=lambda c: {'lecture_id': c.lecture.id}),
+    Endpoint('analytics.diagnostics', 'learning.placement_views.ProfessorDiagnosticView', user='instructor',
+             kwargs=lambda c: {'lecture_id': c.lecture.id}),
+    Endpoint('review.pending_routes', 'learning.review_views.PendingReviewRoutesView', user='instructor'),
+
+    # 학생 개인
+    Endpoint('review.my_routes', 'learning.review_views.MyReviewRoutesView'),
+    Endpoint('review.sr_due', 'learning.review_views.SpacedRepetitionDueView'),
+    Endpoint('formative.my_pending', 'learning.formative_views.MyPendingFormativeView'),
+    Endpoint('skillblock.my', 'learning.skillblock_views.MySkillBlocksView'),
+    Endpoint('gapmap.my_map', 'learning.placement_views.GapMapViewSet', action='my_map'),
+    Endpoint('messages.my', 'learning.analytics_views.MyMessagesView'),
+]
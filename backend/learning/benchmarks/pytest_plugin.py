@@ -0,0 +1,81 @@
+"""
+pytest 플러그인: 테스트 세션 종료 시 엔드포인트 벤치마크를 실행하고
+임계값 위반이 있으면 세션을 실패 처리한다.
+
+사용법 (backend/ 에서):
+  DJANGO_SETTINGS_MODULE=reboot_api.settings \
+    pytest -p learning.benchmarks.pytest_plugin --reboot-bench --bench-scales 10,50 \
+           --bench-report bench.json --bench-baseline bench_prev.json
+
+pytest-django 없이도 동작하도록 Django 테스트 DB를 직접 생성/삭제한다.
+모델 의존 모듈은 django.setup() 이후 훅 안에서 import한다.
+"""
+import json
+
+import pytest
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('reboot-bench', 'Re:Boot 엔드포인트 벤치마크')
+    group.addoption('--reboot-bench', action='store_true', default=False,
+                    help='세션 종료 시 엔드포인트 벤치마크 실행')
+    group.addoption('--bench-scales', default='10,50', help='학생 수 스케일 (콤마 구분)')
+    group.addoption('--bench-repeat', type=int, default=3, help='응답 시간 측정 반복 횟수')
+    group.addoption('--bench-report', default='benchmark_report.json', help='리포트 저장 경로')
+    group.addoption('--bench-baseline', default=None, help='비교할 이전 리포트 경로')
+    group.addoption('--bench-thresholds', default=None, help='엔드포인트별 임계값 JSON 경로')
+    group.addoption('--bench-time-tolerance', type=float, default=0.5,
+                    help='기준선 대비 허용 응답 시간 증가율 (0.5 = +50%%)')
+    group.addoption('--bench-fail-on-scaling', action='store_true', default=False,
+                    help='코호트 크기에 따라 쿼리 수가 증가하면 실패')
+
+
+def _load_json(path):
+    if not path:
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    if not config.getoption('--reboot-bench'):
+        return
+
+    import django
+    django.setup()
+    from django.test.utils import setup_test_environment, teardown_test_environment
+    from django.test.runner import DiscoverRunner
+    from .cohort import CohortSpec
+    from .runner import run_suite, find_violations, write_report
+
+    scales = [int(s) for s in config.getoption('--bench-scales').split(',') if s.strip()]
+    reporter = config.pluginmanager.get_plugin('terminalreporter')
+    log = reporter.write_line if reporter else print
+
+    setup_test_environment(debug=True)
+    runner = DiscoverRunner(verbosity=0, interactive=False)
+    old_config = runner.setup_databases()
+    try:
+        report = run_suite(
+            CohortSpec(students=scales[0]), scales,
+            repeat=config.getoption('--bench-repeat'), log=log,
+        )
+    finally:
+        runner.teardown_databases(old_config)
+        teardown_test_environment()
+
+    write_report(report, config.getoption('--bench-report'))
+    violations = find_violations(
+        report,
+        thresholds=_load_json(config.getoption('--bench-thresholds')),
+        baseline=_load_json(config.getoption('--bench-baseline')),
+        time_tolerance=config.getoption('--bench-time-tolerance'),
+        fail_on_scaling=config.getoption('--bench-fail-on-scaling'),
+    )
+    log(f"벤치마크 리포트: {config.getoption('--bench-report')}")
+    if violations:
+        for v in violations:
+            log(f'  ❌ {v}')
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
@@ -0,0 +1,176 @@
+"""
+벤치마크 실행기: 측정 → 리포트(JSON) → 임계값/기준선 비교
+"""
+import json
+import statistics
+import subprocess
+import time
+import tracemalloc
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from .cohort import seed_cohort
+from .endpoints import ENDPOINTS
+
+DEFAULT_MAX_QUERIES = 50
+DEFAULT_MAX_MS = 2000
+DEFAULT_TIME_TOLERANCE = 0.5  # 기준선 대비 응답 시간 +50%까지 허용
+
+
+def measure_endpoint(endpoint, cohort, repeat=3):
+    """
+    엔드포인트 1개 측정 (세이브포인트 안에서 실행 후 롤백).
+    첫 호출에서 쿼리 수 + 피크 메모리(tracemalloc), 이후 repeat회 호출의 중앙값으로 응답 시간을 잰다.
+    """
+    factory = APIRequestFactory()
+    view = endpoint.as_view()
+    user = getattr(cohort, endpoint.user)
+    kwargs = endpoint.kwargs(cohort)
+    params = endpoint.params(cohort)
+
+    def call():
+        request = factory.get(f'/bench/{endpoint.name}/', params)
+        force_authenticate(request, user=user)
+        response = view(request, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    try:
+        # 엔드포인트별 세이브포인트: 측정 중 쓰기(조회 로그 등)는 되돌려 다음 엔드포인트에 영향이 없게 하고,
+        # DB 오류가 나도 바깥 트랜잭션은 계속 쓸 수 있다
+        with transaction.atomic():
+            tracemalloc.start()
+            with CaptureQueriesContext(connection) as ctx:
+                response = call()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            timings = []
+            for _ in range(max(1, repeat)):
+                start = time.perf_counter()
+                call()
+                timings.append((time.perf_counter() - start) * 1000)
+            transaction.set_rollback(True)
+    except Exception as e:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        return {'ok': False, 'error': f'{type(e).__name__}: {e}'[:300]}
+
+    return {
+        'ok': 200 <= response.status_code < 300,
+        'status': response.status_code,
+        'queries': len(ctx.captured_queries),
+        'wall_ms': round(statistics.median(timings), 2),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def run_suite(spec, scales, endpoints=None, repeat=3, label='bench', log=None):
+    """
+    스케일(학생 수)별 코호트를 생성해 모든 엔드포인트를 측정.
+    합성 데이터는 트랜잭션 롤백으로 남기지 않는다.
+    """
+    endpoints = endpoints or ENDPOINTS
+    scales = sorted(set(scales))
+    runs = {ep.name: {} for ep in endpoints}
+
+    with transaction.atomic():
+        for n in scales:
+            if log:
+                log(f'코호트 생성: 학생 {n}명')
+            cohort = seed_cohort(spec.scaled(n), label=f'{label}{n}')
+            for ep in endpoints:
+                result = measure_endpoint(ep, cohort, repeat=repeat)
+                runs[ep.name][str(n)] = result
+                if log:
+                    log(_format_result(ep.name, n, result))
+        transaction.set_rollback(True)
+
+    report_endpoints = {}
+    for ep in endpoints:
+        ep_runs = runs[ep.name]
+        first, last = ep_runs[str(scales[0])], ep_runs[str(scales[-1])]
+        growth = None
+        if len(scales) > 1 and first.get('ok') and last.get('ok'):
+            growth = last['queries'] - first['queries']
+        report_endpoints[ep.name] = {
+            'runs': ep_runs,
+            'query_growth': growth,
+            'scales_with_cohort': bool(growth and growth > 0),
+            'max_queries': ep.max_queries or DEFAULT_MAX_QUERIES,
+            'max_ms': ep.max_ms or DEFAULT_MAX_MS,
+        }
+
+    return {
+        'generated_at': timezone.now().isoformat(),
+        'commit': _git_commit(),
+        'database': connection.vendor,
+        'spec': spec.as_dict(),
+        'scales': scales,
+        'repeat': repeat,
+        'endpoints': report_endpoints,
+    }
+
+
+def find_violations(report, thresholds=None, baseline=None,
+                    time_tolerance=DEFAULT_TIME_TOLERANCE, fail_on_scaling=False):
+    """
+    리포트 검사 → 위반 메시지 목록 (비어 있으면 통과).
+    - thresholds: {endpoint: {max_queries, max_ms}} 오버라이드
+    - baseline: 이전 커밋 리포트 (같은 스케일의 쿼리 수 증가 / 응답 시간 회귀 검출)
+    - fail_on_scaling: 코호트 크기에 따라 쿼리 수가 늘면 위반
+    """
+    thresholds = thresholds or {}
+    violations = []
+    base_endpoints = (baseline or {}).get('endpoints', {})
+
+    for name, data in report['endpoints'].items():
+        limits = {**{'max_queries': data['max_queries'], 'max_ms': data['max_ms']}, **thresholds.get(name, {})}
+        for scale, result in data['runs'].items():
+            where = f'{name} @ {scale}명'
+            if not result.get('ok'):
+                violations.append(f"{where}: 실패 ({result.get('error') or result.get('status')})")
+                continue
+            if result['queries'] > limits['max_queries']:
+                violations.append(f"{where}: 쿼리 {result['queries']}회 > {limits['max_queries']}")
+            if result['wall_ms'] > limits['max_ms']:
+                violations.append(f"{where}: {result['wall_ms']}ms > {limits['max_ms']}ms")
+
+            base = base_endpoints.get(name, {}).get('runs', {}).get(scale)
+            if base and base.get('ok'):
+                if result['queries'] > base['queries']:
+                    violations.append(f"{where}: 쿼리 {base['queries']} → {result['queries']}회 (기준선 대비 증가)")
+                if result['wall_ms'] > base['wall_ms'] * (1 + time_tolerance):
+                    violations.append(f"{where}: {base['wall_ms']} → {result['wall_ms']}ms (기준선 대비 회귀)")
+
+        if fail_on_scaling and data['scales_with_cohort']:
+            violations.append(f"{name}: 코호트 크기에 비례해 쿼리 {data['query_growth']}회 증가 (N+1 의심)")
+
+    return violations
+
+
+def write_report(report, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def _format_result(name, scale, result):
+    if not result.get('ok'):
+        return f"  ❌ {name} @ {scale}명: {result.get('error') or result.get('status')}"
+    return (
+        f"  {name} @ {scale}명: {result['queries']} queries, "
+        f"{result['wall_ms']}ms, peak {result['peak_kb']}KB"
+    )
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True,
+        ).strip()
+    except Exception:
+        return None
@@ -12,46 +12,21 @@ Endpoints:
   DELETE /api/learning/chat/sessions/{id}/   → 세션 삭제
 """
 import re
-import json
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.http import StreamingHttpResponse
 from django.utils import timezone
 
 from .models import AIChatSession, AIChatMessage, VectorStore, Lecture
 from .rag import RAGService
+from .prompts import AI_TUTOR, describe
+from .streaming import iter_tokens, sse_event, sse_response, sse_stream
 from .serializers import (
     AIChatSessionSerializer,
     AIChatSessionDetailSerializer,
     AIChatMessageSerializer,
 )
 
-# 공통 시스템 프롬프트
-AI_TUTOR_SYSTEM_PROMPT = (
-    "너는 Re:Boot IT 부트캠프의 전문 AI 튜터야.\n"
-    "학생의 질문에 대해 [공식 문서 지식]과 [대화 맥락]을 바탕으로 **체계적이고 교육적으로** 답변해.\n\n"
-    "## 답변 형식 (반드시 마크다운으로 작성)\n\n"
-    "### 1️⃣ 핵심 개념 한 줄 요약\n"
-    "> 핵심 내용을 한 줄로 정리\n\n"
-    "### 2️⃣ 상세 설명\n"
-    "- 개념을 **초보자도 이해할 수 있도록** 비유와 함께 설명\n"
-    "- 관련된 하위 개념은 불릿 포인트로 정리\n"
-    "- **중요 키워드**는 볼드 처리\n\n"
-    "### 3️⃣ 코드 예시\n"
-    "```언어\n// 실제 동작하는 코드 예시 포함\n```\n"
-    "- 코드에 대한 라인별 설명 추가\n\n"
-    "### 4️⃣ 실전 팁 💡\n"
-    "- 실무에서 자주 쓰이는 패턴이나 주의사항\n\n"
-    "## 규칙\n"
-    "- [공식 문서 지식]에 근거가 있는 내용만 답변할 것. 근거 없이 추측하지 말 것.\n"
-    "- 한국어로 답변, 기술 용어는 영어 병기 (예: 반응성(Reactivity))\n"
-    "- 정보가 부족하면 솔직히 말하고 공식 문서 URL 안내\n"
-    "- 이전 대화 맥락을 고려하여 자연스럽게 이어가기\n"
-    "- 답변은 항상 마크다운 형식으로 가독성 있게 작성"
-)
-
-
 class AIChatViewSet(viewsets.ModelViewSet):
     """AI 튜터 챗봇 ViewSet"""
     permission_classes = [permissions.IsAuthenticated]
@@ -128,13 +103,15 @@ class AIChatViewSet(viewsets.ModelViewSet):
             for m in reversed(list(recent_messages))
         ])
 
-        user_prompt = (
-            f"[공식 문서 지식 (Knowledge)]:\n{knowledge_context[:3000]}\n\n"
-            f"[이전 대화]:\n{conversation_history}\n\n"
-            f"[학생의 질문]:\n{question}"
+        # 고정 시스템 프롬프트 → 이전 대화 → 검색 지식 → 질문 순 (앞부분 프롬프트 캐시 적중)
+        messages = AI_TUTOR.messages(
+            history=conversation_history,
+            knowledge=knowledge_context[:3000],
+            question=question,
         )
+        print(f"🧾 [AI Tutor] 세션 #{session.id} 프롬프트 {describe(AI_TUTOR, messages)}")
 
-        return rag, sources, user_prompt
+        return rag, sources, messages
 
     @action(detail=True, methods=['post'])
     def ask(self, request, pk=None):
@@ -162,14 +139,12 @@ class AIChatViewSet(viewsets.ModelViewSet):
 
         # 3. RAG 검색 + 답변 생성
         try:
-            rag, sources, user_prompt = self._prepare_context(session, question)
+            rag, sources, messages = self._prepare_context(session, question)
 
             answer = rag.client.chat.completions.create(
                 model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": AI_TUTOR_SYSTEM_PROMPT},
-                    {"role": "user", "content": user_prompt}
-                ],
+                messages=messages,
+                prompt_cache_key=AI_TUTOR.id,
                 max_tokens=3000,
             )
             ai_answer = answer.choices[0].message.content
@@ -222,41 +197,24 @@ class AIChatViewSet(viewsets.ModelViewSet):
 
         # 3. 컨텍스트 준비
         try:
-            rag, sources, user_prompt = self._prepare_context(session, question)
+            rag, sources, messages = self._prepare_context(session, question)
         except Exception as e:
             return Response(
                 {'error': f'컨텍스트 준비 실패: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-        # 4. SSE 스트리밍 generator
-        def stream_generator():
-            full_answer = ""
-            try:
-                # 소스 정보 먼저 전송
-                yield f"data: {json.dumps({'type': 'sources', 'sources': sources[:5]}, ensure_ascii=False)}\n\n"
-
-                stream = rag.client.chat.completions.create(
-                    model="gpt-4o",
-                    messages=[
-                        {"role": "system", "content": AI_TUTOR_SYSTEM_PROMPT},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    max_tokens=3000,
-                    stream=True,
-                )
-
-                for chunk in stream:
-                    if chunk.choices[0].delta.content:
-                        token = chunk.choices[0].delta.content
-                        full_answer += token
-                        yield f"data: {json.dumps({'type': 'token', 'content': token}, ensure_ascii=False)}\n\n"
-
-            except Exception as e:
-                full_answer = f"답변 생성 중 오류가 발생했습니다: {str(e)}"
-                yield f"data: {json.dumps({'type': 'error', 'content': full_answer}, ensure_ascii=False)}\n\n"
-
-            # 스트리밍 완료 후 DB 저장
+        # 4. SSE 스트리밍 (소스 정보 먼저 → 토큰 → 완료 후 DB 저장)
+        def open_tokens():
+            return iter_tokens(rag.client.chat.completions.create(
+                model="gpt-4o",
+                messages=messages,
+                prompt_cache_key=AI_TUTOR.id,
+                max_tokens=3000,
+                stream=True,
+            ))
+
+        def save_answer(full_answer, failed):
             ai_msg = AIChatMessage.objects.create(
                 session=session,
                 sender='AI',
@@ -264,13 +222,9 @@ class AIChatViewSet(viewsets.ModelViewSet):
                 sources=sources[:5],
             )
             session.save(update_fields=['updated_at'])
+            return {'message_id': ai_msg.id}
 
-            yield f"data: {json.dumps({'type': 'done', 'message_id': ai_msg.id}, ensure_ascii=False)}\n\n"
-
-        response = StreamingHttpResponse(
-            stream_generator(),
-            content_type='text/event-stream',
-        )
-        response['Cache-Control'] = 'no-cache'
-        response['X-Accel-Buffering'] = 'no'
-        return response
+        return sse_response(sse_stream(
+            open_tokens, save_answer,
+            preface=[sse_event('sources', sources=sources[:5])],
+        ))
@@ -0,0 +1,73 @@
+"""
+Phase 3: 개념 태그 오답 인덱스 (ConceptMistake) 적재 헬퍼
+퀴즈 응답 / 형성평가 제출 / Weak Zone 감지 시점에 호출됨 (View 아님)
+"""
+from .models import ConceptMistake
+
+CONCEPT_KEY_LENGTH = 50
+
+
+def quiz_concept(question_text):
+    """라이브 퀴즈 개념 키: 문제 앞 50자"""
+    return (question_text or '')[:CONCEPT_KEY_LENGTH]
+
+
+def formative_concept(question):
+    """형성평가 개념 키: concept_tag 우선, 없으면 문제 앞 50자"""
+    return question.get('concept_tag') or (question.get('question') or '')[:CONCEPT_KEY_LENGTH]
+
+
+def record_quiz_mistake(response):
+    """라이브 퀴즈 오답 1건 인덱싱"""
+    if response.is_correct:
+        return None
+    quiz = response.quiz
+    session = quiz.live_session
+    return ConceptMistake.objects.create(
+        lecture_id=session.lecture_id,
+        live_session=session,
+        student_id=response.student_id,
+        concept=quiz_concept(quiz.question_text),
+        source='QUIZ',
+        quiz=quiz,
+        created_at=response.responded_at,
+    )
+
+
+def record_formative_mistakes(assessment, formative_response):
+    """형성평가 제출 결과(answers=[{question_id, is_correct}])에서 오답 개념 일괄 인덱싱"""
+    questions_map = {q.get('id'): q for q in (assessment.questions or [])}
+    session = assessment.live_session
+    rows = []
+    for result in (formative_response.answers or []):
+        if result.get('is_correct'):
+            continue
+        q = questions_map.get(result.get('question_id'))
+        if not q:
+            continue
+        rows.append(ConceptMistake(
+            lecture_id=session.lecture_id,
+            live_session=session,
+            student_id=formative_response.student_id,
+            concept=formative_concept(q)[:200],
+            source='FORMATIVE',
+            assessment=assessment,
+            created_at=formative_response.submitted_at,
+        ))
+    return ConceptMistake.objects.bulk_create(rows)
+
+
+def record_weak_zone(alert):
+    """Weak Zone 감지 1건 인덱싱 (recent_topic 기준)"""
+    topic = (alert.trigger_detail or {}).get('recent_topic', '')[:CONCEPT_KEY_LENGTH]
+    if not topic:
+        return None
+    session = alert.live_session
+    return ConceptMistake.objects.create(
+        lecture_id=session.lecture_id,
+        live_session=session,
+        student_id=alert.student_id,
+        concept=topic,
+        source='WEAK_ZONE',
+        created_at=alert.created_at,
+    )
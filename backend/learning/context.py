@@ -1,6 +1,8 @@
 from django.conf import settings
+from django.core.cache import cache
 from .models import LearningSession, STTLog
 import openai
+import threading
 from django.utils import timezone
 from datetime import timedelta
 
@@ -9,107 +11,194 @@ class ContextManager:
     [대화 압축 및 화자 분리 컨텍스트 관리자]
     - Long Context를 압축(Summarize)하여 토큰 비용 절감
     - 다화자(Multi-Speaker) 환경에서 화자 식별
+    - 압축 워터마크(compressed_until_id) 이후의 새 로그만 요약에 접어 넣음 (증분 압축)
+      워터마크는 STTLog.id(저장 순서) 기준: 청크가 동시 업로드돼 sequence_order 순서와 다르게 저장돼도
+      늦게 저장된 로그는 다음 압축에 포함됨 (구간 안 정렬은 sequence_order)
+    - 계층 요약: 새 로그 묶음 → level 0 구간 요약, 같은 레벨 구간이 FANOUT개 쌓이면 한 단계 위 구간으로 병합
+      → 아주 긴 세션도 구간 수가 O(FANOUT · log n)로 유지
     """
-    
+
+    FOLD_BATCH = 50       # 한 번에 접어 넣는 최대 로그 수 (밀린 로그는 여러 구간으로)
+    FANOUT = 4            # 같은 레벨 구간 4개 → 상위 구간 1개
+    RECENT_MAX = 30       # get_full_context에 원본으로 붙이는 미압축 로그 상한
+    RECENT_MIN = 5        # 모두 압축됐어도 최근 N개는 원본으로 (Short-term memory)
+    LOCK_TIMEOUT = 300    # 압축 진행 중 표시 유지 시간 (스레드가 죽어도 풀리도록)
+
     def __init__(self):
         self.client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
-        self.compression_threshold = 10  # 대화 10턴마다 압축 시도 (테스트용)
+        self.compression_threshold = 10  # 새 로그 10개마다 압축 시도 (테스트용)
         # self.compression_threshold = 50 # 실전용 권장값
 
     def compress_session_if_needed(self, session_id):
         """
         특정 세션의 로그를 확인하고, 압축 시점이 도래했으면 압축 수행
+        - 워터마크 이후 새 로그가 threshold 이상이거나, 마지막 압축 후 5분이 지났고 새 로그가 있으면 압축
         """
         session = LearningSession.objects.get(id=session_id)
-        
-        # 1. 최근 압축 이후 쌓인 새 로그 조회 (last_compressed_at 기준이 아니라, 이미 처리된 시점을 별도 기록하거나 로그 수로 판단)
-        # 여기서는 간단히: 전체 로그 수 확인
-        total_logs = STTLog.objects.filter(session=session).count()
-        
-        # (임시 로직) 그냥 항상 압축하는 건 비효율적이므로, 
-        # 실제로는 '마지막 압축된 sequence_order'를 저장하는 필드가 필요함.
-        # 하지만 지금은 모델 변경 최소화를 위해 '시간'으로 체크하거나 '로그 개수'로 체크
-        
-        # 예: 10개 단위로 끊어서 압축
-        # if total_logs % self.compression_threshold != 0:
-        #     return False
-
-        # [Better Logic] 
-        # 현재 context_summary가 비어있으면 -> 첫 압축
-        # 이미 있으면 -> Incremental Update
-        
-        # 최근 10분 내에 압축했으면 생략 (너무 잦은 압축 방지)
-        if session.last_compressed_at and (timezone.now() - session.last_compressed_at) < timedelta(minutes=5):
-             return False
+        pending = STTLog.objects.filter(session=session, id__gt=session.compressed_until_id).count()
+        if pending == 0:
+            return False
+        if pending < self.compression_threshold and session.last_compressed_at and \
+                (timezone.now() - session.last_compressed_at) < timedelta(minutes=5):
+            return False
 
         # 압축 실행
         self._perform_compression(session)
         return True
 
+    def compress_session_async(self, session_id):
+        """세션당 압축 스레드 1개만 (진행 중이면 None — 같은 구간을 중복 요약하지 않음)"""
+        lock_key = f'learning:context_compress:{session_id}'
+        if not cache.add(lock_key, 1, self.LOCK_TIMEOUT):
+            return None
+
+        def _run():
+            try:
+                self.compress_session_if_needed(session_id)
+            except Exception as e:
+                print(f"Compression Error: {e}")
+            finally:
+                cache.delete(lock_key)
+
+        thread = threading.Thread(target=_run)
+        thread.daemon = True
+        thread.start()
+        return thread
+
     def _perform_compression(self, session):
-        # 1. 전체 또는 최근 로그 가져오기
-        logs = STTLog.objects.filter(session=session).order_by('sequence_order')
-        full_text = " ".join([f"[{log.created_at.strftime('%H:%M')}] {log.text_chunk}" for log in logs])
-        
-        if not full_text.strip():
+        # 1. 워터마크 이후 새 로그만 가져오기 (FOLD_BATCH 단위)
+        watermark = session.compressed_until_id
+        segments = list(session.context_segments or [])
+        new_logs = list(
+            STTLog.objects.filter(session=session, id__gt=watermark).order_by('id')
+        )
+        if not new_logs:
             return
 
-        # 2. OpenAI에게 '누적 요약' 요청
-        print(f"DEBUG: Compressing Session {session.id} (Length: {len(full_text)})")
-        
-        current_summary = session.context_summary or "없음"
-        
+        try:
+            for start in range(0, len(new_logs), self.FOLD_BATCH):
+                batch = new_logs[start:start + self.FOLD_BATCH]
+                watermark_after = batch[-1].id
+                batch = sorted(batch, key=lambda log: log.sequence_order)
+                text = " ".join([f"[{log.created_at.strftime('%H:%M')}] {log.text_chunk}" for log in batch])
+                if text.strip():
+                    # 2. 직전 구간 요약만 문맥으로 붙여 새 로그를 level 0 구간으로 요약
+                    print(f"DEBUG: Compressing Session {session.id} (seq {batch[0].sequence_order}~{batch[-1].sequence_order}, Length: {len(text)})")
+                    previous = segments[-1]['text'] if segments else "없음"
+                    segments = self._merge_levels(segments + [{
+                        'from_seq': batch[0].sequence_order,
+                        'to_seq': batch[-1].sequence_order,
+                        'level': 0,
+                        'text': self._summarize_new(previous, text),
+                    }])
+                watermark = watermark_after
+        except Exception as e:
+            print(f"Compression Error: {e}")
+            if watermark == session.compressed_until_id:
+                return
+
+        # 3. DB 업데이트 (다른 압축이 먼저 워터마크를 옮겼으면 버림)
+        new_summary = self.render_segments(segments)
+        updated = LearningSession.objects.filter(
+            id=session.id, compressed_until_id=session.compressed_until_id,
+        ).update(
+            context_summary=new_summary,
+            context_segments=segments,
+            compressed_until_id=watermark,
+            last_compressed_at=timezone.now(),
+        )
+        if updated:
+            session.context_summary = new_summary
+            session.context_segments = segments
+            session.compressed_until_id = watermark
+            print(f"DEBUG: Compression Complete (until log #{watermark}, {len(segments)} segments). Summary: {new_summary[:50]}...")
+
+    def _merge_levels(self, segments):
+        """끝에서 같은 레벨 구간이 FANOUT개 이어지면 상위 레벨 구간 1개로 병합 (반복)"""
+        while len(segments) >= self.FANOUT:
+            tail = segments[-self.FANOUT:]
+            level = tail[0]['level']
+            if any(seg['level'] != level for seg in tail):
+                break
+            merged = self._summarize_merge([seg['text'] for seg in tail])
+            segments = segments[:-self.FANOUT] + [{
+                'from_seq': min(seg['from_seq'] for seg in tail),
+                'to_seq': max(seg['to_seq'] for seg in tail),
+                'level': level + 1,
+                'text': merged,
+            }]
+        return segments
+
+    def _summarize_new(self, previous_summary, new_text):
         prompt = (
-            "아래 제공된 '[이전 요약]'과 '[새로운 대화 내용]'을 합쳐서, "
-            "**최신 상태의 단일 압축 요약본**을 갱신해줘.\n\n"
+            "아래 제공된 '[이전 요약]'은 문맥 참고용이고, '[새로운 대화 내용]'만 요약해줘.\n\n"
             "[규칙]\n"
             "1. 핵심 주제, 결정된 사항, 주요 질문 위주로 요약\n"
-            "2. 불필요한 인사말이나 반복 제거\n"
+            "2. 불필요한 인사말이나 반복 제거 (이전 요약과 겹치는 내용도 제외)\n"
             "3. 3~5문장 내외로 간결하게 작성\n"
             "4. 화자 식별 가능 시 명시 (학생 A, 강사 등)\n\n"
-            f"[이전 요약]:\n{current_summary}\n\n"
-            f"[새로운 대화 내용]:\n{full_text}\n\n"
-            "[갱신된 요약]:"
+            f"[이전 요약]:\n{previous_summary}\n\n"
+            f"[새로운 대화 내용]:\n{new_text}\n\n"
+            "[새 내용 요약]:"
         )
-        
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": "당신은 대화 기록 관리 전문가입니다. 핵심 내용만 간결하게 압축하세요."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=500
-            )
-            
-            new_summary = response.choices[0].message.content
-            
-            # 3. DB 업데이트
-            session.context_summary = new_summary
-            session.last_compressed_at = timezone.now()
-            session.save()
-            print(f"DEBUG: Compression Complete. Summary: {new_summary[:50]}...")
-            
-        except Exception as e:
-            print(f"Compression Error: {e}")
+        return self._complete(prompt, max_tokens=500)
+
+    def _summarize_merge(self, texts):
+        joined = "\n\n".join(f"({idx}) {text}" for idx, text in enumerate(texts, start=1))
+        prompt = (
+            "아래는 한 수업의 연속된 구간 요약들이야. 시간 순서를 유지하며 **하나의 압축 요약본**으로 합쳐줘.\n\n"
+            "[규칙]\n"
+            "1. 핵심 주제, 결정된 사항, 주요 질문 위주로 요약\n"
+            "2. 중복 제거, 4~6문장 내외\n\n"
+            f"[구간 요약]:\n{joined}\n\n"
+            "[통합 요약]:"
+        )
+        return self._complete(prompt, max_tokens=600)
+
+    def _complete(self, prompt, max_tokens):
+        response = self.client.chat.completions.create(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": "당신은 대화 기록 관리 전문가입니다. 핵심 내용만 간결하게 압축하세요."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=max_tokens
+        )
+        return response.choices[0].message.content.strip()
+
+    @staticmethod
+    def render_segments(segments):
+        """계층 요약 구간 → 단일 요약 텍스트 (오래된 구간일수록 더 압축된 상위 레벨)"""
+        return "\n".join(f"- (#{seg['from_seq']}~#{seg['to_seq']}) {seg['text']}" for seg in segments)
 
     def get_full_context(self, session_id):
         """
         RAG나 챗봇이 사용할 '완성된 프롬프트 컨텍스트' 반환
         Format: [압축된 과거 기억] + [최근 대화 원본]
+        비용은 워터마크 이후 최근 로그 수에만 비례 (미압축 로그가 쌓였으면 백그라운드 압축 시작)
         """
         session = LearningSession.objects.get(id=session_id)
-        
+
         # 1. 압축된 과거
         context = f"[--- 지난 대화 요약 ---]\n{session.context_summary or '(없음)'}\n\n"
-        
-        # 2. 최근 대화 (아직 압축 안 된, 혹은 최근 N개)
-        # 여기서는 단순히 최근 5개만 원본으로 붙여줌 (Short-term memory)
-        recent_logs = STTLog.objects.filter(session=session).order_by('-sequence_order')[:5]
-        recent_logs = reversed(recent_logs) # 시간순 정렬
-        
+
+        # 2. 최근 대화 (워터마크 이후 아직 압축 안 된 로그, 없으면 최근 N개)
+        recent_logs = list(STTLog.objects.filter(
+            session=session, id__gt=session.compressed_until_id,
+        ).order_by('-id')[:self.RECENT_MAX])
+        if len(recent_logs) >= self.compression_threshold:
+            self.compress_session_async(session.id)
+        if len(recent_logs) < self.RECENT_MIN:
+            # 미압축 로그(늦게 도착한 청크 포함)는 유지하고 최근 N개로 채움
+            seen = {log.id for log in recent_logs}
+            recent_logs += [
+                log for log in STTLog.objects.filter(session=session).order_by('-sequence_order')[:self.RECENT_MIN]
+                if log.id not in seen
+            ]
+        recent_logs = sorted(recent_logs, key=lambda log: log.sequence_order) # 시간순 정렬
+
         context += "[--- 최근 대화 ---]\n"
         for log in recent_logs:
             context += f"- {log.text_chunk}\n"
-            
+
         return context
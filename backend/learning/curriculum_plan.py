@@ -0,0 +1,197 @@
+"""
+커리큘럼 경로 계획 헬퍼 (View 아님)
+학생의 목표 직무가 있으면 역량 선수관계 그래프(skill_graph)로 학습 순서를 결정적으로 계산하고,
+LLM은 계산된 계획의 근거 설명에만 사용한다. 목표 직무가 없으면 View가 기존 LLM 설계로 대체.
+리라우팅은 목표 순서와 현재 항목의 차이(추가/삭제/이동)만 bulk 연산으로 반영하고 압축 diff를 남긴다.
+"""
+import hashlib
+import json
+
+import openai
+from django.conf import settings
+from django.db import transaction
+
+from .models import StudentGoal, StudentSkill, CurriculumItem
+from .skill_graph import get_skill_graph
+
+QUIZ_EVERY = 3  # 역량 3개마다 중간 점검 퀴즈
+
+
+def student_goal(student):
+    """최신 목표 직무 (없으면 None)"""
+    goal = StudentGoal.objects.filter(student=student).select_related('career_goal').first()
+    return goal.career_goal if goal else None
+
+
+def owned_skill_ids(student, extra=()):
+    ids = set(StudentSkill.objects.filter(student=student, status='OWNED').values_list('skill_id', flat=True))
+    ids.update(extra)
+    return ids
+
+
+def plan_new_items(path):
+    """학습 경로 → 커리큘럼 항목 [{title, type, skill_id}]"""
+    graph = get_skill_graph()
+    items = []
+    for idx, skill_id in enumerate(path, start=1):
+        items.append({'title': graph.names[skill_id], 'type': 'LECTURE', 'skill_id': skill_id})
+        if idx % QUIZ_EVERY == 0 and idx < len(path):
+            items.append({'title': '중간 점검 퀴즈', 'type': 'QUIZ', 'skill_id': None})
+    if items:
+        items.append({'title': '최종 프로젝트', 'type': 'PROJECT', 'skill_id': None})
+    return items
+
+
+def plan_reroute(curriculum, items, path):
+    """
+    현재 항목 + 새 학습 경로 → 새 순서의 항목 목록 (추가 항목은 저장 전 CurriculumItem)
+    - 완료 항목은 기존 순서 그대로 앞에
+    - 미완료 역량 항목은 경로(위상) 순서로, 경로에 없는 역량은 보충 항목으로 추가
+    - 이미 보유하게 된 역량의 미완료 보충 항목은 제외 (삭제 대상)
+    - 역량이 없는 항목(퀴즈/프로젝트 등)은 직전 역량 항목에 붙어 함께 이동
+    """
+    graph = get_skill_graph()
+    done = [i for i in items if i.is_completed]
+    position = {sid: idx for idx, sid in enumerate(path)}
+
+    followers = {None: []}
+    by_skill = {}
+    anchor = None
+    for item in items:
+        if item.is_completed:
+            continue
+        if item.skill_id in position and item.skill_id not in by_skill:
+            by_skill[item.skill_id] = item
+            anchor = item.skill_id
+            followers.setdefault(anchor, [])
+        elif item.skill_id and item.is_supplementary and item.skill_id not in position:
+            continue
+        else:
+            followers.setdefault(anchor, []).append(item)
+
+    sequence = list(done) + followers[None]
+    for sid in path:
+        sequence.append(by_skill.get(sid) or CurriculumItem(
+            curriculum=curriculum,
+            title=graph.names[sid],
+            item_type='SUPPLEMENT',
+            is_supplementary=True,
+            skill_id=sid,
+        ))
+        sequence.extend(followers.get(sid, []))
+    return sequence
+
+
+def plan_llm_reroute(curriculum, items, ai_result):
+    """
+    LLM 제안(add_items / reorder / remove_items) → 새 순서의 항목 목록
+    완료 항목은 이동/삭제하지 않고, 삭제는 미완료 보충 항목만 허용
+    """
+    sequence = list(items)
+
+    removable = {i.title: i for i in items if i.is_supplementary and not i.is_completed}
+    for title in ai_result.get('remove_items') or []:
+        item = removable.pop(str(title), None)
+        if item is not None:
+            sequence.remove(item)
+
+    movable = {i.title: i for i in sequence if not i.is_completed}
+    for move in ai_result.get('reorder') or []:
+        item = movable.get(move.get('item_title'))
+        new_order = move.get('new_order')
+        if item is None or not isinstance(new_order, int):
+            continue
+        sequence.remove(item)
+        sequence.insert(_slot(sequence, new_order), item)
+
+    for new_item in ai_result.get('add_items') or []:
+        item = CurriculumItem(
+            curriculum=curriculum,
+            title=new_item.get('title', '보충 학습'),
+            item_type=new_item.get('type', 'SUPPLEMENT'),
+            is_supplementary=True,
+        )
+        order = new_item.get('order')
+        if isinstance(order, int):
+            sequence.insert(_slot(sequence, order), item)
+        else:
+            sequence.append(item)
+    return sequence
+
+
+def _slot(sequence, order):
+    """1부터 시작하는 순서 → 삽입 위치 (완료 항목 앞으로는 넣지 않음)"""
+    first_open = next((idx for idx, i in enumerate(sequence) if not i.is_completed), len(sequence))
+    return min(max(order - 1, first_open), len(sequence))
+
+
+def apply_sequence(curriculum, items, sequence):
+    """
+    목표 순서를 bulk 연산으로 반영 (삭제 1회 + bulk_create + bulk_update)
+    반환: 압축 diff {'add': [[id, order, title]], 'remove': [[id, title]], 'move': [[id, from, to]]}
+    """
+    keep = {i.pk for i in sequence if i.pk}
+    removed = [i for i in items if i.pk not in keep]
+    to_create, to_update, moves = [], [], []
+    for idx, item in enumerate(sequence, start=1):
+        if item.pk is None:
+            item.order_index = idx
+            to_create.append(item)
+        elif item.order_index != idx:
+            moves.append([item.pk, item.order_index, idx])
+            item.order_index = idx
+            to_update.append(item)
+
+    with transaction.atomic():
+        if removed:
+            CurriculumItem.objects.filter(id__in=[i.pk for i in removed]).delete()
+        CurriculumItem.objects.bulk_create(to_create)
+        CurriculumItem.objects.bulk_update(to_update, ['order_index'])
+
+    return {
+        'add': [[i.pk, i.order_index, i.title] for i in to_create],
+        'remove': [[i.pk, i.title] for i in removed],
+        'move': moves,
+    }
+
+
+def reroute_signature(items, signals, reason='', reason_detail=''):
+    """학습 신호 + 항목 상태 + 요청 사유 해시 — 직전 리라우팅 이후 변화가 없으면 같은 값"""
+    payload = {
+        'items': [[i.pk, i.skill_id, i.order_index, i.is_completed] for i in items],
+        'signals': signals,
+        'reason': [reason, reason_detail],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def explain_plan(goal, added_names, path_names, reason, reason_detail):
+    """계산된 경로의 근거 설명만 LLM에 요청 (실패 시 규칙 기반 문구)"""
+    fallback = (
+        f"'{goal.title}' 목표 기준 선수 역량 순서로 학습 경로를 재정렬했습니다."
+        + (f" 보충 역량 {len(added_names)}개({', '.join(added_names[:5])})를 추가했습니다." if added_names else '')
+    )
+    try:
+        client = openai.OpenAI(api_key=settings.OPENAI_API_KEY, timeout=30.0)
+        response = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": (
+                    "너는 IT 부트캠프의 학습 코치야. 학습 경로는 이미 선수관계 그래프로 확정되었어.\n"
+                    "경로를 바꾸지 말고, 학생에게 이 순서와 추가된 보충 역량의 이유를 3~4문장 한국어로 설명해줘.\n"
+                    '반드시 {"recommendation": "설명"} json 형식으로 응답할 것.'
+                )},
+                {"role": "user", "content": (
+                    f"[목표 직무]: {goal.title}\n"
+                    f"[리라우팅 사유]: {reason} - {reason_detail}\n"
+                    f"[추가된 보충 역량]: {', '.join(added_names) or '없음'}\n"
+                    f"[남은 학습 순서]: {' → '.join(path_names) or '모두 보유'}"
+                )},
+            ],
+            max_tokens=400,
+            response_format={"type": "json_object"},
+        )
+        return json.loads(response.choices[0].message.content).get('recommendation') or fallback
+    except Exception as e:
+        print(f"⚠️ [Curriculum] 경로 설명 생성 실패 (경로는 정상): {e}")
+        return fallback
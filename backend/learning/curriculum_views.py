@@ -14,7 +14,6 @@ from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.utils import timezone
-from django.db import models as db_models
 
 import openai
 import json
@@ -24,6 +23,11 @@ from .models import (
     Curriculum, CurriculumItem, ReroutingLog,
     Lecture, QuizAttempt, SkillBlock,
 )
+from .curriculum_plan import (
+    student_goal, owned_skill_ids, plan_new_items, plan_reroute, plan_llm_reroute,
+    apply_sequence, reroute_signature, explain_plan,
+)
+from .skill_graph import get_skill_graph
 from .serializers import (
     CurriculumSerializer,
     CurriculumDetailSerializer,
@@ -96,12 +100,22 @@ class CurriculumViewSet(viewsets.ModelViewSet):
             curriculum_title = f"{first_lecture.title} 학습 로드맵"
             course_name = first_lecture.title
 
-        try:
-            client = openai.OpenAI(api_key=settings.OPENAI_API_KEY, timeout=60.0)
-            response = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": """
+        # 목표 직무가 있으면 선수관계 그래프로 학습 경로를 결정적으로 계산 (LLM 설계 생략)
+        goal = student_goal(student)
+        if goal:
+            items_to_create = plan_new_items(
+                get_skill_graph().learning_path(goal.id, owned_skill_ids(student))
+            )
+            if items_to_create:
+                curriculum_title = f"{goal.title} 학습 로드맵"
+
+        if not items_to_create:
+            try:
+                client = openai.OpenAI(api_key=settings.OPENAI_API_KEY, timeout=60.0)
+                response = client.chat.completions.create(
+                    model="gpt-4o",
+                    messages=[
+                        {"role": "system", "content": """
 너는 IT 부트캠프의 '학습 경로 설계 전문가'야.
 학생의 수강 강의, 퀴즈 성적, 보유 스킬을 분석하여 최적의 학습 커리큘럼을 설계해줘.
 
@@ -120,7 +134,7 @@ class CurriculumViewSet(viewsets.ModelViewSet):
   ]
 }
                     """},
-                    {"role": "user", "content": f"""
+                        {"role": "user", "content": f"""
 [수강 강의]:
 {lecture_info}
 
@@ -132,29 +146,29 @@ class CurriculumViewSet(viewsets.ModelViewSet):
 
 위 데이터를 기반으로 맞춤형 학습 커리큘럼을 설계해줘.
                     """}
-                ],
-                max_tokens=1500,
-                response_format={"type": "json_object"},
-            )
-
-            ai_result = json.loads(response.choices[0].message.content)
-            if ai_result.get('title'):
-                curriculum_title = ai_result['title']
-            items_to_create = ai_result.get('items', [])
+                    ],
+                    max_tokens=1500,
+                    response_format={"type": "json_object"},
+                )
 
-        except Exception as e:
-            # AI 실패 시 기본 항목으로 fallback
-            items_to_create = [
-                {"title": "오리엔테이션 & 환경 설정", "type": "LECTURE"},
-                {"title": "기초 문법 학습", "type": "LECTURE"},
-                {"title": "기초 확인 퀴즈", "type": "QUIZ"},
-                {"title": "핵심 개념 심화", "type": "LECTURE"},
-                {"title": "실습 프로젝트", "type": "PROJECT"},
-                {"title": "중간 점검 퀴즈", "type": "QUIZ"},
-                {"title": "응용 학습", "type": "LECTURE"},
-                {"title": "종합 복습", "type": "REVIEW"},
-                {"title": "최종 프로젝트", "type": "PROJECT"},
-            ]
+                ai_result = json.loads(response.choices[0].message.content)
+                if ai_result.get('title'):
+                    curriculum_title = ai_result['title']
+                items_to_create = ai_result.get('items', [])
+
+            except Exception as e:
+                # AI 실패 시 기본 항목으로 fallback
+                items_to_create = [
+                    {"title": "오리엔테이션 & 환경 설정", "type": "LECTURE"},
+                    {"title": "기초 문법 학습", "type": "LECTURE"},
+                    {"title": "기초 확인 퀴즈", "type": "QUIZ"},
+                    {"title": "핵심 개념 심화", "type": "LECTURE"},
+                    {"title": "실습 프로젝트", "type": "PROJECT"},
+                    {"title": "중간 점검 퀴즈", "type": "QUIZ"},
+                    {"title": "응용 학습", "type": "LECTURE"},
+                    {"title": "종합 복습", "type": "REVIEW"},
+                    {"title": "최종 프로젝트", "type": "PROJECT"},
+                ]
 
         # 커리큘럼 생성
         target_date = timezone.now().date() + timezone.timedelta(weeks=8)
@@ -174,6 +188,7 @@ class CurriculumViewSet(viewsets.ModelViewSet):
                 item_type=item_data.get('type', 'LECTURE'),
                 order_index=idx + 1,
                 lecture=linked_lecture,
+                skill_id=item_data.get('skill_id'),
             )
 
         return Response(
@@ -224,38 +239,113 @@ class CurriculumViewSet(viewsets.ModelViewSet):
         """
         AI 기반 커리큘럼 리라우팅.
         퀴즈 성적, 진도, 이해도를 분석하여 학습 경로를 재설계.
+        - 목표 직무가 있으면 선수관계 그래프로 경로 계산, LLM은 근거 설명만
+        - 바뀐 항목만 bulk 추가/삭제/이동하고 압축 diff를 로그에 기록
+        - 직전 리라우팅 이후 학습 신호와 항목 상태가 그대로면 LLM 호출 없이 직전 결과 반환
         """
         curriculum = self.get_object()
         reason = request.data.get('reason', 'QUIZ_FAIL')
         reason_detail = request.data.get('reason_detail', '')
 
-        # 현재 경로 스냅샷
-        old_items = list(curriculum.items.values_list('id', flat=True))
-
-        # 학생 학습 데이터 수집
         student = curriculum.student
-        quiz_attempts = QuizAttempt.objects.filter(
-            student=student
-        ).order_by('-submitted_at')[:10]
+        items = list(curriculum.items.all())
+        goal = student_goal(student)
+
+        if goal:
+            graph = get_skill_graph()
+            done_skills = {i.skill_id for i in items if i.is_completed and i.skill_id}
+            path = graph.learning_path(goal.id, owned_skill_ids(student, done_skills))
+            signals = {'goal': goal.id, 'path': path}
+        else:
+            quiz_attempts = list(QuizAttempt.objects.filter(
+                student=student
+            ).order_by('-submitted_at')[:10])
+            skill_blocks = list(SkillBlock.objects.filter(
+                student=student
+            ).select_related('skill').order_by('-created_at')[:10])
+            signals = {
+                'quiz': [[a.id, a.score] for a in quiz_attempts],
+                'blocks': [[b.skill_id, b.is_earned, b.level] for b in skill_blocks],
+            }
+
+        # 변화 없음 → 직전 리라우팅 결과 그대로 (LLM 호출 없음)
+        signature = reroute_signature(items, signals, reason, reason_detail)
+        last_log = curriculum.rerouting_logs.first()
+        if last_log and last_log.signature == signature:
+            return Response({
+                'rerouting_id': last_log.id,
+                'recommendation': last_log.ai_recommendation,
+                'items_added': 0,
+                'diff': {'add': [], 'remove': [], 'move': []},
+                'unchanged': True,
+                'new_progress': curriculum.progress_percent,
+                'curriculum': CurriculumDetailSerializer(curriculum).data,
+            })
+
+        ai_failed = False
+        if goal:
+            sequence = plan_reroute(curriculum, items, path)
+            diff = apply_sequence(curriculum, items, sequence)
+            if diff['add'] or diff['remove'] or diff['move']:
+                recommendation = explain_plan(
+                    goal,
+                    [title for _, _, title in diff['add']],
+                    [graph.names[sid] for sid in path],
+                    reason, reason_detail,
+                )
+            else:
+                recommendation = f"'{goal.title}' 목표 기준 현재 학습 경로가 이미 최적 순서입니다."
+        else:
+            ai_result, recommendation = self._ask_reroute(
+                items, quiz_attempts, skill_blocks, reason, reason_detail,
+            )
+            ai_failed = ai_result is None
+            sequence = plan_llm_reroute(curriculum, items, ai_result or {})
+            diff = apply_sequence(curriculum, items, sequence)
+
+        # 리라우팅 로그 기록 (반영 후 상태의 시그니처 → 다음 요청의 단축 판정 기준)
+        # AI 분석이 실패했으면 시그니처를 비워 다음 요청에서 다시 분석
+        log = ReroutingLog.objects.create(
+            curriculum=curriculum,
+            reason=reason,
+            reason_detail=reason_detail,
+            diff=diff,
+            signature='' if ai_failed else reroute_signature(sequence, signals, reason, reason_detail),
+            items_added=len(diff['add']),
+            items_removed=len(diff['remove']),
+            ai_recommendation=recommendation,
+        )
+
+        # 진도율 재계산 (get_queryset의 items prefetch 캐시 폐기 후)
+        curriculum.refresh_from_db()
+        curriculum.update_progress()
+
+        return Response({
+            'rerouting_id': log.id,
+            'recommendation': recommendation,
+            'items_added': len(diff['add']),
+            'diff': diff,
+            'unchanged': False,
+            'new_progress': curriculum.progress_percent,
+            'curriculum': CurriculumDetailSerializer(curriculum).data,
+        })
 
+    def _ask_reroute(self, items, quiz_attempts, skill_blocks, reason, reason_detail):
+        """목표 직무가 없을 때: GPT-4o에 경로 변경 제안 요청 → (제안 dict, 근거 설명), 실패 시 제안은 None"""
         quiz_summary = "\n".join([
             f"- 퀴즈 #{a.quiz_id}: {a.score}점 ({'통과' if a.score >= 60 else '미통과'})"
             for a in quiz_attempts
         ]) or "퀴즈 이력 없음"
 
-        skill_blocks = SkillBlock.objects.filter(
-            student=student
-        ).order_by('-created_at')[:10]
         skill_summary = "\n".join([
             f"- {s.skill.name}: {'획득' if s.is_earned else '미획득'} ({s.level}레벨)"
             for s in skill_blocks
         ]) or "스킬블록 없음"
 
         # 현재 커리큘럼 상태
-        current_items = curriculum.items.all()
         curriculum_text = "\n".join([
             f"- [{i.order_index}] {i.title} ({'✅' if i.is_completed else '🔲'}) [{i.item_type}]"
-            for i in current_items
+            for i in items
         ])
 
         # AI 리라우팅 추천
@@ -271,7 +361,8 @@ class CurriculumViewSet(viewsets.ModelViewSet):
 [응답 규칙]
 1. 반드시 json 형식(JSON object)으로 응답할 것.
 2. 추가할 보충 학습 항목과 순서 변경 사항을 제안할 것.
-3. 한국어로 근거를 설명할 것.
+3. 더 이상 필요 없는 미완료 보충 항목은 remove_items로 제안할 수 있음.
+4. 한국어로 근거를 설명할 것.
 
 [응답 형식]
 {
@@ -281,7 +372,8 @@ class CurriculumViewSet(viewsets.ModelViewSet):
   ],
   "reorder": [
     {"item_title": "기존 항목", "new_order": 3}
-  ]
+  ],
+  "remove_items": ["제거할 보충 항목 제목"]
 }
                     """},
                     {"role": "user", "content": f"""
@@ -304,55 +396,10 @@ class CurriculumViewSet(viewsets.ModelViewSet):
             )
 
             ai_result = json.loads(response.choices[0].message.content)
-            recommendation = ai_result.get('recommendation', '')
-            add_items = ai_result.get('add_items', [])
-
-            # 보충 항목 추가
-            items_added = 0
-            max_order = curriculum.items.aggregate(
-                db_models.Max('order_index')
-            )['order_index__max'] or 0
-
-            for new_item in add_items:
-                max_order += 1
-                CurriculumItem.objects.create(
-                    curriculum=curriculum,
-                    title=new_item.get('title', '보충 학습'),
-                    item_type=new_item.get('type', 'SUPPLEMENT'),
-                    order_index=new_item.get('order', max_order),
-                    is_supplementary=True,
-                )
-                items_added += 1
+            return ai_result, ai_result.get('recommendation', '')
 
         except Exception as e:
-            recommendation = f"AI 리라우팅 분석 실패: {str(e)}"
-            items_added = 0
-
-        # 새 경로 스냅샷
-        new_items = list(curriculum.items.values_list('id', flat=True))
-
-        # 리라우팅 로그 기록
-        log = ReroutingLog.objects.create(
-            curriculum=curriculum,
-            reason=reason,
-            reason_detail=reason_detail,
-            old_path=old_items,
-            new_path=new_items,
-            items_added=items_added,
-            items_removed=0,
-            ai_recommendation=recommendation,
-        )
-
-        # 진도율 재계산
-        curriculum.update_progress()
-
-        return Response({
-            'rerouting_id': log.id,
-            'recommendation': recommendation,
-            'items_added': items_added,
-            'new_progress': curriculum.progress_percent,
-            'curriculum': CurriculumDetailSerializer(curriculum).data,
-        })
+            return None, f"AI 리라우팅 분석 실패: {str(e)}"
 
     @action(detail=True, methods=['get'])
     def history(self, request, pk=None):
@@ -2,15 +2,15 @@ from .utils_text import check_answer_match
 """
 Phase 2-4: 사후 형성평가 API Views
 """
-import json
 import os
-from datetime import timedelta
+from collections import Counter
 
 import openai
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
+from django.db import IntegrityError
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 
@@ -19,6 +19,11 @@ from .models import (
     LiveSession, LiveSessionNote, SpacedRepetitionItem,
     StudentSkill, Skill, LiveParticipant,
 )
+from .concept_index import record_formative_mistakes
+from .spaced_repetition import create_sr_item
+from .skill_tagger import concept_skills, tag_formative_questions
+from .live_note import generate_formative_questions
+from .quiz_close import WEAK_PROGRESS_PENALTY
 
 
 class MyPendingFormativeView(APIView):
@@ -61,15 +66,27 @@ class GenerateFormativeView(APIView):
         if not note:
             return Response({'error': '완료된 통합 노트가 없습니다.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # 이미 생성된 평가가 있으면 반환
-        existing = FormativeAssessment.objects.filter(live_session=session).first()
-        if existing and existing.status == 'READY':
+        # 이미 공개된 평가가 있으면 반환 (더 최근의 FAILED/GENERATING 행에 가려지지 않도록 상태로 직접 조회)
+        existing = FormativeAssessment.objects.filter(live_session=session, status='READY').first()
+        if existing:
             return Response({
                 'id': existing.id,
                 'status': existing.status,
                 'total_questions': existing.total_questions,
             })
 
+        # 노트 생성 때 미리 만든 초안이 있으면 LLM 호출 없이 바로 공개
+        prepared = FormativeAssessment.objects.filter(live_session=session, status='PREPARED').first()
+        if prepared and prepared.questions:
+            prepared.note = note
+            prepared.status = 'READY'
+            prepared.save(update_fields=['note', 'status'])
+            return Response({
+                'id': prepared.id,
+                'status': 'READY',
+                'total_questions': prepared.total_questions,
+            }, status=status.HTTP_201_CREATED)
+
         # AI 문항 생성
         fa = FormativeAssessment.objects.create(
             live_session=session,
@@ -95,45 +112,11 @@ class GenerateFormativeView(APIView):
             except Exception as rag_err:
                 print(f"⚠️ [RAG] 형성평가 검색 실패: {rag_err}")
 
-            user_content = f'아래 수업 노트를 기반으로 형성평가 5문항을 생성하세요:\n\n{note_content}'
-            if rag_context:
-                user_content += f'\n\n[공식 문서 참조 (정확한 정의 및 예시)]:\n{rag_context}'
-
-            response = client.chat.completions.create(
-                model='gpt-4o-mini',
-                messages=[
-                    {'role': 'system', 'content': (
-                        '당신은 교육 평가 전문가입니다.\n'
-                        '주어진 수업 노트를 기반으로 형성평가 문항을 5개 생성하세요.\n'
-                        '[공식 문서 참조]가 있으면, 전문 용어의 정확한 정의에 기반한 문항을 포함하세요.\n\n'
-                        '반드시 아래 JSON 형식으로 응답하세요:\n'
-                        '{"questions": [{"id": 1, "question": "질문", "options": ["A) 보기1", "B) 보기2", "C) 보기3", "D) 보기4"], '
-                        '"correct_answer": "A) 보기1", "explanation": "해설", '
-                        '"related_note_section": "관련 섹션", "concept_tag": "개념명"}]}\n\n'
-                        '규칙:\n'
-                        '1. 4지선다 객관식만\n'
-                        '2. correct_answer는 options 중 하나와 정확히 일치\n'
-                        '3. concept_tag는 2-4자 핵심 개념명 (예: 클로저, DOM, 비동기)\n'
-                        '4. 난이도: 이해력 확인 수준 (암기 X)'
-                    )},
-                    {'role': 'user', 'content': user_content}
-                ],
-                temperature=0.3,
-                max_tokens=2000,
-                response_format={'type': 'json_object'},
-            )
-
-            raw = response.choices[0].message.content.strip()
-            parsed = json.loads(raw)
-            questions = parsed.get('questions', parsed) if isinstance(parsed, dict) else parsed
-            if isinstance(questions, dict):
-                for v in parsed.values():
-                    if isinstance(v, list):
-                        questions = v
-                        break
+            questions = generate_formative_questions(client, note_content, rag_context)
 
             fa.questions = questions
             fa.total_questions = len(questions)
+            fa.skill_tags = tag_formative_questions(questions)
             fa.status = 'READY'
             fa.save()
 
@@ -241,10 +224,11 @@ class SubmitFormativeView(APIView):
             total=total,
         )
 
-        # 오답 → SR 자동 등록 + 갭 맵 업데이트
+        # 오답 → 개념 인덱스 + SR 자동 등록 + 갭 맵 업데이트
         if wrong_concepts:
+            record_formative_mistakes(fa, fr)
             self._create_sr_from_wrong(request.user, fa, wrong_concepts)
-            self._update_gap_map(request.user, wrong_concepts)
+            self._update_gap_map(request.user, fa, wrong_concepts)
             fr.sr_items_created = True
             fr.save()
 
@@ -267,43 +251,65 @@ class SubmitFormativeView(APIView):
             ).exists():
                 continue
 
-            schedule = [
-                {'review_num': 1, 'label': '10분 후', 'due_at': (now + timedelta(minutes=10)).isoformat(), 'completed': False},
-                {'review_num': 2, 'label': '1일 후', 'due_at': (now + timedelta(days=1)).isoformat(), 'completed': False},
-                {'review_num': 3, 'label': '1주일 후', 'due_at': (now + timedelta(weeks=1)).isoformat(), 'completed': False},
-                {'review_num': 4, 'label': '1개월 후', 'due_at': (now + timedelta(days=30)).isoformat(), 'completed': False},
-                {'review_num': 5, 'label': '6개월 후', 'due_at': (now + timedelta(days=180)).isoformat(), 'completed': False},
-            ]
+            try:
+                create_sr_item(
+                    student=student,
+                    concept_name=concept[:200],
+                    source_session=fa.live_session,
+                    review_question=wc['question'],
+                    review_answer=wc['correct_answer'],
+                    review_options=wc.get('options', []),
+                    now=now,
+                )
+            except IntegrityError:
+                # 퀴즈 마감 일괄 처리(process_closed_quizzes)가 같은 개념을 먼저 등록 → 기존 항목 유지
+                continue
 
-            SpacedRepetitionItem.objects.create(
-                student=student,
-                concept_name=concept[:200],
-                source_session=fa.live_session,
-                review_question=wc['question'],
-                review_answer=wc['correct_answer'],
-                review_options=wc.get('options', []),
-                schedule=schedule,
-            )
-
-    def _update_gap_map(self, student, wrong_concepts):
-        """오답 concept_tag → StudentSkill 업데이트 (부분 일치 + 로깅)"""
+    def _update_gap_map(self, student, fa, wrong_concepts):
+        """
+        오답 concept_tag → StudentSkill 업데이트 (생성 시 기록된 skill_tags 사용 + 로깅)
+        기존 행 조회 1회 + bulk_update / bulk_create (퀴즈 마감의 _bulk_update_gap_map과 같은 방식)
+        """
+        skill_tags = fa.skill_tags or {}
+        tags = {wc.get('concept_tag', '') for wc in wrong_concepts} - {''}
+        tag_skill_ids = {
+            tag: (skill_tags[tag] if tag in skill_tags else concept_skills(tag))
+            for tag in tags
+        }
+        skills = Skill.objects.in_bulk({ids[0] for ids in tag_skill_ids.values() if ids})
+
+        hits = Counter()
         for wc in wrong_concepts:
             tag = wc.get('concept_tag', '')
             if not tag:
                 continue
 
-            # 부분 일치 검색
-            skill = Skill.objects.filter(name__icontains=tag).first()
+            ids = tag_skill_ids.get(tag)
+            skill = skills.get(ids[0]) if ids else None
             if not skill:
                 print(f"⚠️ [GapMap] concept_tag '{tag}' → Skill 매칭 실패 (AI Fallback 필요)")
                 continue
+            hits[skill.id] += 1
+        if not hits:
+            return
 
-            student_skill, _ = StudentSkill.objects.update_or_create(
-                student=student,
-                skill=skill,
-                defaults={
-                    'status': 'WEAK',
-                    'progress': max(0, (StudentSkill.objects.filter(student=student, skill=skill).first() or type('', (), {'progress': 50})).progress - 10),
-                }
-            )
-            print(f"📊 [GapMap] {student.username}: {skill.name} → WEAK (progress -= 10)")
+        rows = {ss.skill_id: ss for ss in StudentSkill.objects.filter(student=student, skill_id__in=hits)}
+        now = timezone.now()
+        to_update, to_create = [], []
+        for skill_id, count in hits.items():
+            ss = rows.get(skill_id)
+            if ss is None:
+                # 행이 없으면 기본 진척도 50에서 감소
+                to_create.append(StudentSkill(
+                    student=student, skill_id=skill_id, status='WEAK',
+                    progress=max(0, 50 - WEAK_PROGRESS_PENALTY * count),
+                ))
+            else:
+                ss.status = 'WEAK'
+                ss.progress = max(0, ss.progress - WEAK_PROGRESS_PENALTY * count)
+                ss.updated_at = now
+                to_update.append(ss)
+            print(f"📊 [GapMap] {student.username}: {skills[skill_id].name} → WEAK (progress -= {WEAK_PROGRESS_PENALTY * count})")
+
+        StudentSkill.objects.bulk_update(to_update, ['status', 'progress', 'updated_at'])
+        StudentSkill.objects.bulk_create(to_create, ignore_conflicts=True)
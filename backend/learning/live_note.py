@@ -0,0 +1,406 @@
+"""
+라이브 세션 통합 노트 단계별 생성 파이프라인 (View 아님)
+세션 종료 후 백그라운드에서:
+  1. context          — STT / 퀴즈 / Q&A / 이해도 / 교안 / RAG 수집 → 통계 저장 (공유 문맥 1회 준비)
+  2. student_note     ┐
+     instructor_insight ├ 공유 문맥으로 서로 독립적인 LLM 호출을 동시에 실행, 단계마다 결과를 바로 저장
+     formative_draft  ┘  (formative_draft는 PREPARED 형성평가 → 교수자 생성 요청 시 즉시 공개)
+  3. review_routes    — 복습 루트 배치 생성 + 종료 퀴즈 오답 SR 반영
+단계별 상태는 LiveSessionNote.stage_status에 기록되어 노트 조회 API로 부분 결과를 확인할 수 있고,
+실패한 단계는 run_live_note(..., stages=[단계])로 그 단계만 재시도한다.
+"""
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import openai
+from django.db import connection
+from django.utils import timezone
+
+from .models import LiveSession, LiveSessionNote, FormativeAssessment
+from .material_text import get_material_text
+from .review_route import set_stage
+from .skill_tagger import tag_formative_questions
+
+LLM_STAGES = ('student_note', 'instructor_insight', 'formative_draft')
+RETRY_STAGES = LLM_STAGES + ('review_routes',)
+
+NOTE_SYSTEM_PROMPT = (
+    '당신은 대학 강의를 전문적으로 정리하는 AI 어시스턴트입니다.\n'
+    '아래 강의 데이터(교안 원문, 공식 문서 참조, STT 전문, 퀴즈 결과, 학생 질문)를 기반으로\n'
+    '학생들이 복습하기 좋은 통합 노트를 작성하세요.\n\n'
+    '핵심 규칙:\n'
+    '- 교안에 있는 내용은 평문으로 정리하세요.\n'
+    '- 교수자가 STT에서 교안에 없는 추가 설명/예시/노하우를 말한 부분은\n'
+    '  "🎙️ 교수자 설명" 라벨을 붙여 구분하세요.\n'
+    '- [공식 문서 참조]가 있으면, 전문 용어의 정확한 정의와 코드 예시를\n'
+    '  "📖 공식 문서" 라벨로 보충하세요.\n'
+    '- 교안과 STT를 주제별로 통합 정리하세요 (별도 섹션으로 분리하지 마세요).\n\n'
+    '형식:\n'
+    '# 📚 강의 통합 노트\n\n'
+    '## 📋 수업 개요\n- 시간, 참가자, 이해도 등\n\n'
+    '## 📖 핵심 내용 정리\n### 1. 주제별 정리 (교안+🎙️ 통합)\n\n'
+    '## ✅ 체크포인트 퀴즈 복습\n- 문제, 정답, 해설\n\n'
+    '## ❓ 주요 질의응답\n- 학생 질문과 답변 정리\n\n'
+    '## 🔑 핵심 키워드\n- 중요 용어\n\n'
+    '## 📝 복습 포인트\n- 추가 학습 추천 사항'
+)
+
+INSIGHT_SYSTEM_PROMPT = (
+    '당신은 부트캠프 교수자를 위한 수업 분석 AI입니다.\n'
+    '아래 세션 데이터를 분석하여 교수자 인사이트 리포트를 작성하세요.\n\n'
+    '형식:\n'
+    '# 📊 인사이트 리포트\n\n'
+    '## 🔴 주의 구간\n- 이해도가 낮았던 포인트, 혼란이 많았던 시점\n\n'
+    '## ❓ TOP 3 질문\n- 가장 많은 공감을 받은 질문과 의미\n\n'
+    '## 📝 퀴즈 분석\n- 정답률 낮은 문항 분석, 취약 개념\n\n'
+    '## 💡 다음 수업 제안\n- 보충 필요 주제, 수업 속도 조절 제안\n\n'
+    '## 📈 전체 평가\n- 긍정 포인트 + 개선 포인트 요약'
+)
+
+FORMATIVE_SYSTEM_PROMPT = (
+    '당신은 교육 평가 전문가입니다.\n'
+    '주어진 수업 노트를 기반으로 형성평가 문항을 5개 생성하세요.\n'
+    '[공식 문서 참조]가 있으면, 전문 용어의 정확한 정의에 기반한 문항을 포함하세요.\n\n'
+    '반드시 아래 JSON 형식으로 응답하세요:\n'
+    '{"questions": [{"id": 1, "question": "질문", "options": ["A) 보기1", "B) 보기2", "C) 보기3", "D) 보기4"], '
+    '"correct_answer": "A) 보기1", "explanation": "해설", '
+    '"related_note_section": "관련 섹션", "concept_tag": "개념명"}]}\n\n'
+    '규칙:\n'
+    '1. 4지선다 객관식만\n'
+    '2. correct_answer는 options 중 하나와 정확히 일치\n'
+    '3. concept_tag는 2-4자 핵심 개념명 (예: 클로저, DOM, 비동기)\n'
+    '4. 난이도: 이해력 확인 수준 (암기 X)'
+)
+
+
+def generate_formative_questions(client, source_text, rag_context='', source_label='수업 노트'):
+    """형성평가 5문항 생성 → questions 목록 (GenerateFormativeView와 노트 파이프라인 공용)"""
+    user_content = f'아래 {source_label}를 기반으로 형성평가 5문항을 생성하세요:\n\n{source_text}'
+    if rag_context:
+        user_content += f'\n\n[공식 문서 참조 (정확한 정의 및 예시)]:\n{rag_context}'
+
+    response = client.chat.completions.create(
+        model='gpt-4o-mini',
+        messages=[
+            {'role': 'system', 'content': FORMATIVE_SYSTEM_PROMPT},
+            {'role': 'user', 'content': user_content}
+        ],
+        temperature=0.3,
+        max_tokens=2000,
+        response_format={'type': 'json_object'},
+    )
+
+    raw = response.choices[0].message.content.strip()
+    parsed = json.loads(raw)
+    questions = parsed.get('questions', parsed) if isinstance(parsed, dict) else parsed
+    if isinstance(questions, dict):
+        for v in parsed.values():
+            if isinstance(v, list):
+                questions = v
+                break
+    return questions
+
+
+def prepare_context(session, note):
+    """공유 문맥 준비 (LLM 호출 없음, RAG 검색 1회) → dict"""
+    # ── 1. STT 전문 수집 ──
+    stt_logs = list(session.stt_logs.order_by('sequence_order').values_list('text_chunk', flat=True))
+    stt_text = '\n'.join(stt_logs)
+
+    # ── 2. 퀴즈 결과 수집 ──
+    quiz_summary = []
+    for q in session.quizzes.all():
+        total = q.responses.count()
+        correct = q.responses.filter(is_correct=True).count()
+        quiz_summary.append({
+            'question': q.question_text,
+            'options': q.options,
+            'correct_answer': q.correct_answer,
+            'total_responses': total,
+            'correct_count': correct,
+            'accuracy': round((correct / total) * 100, 1) if total > 0 else 0,
+        })
+
+    # ── 3. Q&A 수집 ──
+    qa_summary = [
+        {'question': q.question_text, 'ai_answer': q.ai_answer, 'instructor_answer': q.instructor_answer, 'upvotes': q.upvotes}
+        for q in session.questions.defer('embedding')
+    ]
+
+    # ── 4. 이해도 통계 ──
+    pulse_understand = session.pulses.filter(pulse_type='UNDERSTAND').count()
+    pulse_confused = session.pulses.filter(pulse_type='CONFUSED').count()
+    pulse_total = pulse_understand + pulse_confused
+    understand_rate = round((pulse_understand / pulse_total) * 100, 1) if pulse_total > 0 else 0
+
+    # ── 4-1. C2: 교안 콘텐츠 수집 (업로드 시 저장된 추출 텍스트) ──
+    material_text = ''
+    try:
+        linked_mats = note.linked_materials.select_related('extract')
+        if not linked_mats and session.lecture:
+            linked_mats = session.lecture.materials.select_related('extract')[:3]
+        for mat in linked_mats:
+            content = get_material_text(mat, limit=2000)
+            if content:
+                material_text += f"\n[교안: {mat.title}]\n{content}\n"
+            elif mat.file:
+                material_text += f"\n[교안: {mat.title}] (파일 읽기 불가)\n"
+    except Exception as e:
+        print(f"⚠️ [LiveNote] 교안 텍스트 수집 실패: {e}")
+
+    # ── 4-2. [RAG] 공식 문서에서 관련 컨텍스트 검색 ──
+    rag_context = ''
+    try:
+        from .rag import RAGService
+        rag = RAGService()
+        related_docs = rag.search(query=stt_text[:500], top_k=3, lecture_id=session.lecture_id)
+        if related_docs:
+            rag_context = "\n".join([f"- {doc.content[:300]}" for doc in related_docs])
+            print(f"✅ [RAG] 라이브 노트 생성에 공식 문서 {len(related_docs)}건 참조")
+    except Exception as rag_err:
+        print(f"⚠️ [RAG] 검색 실패 (노트는 STT만으로 진행): {rag_err}")
+
+    # ── 5. 통계 ──
+    stats = {
+        'total_participants': session.participants.count(),
+        'stt_chunks': len(stt_logs),
+        'quiz_count': len(quiz_summary),
+        'question_count': len(qa_summary),
+        'understand_rate': understand_rate,
+        'duration_minutes': 0,
+        'material_count': len(material_text) > 0,  # C2: 교안 포함 여부
+    }
+    if session.started_at and session.ended_at:
+        stats['duration_minutes'] = int((session.ended_at - session.started_at).total_seconds() / 60)
+
+    quiz_text = ''
+    for i, q in enumerate(quiz_summary, 1):
+        quiz_text += f"\n퀴즈 {i}: {q['question']}\n정답: {q['correct_answer']} | 정답률: {q['accuracy']}%\n"
+
+    qa_text = ''
+    for i, q in enumerate(qa_summary, 1):
+        qa_text += f"\n질문 {i} (공감 {q['upvotes']}): {q['question']}\n"
+        if q['instructor_answer']:
+            qa_text += f"교수자 답변: {q['instructor_answer']}\n"
+        elif q['ai_answer']:
+            qa_text += f"AI 답변: {q['ai_answer'][:200]}\n"
+
+    return {
+        'stats': stats,
+        'stt_text': stt_text,
+        'material_text': material_text,
+        'rag_context': rag_context,
+        'quiz_text': quiz_text,
+        'qa_text': qa_text,
+        'quiz_count': len(quiz_summary),
+        'qa_count': len(qa_summary),
+        'pulse_understand': pulse_understand,
+        'pulse_confused': pulse_confused,
+        'understand_rate': understand_rate,
+    }
+
+
+def _lecture_data(ctx):
+    """통합 노트 / 형성평가 초안 공용 강의 데이터 본문"""
+    stats = ctx['stats']
+    return f"""[강의 시간: 약 {stats['duration_minutes']}분 | 참가자: {stats['total_participants']}명 | 이해도: {ctx['understand_rate']}%]
+
+=== 교안 원문 (텍스트 추출) ===
+{ctx['material_text'][:3000] if ctx['material_text'] else '(교안 없음)'}
+
+=== 공식 문서 참조 (RAG 검색 결과) ===
+{ctx['rag_context'][:2000] if ctx['rag_context'] else '(참조 문서 없음)'}
+
+=== 교수자 발화 STT 전문 ===
+{ctx['stt_text'][:8000]}
+
+=== 체크포인트 퀴즈 결과 ({ctx['quiz_count']}건) ===
+{ctx['quiz_text'] if ctx['quiz_text'] else '(퀴즈 없음)'}
+
+=== 학생 질문 ({ctx['qa_count']}건) ===
+{ctx['qa_text'] if ctx['qa_text'] else '(질문 없음)'}
+"""
+
+
+def _student_note(client, note, session, ctx):
+    stats = ctx['stats']
+    try:
+        response = client.chat.completions.create(
+            model='gpt-4o',
+            messages=[
+                {'role': 'system', 'content': NOTE_SYSTEM_PROMPT},
+                {'role': 'user', 'content': _lecture_data(ctx)}
+            ],
+            temperature=0.3,
+            max_tokens=4000,
+        )
+        note.content = response.choices[0].message.content
+        note.save(update_fields=['content'])
+    except Exception:
+        # Fallback: 원문 기반 간이 노트 (단계는 FAILED로 남겨 재시도 가능)
+        note.content = (
+            f"# 📚 강의 통합 노트 (자동 생성 대기중)\n\n"
+            f"## 📋 수업 개요\n"
+            f"- 시간: 약 {stats['duration_minutes']}분\n"
+            f"- 참가자: {stats['total_participants']}명\n"
+            f"- 이해도: {ctx['understand_rate']}%\n\n"
+            f"## 📖 강의 내용 (원문)\n{ctx['stt_text'][:3000]}\n\n"
+            f"## ✅ 퀴즈 ({ctx['quiz_count']}건)\n{ctx['quiz_text']}\n\n"
+            f"## ❓ 질의응답 ({ctx['qa_count']}건)\n{ctx['qa_text']}\n"
+        )
+        note.save(update_fields=['content'])
+        raise
+
+
+def _instructor_insight(client, note, session, ctx):
+    stats = ctx['stats']
+    insight_prompt = f"""[세션 통계]
+- 참가자: {stats['total_participants']}명, 시간: {stats['duration_minutes']}분
+- 이해도: {ctx['understand_rate']}%, 퀴즈 {ctx['quiz_count']}건, 질문 {ctx['qa_count']}건
+
+[퀴즈 결과]
+{ctx['quiz_text'] if ctx['quiz_text'] else '(퀴즈 없음)'}
+
+[학생 질문 (공감순)]
+{ctx['qa_text'] if ctx['qa_text'] else '(질문 없음)'}
+
+[이해도 데이터]
+이해 {ctx['pulse_understand']}명 / 혼란 {ctx['pulse_confused']}명 = {ctx['understand_rate']}%
+"""
+    try:
+        insight_resp = client.chat.completions.create(
+            model='gpt-4o-mini',
+            messages=[
+                {'role': 'system', 'content': INSIGHT_SYSTEM_PROMPT},
+                {'role': 'user', 'content': insight_prompt}
+            ],
+            temperature=0.3,
+            max_tokens=2000,
+        )
+        note.instructor_insight = insight_resp.choices[0].message.content
+        note.save(update_fields=['instructor_insight'])
+    except Exception as ie:
+        # Fallback: 실패 안내 메시지 설정 (프론트엔드 무한 대기 방지)
+        note.instructor_insight = (
+            "# 📊 인사이트 리포트\n\n"
+            "> ⚠️ AI 인사이트 생성에 실패했습니다.\n\n"
+            f"**오류 내용**: {str(ie)[:200]}\n\n"
+            "세션 데이터는 정상 저장되었으며, 통합 노트는 정상 제공됩니다.\n"
+            "인사이트 단계만 다시 시도할 수 있습니다."
+        )
+        note.save(update_fields=['instructor_insight'])
+        raise
+
+
+def _formative_draft(client, note, session, ctx):
+    """형성평가 초안(PREPARED) — 이미 공개된(READY) 평가가 있으면 건드리지 않음"""
+    if FormativeAssessment.objects.filter(live_session=session, status='READY').exists():
+        return
+
+    questions = generate_formative_questions(
+        client, _lecture_data(ctx)[:4000], ctx['rag_context'], source_label='수업 데이터',
+    )
+    fa = FormativeAssessment.objects.filter(live_session=session).exclude(status='READY').first()
+    if fa is None:
+        fa = FormativeAssessment(live_session=session)
+    fa.note = note
+    fa.questions = questions
+    fa.total_questions = len(questions)
+    fa.skill_tags = tag_formative_questions(questions)
+    fa.status = 'PREPARED'
+    fa.save()
+
+
+STAGE_FUNCS = {
+    'student_note': _student_note,
+    'instructor_insight': _instructor_insight,
+    'formative_draft': _formative_draft,
+}
+
+
+def _run_stage(stage, note_id, session_id, ctx):
+    """LLM 단계 1개 실행 (풀 작업자 스레드) — 성공/실패를 stage_status에 기록"""
+    try:
+        note = LiveSessionNote.objects.get(id=note_id)
+        session = LiveSession.objects.get(id=session_id)
+        set_stage(note, stage, 'RUNNING')
+        client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        STAGE_FUNCS[stage](client, note, session, ctx)
+        set_stage(note, stage, 'DONE', 1, 1)
+        print(f"✅ [LiveNote] 세션 #{session_id} {stage} 단계 완료")
+        return True
+    except Exception as e:
+        print(f"⚠️ [LiveNote] 세션 #{session_id} {stage} 단계 실패: {e}")
+        try:
+            set_stage(LiveSessionNote.objects.get(id=note_id), stage, 'FAILED', 0, 1, error=str(e))
+        except Exception:
+            pass
+        return False
+    finally:
+        connection.close()
+
+
+def _review_routes(session, note):
+    from .review_route import build_review_routes
+    from .quiz_close import process_closed_quizzes
+
+    route_count = build_review_routes(session, note)
+    # SpacedRepetitionItem: 종료된 퀴즈 오답 일괄 반영 (이미 처리된 응답은 건너뜀)
+    process_closed_quizzes(list(session.quizzes.values_list('id', flat=True)))
+    print(f"✅ [ReviewRoute] 세션 #{session.id} - {route_count}명 복습 루트 생성 완료")
+
+
+def run_live_note(session_id, note_id, stages=None):
+    """
+    통합 노트 파이프라인 실행 (stages 미지정 = 전체, 지정 시 해당 단계만 재시도)
+    전체 실행 시 LLM 단계가 모두 끝나면 노트 DONE + 자동 승인 후 복습 루트 단계
+    """
+    full_run = stages is None
+    stages = list(RETRY_STAGES if full_run else stages)
+
+    try:
+        session = LiveSession.objects.get(id=session_id)
+        note = LiveSessionNote.objects.get(id=note_id)
+
+        llm_stages = [s for s in stages if s in STAGE_FUNCS]
+        if llm_stages:
+            set_stage(note, 'context', 'RUNNING')
+            ctx = prepare_context(session, note)
+            note.stats = {**(note.stats or {}), **ctx['stats']}
+            note.save(update_fields=['stats'])
+            set_stage(note, 'context', 'DONE', 1, 1)
+
+            # 독립 LLM 단계 동시 실행 (각 단계가 결과를 바로 저장)
+            with ThreadPoolExecutor(max_workers=len(llm_stages)) as pool:
+                for stage in llm_stages:
+                    pool.submit(_run_stage, stage, note.id, session.id, ctx)
+            note.refresh_from_db()
+
+        if full_run:
+            # 모든 LLM 단계 완료 후 최종 DONE + 자동 승인 (노트 생성 완료 시 즉시 학생에게 공개)
+            note.status = 'DONE'
+            note.is_approved = True
+            note.approved_at = timezone.now()
+            note.is_public = True
+            note.save(update_fields=['status', 'is_approved', 'approved_at', 'is_public'])
+            print(f"✅ [AutoApprove] 세션 #{session_id} 노트 자동 승인 → 학생 공개")
+
+        # ── Phase 2-3: 복습 루트 + 간격 반복 자동 생성 (별도 배치 단계) ──
+        if 'review_routes' in stages:
+            try:
+                _review_routes(session, note)
+            except Exception as rre:
+                print(f"⚠️ [ReviewRoute] 복습 루트 생성 실패 (노트는 정상): {rre}")
+
+        print(f"✅ [LiveNote] 세션 #{session_id} 통합 노트 단계 완료 ({', '.join(stages)})")
+
+    except Exception as e:
+        print(f"❌ [LiveNote] 노트 생성 실패: {e}")
+        if full_run:
+            try:
+                LiveSessionNote.objects.filter(id=note_id).update(
+                    status='FAILED', content=f"노트 생성 실패: {str(e)}",
+                )
+            except Exception:
+                pass
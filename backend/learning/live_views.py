@@ -11,23 +11,30 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
-from django.db.models import Count
+from django.db.models import Count, Q, F, Sum, Max, Case, When, IntegerField, Prefetch, Window
+from django.db.models.functions import Coalesce, RowNumber
 
 from .models import (
     LiveSession, LiveParticipant, LectureMaterial, LiveSTTLog,
     Lecture, LearningSession, PulseCheck, PulseLog, LiveQuiz, LiveQuizResponse,
     LiveQuestion, LiveSessionNote, WeakZoneAlert, NoteViewLog,
-    PlacementResult, SpacedRepetitionItem, StudentSkill, Skill
+    PlacementResult, StudentSkill, Skill
 )
+from .quiz_close import close_active_quizzes
+from .skill_tagger import tag_skills
+from .skillblock_utils import recompute_lecture_blocks_async
+from .material_text import get_material_text, extract_material_async
+from .live_note import run_live_note
+from .quiz_bank import build_preclass_async, maybe_build_async, take_quiz, generate_quiz_data
+from .question_cluster import cluster_question_async, cluster_labels, forget_session
 
 import openai
 import os
-import json
 import base64
 import logging
 import threading
 import numpy as np
-from datetime import timedelta
+from datetime import datetime, timedelta
 openai.api_key = os.getenv('OPENAI_API_KEY')
 
 logger = logging.getLogger(__name__)
@@ -76,6 +83,8 @@ class LiveSessionViewSet(viewsets.ViewSet):
             title=title,
             status='WAITING',
         )
+        # 수업 시작 전에 교안/강의계획서로 퀴즈 은행 미리 채우기 (백그라운드)
+        build_preclass_async(session.id)
 
         return Response({
             'id': session.id,
@@ -133,7 +142,13 @@ class LiveSessionViewSet(viewsets.ViewSet):
             session.participants.update(is_active=False)
 
             # 활성 퀴즈 비활성화
-            session.quizzes.filter(is_active=True).update(is_active=False)
+            close_active_quizzes(session)
+
+            # 강의 전체 스킬블록 재계산 (비동기, 종료된 세션 집계 반영)
+            recompute_lecture_blocks_async(session.lecture_id)
+
+            # 질문 클러스터 메모리 상태 해제
+            forget_session(session.id)
 
             # OCI 환경: CMD 종료는 교수 PC의 WebSocket Agent가 담당
             # (프론트엔드에서 ws://localhost:5555 STOP 명령으로 처리)
@@ -363,6 +378,8 @@ class LiveSessionViewSet(viewsets.ViewSet):
             sequence_order=last_seq + 1,
             text_chunk=text,
         )
+        # 새 STT 구간이 충분히 쌓였으면 퀴즈 은행 후보 생성 (백그라운드)
+        maybe_build_async(session.id, last_seq + 1)
 
         # 키워드 스팟팅
         keyword_detected = None
@@ -372,24 +389,30 @@ class LiveSessionViewSet(viewsets.ViewSet):
                 break
 
         quiz_suggestion_triggered = False
+        quiz_suggestion_id = None
         if keyword_detected:
             # 최근 5분 내 제안이 없을 때만 (스팸 방지)
             recent_suggestion = session.quizzes.filter(
                 is_suggestion=True, triggered_at__gte=timezone.now() - timedelta(minutes=5)
             ).exists()
             if not recent_suggestion:
-                # 백그라운드에서 AI 퀴즈 제안 생성
-                thread = threading.Thread(
-                    target=_generate_quiz_suggestion, args=(session.id,)
-                )
-                thread.daemon = True
-                thread.start()
+                # 퀴즈 은행에 후보가 있으면 즉시 제안, 없으면 백그라운드에서 AI 퀴즈 제안 생성
+                banked = take_quiz(session, suggestion=True)
+                if banked:
+                    quiz_suggestion_id = banked.id
+                else:
+                    thread = threading.Thread(
+                        target=_generate_quiz_suggestion, args=(session.id,)
+                    )
+                    thread.daemon = True
+                    thread.start()
                 quiz_suggestion_triggered = True
 
         return Response({
             'sequence': last_seq + 1,
             'keyword_detected': keyword_detected,
             'quiz_suggestion_triggered': quiz_suggestion_triggered,
+            'quiz_suggestion_id': quiz_suggestion_id,
         })
 
     @action(detail=True, methods=['get'], url_path='stt-feed')
@@ -442,7 +465,7 @@ class LiveSessionViewSet(viewsets.ViewSet):
         quiz = get_object_or_404(LiveQuiz, id=quiz_id, live_session=session, is_suggestion=True)
 
         # 기존 활성 퀴즈 비활성화
-        session.quizzes.filter(is_active=True).update(is_active=False)
+        close_active_quizzes(session)
 
         # 제안 → 활성으로 전환
         quiz.is_suggestion = False
@@ -492,7 +515,7 @@ class LiveSessionViewSet(viewsets.ViewSet):
                             status=status.HTTP_400_BAD_REQUEST)
 
         # 기존 활성 퀴즈 비활성화
-        session.quizzes.filter(is_active=True).update(is_active=False)
+        close_active_quizzes(session)
 
         quiz = LiveQuiz.objects.create(
             live_session=session,
@@ -502,6 +525,7 @@ class LiveSessionViewSet(viewsets.ViewSet):
             explanation=explanation,
             is_ai_generated=False,
             time_limit=int(request.data.get('time_limit', 60)),
+            skill_tags=tag_skills(question_text),
         )
 
         return Response({
@@ -518,9 +542,23 @@ class LiveSessionViewSet(viewsets.ViewSet):
         """
         POST /api/learning/live/{id}/quiz/generate/
         최근 STT 내용 기반 AI 퀴즈 자동 생성
+        퀴즈 은행(quiz_bank)에 미리 만든 관련 후보가 있으면 GPT 호출 없이 즉시 발동
         """
         session = get_object_or_404(LiveSession, id=pk, instructor=request.user, status='LIVE')
 
+        banked = take_quiz(session)
+        if banked:
+            return Response({
+                'id': banked.id,
+                'question_text': banked.question_text,
+                'options': banked.options,
+                'correct_answer': banked.correct_answer,
+                'explanation': banked.explanation,
+                'is_ai_generated': True,
+                'from_bank': True,
+                'triggered_at': banked.triggered_at,
+            }, status=status.HTTP_201_CREATED)
+
         # 최근 STT 로그 가져오기 (최근 10건)
         recent_stt = session.stt_logs.order_by('-sequence_order')[:10]
         stt_text = ' '.join([log.text_chunk for log in reversed(recent_stt)])
@@ -530,49 +568,13 @@ class LiveSessionViewSet(viewsets.ViewSet):
                             status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            # [RAG] 공식 문서에서 관련 컨텍스트 검색
-            rag_context = ""
-            try:
-                from .rag import RAGService
-                rag = RAGService()
-                lecture_id = session.lecture_id if session.lecture else None
-                related_docs = rag.search(query=stt_text[:300], top_k=2, lecture_id=lecture_id)
-                if related_docs:
-                    rag_context = "\n".join([f"- {doc.content[:200]}" for doc in related_docs])
-                    print(f"✅ [RAG] 자동 퀴즈 생성에 공식 문서 {len(related_docs)}건 참조")
-            except Exception as rag_err:
-                print(f"⚠️ [RAG] 자동 퀴즈 검색 실패: {rag_err}")
-
-            quiz_prompt = f'강의 내용:\n{stt_text[:2000]}'
-            if rag_context:
-                quiz_prompt += f'\n\n[공식 문서 참조 (정확성 보장용)]:\n{rag_context}'
-
-            response = openai.chat.completions.create(
-                model='gpt-4o-mini',
-                messages=[
-                    {'role': 'system', 'content': (
-                        '당신은 교육 전문가입니다. '
-                        '주어진 강의 내용을 바탕으로 객관식 4지선다 퀴즈 1문제를 생성하세요. '
-                        '[공식 문서 참조]가 있으면 정확한 정의에 기반한 문제를 출제하세요.\n'
-                        '반드시 JSON 형식으로 응답하세요:\n'
-                        '{"question": "문제", "options": ["A", "B", "C", "D"], "correct_answer": "정답", "explanation": "해설"}'
-                    )},
-                    {'role': 'user', 'content': quiz_prompt}
-                ],
-                temperature=0.7,
-                max_tokens=500,
-                response_format={'type': 'json_object'},
-            )
-
-            content = response.choices[0].message.content.strip()
-            quiz_data = json.loads(content)
-
+            quiz_data = generate_quiz_data(stt_text[:2000], session.lecture_id)
         except Exception as e:
             return Response({'error': f'AI 퀴즈 생성 실패: {str(e)}'},
                             status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
         # 기존 활성 퀴즈 비활성화
-        session.quizzes.filter(is_active=True).update(is_active=False)
+        close_active_quizzes(session)
 
         quiz = LiveQuiz.objects.create(
             live_session=session,
@@ -581,6 +583,7 @@ class LiveSessionViewSet(viewsets.ViewSet):
             correct_answer=quiz_data.get('correct_answer', ''),
             explanation=quiz_data.get('explanation', ''),
             is_ai_generated=True,
+            skill_tags=tag_skills(quiz_data.get('question', '')),
         )
 
         return Response({
@@ -590,6 +593,7 @@ class LiveSessionViewSet(viewsets.ViewSet):
             'correct_answer': quiz.correct_answer,
             'explanation': quiz.explanation,
             'is_ai_generated': True,
+            'from_bank': False,
             'triggered_at': quiz.triggered_at,
         }, status=status.HTTP_201_CREATED)
 
@@ -655,69 +659,17 @@ class LiveSessionViewSet(viewsets.ViewSet):
         # Phase 2-1: Weak Zone 감지 트리거
         weak_zone_alert = None
         if not is_correct:
+            from .concept_index import record_quiz_mistake
+            record_quiz_mistake(response_obj)
+
             from .weak_zone_utils import check_quiz_weak_zone
             weak_zone_alert = check_quiz_weak_zone(session, request.user, response_obj)
 
-            # ── 학습 재설계 반영: SR 등록 + GapMap 업데이트 (비동기) ──
-            def _update_learning_redesign():
-                try:
-                    from datetime import timedelta as _td
-                    from django.utils import timezone as _tz
-                    now = _tz.now()
-
-                    concept = quiz.question_text[:60]  # 문제 자체를 개념명으로 사용
-                    # 1) 간격반복(SR) 자동 등록
-                    if not SpacedRepetitionItem.objects.filter(
-                        student=request.user,
-                        concept_name=concept[:200],
-                    ).exists():
-                        schedule = [
-                            {'review_num': 1, 'label': '10분 후', 'due_at': (now + _td(minutes=10)).isoformat(), 'completed': False},
-                            {'review_num': 2, 'label': '1일 후', 'due_at': (now + _td(days=1)).isoformat(), 'completed': False},
-                            {'review_num': 3, 'label': '1주일 후', 'due_at': (now + _td(weeks=1)).isoformat(), 'completed': False},
-                            {'review_num': 4, 'label': '1개월 후', 'due_at': (now + _td(days=30)).isoformat(), 'completed': False},
-                        ]
-                        SpacedRepetitionItem.objects.create(
-                            student=request.user,
-                            concept_name=concept[:200],
-                            source_session=session,
-                            review_question=quiz.question_text,
-                            review_answer=quiz.correct_answer,
-                            review_options=quiz.options or [],
-                            schedule=schedule,
-                        )
-                        print(f"📝 [LiveQuiz→SR] {request.user.username}: '{concept}' SR 등록")
-
-                    # 2) GapMap(StudentSkill) 업데이트 — 오답 개념 반영
-                    try:
-                        from .models import StudentSkill, Skill
-                        # 문제 텍스트에서 매칭되는 스킬 탐색
-                        skills = Skill.objects.all()
-                        matched_skill = None
-                        for s in skills:
-                            if s.name.lower() in quiz.question_text.lower():
-                                matched_skill = s
-                                break
-                        if matched_skill:
-                            student_skill, _ = StudentSkill.objects.update_or_create(
-                                student=request.user,
-                                skill=matched_skill,
-                                defaults={'status': 'WEAK'},
-                            )
-                            # progress 감소
-                            if student_skill.progress > 0:
-                                student_skill.progress = max(0, student_skill.progress - 10)
-                                student_skill.save(update_fields=['progress'])
-                            print(f"📊 [LiveQuiz→GapMap] {request.user.username}: {matched_skill.name} → WEAK")
-                    except Exception as gm_err:
-                        print(f"⚠️ [LiveQuiz→GapMap] 업데이트 실패: {gm_err}")
-
-                except Exception as sr_err:
-                    print(f"⚠️ [LiveQuiz→SR] 등록 실패: {sr_err}")
-
-            thread = threading.Thread(target=_update_learning_redesign)
-            thread.daemon = True
-            thread.start()
+            # ── 학습 재설계 반영: SR 등록 + GapMap 업데이트 ──
+            # 퀴즈 종료 시 오답을 모아 일괄 처리 (quiz_close). 이미 닫힌 퀴즈에 늦게 응답한 경우만 즉시 처리
+            if not quiz.is_active:
+                from .quiz_close import process_closed_quizzes_async
+                process_closed_quizzes_async([quiz.id])
 
         resp = {
             'is_correct': is_correct,
@@ -758,14 +710,21 @@ class LiveSessionViewSet(viewsets.ViewSet):
             return Response({'error': '교수자만 조회 가능합니다.'}, status=status.HTTP_403_FORBIDDEN)
 
         responses = quiz.responses.select_related('student').all()
-        total = responses.count()
-        correct = responses.filter(is_correct=True).count()
+        counts = quiz.responses.aggregate(
+            total=Count('id'),
+            correct=Count('id', filter=Q(is_correct=True)),
+        )
+        total = counts['total']
+        correct = counts['correct']
         total_participants = session.participants.filter(is_active=True).count()
 
-        # 보기별 선택 분포 계산
-        option_distribution = {}
-        for opt in (quiz.options or []):
-            option_distribution[opt] = responses.filter(answer=opt).count()
+        # 보기별 선택 분포 (GROUP BY answer 1회)
+        answer_counts = dict(
+            quiz.responses.order_by().values_list('answer').annotate(count=Count('id'))
+        )
+        option_distribution = {
+            opt: answer_counts.get(opt, 0) for opt in (quiz.options or [])
+        }
 
         return Response({
             'quiz_id': quiz.id,
@@ -795,27 +754,19 @@ class LiveSessionViewSet(viewsets.ViewSet):
     @action(detail=True, methods=['get'], url_path='questions')
     def list_questions(self, request, pk=None):
         """
-        GET /api/learning/live/{id}/questions/
-        교수자용: 익명 질문 목록 (공감순 정렬)
+        GET /api/learning/live/{id}/questions/?since=<question_id>
+        교수자용: 익명 질문 목록 (공감순 정렬, since 이후 신규 질문만 선택 조회)
         """
         session = get_object_or_404(LiveSession, id=pk)
         if session.instructor != request.user:
             return Response({'error': '교수자만 조회 가능합니다.'}, status=status.HTTP_403_FORBIDDEN)
 
-        questions = session.questions.all()
-        data = [
-            {
-                'id': q.id,
-                'question_text': q.question_text,
-                'ai_answer': q.ai_answer,
-                'instructor_answer': q.instructor_answer,
-                'upvotes': q.upvotes,
-                'is_answered': q.is_answered,
-                'created_at': q.created_at,
-            }
-            for q in questions
-        ]
-        return Response(data)
+        try:
+            since = int(request.query_params.get('since', 0))
+        except ValueError:
+            return Response({'error': 'since는 정수여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(_question_feed(session, since))
 
     @action(detail=True, methods=['post'], url_path=r'questions/(?P<question_id>\d+)/answer')
     def answer_question(self, request, pk=None, question_id=None):
@@ -855,27 +806,86 @@ class LiveSessionViewSet(viewsets.ViewSet):
     @action(detail=True, methods=['get'], url_path='questions/feed')
     def question_feed(self, request, pk=None):
         """
-        GET /api/learning/live/{id}/questions/feed/
+        GET /api/learning/live/{id}/questions/feed/?since=<question_id>
         학생용: 전체 질문 목록 (공감순, 답변 상태 포함)
         """
         session = get_object_or_404(LiveSession, id=pk)
         if not session.participants.filter(student=request.user).exists():
             return Response({'error': '참가자만 조회 가능합니다.'}, status=status.HTTP_403_FORBIDDEN)
 
-        all_questions = session.questions.all()  # ordering은 모델에서 -upvotes
+        try:
+            since = int(request.query_params.get('since', 0))
+        except ValueError:
+            return Response({'error': 'since는 정수여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(_question_feed(session, since))
+
+    @action(detail=True, methods=['get'], url_path='questions/clusters')
+    def question_clusters(self, request, pk=None):
+        """
+        GET /api/learning/live/{id}/questions/clusters/?since=<cursor>
+        유사 질문 클러스터별 집계 (질문 수, 공감 합계, 대표 질문=최다 공감)
+        since 커서 이후 새 질문이 들어온 클러스터만 반환 → 증분 폴링
+        """
+        session = get_object_or_404(LiveSession, id=pk)
+        is_instructor = session.instructor == request.user
+        if not is_instructor and not session.participants.filter(student=request.user).exists():
+            return Response({'error': '접근 권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            since = int(request.query_params.get('since', 0))
+        except ValueError:
+            return Response({'error': 'since는 정수여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        cluster_key = Coalesce('cluster_id', 'id', output_field=IntegerField())
+        clusters = (
+            LiveQuestion.objects.filter(live_session=session)
+            .annotate(
+                cluster_key=cluster_key,
+                question_count=Window(Count('id'), partition_by=[cluster_key]),
+                total_upvotes=Window(Sum('upvotes'), partition_by=[cluster_key]),
+                answered_count=Window(
+                    Sum(Case(When(is_answered=True, then=1), default=0)),
+                    partition_by=[cluster_key],
+                ),
+                last_question_id=Window(Max('id'), partition_by=[cluster_key]),
+                latest_at=Window(Max('created_at'), partition_by=[cluster_key]),
+                rank=Window(
+                    RowNumber(), partition_by=[cluster_key],
+                    order_by=[F('upvotes').desc(), F('created_at').asc()],
+                ),
+            )
+            .filter(rank=1, last_question_id__gt=since)
+            .order_by('-total_upvotes', '-question_count', '-latest_at')
+            .values(
+                'cluster_key', 'question_count', 'total_upvotes', 'answered_count',
+                'last_question_id', 'latest_at',
+                'id', 'question_text', 'ai_answer', 'instructor_answer', 'upvotes', 'is_answered',
+            )
+        )
+
+        labels = cluster_labels(session.id)
         data = [
             {
-                'id': q.id,
-                'question_text': q.question_text,
-                'ai_answer': q.ai_answer,
-                'instructor_answer': q.instructor_answer,
-                'upvotes': q.upvotes,
-                'is_answered': q.is_answered,
-                'created_at': q.created_at,
+                'cluster_id': c['cluster_key'],
+                'label': labels.get(c['cluster_key'], ''),
+                'question_count': c['question_count'],
+                'total_upvotes': c['total_upvotes'],
+                'answered_count': c['answered_count'],
+                'latest_at': c['latest_at'],
+                'representative': {
+                    'id': c['id'],
+                    'question_text': c['question_text'],
+                    'ai_answer': c['ai_answer'],
+                    'instructor_answer': c['instructor_answer'],
+                    'upvotes': c['upvotes'],
+                    'is_answered': c['is_answered'],
+                },
             }
-            for q in all_questions
+            for c in clusters
         ]
-        return Response(data)
+        cursor = max([c['last_question_id'] for c in clusters] + [since])
+        return Response({'clusters': data, 'cursor': cursor})
 
     @action(detail=True, methods=['post'], url_path='questions/ask')
     def ask_question(self, request, pk=None):
@@ -898,12 +908,8 @@ class LiveSessionViewSet(viewsets.ViewSet):
             question_text=text,
         )
 
-        # B1: 비동기로 유사 질문 클러스터링
-        thread = threading.Thread(
-            target=_cluster_similar_question, args=(session.id, question.id)
-        )
-        thread.daemon = True
-        thread.start()
+        # B1: 비동기로 유사 질문 클러스터링 (임베딩 + 최근접 중심, 공유 스레드 풀)
+        cluster_question_async(question.id)
 
         return Response({
             'id': question.id,
@@ -1023,31 +1029,12 @@ class LiveSessionViewSet(viewsets.ViewSet):
         """
         session = get_object_or_404(LiveSession, id=pk)
 
-        # 해당 세션의 모든 퀴즈 (시간순)
+        # 해당 세션의 모든 퀴즈 (시간순) + 본인 응답 (prefetch 1회)
         quizzes = LiveQuiz.objects.filter(
             live_session=session, is_suggestion=False
-        ).order_by('triggered_at')
-
-        results = []
-        for quiz in quizzes:
-            # 본인 응답 조회
-            response = LiveQuizResponse.objects.filter(
-                quiz=quiz, student=request.user
-            ).first()
+        ).order_by('triggered_at').prefetch_related(_my_response_prefetch(request.user))
 
-            results.append({
-                'quiz_id': quiz.id,
-                'question_text': quiz.question_text,
-                'options': quiz.options or [],
-                'correct_answer': quiz.correct_answer,
-                'explanation': quiz.explanation or '',
-                'is_ai_generated': quiz.is_ai_generated,
-                'triggered_at': quiz.triggered_at,
-                'my_answer': response.answer if response else None,
-                'is_correct': response.is_correct if response else None,
-                'responded_at': response.responded_at if response else None,
-                'answered': response is not None,
-            })
+        results = [_serialize_quiz_history(quiz) for quiz in quizzes]
 
         total = len(results)
         answered = sum(1 for r in results if r['answered'])
@@ -1214,64 +1201,137 @@ class LectureQuizHistoryView(APIView):
     GET /api/learning/lectures/<lecture_id>/quiz-history/
     학생용: 해당 강의의 모든 라이브 세션에서 본인이 응답한 퀴즈 결과 누적 조회
     (대시보드 > 수업목록 > 세션 상세 화면에서 사용)
+
+    Query: ?limit=20 (세션 수) &before=<next_cursor> (이전 세션 페이지)
     """
     permission_classes = [IsAuthenticated]
 
+    DEFAULT_PAGE_SIZE = 20
+    MAX_PAGE_SIZE = 100
+
     def get(self, request, lecture_id):
         lecture = get_object_or_404(Lecture, id=lecture_id)
 
-        # 해당 강의의 모든 라이브 세션 (최신순)
-        live_sessions = LiveSession.objects.filter(
-            lecture=lecture
-        ).order_by('created_at')
+        try:
+            limit = int(request.query_params.get('limit', self.DEFAULT_PAGE_SIZE))
+        except ValueError:
+            return Response({'error': 'limit은 정수여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, self.MAX_PAGE_SIZE))
+
+        # 키셋 페이지네이션: 최신 세션부터 limit개, before 커서 이전 세션만
+        live_sessions = LiveSession.objects.filter(lecture=lecture)
+        before = request.query_params.get('before')
+        if before:
+            try:
+                cursor_at, cursor_id = _parse_session_cursor(before)
+            except ValueError:
+                return Response({'error': '잘못된 커서입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+            live_sessions = live_sessions.filter(
+                Q(created_at__lt=cursor_at) | Q(created_at=cursor_at, id__lt=cursor_id)
+            )
+
+        page = list(
+            live_sessions.order_by('-created_at', '-id')
+            .only('id', 'title', 'created_at')[:limit + 1]
+        )
+        has_more = len(page) > limit
+        page = page[:limit]
+        next_cursor = _session_cursor(page[-1]) if has_more else None
+        page.reverse()  # 페이지 내부는 시간순 유지
+
+        # 페이지 내 모든 세션의 퀴즈 + 본인 응답 (쿼리 2회)
+        quizzes_by_session = {}
+        quizzes = LiveQuiz.objects.filter(
+            live_session__in=page, is_suggestion=False
+        ).order_by('triggered_at').prefetch_related(_my_response_prefetch(request.user))
+        for quiz in quizzes:
+            quizzes_by_session.setdefault(quiz.live_session_id, []).append(quiz)
 
         all_results = []
-        total_quizzes = 0
-        total_answered = 0
-        total_correct = 0
-
-        for session in live_sessions:
-            quizzes = LiveQuiz.objects.filter(
-                live_session=session, is_suggestion=False
-            ).order_by('triggered_at')
-
-            for quiz in quizzes:
-                response = LiveQuizResponse.objects.filter(
-                    quiz=quiz, student=request.user
-                ).first()
-
-                all_results.append({
-                    'quiz_id': quiz.id,
-                    'session_id': session.id,
-                    'session_title': session.title or f'세션 #{session.id}',
-                    'question_text': quiz.question_text,
-                    'options': quiz.options or [],
-                    'correct_answer': quiz.correct_answer,
-                    'explanation': quiz.explanation or '',
-                    'is_ai_generated': quiz.is_ai_generated,
-                    'triggered_at': quiz.triggered_at,
-                    'my_answer': response.answer if response else None,
-                    'is_correct': response.is_correct if response else None,
-                    'responded_at': response.responded_at if response else None,
-                    'answered': response is not None,
-                })
-                total_quizzes += 1
-                if response is not None:
-                    total_answered += 1
-                    if response.is_correct:
-                        total_correct += 1
+        for session in page:
+            session_title = session.title or f'세션 #{session.id}'
+            for quiz in quizzes_by_session.get(session.id, []):
+                item = _serialize_quiz_history(quiz)
+                item['session_id'] = session.id
+                item['session_title'] = session_title
+                all_results.append(item)
+
+        # 누적 통계는 페이지와 무관하게 강의 전체 기준 (집계 1회)
+        my_responses = Q(responses__student=request.user)
+        totals = LiveQuiz.objects.filter(
+            live_session__lecture=lecture, is_suggestion=False
+        ).aggregate(
+            total=Count('id', distinct=True),
+            answered=Count('responses', filter=my_responses),
+            correct=Count('responses', filter=my_responses & Q(responses__is_correct=True)),
+        )
+        total_answered = totals['answered']
+        total_correct = totals['correct']
 
         return Response({
             'lecture_id': lecture.id,
             'lecture_title': lecture.title,
-            'total_quizzes': total_quizzes,
+            'total_quizzes': totals['total'],
             'answered_count': total_answered,
             'correct_count': total_correct,
             'accuracy': round((total_correct / total_answered) * 100, 1) if total_answered > 0 else 0,
             'results': all_results,
+            'has_more': has_more,
+            'next_cursor': next_cursor,
         })
 
 
+def _my_response_prefetch(user):
+    """퀴즈별 본인 응답만 가져오는 Prefetch (quiz.my_responses)"""
+    return Prefetch(
+        'responses',
+        queryset=LiveQuizResponse.objects.filter(student=user),
+        to_attr='my_responses',
+    )
+
+
+def _serialize_quiz_history(quiz):
+    """퀴즈 이력 항목 직렬화 (_my_response_prefetch 적용 필요)"""
+    response = quiz.my_responses[0] if quiz.my_responses else None
+    return {
+        'quiz_id': quiz.id,
+        'question_text': quiz.question_text,
+        'options': quiz.options or [],
+        'correct_answer': quiz.correct_answer,
+        'explanation': quiz.explanation or '',
+        'is_ai_generated': quiz.is_ai_generated,
+        'triggered_at': quiz.triggered_at,
+        'my_answer': response.answer if response else None,
+        'is_correct': response.is_correct if response else None,
+        'responded_at': response.responded_at if response else None,
+        'answered': response is not None,
+    }
+
+
+def _session_cursor(session):
+    """키셋 커서: '<created_at ISO>_<id>'"""
+    return f"{session.created_at.isoformat()}_{session.id}"
+
+
+def _parse_session_cursor(cursor):
+    created_at, _, session_id = cursor.rpartition('_')
+    return datetime.fromisoformat(created_at), int(session_id)
+
+
+_QUESTION_FEED_FIELDS = (
+    'id', 'question_text', 'ai_answer', 'instructor_answer',
+    'upvotes', 'is_answered', 'cluster_id', 'created_at',
+)
+
+
+def _question_feed(session, since=0):
+    """세션 질문 목록 (공감순). since(질문 id, 호출부에서 정수 검증) 이후 신규 질문만 선택 조회"""
+    questions = session.questions.all()  # ordering은 모델에서 -upvotes
+    if since:
+        questions = questions.filter(id__gt=since)
+    return list(questions.values(*_QUESTION_FEED_FIELDS))
+
+
 # ══════════════════════════════════════════════════════════
 # 학습자: 세션 입장
 # ══════════════════════════════════════════════════════════
@@ -1405,6 +1465,8 @@ class LectureMaterialViewSet(viewsets.ViewSet):
             file_type=file_type,
             uploaded_by=request.user,
         )
+        # 텍스트 추출은 백그라운드에서 한 번만 (노트/퀴즈/적응형 콘텐츠 생성이 결과를 재사용)
+        extract_material_async(material.id)
 
         return Response({
             'id': material.id,
@@ -1591,15 +1653,10 @@ def _generate_quiz_suggestion(session_id):
         if not recent_chunks:
             # STT 없음 fallback: 교안 또는 강의 제목 기반 퀴즈 생성
             # 1순위: 교안 텍스트 기반
-            materials = session.lecture.materials.all()[:2] if session.lecture else []
+            materials = session.lecture.materials.select_related('extract')[:2] if session.lecture else []
             material_text = ''
             for mat in materials:
-                if mat.file and hasattr(mat.file, 'path'):
-                    try:
-                        with open(mat.file.path, 'r', encoding='utf-8', errors='ignore') as f:
-                            material_text += f.read()[:2000]
-                    except:
-                        pass
+                material_text += get_material_text(mat, limit=2000)
             if material_text:
                 context_text = material_text
                 logger.info(f"📝 [Fallback] STT 없음 → 교안 기반 퀴즈 생성 (세션 #{session_id})")
@@ -1613,45 +1670,7 @@ def _generate_quiz_suggestion(session_id):
 
 
 
-        # [RAG] 공식 문서에서 관련 컨텍스트 검색
-        rag_context = ""
-        try:
-            from .rag import RAGService
-            rag = RAGService()
-            lecture_id = session.lecture_id if session.lecture else None
-            related_docs = rag.search(query=context_text[:300], top_k=2, lecture_id=lecture_id)
-            if related_docs:
-                rag_context = "\n".join([f"- {doc.content[:200]}" for doc in related_docs])
-                print(f"✅ [RAG] 라이브 퀴즈 제안에 공식 문서 {len(related_docs)}건 참조")
-        except Exception as rag_err:
-            print(f"⚠️ [RAG] 퀴즈 제안 검색 실패: {rag_err}")
-
-        quiz_prompt = f'방금 교수자가 설명한 내용:\n{context_text}'
-        if rag_context:
-            quiz_prompt += f'\n\n[공식 문서 참조 (정확성 보장용)]:\n{rag_context}'
-
-        client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        response = client.chat.completions.create(
-            model='gpt-4o-mini',
-            messages=[
-                {'role': 'system', 'content': (
-                    '당신은 부트캠프 강의에서 교수자가 방금 설명한 내용을 바탕으로 '
-                    '체크포인트 퀴즈를 생성하는 AI입니다.\n'
-                    '[공식 문서 참조]가 있으면 정확한 정의에 기반한 문제를 출제하세요.\n'
-                    '반드시 아래 JSON 형식으로 응답하세요:\n'
-                    '{"question": "문제", "options": ["A", "B", "C", "D"], '
-                    '"correct_answer": "정답", "explanation": "해설"}'
-                )},
-                {'role': 'user', 'content': quiz_prompt}
-            ],
-            temperature=0.7,
-            max_tokens=500,
-            response_format={'type': 'json_object'},
-        )
-
-        import json as json_module
-        raw = response.choices[0].message.content.strip()
-        quiz_data = json_module.loads(raw)
+        quiz_data = generate_quiz_data(context_text, session.lecture_id)
 
         LiveQuiz.objects.create(
             live_session=session,
@@ -1662,6 +1681,7 @@ def _generate_quiz_suggestion(session_id):
             is_ai_generated=True,
             is_suggestion=True,   # 교수자 승인 대기
             is_active=False,      # 아직 학생에게 미발동
+            skill_tags=tag_skills(quiz_data['question']),
         )
         print(f"✅ [QuizSuggestion] 세션 #{session_id} AI 퀴즈 제안 생성 완료")
 
@@ -1672,400 +1692,9 @@ def _generate_quiz_suggestion(session_id):
 def _generate_live_note(session_id, note_id):
     """
     세션 종료 후 백그라운드에서 실행.
-    STT + 퀴즈 + Q&A + 이해도 데이터를 수집하여 GPT-4o로 통합 노트 생성.
+    공유 문맥 준비 후 학생 노트 / 교수자 인사이트 / 형성평가 초안을 동시에 생성 (learning/live_note.py)
     """
-    import django
-    django.setup()
-
-    try:
-        session = LiveSession.objects.get(id=session_id)
-        note = LiveSessionNote.objects.get(id=note_id)
-
-        # ── 1. STT 전문 수집 ──
-        stt_logs = session.stt_logs.order_by('sequence_order')
-        stt_text = '\n'.join([log.text_chunk for log in stt_logs])
-
-        # ── 2. 퀴즈 결과 수집 ──
-        quizzes = session.quizzes.all()
-        quiz_summary = []
-        for q in quizzes:
-            total = q.responses.count()
-            correct = q.responses.filter(is_correct=True).count()
-            quiz_summary.append({
-                'question': q.question_text,
-                'options': q.options,
-                'correct_answer': q.correct_answer,
-                'total_responses': total,
-                'correct_count': correct,
-                'accuracy': round((correct / total) * 100, 1) if total > 0 else 0,
-            })
-
-        # ── 3. Q&A 수집 ──
-        questions = session.questions.all()
-        qa_summary = [
-            {'question': q.question_text, 'ai_answer': q.ai_answer, 'instructor_answer': q.instructor_answer, 'upvotes': q.upvotes}
-            for q in questions
-        ]
-
-        # ── 4. 이해도 통계 ──
-        pulse_understand = session.pulses.filter(pulse_type='UNDERSTAND').count()
-        pulse_confused = session.pulses.filter(pulse_type='CONFUSED').count()
-        pulse_total = pulse_understand + pulse_confused
-        understand_rate = round((pulse_understand / pulse_total) * 100, 1) if pulse_total > 0 else 0
-
-        # ── 4-1. C2: 교안 콘텐츠 수집 (링크된 교안의 텍스트 추출) ──
-        material_text = ''
-        try:
-            linked_mats = note.linked_materials.all() if hasattr(note, 'linked_materials') else []
-            if not linked_mats:
-                linked_mats = session.lecture.materials.all()[:3]
-            for mat in linked_mats:
-                if mat.file and hasattr(mat.file, 'path'):
-                    try:
-                        # 텍스트 파일이면 직접 읽기
-                        with open(mat.file.path, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read()[:2000]
-                            material_text += f"\n[교안: {mat.title}]\n{content}\n"
-                    except:
-                        material_text += f"\n[교안: {mat.title}] (파일 읽기 불가)\n"
-        except:
-            pass
-
-        # ── 4-2. [RAG] 공식 문서에서 관련 컨텍스트 검색 ──
-        rag_context = ''
-        try:
-            from .rag import RAGService
-            rag = RAGService()
-            search_query = stt_text[:500]
-            related_docs = rag.search(query=search_query, top_k=3, lecture_id=session.lecture_id if session.lecture else None)
-            if related_docs:
-                rag_context = "\n".join([f"- {doc.content[:300]}" for doc in related_docs])
-                print(f"✅ [RAG] 라이브 노트 생성에 공식 문서 {len(related_docs)}건 참조")
-        except Exception as rag_err:
-            print(f"⚠️ [RAG] 검색 실패 (노트는 STT만으로 진행): {rag_err}")
-
-        # ── 5. 통계 저장 ──
-        stats = {
-            'total_participants': session.participants.count(),
-            'stt_chunks': stt_logs.count(),
-            'quiz_count': len(quiz_summary),
-            'question_count': len(qa_summary),
-            'understand_rate': understand_rate,
-            'duration_minutes': 0,
-            'material_count': len(material_text) > 0,  # C2: 교안 포함 여부
-        }
-        if session.started_at and session.ended_at:
-            stats['duration_minutes'] = int((session.ended_at - session.started_at).total_seconds() / 60)
-
-        note.stats = stats
-        note.save()
-
-        # ── 6. AI 통합 노트 생성 ──
-        quiz_text = ''
-        for i, q in enumerate(quiz_summary, 1):
-            quiz_text += f"\n퀴즈 {i}: {q['question']}\n정답: {q['correct_answer']} | 정답률: {q['accuracy']}%\n"
-
-        qa_text = ''
-        for i, q in enumerate(qa_summary, 1):
-            qa_text += f"\n질문 {i} (공감 {q['upvotes']}): {q['question']}\n"
-            if q['instructor_answer']:
-                qa_text += f"교수자 답변: {q['instructor_answer']}\n"
-            elif q['ai_answer']:
-                qa_text += f"AI 답변: {q['ai_answer'][:200]}\n"
-
-        prompt_content = f"""[강의 시간: 약 {stats['duration_minutes']}분 | 참가자: {stats['total_participants']}명 | 이해도: {understand_rate}%]
-
-=== 교안 원문 (텍스트 추출) ===
-{material_text[:3000] if material_text else '(교안 없음)'}
-
-=== 공식 문서 참조 (RAG 검색 결과) ===
-{rag_context[:2000] if rag_context else '(참조 문서 없음)'}
-
-=== 교수자 발화 STT 전문 ===
-{stt_text[:8000]}
-
-=== 체크포인트 퀴즈 결과 ({len(quiz_summary)}건) ===
-{quiz_text if quiz_text else '(퀴즈 없음)'}
-
-=== 학생 질문 ({len(qa_summary)}건) ===
-{qa_text if qa_text else '(질문 없음)'}
-"""
-
-        try:
-            client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-            response = client.chat.completions.create(
-                model='gpt-4o',
-                messages=[
-                    {'role': 'system', 'content': (
-                        '당신은 대학 강의를 전문적으로 정리하는 AI 어시스턴트입니다.\n'
-                        '아래 강의 데이터(교안 원문, 공식 문서 참조, STT 전문, 퀴즈 결과, 학생 질문)를 기반으로\n'
-                        '학생들이 복습하기 좋은 통합 노트를 작성하세요.\n\n'
-                        '핵심 규칙:\n'
-                        '- 교안에 있는 내용은 평문으로 정리하세요.\n'
-                        '- 교수자가 STT에서 교안에 없는 추가 설명/예시/노하우를 말한 부분은\n'
-                        '  "🎙️ 교수자 설명" 라벨을 붙여 구분하세요.\n'
-                        '- [공식 문서 참조]가 있으면, 전문 용어의 정확한 정의와 코드 예시를\n'
-                        '  "📖 공식 문서" 라벨로 보충하세요.\n'
-                        '- 교안과 STT를 주제별로 통합 정리하세요 (별도 섹션으로 분리하지 마세요).\n\n'
-                        '형식:\n'
-                        '# 📚 강의 통합 노트\n\n'
-                        '## 📋 수업 개요\n- 시간, 참가자, 이해도 등\n\n'
-                        '## 📖 핵심 내용 정리\n### 1. 주제별 정리 (교안+🎙️ 통합)\n\n'
-                        '## ✅ 체크포인트 퀴즈 복습\n- 문제, 정답, 해설\n\n'
-                        '## ❓ 주요 질의응답\n- 학생 질문과 답변 정리\n\n'
-                        '## 🔑 핵심 키워드\n- 중요 용어\n\n'
-                        '## 📝 복습 포인트\n- 추가 학습 추천 사항'
-                    )},
-                    {'role': 'user', 'content': prompt_content}
-                ],
-                temperature=0.3,
-                max_tokens=4000,
-            )
-            note.content = response.choices[0].message.content
-            # status는 인사이트까지 완료된 후 변경 (폴링 조기 중지 방지)
-
-        except Exception as e:
-            # Fallback: 원문 기반 간이 노트
-            note.content = (
-                f"# 📚 강의 통합 노트 (자동 생성 대기중)\n\n"
-                f"## 📋 수업 개요\n"
-                f"- 시간: 약 {stats['duration_minutes']}분\n"
-                f"- 참가자: {stats['total_participants']}명\n"
-                f"- 이해도: {understand_rate}%\n\n"
-                f"## 📖 강의 내용 (원문)\n{stt_text[:3000]}\n\n"
-                f"## ✅ 퀴즈 ({len(quiz_summary)}건)\n{quiz_text}\n\n"
-                f"## ❓ 질의응답 ({len(qa_summary)}건)\n{qa_text}\n"
-            )
-            # status는 인사이트까지 완료된 후 변경 (폴링 조기 중지 방지)
-            print(f"⚠️ [LiveNote] GPT 실패, Fallback 사용: {e}")
-
-        note.save()  # 콘텐츠만 먼저 저장 (status는 아직 PENDING)
-
-        # ── 7. 교수자 인사이트 리포트 생성 ──
-        try:
-            insight_prompt = f"""[세션 통계]
-- 참가자: {stats['total_participants']}명, 시간: {stats['duration_minutes']}분
-- 이해도: {understand_rate}%, 퀴즈 {len(quiz_summary)}건, 질문 {len(qa_summary)}건
-
-[퀴즈 결과]
-{quiz_text if quiz_text else '(퀴즈 없음)'}
-
-[학생 질문 (공감순)]
-{qa_text if qa_text else '(질문 없음)'}
-
-[이해도 데이터]
-이해 {pulse_understand}명 / 혼란 {pulse_confused}명 = {understand_rate}%
-"""
-            client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-            insight_resp = client.chat.completions.create(
-                model='gpt-4o-mini',
-                messages=[
-                    {'role': 'system', 'content': (
-                        '당신은 부트캠프 교수자를 위한 수업 분석 AI입니다.\n'
-                        '아래 세션 데이터를 분석하여 교수자 인사이트 리포트를 작성하세요.\n\n'
-                        '형식:\n'
-                        '# 📊 인사이트 리포트\n\n'
-                        '## 🔴 주의 구간\n- 이해도가 낮았던 포인트, 혼란이 많았던 시점\n\n'
-                        '## ❓ TOP 3 질문\n- 가장 많은 공감을 받은 질문과 의미\n\n'
-                        '## 📝 퀴즈 분석\n- 정답률 낮은 문항 분석, 취약 개념\n\n'
-                        '## 💡 다음 수업 제안\n- 보충 필요 주제, 수업 속도 조절 제안\n\n'
-                        '## 📈 전체 평가\n- 긍정 포인트 + 개선 포인트 요약'
-                    )},
-                    {'role': 'user', 'content': insight_prompt}
-                ],
-                temperature=0.3,
-                max_tokens=2000,
-            )
-            note.instructor_insight = insight_resp.choices[0].message.content
-            print(f"✅ [Insight] 교수자 인사이트 리포트 생성 완료")
-        except Exception as ie:
-            print(f"⚠️ [Insight] 인사이트 생성 실패 (노트는 정상): {ie}")
-            # Fallback: 실패 안내 메시지 설정 (프론트엔드 무한 대기 방지)
-            note.instructor_insight = (
-                "# 📊 인사이트 리포트\n\n"
-                "> ⚠️ AI 인사이트 생성에 실패했습니다.\n\n"
-                f"**오류 내용**: {str(ie)[:200]}\n\n"
-                "세션 데이터는 정상 저장되었으며, 통합 노트는 정상 제공됩니다.\n"
-                "페이지를 새로고침하면 재시도됩니다."
-            )
-
-        # 모든 처리(콘텐츠 + 인사이트) 완료 후 최종 DONE 상태로 변경
-        note.status = 'DONE'
-        note.save()
-
-        # ── 자동 승인: 노트 생성 완료 시 즉시 학생에게 공개 ──
-        note.is_approved = True
-        note.approved_at = timezone.now()
-        note.is_public = True
-        note.save()
-        print(f"✅ [AutoApprove] 세션 #{session_id} 노트 자동 승인 → 학생 공개")
-
-        # ── 8. Phase 2-3: 복습 루트 + 간격 반복 자동 생성 ──
-        try:
-            from .models import ReviewRoute, SpacedRepetitionItem
-            from datetime import timedelta
-
-            participants = LiveParticipant.objects.filter(live_session=session)
-
-            for participant in participants:
-                student = participant.student
-
-                # 해당 학생의 오답 퀴즈 수집
-                wrong_responses = LiveQuizResponse.objects.filter(
-                    quiz__live_session=session,
-                    student=student,
-                    is_correct=False,
-                ).select_related('quiz')
-
-                # 복습 항목 구성
-                items = []
-                order = 1
-
-                # 1순위: 통합 노트
-                items.append({
-                    'order': order, 'type': 'note',
-                    'title': '오늘 수업 통합 노트',
-                    'note_id': note.id, 'est_minutes': 10,
-                })
-                order += 1
-
-                # 2순위: 오답 개념
-                wrong_concepts = []
-                for wr in wrong_responses:
-                    concept = wr.quiz.question_text[:60]
-                    items.append({
-                        'order': order, 'type': 'concept',
-                        'title': f'오답 복습: {concept}',
-                        'content': f"문제: {wr.quiz.question_text}\n정답: {wr.quiz.correct_answer}\n{wr.quiz.explanation or ''}",
-                        'est_minutes': 5,
-                    })
-                    wrong_concepts.append({
-                        'concept': concept,
-                        'quiz': wr.quiz,
-                        'response': wr,
-                    })
-                    order += 1
-
-                total_minutes = sum(i.get('est_minutes', 0) for i in items)
-
-                # ReviewRoute 생성
-                ReviewRoute.objects.update_or_create(
-                    live_session=session,
-                    student=student,
-                    defaults={
-                        'items': items,
-                        'total_est_minutes': total_minutes,
-                        'status': 'AUTO_APPROVED',
-                    }
-                )
-
-                # SpacedRepetitionItem: 오답 개념마다 생성 (5주기)
-                now = timezone.now()
-                for wc in wrong_concepts:
-                    # 중복 방지
-                    if SpacedRepetitionItem.objects.filter(
-                        student=student,
-                        concept_name=wc['concept'][:200],
-                        source_session=session,
-                    ).exists():
-                        continue
-
-                    schedule = [
-                        {'review_num': 1, 'label': '10분 후', 'due_at': (now + timedelta(minutes=10)).isoformat(), 'completed': False},
-                        {'review_num': 2, 'label': '1일 후', 'due_at': (now + timedelta(days=1)).isoformat(), 'completed': False},
-                        {'review_num': 3, 'label': '1주일 후', 'due_at': (now + timedelta(weeks=1)).isoformat(), 'completed': False},
-                        {'review_num': 4, 'label': '1개월 후', 'due_at': (now + timedelta(days=30)).isoformat(), 'completed': False},
-                        {'review_num': 5, 'label': '6개월 후', 'due_at': (now + timedelta(days=180)).isoformat(), 'completed': False},
-                    ]
-
-                    # AI로 복습 문항 생성
-                    review_q = wc['quiz'].question_text
-                    review_a = wc['quiz'].correct_answer
-                    review_opts = wc['quiz'].options if hasattr(wc['quiz'], 'options') and wc['quiz'].options else []
-
-                    SpacedRepetitionItem.objects.create(
-                        student=student,
-                        concept_name=wc['concept'][:200],
-                        source_session=session,
-                        source_quiz=wc['quiz'],
-                        review_question=review_q,
-                        review_answer=review_a,
-                        review_options=review_opts,
-                        schedule=schedule,
-                    )
-
-            print(f"✅ [ReviewRoute] 세션 #{session_id} - {participants.count()}명 복습 루트 생성 완료")
-        except Exception as rre:
-            print(f"⚠️ [ReviewRoute] 복습 루트 생성 실패 (노트는 정상): {rre}")
-
-        print(f"✅ [LiveNote] 세션 #{session_id} 통합 노트 생성 완료 ({note.status})")
-
-    except Exception as e:
-        print(f"❌ [LiveNote] 노트 생성 실패: {e}")
-        try:
-            note = LiveSessionNote.objects.get(id=note_id)
-            note.status = 'FAILED'
-            note.content = f"노트 생성 실패: {str(e)}"
-            note.save()
-        except:
-            pass
-
-
-# ══════════════════════════════════════════════════════════
-# B1: 유사 질문 AI 클러스터링 (백그라운드)
-# ══════════════════════════════════════════════════════════
-
-def _cluster_similar_question(session_id, question_id):
-    """
-    신규 질문과 기존 질문들을 비교하여 유사하면 같은 cluster_id를 부여.
-    """
-    import django
-    django.setup()
-    try:
-        session = LiveSession.objects.get(id=session_id)
-        new_q = LiveQuestion.objects.get(id=question_id)
-        existing = session.questions.exclude(id=question_id).values_list('id', 'question_text', 'cluster_id')
-
-        if not existing:
-            # 첫 번째 질문 → cluster_id = question_id 자체
-            new_q.cluster_id = new_q.id
-            new_q.save()
-            return
-
-        # 기존 질문 목록 구성
-        existing_list = [{'id': e[0], 'text': e[1], 'cluster': e[2]} for e in existing]
-        existing_texts = '\n'.join([f"{i+1}. {e['text']}" for i, e in enumerate(existing_list)])
-
-        client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        response = client.chat.completions.create(
-            model='gpt-4o-mini',
-            messages=[
-                {'role': 'system', 'content': (
-                    '당신은 질문 유사도 판별 전문가입니다.\n'
-                    '새 질문이 기존 질문 중 하나와 같은 의미인지 판단하세요.\n'
-                    '같은 의미의 질문이 있으면 그 질문의 번호(1부터 시작)를 반환하세요.\n'
-                    '없으면 0을 반환하세요.\n'
-                    '숫자만 반환하세요. 설명 불필요.'
-                )},
-                {'role': 'user', 'content': f'기존 질문:\n{existing_texts}\n\n새 질문: {new_q.question_text}'}
-            ],
-            temperature=0,
-            max_tokens=10,
-        )
-        result = response.choices[0].message.content.strip()
-        match_idx = int(result) if result.isdigit() else 0
-
-        if 1 <= match_idx <= len(existing_list):
-            matched = existing_list[match_idx - 1]
-            # 매칭된 질문의 cluster_id 사용 (없으면 해당 질문 id)
-            new_q.cluster_id = matched['cluster'] or matched['id']
-        else:
-            new_q.cluster_id = new_q.id  # 새 클러스터
-        new_q.save()
-        print(f"✅ [Cluster] 질문 #{question_id} → cluster {new_q.cluster_id}")
-
-    except Exception as e:
-        print(f"⚠️ [Cluster] 클러스터링 실패: {e}")
+    run_live_note(session_id, note_id)
 
 
 # ══════════════════════════════════════════════════════════
@@ -2159,6 +1788,6 @@ def _build_summary_message(total_q, correct_q, confused, pulse_total, weak_topic
 # 통합 노트 관련 Views — note_views.py로 이동됨
 # Re-export for backward compatibility (urls.py imports from .live_views)
 # ══════════════════════════════════════════════════════════
-from .note_views import LiveNoteView, NoteApproveView, NoteMaterialLinkView, AbsentNoteListView  # noqa: F401
+from .note_views import LiveNoteView, NoteStageRetryView, NoteApproveView, NoteMaterialLinkView, AbsentNoteListView  # noqa: F401
 
 
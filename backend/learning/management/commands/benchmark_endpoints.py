@@ -0,0 +1,107 @@
+"""
+Django Management Command: benchmark_endpoints
+===============================================
+합성 코호트를 생성하여 API 엔드포인트별 쿼리 수 / 응답 시간 / 피크 메모리를 측정.
+합성 데이터는 트랜잭션 롤백으로 정리되며, 결과는 커밋 간 비교 가능한 JSON 리포트로 저장.
+
+사용법:
+  python manage.py benchmark_endpoints                          # 학생 10명/50명 스케일
+  python manage.py benchmark_endpoints --scales 20,100,500      # 스케일 지정
+  python manage.py benchmark_endpoints --only manager.,live.    # 이름 접두어로 필터
+  python manage.py benchmark_endpoints --baseline bench_prev.json --output bench.json
+  python manage.py benchmark_endpoints --thresholds bench_thresholds.json --fail-on-scaling
+
+임계값 파일 형식: {"live.quiz_results": {"max_queries": 10, "max_ms": 300}}
+위반이 있으면 CommandError로 종료(exit code 1) → CI에서 실패 처리.
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from learning.benchmarks.cohort import CohortSpec
+from learning.benchmarks.endpoints import ENDPOINTS
+from learning.benchmarks.runner import (
+    DEFAULT_TIME_TOLERANCE, run_suite, find_violations, write_report,
+)
+
+
+class Command(BaseCommand):
+    help = 'API 엔드포인트 쿼리 수/응답 시간 회귀 벤치마크'
+
+    def add_arguments(self, parser):
+        defaults = CohortSpec()
+        parser.add_argument('--scales', type=str, default='10,50', help='학생 수 스케일 (콤마 구분)')
+        parser.add_argument('--sessions', type=int, default=defaults.sessions, help='라이브 세션 수')
+        parser.add_argument('--quizzes', type=int, default=defaults.quizzes, help='세션당 퀴즈 수')
+        parser.add_argument('--pulses', type=int, default=defaults.pulses, help='세션당 학생별 펄스 수')
+        parser.add_argument('--questions', type=int, default=defaults.questions, help='세션당 질문자별 질문 수')
+        parser.add_argument('--vectors', type=int, default=defaults.vectors, help='VectorStore 청크 수')
+        parser.add_argument('--repeat', type=int, default=3, help='응답 시간 측정 반복 횟수')
+        parser.add_argument('--only', type=str, default='', help='엔드포인트 이름 접두어 필터 (콤마 구분)')
+        parser.add_argument('--output', type=str, default='benchmark_report.json', help='리포트 저장 경로')
+        parser.add_argument('--baseline', type=str, default=None, help='비교할 이전 리포트 경로')
+        parser.add_argument('--thresholds', type=str, default=None, help='엔드포인트별 임계값 JSON 경로')
+        parser.add_argument('--time-tolerance', type=float, default=DEFAULT_TIME_TOLERANCE,
+                            help='기준선 대비 허용 응답 시간 증가율 (0.5 = +50%%)')
+        parser.add_argument('--fail-on-scaling', action='store_true',
+                            help='코호트 크기에 따라 쿼리 수가 증가하면 실패')
+
+    def handle(self, *args, **options):
+        try:
+            scales = [int(s) for s in options['scales'].split(',') if s.strip()]
+        except ValueError:
+            raise CommandError('--scales는 콤마로 구분된 정수여야 합니다.')
+        if not scales:
+            raise CommandError('--scales가 비어 있습니다.')
+
+        spec = CohortSpec(
+            students=scales[0], sessions=options['sessions'], quizzes=options['quizzes'],
+            pulses=options['pulses'], questions=options['questions'], vectors=options['vectors'],
+        )
+
+        endpoints = ENDPOINTS
+        prefixes = [p.strip() for p in options['only'].split(',') if p.strip()]
+        if prefixes:
+            endpoints = [ep for ep in ENDPOINTS if ep.name.startswith(tuple(prefixes))]
+            if not endpoints:
+                raise CommandError(f'일치하는 엔드포인트가 없습니다: {options["only"]}')
+
+        self.stdout.write(self.style.SUCCESS('=' * 70))
+        self.stdout.write(self.style.SUCCESS(f' ⏱  엔드포인트 벤치마크 ({len(endpoints)}개, 스케일 {scales})'))
+        self.stdout.write(self.style.SUCCESS('=' * 70))
+
+        report = run_suite(spec, scales, endpoints=endpoints, repeat=options['repeat'], log=self.stdout.write)
+        write_report(report, options['output'])
+        self.stdout.write(f'\n📄 리포트 저장: {options["output"]}')
+
+        scaling = [name for name, data in report['endpoints'].items() if data['scales_with_cohort']]
+        if scaling:
+            self.stdout.write(self.style.WARNING(f'\n📈 코호트 크기에 비례해 쿼리가 늘어나는 엔드포인트 ({len(scaling)}개):'))
+            for name in scaling:
+                self.stdout.write(self.style.WARNING(
+                    f"    - {name}: +{report['endpoints'][name]['query_growth']} queries"
+                ))
+
+        violations = find_violations(
+            report,
+            thresholds=self._load_json(options['thresholds']),
+            baseline=self._load_json(options['baseline']),
+            time_tolerance=options['time_tolerance'],
+            fail_on_scaling=options['fail_on_scaling'],
+        )
+        if violations:
+            self.stdout.write(self.style.ERROR(f'\n❌ 임계값 위반 {len(violations)}건:'))
+            for v in violations:
+                self.stdout.write(self.style.ERROR(f'    - {v}'))
+            raise CommandError('벤치마크 임계값 위반')
+
+        self.stdout.write(self.style.SUCCESS('\n✅ 모든 엔드포인트가 임계값 이내입니다.'))
+
+    def _load_json(self, path):
+        if not path:
+            return None
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise CommandError(f'JSON 파일을 읽을 수 없습니다: {path} ({e})')
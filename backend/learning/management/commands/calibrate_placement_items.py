@@ -0,0 +1,68 @@
+"""
+Django Management Command: calibrate_placement_items
+=====================================================
+진단 테스트 응답 이력(PlacementResult.answers)으로 문항별 IRT 모수(변별도 a, 난이도 b)를 일괄 보정.
+적응형 진단(placement/adaptive/)의 문항 선택 / 능력 추정이 이 값을 사용한다.
+
+사용법:
+  python manage.py calibrate_placement_items                    # 2PL
+  python manage.py calibrate_placement_items --model 1pl        # 1PL (a=1 고정)
+  python manage.py calibrate_placement_items --min-responses 50 --dry-run
+
+cron 등록 예시 (매주 월요일 새벽 3시):
+  0 3 * * 1 cd /path/to/backend && /path/to/venv/bin/python manage.py calibrate_placement_items >> /var/log/reboot_irt.log 2>&1
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from learning.models import PlacementQuestion, PlacementResult
+from learning.placement_irt import calibrate_items
+from learning.placement_utils import get_item_bank, invalidate_item_bank
+
+
+class Command(BaseCommand):
+    help = '진단 테스트 응답 이력으로 문항 IRT 모수 일괄 보정'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', type=str, default='2pl', help='1pl | 2pl')
+        parser.add_argument('--min-responses', type=int, default=30, help='보정에 필요한 문항별 최소 응답 수')
+        parser.add_argument('--iterations', type=int, default=20, help='EM 반복 횟수')
+        parser.add_argument('--dry-run', action='store_true', help='저장하지 않고 결과만 출력')
+
+    def handle(self, *args, **options):
+        if options['model'] not in ('1pl', '2pl'):
+            raise CommandError(f"알 수 없는 모델: {options['model']}")
+
+        bank = get_item_bank()
+        answer_sets = PlacementResult.objects.values_list('answers', flat=True).iterator(chunk_size=2000)
+        calibrated = calibrate_items(
+            bank, answer_sets, model=options['model'],
+            iterations=options['iterations'], min_responses=options['min_responses'],
+        )
+        if not calibrated:
+            self.stdout.write('📐 보정할 수 있는 문항이 없습니다 (응답 수 부족).')
+            return
+
+        for row in calibrated:
+            self.stdout.write(f"  Q{row['id']}: a={row['a']:.2f}, b={row['b']:+.2f} (n={row['n']})")
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"[DRY-RUN] 📐 {len(calibrated)}/{len(bank)}개 문항 보정"))
+            return
+
+        now = timezone.now()
+        questions = PlacementQuestion.objects.in_bulk([row['id'] for row in calibrated])
+        for row in calibrated:
+            q = questions.get(row['id'])
+            if q is None:
+                continue
+            q.irt_a, q.irt_b, q.irt_responses, q.irt_calibrated_at = row['a'], row['b'], row['n'], now
+        PlacementQuestion.objects.bulk_update(
+            list(questions.values()), ['irt_a', 'irt_b', 'irt_responses', 'irt_calibrated_at'],
+        )
+        # bulk_update는 시그널이 없으므로 문항 뱅크 캐시를 직접 무효화
+        invalidate_item_bank()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"📐 {options['model'].upper()} 보정 완료: {len(calibrated)}/{len(bank)}개 문항"
+        ))
@@ -0,0 +1,44 @@
+"""
+Django Management Command: extract_materials
+============================================
+교안 텍스트 추출 결과(MaterialExtract)를 일괄 생성/갱신.
+새 업로드는 업로드 직후 자동 추출되므로, 기존 교안 백필이나 파서 변경 후 재추출에 사용한다.
+원본 해시가 같은 교안은 건너뛰고(--force 제외), 바뀐 교안과 재시도 간격이 지난 실패 교안만 다시 파싱한다.
+
+사용법:
+  python manage.py extract_materials --all
+  python manage.py extract_materials --lecture 3
+  python manage.py extract_materials --lecture 3 --force
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from learning.models import Lecture, LectureMaterial
+from learning.material_text import extract_material
+
+
+class Command(BaseCommand):
+    help = '교안 텍스트 추출 결과를 일괄 생성/갱신'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lecture', type=int, default=None, help='강의 ID')
+        parser.add_argument('--all', action='store_true', help='모든 교안')
+        parser.add_argument('--force', action='store_true', help='원본 해시가 같아도 다시 파싱')
+
+    def handle(self, *args, **options):
+        if options['lecture']:
+            if not Lecture.objects.filter(id=options['lecture']).exists():
+                raise CommandError(f"강의를 찾을 수 없습니다: {options['lecture']}")
+            materials = LectureMaterial.objects.filter(lecture_id=options['lecture'])
+        elif options['all']:
+            materials = LectureMaterial.objects.all()
+        else:
+            raise CommandError('--lecture 또는 --all 중 하나를 지정하세요.')
+
+        counts = {}
+        for material in materials.order_by('id').iterator():
+            extract = extract_material(material, force=options['force'])
+            key = extract.status if extract else 'NO_SOURCE'
+            counts[key] = counts.get(key, 0) + 1
+
+        summary = ', '.join(f"{k} {v}건" for k, v in sorted(counts.items())) or '대상 없음'
+        self.stdout.write(self.style.SUCCESS(f"📄 교안 텍스트 추출: {summary}"))
@@ -0,0 +1,50 @@
+"""
+Django Management Command: import_placements
+=============================================
+코호트 전체의 진단 테스트 응답을 CSV로 일괄 등록 (채점 → PlacementResult bulk_create → 갭 맵 bulk upsert).
+교수자 화면의 업로드(POST /api/learning/professor/{lecture_id}/placement-import/)와 같은 경로를 사용한다.
+
+CSV 형식 (헤더: username 또는 email + 문항 ID, 응답 없이 레벨만 지정하려면 level 열):
+  username,1,2,3
+  kim01,선택A,선택C,선택B
+
+사용법:
+  python manage.py import_placements --file cohort.csv
+  python manage.py import_placements --file cohort.csv --lecture 3 --enroll
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from learning.models import Lecture
+from learning.placement_utils import import_placement_csv
+
+
+class Command(BaseCommand):
+    help = '코호트 진단 테스트 결과 CSV 일괄 등록'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', type=str, required=True, help='CSV 파일 경로 (UTF-8)')
+        parser.add_argument('--lecture', type=int, default=None, help='진단 결과를 연결할 강의 ID')
+        parser.add_argument('--enroll', action='store_true', help='CSV의 학생을 강의 수강생으로 등록')
+
+    def handle(self, *args, **options):
+        lecture = None
+        if options['lecture']:
+            lecture = Lecture.objects.filter(id=options['lecture']).first()
+            if lecture is None:
+                raise CommandError(f"강의를 찾을 수 없습니다: {options['lecture']}")
+        elif options['enroll']:
+            raise CommandError('--enroll은 --lecture와 함께 사용하세요.')
+
+        try:
+            with open(options['file'], 'rb') as f:
+                stats = import_placement_csv(f, lecture=lecture, enroll=options['enroll'])
+        except OSError as e:
+            raise CommandError(f'파일을 열 수 없습니다: {e}')
+        except (ValueError, UnicodeDecodeError) as e:
+            raise CommandError(f'CSV 형식 오류: {e}')
+
+        for err in stats['errors']:
+            self.stdout.write(self.style.WARNING(f"  {err['row']}행: {err['error']}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"📋 진단 결과 {stats['imported']}건 등록, 갭 맵 {stats['skills']}행 초기화, 오류 {len(stats['errors'])}건"
+        ))
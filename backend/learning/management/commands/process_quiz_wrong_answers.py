@@ -0,0 +1,49 @@
+"""
+Django Management Command: process_quiz_wrong_answers
+======================================================
+종료된(또는 제한 시간이 지난) 라이브 퀴즈의 미처리 오답을 SR / GapMap에 일괄 반영.
+퀴즈 종료 시점의 비동기 처리가 서버 재시작 등으로 누락된 경우를 보정한다.
+
+사용법:
+  python manage.py process_quiz_wrong_answers
+  python manage.py process_quiz_wrong_answers --session 42
+
+cron 등록 예시 (10분마다):
+  */10 * * * * cd /path/to/backend && /path/to/venv/bin/python manage.py process_quiz_wrong_answers >> /var/log/reboot_quiz_close.log 2>&1
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from learning.models import LiveQuiz
+from learning.quiz_close import process_closed_quizzes
+
+
+class Command(BaseCommand):
+    help = '종료된 라이브 퀴즈의 미처리 오답을 SR/GapMap에 일괄 반영'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--session', type=int, default=None, help='특정 라이브 세션 ID만')
+
+    def handle(self, *args, **options):
+        quizzes = LiveQuiz.objects.filter(
+            responses__is_correct=False, responses__redesign_processed=False,
+        ).distinct()
+        if options['session']:
+            quizzes = quizzes.filter(live_session_id=options['session'])
+
+        now = timezone.now()
+        quiz_ids = [
+            q.id for q in quizzes.only('id', 'is_active', 'triggered_at', 'time_limit')
+            if not q.is_active or q.triggered_at + timedelta(seconds=q.time_limit) <= now
+        ]
+        if not quiz_ids:
+            self.stdout.write('📝 미처리 오답이 없습니다.')
+            return
+
+        stats = process_closed_quizzes(quiz_ids)
+        self.stdout.write(self.style.SUCCESS(
+            f"📝 퀴즈 {len(quiz_ids)}개: 오답 {stats['responses']}건 → SR {stats['sr_created']}개, "
+            f"GapMap 갱신 {stats['skills_updated']} / 신규 {stats['skills_created']}"
+        ))
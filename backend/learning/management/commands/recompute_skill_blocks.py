@@ -0,0 +1,48 @@
+"""
+Django Management Command: recompute_skill_blocks
+==================================================
+강의 단위로 수강생 전원의 스킬블록을 재계산 (학생별 집계 1회 + SkillBlock / StudentSkill bulk upsert).
+라이브 세션 종료 시 자동 실행되며, 누락분 보정이나 가중치 변경 후 일괄 재계산에 사용한다.
+
+사용법:
+  python manage.py recompute_skill_blocks --lecture 3
+  python manage.py recompute_skill_blocks --all
+  python manage.py recompute_skill_blocks --lecture 3 --batch-size 200
+
+cron 등록 예시 (매일 새벽 4시):
+  0 4 * * * cd /path/to/backend && /path/to/venv/bin/python manage.py recompute_skill_blocks --all >> /var/log/reboot_skill_blocks.log 2>&1
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from learning.models import Lecture, LiveSession
+from learning.skillblock_utils import recompute_lecture_blocks
+
+
+class Command(BaseCommand):
+    help = '강의 수강생 전원의 스킬블록을 일괄 재계산'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lecture', type=int, default=None, help='강의 ID')
+        parser.add_argument('--all', action='store_true', help='종료된 라이브 세션이 있는 모든 강의')
+        parser.add_argument('--batch-size', type=int, default=500, help='한 번에 처리할 학생 수')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] <= 0:
+            raise CommandError('--batch-size는 1 이상이어야 합니다.')
+
+        if options['lecture']:
+            if not Lecture.objects.filter(id=options['lecture']).exists():
+                raise CommandError(f"강의를 찾을 수 없습니다: {options['lecture']}")
+            lecture_ids = [options['lecture']]
+        elif options['all']:
+            lecture_ids = list(
+                LiveSession.objects.filter(status='ENDED').order_by().values_list('lecture_id', flat=True).distinct()
+            )
+        else:
+            raise CommandError('--lecture 또는 --all 중 하나를 지정하세요.')
+
+        for lecture_id in lecture_ids:
+            students, blocks = recompute_lecture_blocks(lecture_id, batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f"🧱 강의 #{lecture_id}: 학생 {students}명, 블록 {blocks}개 재계산"
+            ))
@@ -0,0 +1,89 @@
+"""
+Django Management Command: reschedule_sr
+=========================================
+간격 반복(SR) 항목의 다음 복습 시점을 응답 이력으로 일괄 재계산.
+- 고정 스케줄 시절 미리 잡힌 주기들을 스케줄러 결과 1개로 정리
+- 스케줄러 교체(SM-2 ↔ FSRS) 시 전체 항목 상태(scheduler_state) 재생성
+배치 단위로 prefetch → 메모리 계산 → bulk_update / bulk_create / 일괄 delete
+
+사용법:
+  python manage.py reschedule_sr                       # settings.SR_SCHEDULER 기준
+  python manage.py reschedule_sr --scheduler fsrs      # 알고리즘 지정
+  python manage.py reschedule_sr --student 12          # 특정 학생만
+  python manage.py reschedule_sr --dry-run             # 변경 건수만 확인
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from learning.models import SpacedRepetitionItem, SpacedRepetitionReview
+from learning.spaced_repetition import plan_reschedule
+from learning.sr_scheduler import SCHEDULERS, get_scheduler
+
+
+class Command(BaseCommand):
+    help = '간격 반복 항목의 다음 복습 시점을 스케줄러로 일괄 재계산'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scheduler', type=str, default=None, help=f"알고리즘 ({' | '.join(SCHEDULERS)})")
+        parser.add_argument('--student', type=int, default=None, help='특정 학생 ID만')
+        parser.add_argument('--batch-size', type=int, default=500, help='배치 크기')
+        parser.add_argument('--dry-run', action='store_true', help='저장하지 않고 건수만 출력')
+
+    def handle(self, *args, **options):
+        if options['scheduler'] and options['scheduler'] not in SCHEDULERS:
+            raise CommandError(f"알 수 없는 스케줄러: {options['scheduler']}")
+        if options['batch_size'] <= 0:
+            raise CommandError('--batch-size는 1 이상이어야 합니다.')
+        scheduler = get_scheduler(options['scheduler'])
+
+        items = SpacedRepetitionItem.objects.order_by('id')
+        if options['student']:
+            items = items.filter(student_id=options['student'])
+        ids = list(items.values_list('id', flat=True))
+
+        totals = {'items': 0, 'moved': 0, 'created': 0, 'deleted': 0, 'graduated': 0}
+        size = options['batch_size']
+        for start in range(0, len(ids), size):
+            batch = SpacedRepetitionItem.objects.filter(
+                id__in=ids[start:start + size],
+            ).prefetch_related('reviews')
+            self._reschedule_batch(list(batch), scheduler, totals, options['dry_run'])
+
+        prefix = '[DRY-RUN] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}🔁 {scheduler.name} 재스케줄: 항목 {totals['items']}개, "
+            f"주기 이동 {totals['moved']} / 신규 {totals['created']} / 삭제 {totals['deleted']}, "
+            f"졸업 {totals['graduated']}"
+        ))
+
+    def _reschedule_batch(self, items, scheduler, totals, dry_run):
+        to_update, to_create, to_delete = [], [], []
+        for item in items:
+            reviews = list(item.reviews.all())
+            before = {r.id: r.due_at for r in reviews if not r.completed_at}
+            keep, delete_ids = plan_reschedule(item, reviews, scheduler)
+
+            if keep is None:
+                if before or delete_ids:
+                    totals['graduated'] += 1
+            elif keep.pk is None:
+                to_create.append(keep)
+            elif before.get(keep.pk) != keep.due_at:
+                to_update.append(keep)
+            to_delete.extend(delete_ids)
+            totals['items'] += 1
+
+        totals['moved'] += len(to_update)
+        totals['created'] += len(to_create)
+        totals['deleted'] += len(to_delete)
+        if dry_run:
+            return
+
+        with transaction.atomic():
+            if to_delete:
+                SpacedRepetitionReview.objects.filter(id__in=to_delete).delete()
+            SpacedRepetitionReview.objects.bulk_update(to_update, ['due_at', 'label'])
+            SpacedRepetitionReview.objects.bulk_create(to_create)
+            SpacedRepetitionItem.objects.bulk_update(
+                items, ['scheduler', 'scheduler_state', 'last_reviewed_at', 'schedule'],
+            )
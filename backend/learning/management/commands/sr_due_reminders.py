@@ -0,0 +1,46 @@
+"""
+Django Management Command: sr_due_reminders
+============================================
+곧 도래하는 간격 반복(SR) 복습을 학생별로 묶어 출력 (푸시 리마인더 발송용).
+SpacedRepetitionReview의 due_at 부분 인덱스 범위 스캔 1회로 전체 학생을 조회한다.
+
+사용법:
+  python manage.py sr_due_reminders                # 앞으로 60분 이내 도래
+  python manage.py sr_due_reminders --minutes 30   # 창 크기 지정
+
+cron 등록 예시 (매시 정각):
+  0 * * * * cd /path/to/backend && /path/to/venv/bin/python manage.py sr_due_reminders >> /var/log/reboot_sr_reminders.log 2>&1
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from learning.spaced_repetition import reviews_due_within
+
+
+class Command(BaseCommand):
+    help = '앞으로 N분 이내 도래하는 간격 반복 복습을 학생별로 출력'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--minutes', type=int, default=60, help='조회 창 (분)')
+
+    def handle(self, *args, **options):
+        if options['minutes'] <= 0:
+            raise CommandError('--minutes는 1 이상이어야 합니다.')
+
+        by_student = defaultdict(list)
+        for review in reviews_due_within(timedelta(minutes=options['minutes'])):
+            by_student[review.student].append(review)
+
+        if not by_student:
+            self.stdout.write(f"⏰ {options['minutes']}분 이내 도래하는 복습이 없습니다.")
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f"⏰ {options['minutes']}분 이내 복습 도래: 학생 {len(by_student)}명"
+        ))
+        for student, reviews in by_student.items():
+            concepts = ', '.join(r.item.concept_name[:30] for r in reviews[:3])
+            more = f' 외 {len(reviews) - 3}건' if len(reviews) > 3 else ''
+            self.stdout.write(f'  - {student.username}: {len(reviews)}건 ({concepts}{more})')
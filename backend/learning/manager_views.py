@@ -27,6 +27,9 @@ from learning.models import (
     LiveSession, LiveParticipant, SkillBlock, StudentSkill,
     FormativeAssessment, FormativeResponse,
 )
+from learning.risk_utils import (
+    annotate_student_activity, score_at_risk_students, at_risk_student_ids,
+)
 
 
 class ManagerDashboardView(APIView):
@@ -57,7 +60,8 @@ class ManagerDashboardView(APIView):
         else:
             student_ids = []
 
-        total_students = len(set(student_ids))
+        student_ids = set(student_ids)
+        total_students = len(student_ids)
 
         # 퀴즈 평균 점수
         avg_quiz = QuizAttempt.objects.filter(
@@ -72,51 +76,51 @@ class ManagerDashboardView(APIView):
         ).count()
 
         # 이탈 위험군: 최근 7일 활동 없는 학생
-        active_student_ids = set(LearningSession.objects.filter(
-            student_id__in=student_ids,
-            start_time__gte=week_ago
-        ).values_list('student_id', flat=True))
-        at_risk_count = total_students - len(active_student_ids)
+        at_risk_count = len(at_risk_student_ids(student_ids))
 
-        # 스킬블록 획득 통계
-        earned_blocks = SkillBlock.objects.filter(
-            student_id__in=student_ids, is_earned=True
-        ).count()
-        total_blocks = SkillBlock.objects.filter(
+        # 스킬블록 획득 통계 (단일 집계)
+        block_stats = SkillBlock.objects.filter(
             student_id__in=student_ids
-        ).count()
+        ).aggregate(
+            earned=Count('id', filter=Q(is_earned=True)),
+            total=Count('id'),
+        )
+        earned_blocks = block_stats['earned']
+        total_blocks = block_stats['total']
         skill_completion_rate = (
             int((earned_blocks / total_blocks) * 100) if total_blocks > 0 else 0
         )
 
-        # 클래스별 요약
-        class_summaries = []
-        for cls in managed_classes:
-            enrolled = Enrollment.objects.filter(class_group=cls)
-            class_student_ids = list(enrolled.values_list('student_id', flat=True))
-            cls_avg = QuizAttempt.objects.filter(
-                student_id__in=class_student_ids
-            ).aggregate(avg=Avg('score'))['avg'] or 0
-
-            class_summaries.append({
+        # 클래스별 요약 (클래스 수와 무관하게 쿼리 1회)
+        class_rows = managed_classes.annotate(
+            student_count=Count('enrollments', distinct=True),
+            avg_score=Avg('enrollments__student__quizattempt__score'),
+        )
+        class_summaries = [
+            {
                 'id': cls.id,
                 'name': cls.name,
-                'student_count': len(class_student_ids),
-                'avg_score': round(cls_avg, 1),
+                'student_count': cls.student_count,
+                'avg_score': round(cls.avg_score or 0, 1),
                 'start_date': cls.start_date.isoformat(),
                 'end_date': cls.end_date.isoformat(),
-            })
+            }
+            for cls in class_rows
+        ]
 
         # 강의별 요약 (강사용)
-        lecture_summaries = []
-        for lec in teaching_lectures:
-            lec_students = lec.students.count()
-            lecture_summaries.append({
+        lecture_rows = teaching_lectures.annotate(
+            student_count=Count('students', distinct=True)
+        )
+        lecture_summaries = [
+            {
                 'id': lec.id,
                 'title': lec.title,
-                'student_count': lec_students,
+                'student_count': lec.student_count,
                 'access_code': lec.access_code,
-            })
+            }
+            for lec in lecture_rows
+        ]
 
         return Response({
             'total_students': total_students,
@@ -140,51 +144,29 @@ class ClassMonitorView(APIView):
         except ClassGroup.DoesNotExist:
             return Response({'error': '클래스를 찾을 수 없습니다.'}, status=404)
 
-        enrollments = Enrollment.objects.filter(
-            class_group=cls
-        ).select_related('student')
-        student_ids = [e.student_id for e in enrollments]
-
-        week_ago = timezone.now() - timedelta(days=7)
+        # 학생별 퀴즈/활동/스킬블록 지표를 서브쿼리로 한 번에 조회
+        enrollments = annotate_student_activity(
+            Enrollment.objects.filter(class_group=cls).select_related('student')
+        )
 
+        now = timezone.now()
         students_data = []
         for enrollment in enrollments:
-            sid = enrollment.student_id
             student = enrollment.student
-
-            # 퀴즈 성적
-            quiz_stats = QuizAttempt.objects.filter(
-                student_id=sid
-            ).aggregate(
-                avg_score=Avg('score'),
-                total_attempts=Count('id'),
-            )
-
-            # 최근 활동
-            last_session = LearningSession.objects.filter(
-                student_id=sid
-            ).order_by('-start_time').first()
-
-            # 스킬블록
-            earned = SkillBlock.objects.filter(
-                student_id=sid, is_earned=True
-            ).count()
-            total = SkillBlock.objects.filter(student_id=sid).count()
+            last_active = enrollment.last_active
 
             # 이탈 위험 판정
-            days_inactive = 0
-            if last_session:
-                days_inactive = (timezone.now() - last_session.start_time).days
+            days_inactive = (now - last_active).days if last_active else 0
 
             students_data.append({
-                'student_id': sid,
+                'student_id': enrollment.student_id,
                 'username': student.username,
                 'nickname': student.first_name or student.username,
-                'avg_quiz_score': round(quiz_stats['avg_score'] or 0, 1),
-                'total_quiz_attempts': quiz_stats['total_attempts'] or 0,
-                'skill_blocks_earned': earned,
-                'skill_blocks_total': total,
-                'last_active': last_session.start_time.isoformat() if last_session else None,
+                'avg_quiz_score': round(enrollment.avg_quiz_score or 0, 1),
+                'total_quiz_attempts': enrollment.total_quiz_attempts,
+                'skill_blocks_earned': enrollment.skill_blocks_earned,
+                'skill_blocks_total': enrollment.skill_blocks_total,
+                'last_active': last_active.isoformat() if last_active else None,
                 'days_inactive': days_inactive,
                 'is_at_risk': days_inactive >= 7,
                 'joined_at': enrollment.joined_at.isoformat(),
@@ -212,41 +194,27 @@ class AtRiskStudentsView(APIView):
         except ClassGroup.DoesNotExist:
             return Response({'error': '클래스를 찾을 수 없습니다.'}, status=404)
 
-        enrollments = Enrollment.objects.filter(
-            class_group=cls
-        ).select_related('student')
+        enrollments = list(
+            Enrollment.objects.filter(class_group=cls).select_related('student')
+        )
+        scores = score_at_risk_students([e.student_id for e in enrollments])
 
-        week_ago = timezone.now() - timedelta(days=7)
         at_risk = []
-
         for enrollment in enrollments:
-            sid = enrollment.student_id
-            last_session = LearningSession.objects.filter(
-                student_id=sid
-            ).order_by('-start_time').first()
-
-            if not last_session or (timezone.now() - last_session.start_time).days >= 7:
-                days_inactive = (
-                    (timezone.now() - last_session.start_time).days
-                    if last_session else 999
-                )
-
-                # 최근 퀴즈 성적 하락 체크
-                recent_quizzes = QuizAttempt.objects.filter(
-                    student_id=sid
-                ).order_by('-submitted_at')[:5]
-                avg_recent = sum(q.score for q in recent_quizzes) / len(recent_quizzes) if recent_quizzes else 0
-
-                at_risk.append({
-                    'student_id': sid,
-                    'username': enrollment.student.username,
-                    'nickname': enrollment.student.first_name or enrollment.student.username,
-                    'days_inactive': days_inactive,
-                    'last_active': last_session.start_time.isoformat() if last_session else '없음',
-                    'recent_avg_score': round(avg_recent, 1),
-                    'risk_level': 'HIGH' if days_inactive >= 14 else 'MEDIUM',
-                    'risk_factors': self._get_risk_factors(sid, days_inactive, avg_recent),
-                })
+            score = scores.get(enrollment.student_id)
+            if not score or not score['is_at_risk']:
+                continue
+            last_active = score['last_active']
+            at_risk.append({
+                'student_id': enrollment.student_id,
+                'username': enrollment.student.username,
+                'nickname': enrollment.student.first_name or enrollment.student.username,
+                'days_inactive': score['days_inactive'],
+                'last_active': last_active.isoformat() if last_active else '없음',
+                'recent_avg_score': score['recent_avg_score'],
+                'risk_level': score['risk_level'],
+                'risk_factors': score['risk_factors'],
+            })
 
         at_risk.sort(key=lambda x: -x['days_inactive'])
 
@@ -257,25 +225,6 @@ class AtRiskStudentsView(APIView):
             'total_at_risk': len(at_risk),
         })
 
-    def _get_risk_factors(self, student_id, days_inactive, avg_score):
-        factors = []
-        if days_inactive >= 14:
-            factors.append('2주 이상 미접속')
-        elif days_inactive >= 7:
-            factors.append('1주 이상 미접속')
-        if avg_score < 60:
-            factors.append('퀴즈 평균 60점 미만')
-        if avg_score == 0:
-            factors.append('퀴즈 미응시')
-
-        failed_count = QuizAttempt.objects.filter(
-            student_id=student_id, score__lt=60
-        ).count()
-        if failed_count >= 3:
-            factors.append(f'퀴즈 {failed_count}회 낙제')
-
-        return factors
-
 
 # ═══════════════════════════════════════════════
 # 시각화 데이터 피딩 API
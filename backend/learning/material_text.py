@@ -0,0 +1,195 @@
+"""
+교안 텍스트 추출 헬퍼 (View 아님)
+PDF / PPT(X) / DOCX / MD / TXT / 마크다운 교안을 페이지·슬라이드·섹션 단위로 파싱해 MaterialExtract에 저장한다.
+- 업로드 직후 백그라운드에서 한 번만 파싱 (원본 sha256이 같으면 재파싱하지 않음)
+  FAILED 결과는 일시 오류일 수 있어 FAILED_RETRY_AFTER가 지난 뒤 다음 요청에서 한 번 재시도
+  (손상 파일 / 파서 미설치 같은 영구 실패도 요청마다 파싱하지 않도록 간격을 둠)
+- 노트 생성 / 퀴즈 제안 / 적응형 콘텐츠 생성은 get_material_text()로 저장된 결과만 읽음
+  (추출 결과가 아직 없으면 그 자리에서 한 번 추출해 저장)
+- 페이지 경계는 text 내 문자 오프셋 [[start, end], ...]로 보관 → 페이지 단위 청킹에 사용
+"""
+import hashlib
+import io
+import threading
+from datetime import timedelta
+
+from django.db import connection
+from django.utils import timezone
+
+from .models import LectureMaterial, MaterialExtract
+
+PAGE_SEPARATOR = '\n\n'
+TEXT_ENCODINGS = ['utf-8', 'euc-kr', 'cp949', 'latin-1']
+FAILED_RETRY_AFTER = timedelta(minutes=10)
+
+
+def _read_bytes(material):
+    material.file.open('rb')
+    try:
+        return material.file.read()
+    finally:
+        material.file.close()
+
+
+def _decode(raw):
+    """인코딩 자동 감지"""
+    for enc in TEXT_ENCODINGS:
+        try:
+            return raw.decode(enc)
+        except UnicodeDecodeError:
+            continue
+    return raw.decode('utf-8', errors='replace')
+
+
+def _split_markdown(text):
+    """마크다운 → 최상위(#, ##) 제목 단위 섹션"""
+    sections, current = [], []
+    for line in text.split('\n'):
+        if (line.startswith('# ') or line.startswith('## ')) and any(l.strip() for l in current):
+            sections.append('\n'.join(current))
+            current = []
+        current.append(line)
+    sections.append('\n'.join(current))
+    return sections
+
+
+def source_hash(material):
+    """원본 sha256 (파일 또는 마크다운 텍스트, 원본이 없으면 None)"""
+    if material.file:
+        digest = hashlib.sha256()
+        material.file.open('rb')
+        try:
+            for chunk in material.file.chunks():
+                digest.update(chunk)
+        finally:
+            material.file.close()
+        return digest.hexdigest()
+    if material.content_type == 'MARKDOWN' and material.content_data:
+        return hashlib.sha256(material.content_data.encode()).hexdigest()
+    return None
+
+
+def parse_pages(material):
+    """교안 → 페이지/슬라이드/섹션 텍스트 목록"""
+    if not material.file:
+        if material.content_type == 'MARKDOWN':
+            return _split_markdown(material.content_data)
+        return []
+
+    if material.file_type == 'PDF':
+        import fitz
+        doc = fitz.open(stream=_read_bytes(material), filetype='pdf')
+        try:
+            return [page.get_text() for page in doc]
+        finally:
+            doc.close()
+
+    if material.file_type == 'PPT':
+        from pptx import Presentation
+        prs = Presentation(io.BytesIO(_read_bytes(material)))
+        return [
+            '\n'.join(shape.text for shape in slide.shapes if hasattr(shape, 'text'))
+            for slide in prs.slides
+        ]
+
+    if material.file_type == 'DOCX':
+        from docx import Document
+        # Django FileField를 통해 바이너리로 읽어서 전달 (한글 경로 이슈 방지)
+        doc = Document(io.BytesIO(_read_bytes(material)))
+        # 제목(Heading) 스타일 문단마다 섹션 분리, 테이블은 마지막 섹션으로
+        sections, current = [], []
+        for para in doc.paragraphs:
+            if para.style is not None and para.style.name.startswith('Heading') and current:
+                sections.append('\n'.join(current))
+                current = []
+            current.append(para.text)
+        sections.append('\n'.join(current))
+        tables = '\n'.join(
+            ' '.join(cell.text for cell in row.cells)
+            for table in doc.tables for row in table.rows
+        )
+        if tables.strip():
+            sections.append(tables)
+        return sections
+
+    if material.file_type == 'MD':
+        return _split_markdown(_decode(_read_bytes(material)))
+
+    if material.file_type == 'TXT':
+        return _decode(_read_bytes(material)).split('\f')
+
+    return []
+
+
+def _retry_due(extract):
+    """FAILED 결과를 다시 파싱할 때가 됐는지 (마지막 시도 후 FAILED_RETRY_AFTER 경과)"""
+    return extract.status == 'FAILED' and extract.extracted_at <= timezone.now() - FAILED_RETRY_AFTER
+
+
+def extract_material(material, force=False):
+    """
+    추출 결과 생성/갱신 → MaterialExtract (원본이 없으면 None)
+    원본 해시가 저장된 결과와 같으면 파싱 없이 그대로 반환 (재시도 시점이 된 FAILED만 다시 파싱)
+    """
+    digest = source_hash(material)
+    if digest is None:
+        return None
+    existing = MaterialExtract.objects.filter(material=material).first()
+    if existing and existing.file_hash == digest and not _retry_due(existing) and not force:
+        return existing
+
+    text, pages, error = '', [], ''
+    try:
+        for page in parse_pages(material):
+            if pages:
+                text += PAGE_SEPARATOR
+            start = len(text)
+            text += page.strip()
+            pages.append([start, len(text)])
+        status = 'READY' if text.strip() else 'EMPTY'
+    except ImportError as e:
+        status, error = 'FAILED', f'파서 라이브러리 미설치: {e}'
+    except Exception as e:
+        status, error = 'FAILED', str(e)
+        print(f"⚠️ [Material] 교안 #{material.id} 텍스트 추출 실패: {e}")
+
+    extract, _ = MaterialExtract.objects.update_or_create(
+        material=material,
+        defaults={'file_hash': digest, 'status': status, 'text': text, 'pages': pages, 'error': error},
+    )
+    return extract
+
+
+def extract_material_async(material_id):
+    def _run():
+        try:
+            extract = extract_material(LectureMaterial.objects.get(id=material_id))
+            if extract:
+                print(f"📄 [Material] 교안 #{material_id} 텍스트 추출: {extract.status}, {len(extract.pages)}페이지")
+        except Exception as e:
+            print(f"⚠️ [Material] 교안 #{material_id} 텍스트 추출 실패: {e}")
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=_run)
+    thread.daemon = True
+    thread.start()
+    return thread
+
+
+def get_material_text(material, limit=None):
+    """
+    저장된 추출 텍스트 (없거나 실패 후 재시도 시점이 됐으면 추출해 저장, 추출 불가면 '')
+    마크다운 텍스트 교안은 내용이 바뀌었을 수 있어 해시를 비교 (파일 교안은 업로드 후 불변)
+    """
+    try:
+        extract = material.extract
+    except MaterialExtract.DoesNotExist:
+        extract = None
+    if extract is None or _retry_due(extract) or (
+        not material.file and material.content_type == 'MARKDOWN'
+        and extract.file_hash != source_hash(material)
+    ):
+        extract = extract_material(material)
+    text = extract.text if extract and extract.status == 'READY' else ''
+    return text[:limit] if limit else text
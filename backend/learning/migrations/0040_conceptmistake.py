@@ -0,0 +1,83 @@
+# Generated by Django 4.2.28 on 2026-10-20 03:39
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def backfill_concept_mistakes(apps, schema_editor):
+    """기존 퀴즈/형성평가 오답과 Weak Zone 알림을 인덱스로 이관"""
+    ConceptMistake = apps.get_model('learning', 'ConceptMistake')
+    LiveQuizResponse = apps.get_model('learning', 'LiveQuizResponse')
+    FormativeResponse = apps.get_model('learning', 'FormativeResponse')
+    WeakZoneAlert = apps.get_model('learning', 'WeakZoneAlert')
+
+    rows = []
+    for qr in LiveQuizResponse.objects.filter(is_correct=False).select_related('quiz__live_session').iterator():
+        session = qr.quiz.live_session
+        rows.append(ConceptMistake(
+            lecture_id=session.lecture_id, live_session_id=session.id, student_id=qr.student_id,
+            concept=(qr.quiz.question_text or '')[:50], source='QUIZ', quiz_id=qr.quiz_id,
+            created_at=qr.responded_at,
+        ))
+
+    for fr in FormativeResponse.objects.select_related('assessment__live_session').iterator():
+        fa = fr.assessment
+        questions_map = {q.get('id'): q for q in (fa.questions or []) if isinstance(q, dict)}
+        answers = fr.answers if isinstance(fr.answers, list) else []
+        for result in answers:
+            if not isinstance(result, dict) or result.get('is_correct'):
+                continue
+            q = questions_map.get(result.get('question_id'))
+            if not q:
+                continue
+            concept = q.get('concept_tag') or (q.get('question') or '')[:50]
+            rows.append(ConceptMistake(
+                lecture_id=fa.live_session.lecture_id, live_session_id=fa.live_session_id,
+                student_id=fr.student_id, concept=concept[:200], source='FORMATIVE',
+                assessment_id=fa.id, created_at=fr.submitted_at,
+            ))
+
+    for wz in WeakZoneAlert.objects.select_related('live_session').iterator():
+        detail = wz.trigger_detail if isinstance(wz.trigger_detail, dict) else {}
+        topic = (detail.get('recent_topic') or '')[:50]
+        if not topic:
+            continue
+        rows.append(ConceptMistake(
+            lecture_id=wz.live_session.lecture_id, live_session_id=wz.live_session_id,
+            student_id=wz.student_id, concept=topic, source='WEAK_ZONE',
+            created_at=wz.created_at,
+        ))
+
+    ConceptMistake.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('learning', '0039_lecture_category'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConceptMistake',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('concept', models.CharField(help_text='개념 키 (concept_tag 또는 문제 앞 50자)', max_length=200)),
+                ('source', models.CharField(choices=[('QUIZ', '라이브 퀴즈 오답'), ('FORMATIVE', '형성평가 오답'), ('WEAK_ZONE', 'Weak Zone 감지')], max_length=20)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, help_text='원본 응답/감지 시각')),
+                ('assessment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='learning.formativeassessment')),
+                ('lecture', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='concept_mistakes', to='learning.lecture')),
+                ('live_session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='concept_mistakes', to='learning.livesession')),
+                ('quiz', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='learning.livequiz')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='concept_mistakes', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['lecture', 'created_at'], name='concept_mistake_lecture_time'), models.Index(fields=['lecture', 'concept'], name='concept_mistake_lecture_cpt')],
+            },
+        ),
+        migrations.RunPython(backfill_concept_mistakes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 4.2.28 on 2026-10-20 03:45
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from datetime import datetime
+
+from django.utils import timezone
+
+
+def _parse_due_at(value):
+    if not value:
+        return None
+    try:
+        due_at = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    if timezone.is_aware(due_at):
+        due_at = timezone.make_naive(due_at)
+    return due_at
+
+
+def backfill_reviews(apps, schema_editor):
+    """SpacedRepetitionItem.schedule(JSON) → SpacedRepetitionReview 행으로 이관"""
+    SpacedRepetitionItem = apps.get_model('learning', 'SpacedRepetitionItem')
+    SpacedRepetitionReview = apps.get_model('learning', 'SpacedRepetitionReview')
+
+    rows = []
+    for item in SpacedRepetitionItem.objects.only('id', 'student_id', 'schedule').iterator():
+        seen = set()
+        for entry in item.schedule if isinstance(item.schedule, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            due_at = _parse_due_at(entry.get('due_at'))
+            review_num = entry.get('review_num')
+            if due_at is None or review_num is None or review_num in seen:
+                continue
+            seen.add(review_num)
+            rows.append(SpacedRepetitionReview(
+                item_id=item.id, student_id=item.student_id, review_num=review_num,
+                label=(entry.get('label') or '')[:50], due_at=due_at,
+                # JSON에는 완료 시각이 없으므로 예정 시각으로 대체
+                completed_at=due_at if entry.get('completed') else None,
+            ))
+        if len(rows) >= 1000:
+            SpacedRepetitionReview.objects.bulk_create(rows, ignore_conflicts=True)
+            rows = []
+    SpacedRepetitionReview.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('learning', '0040_conceptmistake'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpacedRepetitionReview',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review_num', models.IntegerField()),
+                ('label', models.CharField(blank=True, default='', max_length=50)),
+                ('due_at', models.DateTimeField()),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='learning.spacedrepetitionitem')),
+                ('student', models.ForeignKey(help_text='item.student 비정규화 (인덱스용)', on_delete=django.db.models.deletion.CASCADE, related_name='spaced_reviews', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['due_at'],
+                'indexes': [models.Index(condition=models.Q(('completed_at__isnull', True)), fields=['student', 'due_at'], name='sr_review_student_due'), models.Index(condition=models.Q(('completed_at__isnull', True)), fields=['due_at'], name='sr_review_due')],
+                'unique_together': {('item', 'review_num')},
+            },
+        ),
+        migrations.RunPython(backfill_reviews, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.28 on 2026-10-20 03:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0041_spacedrepetitionreview'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='spacedrepetitionitem',
+            name='last_reviewed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='spacedrepetitionitem',
+            name='scheduler',
+            field=models.CharField(default='sm2', help_text='스케줄러 알고리즘 (sm2 | fsrs)', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='spacedrepetitionitem',
+            name='scheduler_state',
+            field=models.JSONField(default=dict, help_text='스케줄러 상태 (SM-2: ease/reps/interval, FSRS: stability/difficulty/lapses)'),
+        ),
+        migrations.AddField(
+            model_name='spacedrepetitionreview',
+            name='rating',
+            field=models.IntegerField(blank=True, help_text='응답 평점 1~4 (AGAIN/HARD/GOOD/EASY)', null=True),
+        ),
+        migrations.AddField(
+            model_name='spacedrepetitionreview',
+            name='response_ms',
+            field=models.IntegerField(blank=True, help_text='응답 소요 시간 (ms)', null=True),
+        ),
+        migrations.AlterField(
+            model_name='spacedrepetitionitem',
+            name='schedule',
+            field=models.JSONField(default=list, help_text='복습 스케줄 [{ review_num, label, due_at, completed }]'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.28 on 2026-10-20 03:49
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def mark_existing_processed(apps, schema_editor):
+    """기존 응답은 응답 시점 스레드에서 이미 반영됨 → 일괄 처리 대상에서 제외"""
+    LiveQuizResponse = apps.get_model('learning', 'LiveQuizResponse')
+    LiveQuizResponse.objects.update(redesign_processed=True)
+
+
+def dedupe_sr_items(apps, schema_editor):
+    """(student, concept_name) 중복 SR 항목 정리: 가장 많이 진행된 항목 1개만 유지"""
+    SpacedRepetitionItem = apps.get_model('learning', 'SpacedRepetitionItem')
+    duplicates = (
+        SpacedRepetitionItem.objects.values('student_id', 'concept_name')
+        .annotate(n=Count('id')).filter(n__gt=1)
+    )
+    for dup in duplicates:
+        ids = list(
+            SpacedRepetitionItem.objects.filter(
+                student_id=dup['student_id'], concept_name=dup['concept_name'],
+            ).order_by('-current_review', 'created_at', 'id').values_list('id', flat=True)
+        )
+        SpacedRepetitionItem.objects.filter(id__in=ids[1:]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0042_sr_scheduler_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='livequizresponse',
+            name='redesign_processed',
+            field=models.BooleanField(default=False, help_text='오답 SR/GapMap 반영 완료 (quiz_close)'),
+        ),
+        migrations.RunPython(mark_existing_processed, migrations.RunPython.noop),
+        migrations.RunPython(dedupe_sr_items, migrations.RunPython.noop),
+    ]
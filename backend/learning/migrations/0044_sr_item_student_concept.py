@@ -0,0 +1,18 @@
+# Generated by Django 4.2.28 on 2026-10-20 03:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """중복 정리(0043)와 분리: 같은 트랜잭션에서 DELETE 후 ALTER TABLE 하지 않도록"""
+
+    dependencies = [
+        ('learning', '0043_quiz_close_batch'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='spacedrepetitionitem',
+            constraint=models.UniqueConstraint(fields=('student', 'concept_name'), name='sr_item_student_concept'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 4.2.28 on 2026-10-20 03:52
+
+from django.db import migrations, models
+
+
+def backfill_skill_tags(apps, schema_editor):
+    """기존 퀴즈/형성평가에 스킬 태그 기록 (skill_tagger와 같은 매칭 규칙, 일회성이라 단순 스캔)"""
+    Skill = apps.get_model('learning', 'Skill')
+    LiveQuiz = apps.get_model('learning', 'LiveQuiz')
+    FormativeAssessment = apps.get_model('learning', 'FormativeAssessment')
+
+    skills = [
+        (sid, name.strip().lower())
+        for sid, name in Skill.objects.order_by('category', 'order', 'id').values_list('id', 'name')
+        if name and name.strip()
+    ]
+    if not skills:
+        return
+
+    def in_text(text):
+        text = (text or '').lower()
+        return [sid for sid, name in skills if name in text]
+
+    quizzes = []
+    for quiz in LiveQuiz.objects.only('id', 'question_text').iterator():
+        quiz.skill_tags = in_text(quiz.question_text)
+        if quiz.skill_tags:
+            quizzes.append(quiz)
+    LiveQuiz.objects.bulk_update(quizzes, ['skill_tags'], batch_size=500)
+
+    assessments = []
+    for fa in FormativeAssessment.objects.only('id', 'questions').iterator():
+        tags = {}
+        for q in fa.questions if isinstance(fa.questions, list) else []:
+            tag = q.get('concept_tag') if isinstance(q, dict) else None
+            if tag and tag not in tags:
+                key = tag.strip().lower()
+                tags[tag] = [sid for sid, name in skills if key and key in name] or in_text(tag)
+        if tags:
+            fa.skill_tags = tags
+            assessments.append(fa)
+    FormativeAssessment.objects.bulk_update(assessments, ['skill_tags'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0044_sr_item_student_concept'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='formativeassessment',
+            name='skill_tags',
+            field=models.JSONField(blank=True, default=dict, help_text='concept_tag → 스킬 ID 목록 (skill_tagger, 생성 시 기록)'),
+        ),
+        migrations.AddField(
+            model_name='livequiz',
+            name='skill_tags',
+            field=models.JSONField(blank=True, default=list, help_text='문제에 등장하는 스킬 ID 목록 (skill_tagger, 생성 시 기록)'),
+        ),
+        migrations.RunPython(backfill_skill_tags, migrations.RunPython.noop),
+    ]
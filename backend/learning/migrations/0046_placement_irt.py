@@ -0,0 +1,48 @@
+# Generated by Django 4.2.28 on 2026-10-20 03:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0045_skill_tags'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='placementquestion',
+            name='irt_a',
+            field=models.FloatField(default=1.0, help_text='IRT 변별도 a (1PL은 1.0 고정)'),
+        ),
+        migrations.AddField(
+            model_name='placementquestion',
+            name='irt_b',
+            field=models.FloatField(blank=True, help_text='IRT 난이도 b (NULL이면 difficulty 1~3 → -1 / 0 / +1)', null=True),
+        ),
+        migrations.AddField(
+            model_name='placementquestion',
+            name='irt_calibrated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='placementquestion',
+            name='irt_responses',
+            field=models.IntegerField(default=0, help_text='보정에 사용된 응답 수'),
+        ),
+        migrations.AddField(
+            model_name='placementresult',
+            name='ability',
+            field=models.FloatField(blank=True, help_text='IRT 능력 추정치 θ (적응형)', null=True),
+        ),
+        migrations.AddField(
+            model_name='placementresult',
+            name='ability_se',
+            field=models.FloatField(blank=True, help_text='θ 표준오차', null=True),
+        ),
+        migrations.AddField(
+            model_name='placementresult',
+            name='mode',
+            field=models.CharField(choices=[('FIXED', '전체 문항'), ('ADAPTIVE', '적응형 (IRT)')], default='FIXED', max_length=10),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.28 on 2026-10-20 04:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0046_placement_irt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='livesessionnote',
+            name='stage_status',
+            field=models.JSONField(blank=True, default=dict, help_text='후처리 단계별 진행 상황 {stage: {status, done, total, updated_at}}'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.28 on 2026-10-20 04:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0047_note_stage_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='curriculumitem',
+            name='skill',
+            field=models.ForeignKey(blank=True, help_text='이 항목이 다루는 역량 (선수관계 그래프 기반 경로 계산용)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='curriculum_items', to='learning.skill'),
+        ),
+        migrations.CreateModel(
+            name='SkillPrerequisite',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('prerequisite', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dependent_links', to='learning.skill')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='prerequisite_links', to='learning.skill')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='skillprerequisite',
+            constraint=models.CheckConstraint(check=models.Q(('skill', models.F('prerequisite')), _negated=True), name='skill_prereq_not_self'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='skillprerequisite',
+            unique_together={('skill', 'prerequisite')},
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.28 on 2026-10-20 04:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0048_skill_prerequisite'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reroutinglog',
+            name='diff',
+            field=models.JSONField(blank=True, default=dict, help_text='압축 diff {add: [[id, order, title]], remove: [[id, title]], move: [[id, from, to]]}'),
+        ),
+        migrations.AddField(
+            model_name='reroutinglog',
+            name='signature',
+            field=models.CharField(blank=True, default='', help_text='반영 후 항목 상태 + 학습 신호 해시 (같으면 다음 리라우팅 생략)', max_length=64),
+        ),
+    ]
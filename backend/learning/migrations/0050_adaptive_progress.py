@@ -0,0 +1,23 @@
+# Generated by Django 4.2.28 on 2026-10-20 04:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0049_rerouting_diff'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='adaptivecontent',
+            name='error',
+            field=models.TextField(blank=True, default='', help_text='생성 실패 사유 (재요청 시 이 레벨만 재생성)'),
+        ),
+        migrations.AddField(
+            model_name='adaptivecontent',
+            name='progress',
+            field=models.IntegerField(default=0, help_text='생성 진행률 (0~100, 스트리밍 중 갱신)'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.28 on 2026-10-20 04:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0050_adaptive_progress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaterialExtract',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_hash', models.CharField(help_text='원본 파일(또는 마크다운 텍스트) sha256', max_length=64)),
+                ('status', models.CharField(choices=[('READY', '추출 완료'), ('EMPTY', '추출 텍스트 없음'), ('FAILED', '추출 실패')], default='READY', max_length=10)),
+                ('text', models.TextField(blank=True, default='', help_text='페이지/슬라이드 순서대로 이어 붙인 전체 텍스트')),
+                ('pages', models.JSONField(blank=True, default=list, help_text='페이지/슬라이드/섹션 경계 [[start, end], ...] (text 내 문자 오프셋, 1페이지부터)')),
+                ('error', models.TextField(blank=True, default='')),
+                ('extracted_at', models.DateTimeField(auto_now=True)),
+                ('material', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='extract', to='learning.lecturematerial')),
+            ],
+        ),
+    ]
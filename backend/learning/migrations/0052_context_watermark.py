@@ -0,0 +1,23 @@
+# Generated by Django 4.2.28 on 2026-10-20 04:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0051_material_extract'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='learningsession',
+            name='compressed_until_seq',
+            field=models.IntegerField(default=0, help_text='요약에 반영된 마지막 STTLog sequence_order (압축 워터마크)'),
+        ),
+        migrations.AddField(
+            model_name='learningsession',
+            name='context_segments',
+            field=models.JSONField(blank=True, default=list, help_text='계층 요약 구간 [{from_seq, to_seq, level, text}] (시간 순, context_summary는 이를 이어 붙인 것)'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.28 on 2026-10-20 04:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0052_context_watermark'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='formativeassessment',
+            name='status',
+            field=models.CharField(choices=[('GENERATING', '생성 중'), ('DRAFT', 'AI 초안 (노트 생성 시 미리 생성, 미공개)'), ('READY', '준비 완료'), ('FAILED', '생성 실패')], default='GENERATING', max_length=20),
+        ),
+    ]
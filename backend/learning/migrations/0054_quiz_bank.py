@@ -0,0 +1,36 @@
+# Generated by Django 4.2.28 on 2026-10-20 04:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+import pgvector.django.vector
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0053_formative_draft'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizBankItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('STT', '수업 중 STT 구간'), ('MATERIAL', '교안'), ('SYLLABUS', '강의계획서')], default='STT', max_length=10)),
+                ('from_seq', models.IntegerField(default=0, help_text='STT 구간 시작 sequence_order (수업 전 항목은 0)')),
+                ('to_seq', models.IntegerField(default=0, help_text='STT 구간 끝 sequence_order (수업 전 항목은 0)')),
+                ('question_text', models.TextField()),
+                ('options', models.JSONField(default=list)),
+                ('correct_answer', models.CharField(max_length=255)),
+                ('explanation', models.TextField(blank=True)),
+                ('skill_tags', models.JSONField(blank=True, default=list)),
+                ('embedding', pgvector.django.vector.VectorField(blank=True, dimensions=1536, help_text='문제+정답 임베딩 (중복 제거/관련도)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('live_session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='quiz_bank', to='learning.livesession')),
+                ('used_quiz', models.OneToOneField(blank=True, help_text='이 후보로 발동/제안된 퀴즈 (NULL이면 미사용)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='bank_item', to='learning.livequiz')),
+            ],
+            options={
+                'ordering': ['-to_seq', '-created_at'],
+            },
+        ),
+    ]
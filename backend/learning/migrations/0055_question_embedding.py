@@ -0,0 +1,19 @@
+# Generated by Django 4.2.28 on 2026-10-20 04:24
+
+from django.db import migrations
+import pgvector.django.vector
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0054_quiz_bank'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='livequestion',
+            name='embedding',
+            field=pgvector.django.vector.VectorField(blank=True, dimensions=1536, help_text='질문 임베딩 (클러스터 배정용, 1회 계산)', null=True),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.28 on 2026-10-20 04:34
+
+from django.db import migrations, models
+
+
+def rename_draft_status(apps, schema_editor):
+    """노트 생성 때 미리 만든 초안: DRAFT → PREPARED (분석 쿼리의 DRAFT 조건과 겹치지 않게)"""
+    FormativeAssessment = apps.get_model('learning', 'FormativeAssessment')
+    FormativeAssessment.objects.filter(status='DRAFT').update(status='PREPARED')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0055_question_embedding'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='formativeassessment',
+            name='status',
+            field=models.CharField(choices=[('GENERATING', '생성 중'), ('PREPARED', 'AI 초안 (노트 생성 시 미리 생성, 미공개)'), ('READY', '준비 완료'), ('FAILED', '생성 실패')], default='GENERATING', max_length=20),
+        ),
+        migrations.RunPython(rename_draft_status, migrations.RunPython.noop),
+    ]
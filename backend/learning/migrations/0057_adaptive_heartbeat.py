@@ -0,0 +1,18 @@
+# Generated by Django 4.2.28 on 2026-10-20 04:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0056_formative_prepared'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='adaptivecontent',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, help_text='생성 중 마지막 진행 저장 시각 (오래되면 중단된 생성으로 보고 재생성)', null=True),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.28 on 2026-10-20 05:02
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def seq_to_id(apps, schema_editor):
+    """기존 워터마크(sequence_order) → 그때까지 반영된 로그의 최대 id"""
+    LearningSession = apps.get_model('learning', 'LearningSession')
+    STTLog = apps.get_model('learning', 'STTLog')
+    for session in LearningSession.objects.filter(compressed_until_id__gt=0):
+        last_id = STTLog.objects.filter(
+            session_id=session.id, sequence_order__lte=session.compressed_until_id,
+        ).aggregate(last=Max('id'))['last'] or 0
+        LearningSession.objects.filter(id=session.id).update(compressed_until_id=last_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('learning', '0057_adaptive_heartbeat'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='learningsession',
+            old_name='compressed_until_seq',
+            new_name='compressed_until_id',
+        ),
+        migrations.AlterField(
+            model_name='learningsession',
+            name='compressed_until_id',
+            field=models.BigIntegerField(default=0, help_text='요약에 반영된 마지막 STTLog id (압축 워터마크, 저장 순서 기준 — 늦게 도착한 청크도 누락 없음)'),
+        ),
+        migrations.RunPython(seq_to_id, migrations.RunPython.noop),
+    ]
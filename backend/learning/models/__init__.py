@@ -34,10 +34,12 @@ from .live import (
     LiveSession,
     LiveParticipant,
     LectureMaterial,
+    MaterialExtract,
     LiveSTTLog,
     PulseCheck,
     PulseLog,
     LiveQuiz,
+    QuizBankItem,
     LiveQuizResponse,
     LiveQuestion,
     LiveSessionNote,
@@ -49,6 +51,7 @@ from .adaptive import (
     AdaptiveContent,
     ReviewRoute,
     SpacedRepetitionItem,
+    SpacedRepetitionReview,
     FormativeAssessment,
     FormativeResponse,
 )
@@ -57,11 +60,13 @@ from .adaptive import (
 from .analytics import (
     NoteViewLog,
     GroupMessage,
+    ConceptMistake,
 )
 
 # === 수준 진단 및 갭 맵 모델 ===
 from .placement import (
     Skill,
+    SkillPrerequisite,
     CareerGoal,
     PlacementQuestion,
     PlacementResult,
@@ -87,16 +92,16 @@ __all__ = [
     # quiz
     'DailyQuiz', 'QuizQuestion', 'QuizAttempt', 'AttemptDetail',
     # live
-    'LiveSession', 'LiveParticipant', 'LectureMaterial', 'LiveSTTLog',
-    'PulseCheck', 'PulseLog', 'LiveQuiz', 'LiveQuizResponse',
+    'LiveSession', 'LiveParticipant', 'LectureMaterial', 'MaterialExtract', 'LiveSTTLog',
+    'PulseCheck', 'PulseLog', 'LiveQuiz', 'QuizBankItem', 'LiveQuizResponse',
     'LiveQuestion', 'LiveSessionNote', 'WeakZoneAlert',
     # adaptive
-    'AdaptiveContent', 'ReviewRoute', 'SpacedRepetitionItem',
+    'AdaptiveContent', 'ReviewRoute', 'SpacedRepetitionItem', 'SpacedRepetitionReview',
     'FormativeAssessment', 'FormativeResponse',
     # analytics
-    'NoteViewLog', 'GroupMessage',
+    'NoteViewLog', 'GroupMessage', 'ConceptMistake',
     # placement
-    'Skill', 'CareerGoal', 'PlacementQuestion', 'PlacementResult',
+    'Skill', 'SkillPrerequisite', 'CareerGoal', 'PlacementQuestion', 'PlacementResult',
     'StudentGoal', 'StudentSkill', 'SkillBlock',
     # curriculum & AI chat
     'AIChatSession', 'AIChatMessage',
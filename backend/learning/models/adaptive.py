@@ -1,6 +1,6 @@
 """
 적응형/복습/형성평가 모델: AdaptiveContent, ReviewRoute, SpacedRepetitionItem,
-FormativeAssessment, FormativeResponse
+SpacedRepetitionReview, FormativeAssessment, FormativeResponse
 """
 from django.db import models
 from django.conf import settings
@@ -26,6 +26,9 @@ class AdaptiveContent(models.Model):
     title = models.CharField(max_length=200)
     content = models.TextField(help_text="AI 변형 마크다운")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='GENERATING')
+    progress = models.IntegerField(default=0, help_text="생성 진행률 (0~100, 스트리밍 중 갱신)")
+    error = models.TextField(blank=True, default='', help_text="생성 실패 사유 (재요청 시 이 레벨만 재생성)")
+    heartbeat_at = models.DateTimeField(null=True, blank=True, help_text="생성 중 마지막 진행 저장 시각 (오래되면 중단된 생성으로 보고 재생성)")
     created_at = models.DateTimeField(auto_now_add=True)
     approved_at = models.DateTimeField(null=True, blank=True)
 
@@ -70,7 +73,7 @@ class ReviewRoute(models.Model):
 
 
 class SpacedRepetitionItem(models.Model):
-    """에빙하우스 5주기 간격 반복 스케줄"""
+    """간격 반복 항목 (다음 복습 시점은 sr_scheduler의 SM-2/FSRS가 응답 이력으로 계산)"""
     student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='spaced_items')
     concept_name = models.CharField(max_length=200, help_text="복습 개념명")
     source_session = models.ForeignKey(LiveSession, on_delete=models.SET_NULL, null=True, blank=True, related_name='spaced_items')
@@ -78,18 +81,58 @@ class SpacedRepetitionItem(models.Model):
     review_question = models.TextField(help_text="빠른 확인용 1문항")
     review_answer = models.CharField(max_length=500)
     review_options = models.JSONField(default=list, help_text="4지선다 보기")
-    schedule = models.JSONField(default=list, help_text="5주기 스케줄 [{ review_num, label, due_at, completed }]")
+    schedule = models.JSONField(default=list, help_text="복습 스케줄 [{ review_num, label, due_at, completed }]")
     current_review = models.IntegerField(default=0, help_text="현재 몇 차 복습까지 완료")
+    scheduler = models.CharField(max_length=10, default='sm2', help_text="스케줄러 알고리즘 (sm2 | fsrs)")
+    scheduler_state = models.JSONField(default=dict, help_text="스케줄러 상태 (SM-2: ease/reps/interval, FSRS: stability/difficulty/lapses)")
+    last_reviewed_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         app_label = 'learning'
         ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'concept_name'], name='sr_item_student_concept'),
+        ]
 
     def __str__(self):
         return f"[SR] {self.student.username}: {self.concept_name}"
 
 
+class SpacedRepetitionReview(models.Model):
+    """
+    간격 반복 주기 1회분 (SpacedRepetitionItem.schedule JSON의 정규화 테이블)
+    due 조회는 (student, due_at) 부분 인덱스 범위 스캔으로 처리
+    """
+    item = models.ForeignKey(SpacedRepetitionItem, on_delete=models.CASCADE, related_name='reviews')
+    student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='spaced_reviews',
+                                help_text="item.student 비정규화 (인덱스용)")
+    review_num = models.IntegerField()
+    label = models.CharField(max_length=50, blank=True, default='')
+    due_at = models.DateTimeField()
+    completed_at = models.DateTimeField(null=True, blank=True)
+    rating = models.IntegerField(null=True, blank=True, help_text="응답 평점 1~4 (AGAIN/HARD/GOOD/EASY)")
+    response_ms = models.IntegerField(null=True, blank=True, help_text="응답 소요 시간 (ms)")
+
+    class Meta:
+        app_label = 'learning'
+        unique_together = ['item', 'review_num']
+        ordering = ['due_at']
+        indexes = [
+            models.Index(
+                fields=['student', 'due_at'], name='sr_review_student_due',
+                condition=models.Q(completed_at__isnull=True),
+            ),
+            models.Index(
+                fields=['due_at'], name='sr_review_due',
+                condition=models.Q(completed_at__isnull=True),
+            ),
+        ]
+
+    def __str__(self):
+        return f"[SR#{self.review_num}] {self.item_id} @ {self.due_at:%Y-%m-%d %H:%M}"
+
+
 # ══════════════════════════════════════════════════════════
 # Phase 2-4: 사후 형성평가
 # ══════════════════════════════════════════════════════════
@@ -98,6 +141,7 @@ class FormativeAssessment(models.Model):
     """세션 이후 AI가 노트 기반으로 생성하는 형성평가"""
     STATUS_CHOICES = (
         ('GENERATING', '생성 중'),
+        ('PREPARED', 'AI 초안 (노트 생성 시 미리 생성, 미공개)'),
         ('READY', '준비 완료'),
         ('FAILED', '생성 실패'),
     )
@@ -116,6 +160,7 @@ class FormativeAssessment(models.Model):
     }]
     """)
     total_questions = models.IntegerField(default=0)
+    skill_tags = models.JSONField(default=dict, blank=True, help_text="concept_tag → 스킬 ID 목록 (skill_tagger, 생성 시 기록)")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='GENERATING')
     created_at = models.DateTimeField(auto_now_add=True)
 
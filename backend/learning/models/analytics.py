@@ -1,8 +1,9 @@
 """
-분석/메시징 모델: NoteViewLog, GroupMessage
+분석/메시징 모델: NoteViewLog, GroupMessage, ConceptMistake
 """
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from .base import Lecture
 
 
@@ -50,3 +51,36 @@ class GroupMessage(models.Model):
 
     def __str__(self):
         return f"[Msg] {self.title} → L{self.target_level}"
+
+
+class ConceptMistake(models.Model):
+    """
+    개념 태그 오답 인덱스.
+    퀴즈/형성평가 오답과 Weak Zone 감지 시점에 (개념, 학생, 세션) 튜플을 미리 추출해 두어
+    취약 개념 인사이트를 GROUP BY 한 번으로 계산한다.
+    """
+    SOURCE_CHOICES = (
+        ('QUIZ', '라이브 퀴즈 오답'),
+        ('FORMATIVE', '형성평가 오답'),
+        ('WEAK_ZONE', 'Weak Zone 감지'),
+    )
+
+    lecture = models.ForeignKey(Lecture, on_delete=models.CASCADE, related_name='concept_mistakes')
+    live_session = models.ForeignKey('LiveSession', on_delete=models.CASCADE, related_name='concept_mistakes')
+    student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='concept_mistakes')
+    concept = models.CharField(max_length=200, help_text="개념 키 (concept_tag 또는 문제 앞 50자)")
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    quiz = models.ForeignKey('LiveQuiz', on_delete=models.SET_NULL, null=True, blank=True)
+    assessment = models.ForeignKey('FormativeAssessment', on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now, help_text="원본 응답/감지 시각")
+
+    class Meta:
+        app_label = 'learning'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['lecture', 'created_at'], name='concept_mistake_lecture_time'),
+            models.Index(fields=['lecture', 'concept'], name='concept_mistake_lecture_cpt'),
+        ]
+
+    def __str__(self):
+        return f"[Mistake] {self.student.username}: {self.concept[:30]} ({self.source})"
@@ -5,6 +5,7 @@ AI 튜터 챗봇 모델: AIChatSession, AIChatMessage
 from django.db import models
 from django.conf import settings
 from .base import Lecture
+from .placement import Skill
 
 
 # ══════════════════════════════════════════════════════════
@@ -138,6 +139,11 @@ class CurriculumItem(models.Model):
         null=True, blank=True, related_name='curriculum_items',
         help_text="연결된 강의"
     )
+    skill = models.ForeignKey(
+        Skill, on_delete=models.SET_NULL,
+        null=True, blank=True, related_name='curriculum_items',
+        help_text="이 항목이 다루는 역량 (선수관계 그래프 기반 경로 계산용)"
+    )
     title = models.CharField(max_length=200, help_text="항목 제목")
     item_type = models.CharField(max_length=15, choices=TYPE_CHOICES, default='LECTURE')
     order_index = models.IntegerField(default=0, help_text="동적으로 조절 가능한 순서")
@@ -191,6 +197,14 @@ class ReroutingLog(models.Model):
     items_removed = models.IntegerField(
         default=0, help_text="제거된 항목 수"
     )
+    diff = models.JSONField(
+        default=dict, blank=True,
+        help_text="압축 diff {add: [[id, order, title]], remove: [[id, title]], move: [[id, from, to]]}"
+    )
+    signature = models.CharField(
+        max_length=64, blank=True, default='',
+        help_text="반영 후 항목 상태 + 학습 신호 해시 (같으면 다음 리라우팅 생략)"
+    )
     ai_recommendation = models.TextField(
         blank=True, help_text="AI의 리라우팅 근거 설명"
     )
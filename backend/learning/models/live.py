@@ -1,10 +1,11 @@
 """
-라이브 세션 관련 모델: LiveSession, LiveParticipant, LectureMaterial,
-LiveSTTLog, PulseCheck, PulseLog, LiveQuiz, LiveQuizResponse,
+라이브 세션 관련 모델: LiveSession, LiveParticipant, LectureMaterial, MaterialExtract,
+LiveSTTLog, PulseCheck, PulseLog, LiveQuiz, QuizBankItem, LiveQuizResponse,
 LiveQuestion, LiveSessionNote, WeakZoneAlert
 """
 from django.db import models
 from django.conf import settings
+from pgvector.django import VectorField
 from .base import Lecture
 from .session import LearningSession
 import random
@@ -122,6 +123,39 @@ class LectureMaterial(models.Model):
         return f"[{self.content_type}] {self.title} ({self.lecture.title})"
 
 
+class MaterialExtract(models.Model):
+    """
+    교안 텍스트 추출 결과 (교안당 1개, 원본 해시 기준).
+    업로드 직후 백그라운드에서 한 번만 파싱하고, 노트/퀴즈/적응형 콘텐츠 생성은 모두 이 결과를 읽는다.
+    """
+    STATUS_CHOICES = (
+        ('READY', '추출 완료'),
+        ('EMPTY', '추출 텍스트 없음'),
+        ('FAILED', '추출 실패'),
+    )
+
+    material = models.OneToOneField(LectureMaterial, on_delete=models.CASCADE, related_name='extract')
+    file_hash = models.CharField(max_length=64, help_text="원본 파일(또는 마크다운 텍스트) sha256")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='READY')
+    text = models.TextField(blank=True, default='', help_text="페이지/슬라이드 순서대로 이어 붙인 전체 텍스트")
+    pages = models.JSONField(
+        default=list, blank=True,
+        help_text="페이지/슬라이드/섹션 경계 [[start, end], ...] (text 내 문자 오프셋, 1페이지부터)"
+    )
+    error = models.TextField(blank=True, default='')
+    extracted_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = 'learning'
+
+    def __str__(self):
+        return f"[Extract] {self.material.title} ({self.status}, {len(self.pages)}p)"
+
+    def page_texts(self):
+        """[(페이지 번호, 텍스트)] — 페이지 단위 청킹용"""
+        return [(idx, self.text[start:end]) for idx, (start, end) in enumerate(self.pages, start=1)]
+
+
 class LiveSTTLog(models.Model):
     """
     라이브 세션 중 교수자 마이크에서 캡처된 STT 로그.
@@ -196,6 +230,7 @@ class LiveQuiz(models.Model):
     is_suggestion = models.BooleanField(default=False, help_text="AI 자동 제안 (교수자 미승인)")
     time_limit = models.IntegerField(default=60, help_text="제한 시간 (초)")
     triggered_at = models.DateTimeField(auto_now_add=True)
+    skill_tags = models.JSONField(default=list, blank=True, help_text="문제에 등장하는 스킬 ID 목록 (skill_tagger, 생성 시 기록)")
 
     class Meta:
         app_label = 'learning'
@@ -205,6 +240,42 @@ class LiveQuiz(models.Model):
         return f"[Quiz #{self.id}] {self.question_text[:40]}..."
 
 
+class QuizBankItem(models.Model):
+    """
+    라이브 퀴즈 은행: 백그라운드에서 미리 만들어 둔 후보 퀴즈 (learning/quiz_bank.py).
+    수업 전에는 강의계획서/교안, 수업 중에는 최근 STT 구간으로 계속 채우고,
+    퀴즈 요청/트리거 시 가장 최신·관련 높은 항목을 LiveQuiz로 즉시 꺼내 쓴다.
+    """
+    SOURCE_CHOICES = (
+        ('STT', '수업 중 STT 구간'),
+        ('MATERIAL', '교안'),
+        ('SYLLABUS', '강의계획서'),
+    )
+
+    live_session = models.ForeignKey(LiveSession, on_delete=models.CASCADE, related_name='quiz_bank')
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES, default='STT')
+    from_seq = models.IntegerField(default=0, help_text="STT 구간 시작 sequence_order (수업 전 항목은 0)")
+    to_seq = models.IntegerField(default=0, help_text="STT 구간 끝 sequence_order (수업 전 항목은 0)")
+    question_text = models.TextField()
+    options = models.JSONField(default=list)
+    correct_answer = models.CharField(max_length=255)
+    explanation = models.TextField(blank=True)
+    skill_tags = models.JSONField(default=list, blank=True)
+    embedding = VectorField(dimensions=1536, null=True, blank=True, help_text="문제+정답 임베딩 (중복 제거/관련도)")
+    used_quiz = models.OneToOneField(
+        LiveQuiz, on_delete=models.SET_NULL, null=True, blank=True, related_name='bank_item',
+        help_text="이 후보로 발동/제안된 퀴즈 (NULL이면 미사용)",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        app_label = 'learning'
+        ordering = ['-to_seq', '-created_at']
+
+    def __str__(self):
+        return f"[Bank {self.source}] {self.question_text[:40]}..."
+
+
 class LiveQuizResponse(models.Model):
     """
     학생의 라이브 퀴즈 응답.
@@ -215,6 +286,7 @@ class LiveQuizResponse(models.Model):
     answer = models.CharField(max_length=255)
     is_correct = models.BooleanField()
     responded_at = models.DateTimeField(auto_now_add=True)
+    redesign_processed = models.BooleanField(default=False, help_text="오답 SR/GapMap 반영 완료 (quiz_close)")
 
     class Meta:
         app_label = 'learning'
@@ -237,6 +309,7 @@ class LiveQuestion(models.Model):
     instructor_answer = models.TextField(blank=True, help_text="교수자가 수동으로 작성한 답변")
     upvotes = models.IntegerField(default=0, help_text="다른 학생들의 공감 수")
     cluster_id = models.IntegerField(null=True, blank=True, help_text="유사 질문 그룹 ID")
+    embedding = VectorField(dimensions=1536, null=True, blank=True, help_text="질문 임베딩 (클러스터 배정용, 1회 계산)")
     is_answered = models.BooleanField(default=False, help_text="교수자가 답변 완료 여부")
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -269,6 +342,10 @@ class LiveSessionNote(models.Model):
     approved_at = models.DateTimeField(null=True, blank=True)
     linked_materials = models.ManyToManyField('LectureMaterial', blank=True, related_name='linked_notes', help_text="세션에 연결된 교안")
     is_public = models.BooleanField(default=False, help_text="결석생 포함 전체 공개 여부")
+    stage_status = models.JSONField(
+        default=dict, blank=True,
+        help_text="후처리 단계별 진행 상황 {stage: {status, done, total, updated_at}}",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -42,6 +42,39 @@ class Skill(models.Model):
         return f"[{self.get_category_display()}] {self.name} (Lv{self.difficulty_level})"
 
 
+class SkillPrerequisite(models.Model):
+    """
+    역량 선수관계 (prerequisite → skill): skill을 배우려면 prerequisite를 먼저 보유해야 함.
+    learning/skill_graph.py가 메모리 그래프로 컴파일해 위상 정렬 / 목표 직무까지의 학습 경로 계산에 사용.
+    """
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='prerequisite_links')
+    prerequisite = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='dependent_links')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        app_label = 'learning'
+        unique_together = ['skill', 'prerequisite']
+        constraints = [
+            models.CheckConstraint(
+                check=~models.Q(skill=models.F('prerequisite')), name='skill_prereq_not_self',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.prerequisite.name} → {self.skill.name}"
+
+    def clean(self):
+        from django.core.exceptions import ValidationError
+        from ..skill_graph import get_skill_graph
+
+        if self.skill_id and self.skill_id == self.prerequisite_id:
+            raise ValidationError('자기 자신을 선수 역량으로 지정할 수 없습니다.')
+        if self.skill_id and self.prerequisite_id and get_skill_graph().would_create_cycle(
+            self.skill_id, self.prerequisite_id,
+        ):
+            raise ValidationError('선수관계에 순환이 생깁니다.')
+
+
 class CareerGoal(models.Model):
     """
     직무/직종 목표 (예: 프론트엔드 개발자, 백엔드 개발자 등)
@@ -79,6 +112,11 @@ class PlacementQuestion(models.Model):
     difficulty = models.IntegerField(default=1, help_text="난이도 1~3")
     order = models.IntegerField(default=0, help_text="출제 순서")
     explanation = models.TextField(blank=True, help_text="정답 해설")
+    # 적응형 진단(IRT) 문항 모수 — calibrate_placement_items 커맨드로 일괄 보정
+    irt_a = models.FloatField(default=1.0, help_text="IRT 변별도 a (1PL은 1.0 고정)")
+    irt_b = models.FloatField(null=True, blank=True, help_text="IRT 난이도 b (NULL이면 difficulty 1~3 → -1 / 0 / +1)")
+    irt_responses = models.IntegerField(default=0, help_text="보정에 사용된 응답 수")
+    irt_calibrated_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         app_label = 'learning'
@@ -98,6 +136,10 @@ class PlacementResult(models.Model):
         (2, 'Level 2: 기초 이해자'),
         (3, 'Level 3: 실습 경험자'),
     )
+    MODE_CHOICES = (
+        ('FIXED', '전체 문항'),
+        ('ADAPTIVE', '적응형 (IRT)'),
+    )
 
     student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='placement_results')
     lecture = models.ForeignKey(Lecture, on_delete=models.CASCADE, related_name='placement_results', null=True, blank=True)
@@ -106,6 +148,9 @@ class PlacementResult(models.Model):
     total_questions = models.IntegerField(default=20)
     answers = models.JSONField(default=dict, help_text="응답 기록 {question_id: selected_answer}")
     category_scores = models.JSONField(default=dict, help_text="카테고리별 점수 {CONCEPT: 5, PRACTICE: 3, PATTERN: 2}")
+    mode = models.CharField(max_length=10, choices=MODE_CHOICES, default='FIXED')
+    ability = models.FloatField(null=True, blank=True, help_text="IRT 능력 추정치 θ (적응형)")
+    ability_se = models.FloatField(null=True, blank=True, help_text="θ 표준오차")
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
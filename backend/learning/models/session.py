@@ -24,6 +24,13 @@ class LearningSession(models.Model):
     # [New] 대화 압축 (Conversation Compression)
     context_summary = models.TextField(blank=True, null=True, help_text="현재까지의 대화/자막 압축 요약본")
     last_compressed_at = models.DateTimeField(default=timezone.now, help_text="마지막 압축 시점")
+    compressed_until_id = models.BigIntegerField(
+        default=0, help_text="요약에 반영된 마지막 STTLog id (압축 워터마크, 저장 순서 기준 — 늦게 도착한 청크도 누락 없음)"
+    )
+    context_segments = models.JSONField(
+        default=list, blank=True,
+        help_text="계층 요약 구간 [{from_seq, to_seq, level, text}] (시간 순, context_summary는 이를 이어 붙인 것)"
+    )
 
     # [Recovery] DB 스키마와 일치시키기 위해 필요한 필드들
     ai_status = models.CharField(max_length=20, default='PENDING', help_text="AI 처리 상태")
@@ -1,6 +1,8 @@
 """
-라이브 세션 노트 관련 Views: 노트 조회, 승인, 교안 연결, 결석 노트
+라이브 세션 노트 관련 Views: 노트 조회, 단계 재시도, 승인, 교안 연결, 결석 노트
 """
+import threading
+
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -36,11 +38,15 @@ class LiveNoteView(APIView):
             return Response({'error': '아직 노트가 생성되지 않았습니다.', 'status': 'NOT_STARTED'},
                             status=status.HTTP_404_NOT_FOUND)
 
+        # 학생 노트 단계가 끝났으면 다른 단계 진행 중에도 부분 결과 제공
+        stages = note.stage_status or {}
+        note_ready = note.status == 'DONE' or stages.get('student_note', {}).get('status') == 'DONE'
         response_data = {
             'session_id': session.id,
             'status': note.status,
-            'content': note.content if note.status == 'DONE' else '',
+            'content': note.content if note_ready else '',
             'stats': note.stats,
+            'stages': note.stage_status,
             'created_at': note.created_at,
         }
 
@@ -90,6 +96,37 @@ class LiveNoteView(APIView):
         return Response({'ok': True, 'message': '노트가 수정되었습니다.'})
 
 
+class NoteStageRetryView(APIView):
+    """
+    POST /api/learning/live/{id}/note/retry/
+    교수자: 실패한 노트 생성 단계만 재시도 (백그라운드)
+    body: {"stage": "student_note" | "instructor_insight" | "formative_draft" | "review_routes"}
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, pk):
+        from .live_note import RETRY_STAGES, run_live_note
+        from .review_route import claim_stage
+
+        session = get_object_or_404(LiveSession, id=pk, instructor=request.user)
+        try:
+            note = session.note
+        except LiveSessionNote.DoesNotExist:
+            return Response({'error': '노트가 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+
+        stage = request.data.get('stage')
+        if stage not in RETRY_STAGES:
+            return Response({'error': f"stage는 {', '.join(RETRY_STAGES)} 중 하나여야 합니다."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if not claim_stage(note, stage):
+            return Response({'error': '이미 진행 중인 단계입니다.'}, status=status.HTTP_409_CONFLICT)
+
+        thread = threading.Thread(target=run_live_note, args=(session.id, note.id, [stage]))
+        thread.daemon = True
+        thread.start()
+        return Response({'ok': True, 'stage': stage, 'status': 'RUNNING'}, status=status.HTTP_202_ACCEPTED)
+
+
 class NoteApproveView(APIView):
     """
     POST /api/learning/live/{id}/note/approve/
@@ -208,6 +245,15 @@ class AbsentNoteListView(APIView):
         })
 
 
+SELF_TEST_SYSTEM_PROMPT = (
+    '아래 강의 노트를 읽은 결석생이 핵심 내용을 이해했는지 확인하는 '
+    '미니 퀴즈 3문항(4지선다)을 생성하세요.\n'
+    '[공식 문서 참조]가 있으면 정확한 정의에 기반한 문제를 출제하세요.\n'
+    '반드시 아래 JSON 형식으로 응답하세요:\n'
+    '{"questions": [{"question":"문제","options":["A","B","C","D"],"correct_answer":"정답","explanation":"해설"}]}'
+)
+
+
 class AbsentSelfTestView(APIView):
     """
     POST /api/learning/absent-notes/{note_id}/self-test/
@@ -216,10 +262,6 @@ class AbsentSelfTestView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, note_id):
-        import openai
-        import os
-        import json
-
         note = get_object_or_404(LiveSessionNote, id=note_id, is_public=True, is_approved=True, status='DONE')
         session = note.live_session
 
@@ -227,53 +269,89 @@ class AbsentSelfTestView(APIView):
         if session.participants.filter(student=request.user).exists():
             return Response({'error': '출석한 세션입니다. 셀프 테스트 대상이 아닙니다.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        return self.generate(note)
 
-            # [RAG] 공식 문서에서 관련 컨텍스트 검색
-            rag_context = ""
-            try:
-                from .rag import RAGService
-                rag = RAGService()
-                lecture_id = session.lecture_id if session.lecture else None
-                related_docs = rag.search(query=note.content[:500], top_k=2, lecture_id=lecture_id)
-                if related_docs:
-                    rag_context = "\n".join([f"- {doc.content[:200]}" for doc in related_docs])
-                    print(f"✅ [RAG] 결석생 셀프 테스트에 공식 문서 {len(related_docs)}건 참조")
-            except Exception as rag_err:
-                print(f"⚠️ [RAG] 셀프 테스트 검색 실패: {rag_err}")
-
-            user_content = f'강의 노트:\n{note.content[:4000]}'
-            if rag_context:
-                user_content += f'\n\n[공식 문서 참조 (정확성 보장용)]:\n{rag_context}'
-
-            response = client.chat.completions.create(
-                model='gpt-4o-mini',
-                messages=[
-                    {'role': 'system', 'content': (
-                        '아래 강의 노트를 읽은 결석생이 핵심 내용을 이해했는지 확인하는 '
-                        '미니 퀴즈 3문항(4지선다)을 생성하세요.\n'
-                        '[공식 문서 참조]가 있으면 정확한 정의에 기반한 문제를 출제하세요.\n'
-                        '반드시 아래 JSON 형식으로 응답하세요:\n'
-                        '{"questions": [{"question":"문제","options":["A","B","C","D"],"correct_answer":"정답","explanation":"해설"}]}'
-                    )},
-                    {'role': 'user', 'content': user_content}
-                ],
-                temperature=0.5,
-                max_tokens=1500,
-                response_format={'type': 'json_object'},
-            )
-            raw = response.choices[0].message.content.strip()
-            parsed = json.loads(raw)
-            questions = parsed.get('questions', parsed) if isinstance(parsed, dict) else parsed
-            if isinstance(questions, dict):
-                for v in parsed.values():
-                    if isinstance(v, list):
-                        questions = v
-                        break
-            return Response({'questions': questions, 'note_id': note_id})
+    def generate(self, note):
+        try:
+            response = self._create_completion(note)
+            questions = self._parse_questions(response.choices[0].message.content)
+            return Response({'questions': questions, 'note_id': note.id})
 
         except Exception as e:
             return Response({'error': f'셀프 테스트 생성 실패: {str(e)}'},
                             status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @staticmethod
+    def _create_completion(note, stream=False):
+        import openai
+        import os
+
+        client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        session = note.live_session
+
+        # [RAG] 공식 문서에서 관련 컨텍스트 검색
+        rag_context = ""
+        try:
+            from .rag import RAGService
+            rag = RAGService()
+            lecture_id = session.lecture_id if session.lecture else None
+            related_docs = rag.search(query=note.content[:500], top_k=2, lecture_id=lecture_id)
+            if related_docs:
+                rag_context = "\n".join([f"- {doc.content[:200]}" for doc in related_docs])
+                print(f"✅ [RAG] 결석생 셀프 테스트에 공식 문서 {len(related_docs)}건 참조")
+        except Exception as rag_err:
+            print(f"⚠️ [RAG] 셀프 테스트 검색 실패: {rag_err}")
+
+        user_content = f'강의 노트:\n{note.content[:4000]}'
+        if rag_context:
+            user_content += f'\n\n[공식 문서 참조 (정확성 보장용)]:\n{rag_context}'
+
+        return client.chat.completions.create(
+            model='gpt-4o-mini',
+            messages=[
+                {'role': 'system', 'content': SELF_TEST_SYSTEM_PROMPT},
+                {'role': 'user', 'content': user_content}
+            ],
+            temperature=0.5,
+            max_tokens=1500,
+            response_format={'type': 'json_object'},
+            stream=stream,
+        )
+
+    @staticmethod
+    def _parse_questions(raw):
+        import json
+
+        parsed = json.loads(raw.strip())
+        questions = parsed.get('questions', parsed) if isinstance(parsed, dict) else parsed
+        if isinstance(questions, dict):
+            for v in parsed.values():
+                if isinstance(v, list):
+                    questions = v
+                    break
+        return questions
+
+
+class AbsentSelfTestStreamView(AbsentSelfTestView):
+    """
+    POST /api/learning/absent-notes/{note_id}/self-test/stream/
+    C1 SSE 스트리밍 버전 — 생성 중인 JSON 토큰을 바로 흘려보내고,
+    스트림이 끝나면 파싱한 문항을 done 이벤트로 전달 {questions, note_id}
+    """
+
+    def generate(self, note):
+        from .streaming import iter_tokens, sse_response, sse_stream
+
+        def open_tokens():
+            return iter_tokens(self._create_completion(note, stream=True))
+
+        def finish(raw, failed):
+            if failed:
+                return {'note_id': note.id}
+            try:
+                return {'questions': self._parse_questions(raw), 'note_id': note.id}
+            except ValueError as e:
+                return {'error': f'셀프 테스트 생성 실패: {str(e)}', 'note_id': note.id}
+
+        return sse_response(sse_stream(open_tokens, finish, error_text='셀프 테스트 생성 실패'))
+
@@ -0,0 +1,192 @@
+"""
+Phase 1: 적응형 진단 테스트(CAT) 엔진 (View 아님)
+IRT 2PL  P(정답 | θ) = 1 / (1 + exp(-a(θ - b)))  — a를 1.0으로 고정하면 1PL(Rasch)
+- 능력 추정: EAP (θ 격자 -4~4, 표준정규 사전분포) → 사후 평균 = θ, 사후 표준편차 = SE
+- 문항 선택: 미응답 문항 중 현재 θ에서 피셔 정보량 a²·P·(1-P)가 최대인 문항
+- 종료: 최소 문항 수 이후 SE ≤ PLACEMENT_SE_TARGET 이거나 θ 신뢰구간이 한 레벨 구간 안에 들어오면,
+  또는 최대 문항 수 / 문항 소진
+- 레벨: 전체 문항 기대 정답률에 고정형과 같은 컷(0.4 / 0.7)을 적용 → 두 모드의 판정 기준 일치
+- 보정: PlacementResult 응답 이력으로 문항 모수(a, b) 일괄 추정 — 주변 최대우도(EM, θ 격자 적분)
+"""
+import numpy as np
+from django.conf import settings
+
+from .placement_utils import get_item_bank, level_for_ratio
+from .utils_text import check_answer_match
+
+DIFFICULTY_B = {1: -1.0, 2: 0.0, 3: 1.0}  # 미보정 문항: difficulty 1~3 → b
+GRID = np.linspace(-4.0, 4.0, 81)
+LOG_PRIOR = -0.5 * GRID ** 2
+MIN_ITEMS = 5
+CI_Z = 1.96  # 레벨 확정 판단용 95% 구간
+
+A_RANGE = (0.2, 3.0)
+B_RANGE = (-4.0, 4.0)
+B_PRIOR_SD = 1.0   # b ~ N(difficulty 기본값, 1)
+A_PRIOR_SD = 0.5   # a ~ N(1, 0.5)
+
+
+def item_params(item):
+    """BankItem → (a, b)"""
+    b = item.irt_b if item.irt_b is not None else DIFFICULTY_B.get(item.difficulty, 0.0)
+    return (item.irt_a or 1.0), b
+
+
+def prob(theta, a, b):
+    return 1.0 / (1.0 + np.exp(-a * (theta - b)))
+
+
+def _posterior(responses):
+    """responses: [(a, b, is_correct)] → θ 격자 위 사후분포"""
+    log_post = LOG_PRIOR.copy()
+    for a, b, correct in responses:
+        p = np.clip(prob(GRID, a, b), 1e-9, 1 - 1e-9)
+        log_post += np.log(p) if correct else np.log(1 - p)
+    w = np.exp(log_post - log_post.max())
+    return w / w.sum()
+
+
+def estimate_ability(responses):
+    """EAP 추정 → (θ, SE)"""
+    w = _posterior(responses)
+    theta = float((w * GRID).sum())
+    se = float(np.sqrt((w * (GRID - theta) ** 2).sum()))
+    return theta, se
+
+
+def expected_ratio(bank, theta):
+    """θ 학습자의 전체 문항 기대 정답률"""
+    if not bank:
+        return 0.0
+    params = np.array([item_params(item) for item in bank])
+    return float(prob(theta, params[:, 0], params[:, 1]).mean())
+
+
+def level_for_ability(bank, theta):
+    return level_for_ratio(expected_ratio(bank, theta))
+
+
+def _level_settled(bank, theta, se):
+    """θ ± 1.96·SE 양 끝의 레벨이 같으면 더 물어도 판정이 바뀌지 않음"""
+    return level_for_ability(bank, theta - CI_Z * se) == level_for_ability(bank, theta + CI_Z * se)
+
+
+def next_item(bank, answered_ids, theta):
+    """미응답 문항 중 θ에서 정보량 최대 문항 (없으면 None)"""
+    best, best_info = None, -1.0
+    for item in bank:
+        if item.id in answered_ids:
+            continue
+        a, b = item_params(item)
+        p = prob(theta, a, b)
+        info = a * a * p * (1 - p)
+        if info > best_info:
+            best, best_info = item, info
+    return best
+
+
+def adaptive_step(answers):
+    """
+    지금까지의 응답으로 θ 추정 → 종료 여부 / 다음 문항 결정
+    answers: {"question_id": "선택 답", ...}
+    반환: {'finished', 'ability', 'se', 'level', 'answered', 'correct', 'category_scores', 'next_item'}
+    """
+    bank = get_item_bank()
+    by_id = {str(item.id): item for item in bank}
+    answered = [(by_id[qid], ans) for qid, ans in answers.items() if qid in by_id]
+
+    responses, category_scores, correct = [], {}, 0
+    for item, ans in answered:
+        is_correct = check_answer_match(ans, item.correct_answer)
+        responses.append((*item_params(item), is_correct))
+        category_scores.setdefault(item.category, 0)
+        if is_correct:
+            correct += 1
+            category_scores[item.category] += 1
+
+    theta, se = estimate_ability(responses)
+    max_items = min(settings.PLACEMENT_MAX_ITEMS, len(bank))
+    finished = len(answered) >= max_items or (
+        len(answered) >= min(MIN_ITEMS, max_items)
+        and (se <= settings.PLACEMENT_SE_TARGET or _level_settled(bank, theta, se))
+    )
+    nxt = None
+    if not finished:
+        nxt = next_item(bank, {item.id for item, _ in answered}, theta)
+        finished = nxt is None
+
+    return {
+        'finished': finished,
+        'ability': round(theta, 3),
+        'se': round(se, 3),
+        'level': level_for_ability(bank, theta),
+        'answered': len(answered),
+        'correct': correct,
+        'category_scores': category_scores,
+        'next_item': nxt,
+    }
+
+
+# ── 문항 모수 일괄 보정 ──
+
+def calibrate_items(bank, answer_sets, model='2pl', iterations=20, min_responses=30):
+    """
+    bank: BankItem 목록, answer_sets: PlacementResult.answers 목록
+    반환: [{'id', 'a', 'b', 'n'}] — 응답 수가 min_responses 이상인 문항만
+    """
+    ids = [str(item.id) for item in bank]
+    col = {qid: j for j, qid in enumerate(ids)}
+
+    # 응답 행렬 (학생 × 문항), 미응답은 mask=0
+    rows = []
+    for answers in answer_sets:
+        if not isinstance(answers, dict):
+            continue
+        row = np.full(len(ids), np.nan)
+        for qid, ans in answers.items():
+            j = col.get(str(qid))
+            if j is not None:
+                row[j] = 1.0 if check_answer_match(ans, bank[j].correct_answer) else 0.0
+        if np.count_nonzero(~np.isnan(row)) >= 2:
+            rows.append(row)
+    if not rows:
+        return []
+
+    U = np.array(rows)
+    M = (~np.isnan(U)).astype(float)
+    U = np.nan_to_num(U)
+    counts = M.sum(axis=0)
+
+    params = np.array([item_params(item) for item in bank], dtype=float)
+    a, b = params[:, 0].copy(), params[:, 1].copy()
+    b0 = np.array([DIFFICULTY_B.get(item.difficulty, 0.0) for item in bank])
+    if model == '1pl':
+        a[:] = 1.0
+
+    for _ in range(iterations):
+        # E 단계: 학생별 θ 사후분포 (격자) → 격자점별 기대 응답 수 / 정답 수
+        P = np.clip(prob(GRID[:, None], a[None, :], b[None, :]), 1e-9, 1 - 1e-9)
+        log_lik = U @ np.log(P).T + (M - U) @ np.log(1 - P).T + LOG_PRIOR
+        w = np.exp(log_lik - log_lik.max(axis=1, keepdims=True))
+        w /= w.sum(axis=1, keepdims=True)
+        n_k = w.T @ M   # 격자 × 문항
+        r_k = w.T @ U
+
+        # M 단계: 문항별 뉴턴 스텝 1회 (정규 사전분포로 수렴 안정화)
+        p = prob(GRID[:, None], a[None, :], b[None, :])
+        resid = r_k - n_k * p
+        pq = n_k * p * (1 - p)
+        g_b = -a * resid.sum(axis=0) - (b - b0) / B_PRIOR_SD ** 2
+        h_b = -(a ** 2) * pq.sum(axis=0) - 1 / B_PRIOR_SD ** 2
+        b = np.clip(b - g_b / h_b, *B_RANGE)
+
+        if model == '2pl':
+            d = GRID[:, None] - b[None, :]
+            g_a = (d * resid).sum(axis=0) - (a - 1.0) / A_PRIOR_SD ** 2
+            h_a = -(d ** 2 * pq).sum(axis=0) - 1 / A_PRIOR_SD ** 2
+            a = np.clip(a - g_a / h_a, *A_RANGE)
+
+    return [
+        {'id': bank[j].id, 'a': round(float(a[j]), 4), 'b': round(float(b[j]), 4), 'n': int(counts[j])}
+        for j in range(len(ids)) if counts[j] >= min_responses
+    ]
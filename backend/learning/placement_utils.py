@@ -0,0 +1,189 @@
+"""
+Phase 1: 진단 테스트 채점 / 갭 맵 초기화 헬퍼 (View 아님)
+- 문항 뱅크: PlacementQuestion 전체(정답 키 + IRT 모수)를 프로세스 메모리에 캐시 (문항 저장/삭제 시 캐시 버전 증가 → 재로딩, process_cache)
+- 갭 맵 초기화: Skill 전체 × 학생 N명을 StudentSkill bulk upsert(ON CONFLICT DO UPDATE) 1회로 기록
+- CSV 일괄 진단: 코호트 전체의 응답을 채점 → PlacementResult bulk_create → 갭 맵 일괄 초기화
+"""
+import csv
+import io
+from collections import namedtuple
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Skill, PlacementQuestion, PlacementResult, StudentSkill
+from .process_cache import VersionedProcessCache
+from .utils_text import check_answer_match
+
+BankItem = namedtuple('BankItem', [
+    'id', 'question_text', 'options', 'correct_answer', 'category', 'difficulty', 'irt_a', 'irt_b',
+])
+
+CATEGORIES = ('CONCEPT', 'PRACTICE', 'PATTERN')
+BATCH_SIZE = 1000
+
+
+# ── 문항 뱅크 캐시 ──
+
+def _load_item_bank():
+    return tuple(BankItem(*row) for row in PlacementQuestion.objects.values_list(*BankItem._fields))
+
+
+_bank_cache = VersionedProcessCache('learning:placement_bank:version', _load_item_bank)
+
+
+def get_item_bank():
+    """(BankItem, ...) — 출제 순서, 문항 변경 시 자동 재로딩"""
+    return _bank_cache.get()
+
+
+def invalidate_item_bank():
+    _bank_cache.invalidate()
+
+
+@receiver(post_save, sender=PlacementQuestion)
+@receiver(post_delete, sender=PlacementQuestion)
+def _question_changed(sender, **kwargs):
+    invalidate_item_bank()
+
+
+# ── 채점 ──
+
+def level_for_ratio(ratio):
+    if ratio >= 0.7:
+        return 3  # 실습 경험자
+    if ratio >= 0.4:
+        return 2  # 기초 이해자
+    return 1  # 완전 초보
+
+
+def score_placement(answers):
+    """
+    answers: {"question_id": "선택 답", ...}
+    반환: {'score', 'total', 'ratio', 'level', 'category_scores', 'category_totals'}
+    """
+    bank = get_item_bank()
+    correct = 0
+    category_scores = dict.fromkeys(CATEGORIES, 0)
+    category_totals = dict.fromkeys(CATEGORIES, 0)
+
+    for item in bank:
+        category_totals[item.category] = category_totals.get(item.category, 0) + 1
+        if check_answer_match(answers.get(str(item.id), ''), item.correct_answer):
+            correct += 1
+            category_scores[item.category] = category_scores.get(item.category, 0) + 1
+
+    total = len(bank)
+    ratio = correct / total if total else 0
+    return {
+        'score': correct,
+        'total': total,
+        'ratio': ratio,
+        'level': level_for_ratio(ratio),
+        'category_scores': category_scores,
+        'category_totals': category_totals,
+    }
+
+
+# ── 갭 맵 초기화 ──
+
+def initial_skill_state(difficulty, level):
+    """스킬 난이도 vs 진단 레벨 → (status, progress)"""
+    if difficulty < level:
+        # 내 레벨 미만의 스킬은 보유로 간주
+        return 'OWNED', min(80 + (level - difficulty) * 10, 100)  # 80~100%
+    if difficulty == level:
+        return 'LEARNING', 30 + level * 10  # 40~60%
+    return 'GAP', 0
+
+
+def initialize_gap_maps(levels):
+    """
+    levels: {student_id: level}
+    전체 Skill 기준 초기 갭 맵을 학생 수와 무관하게 bulk upsert (기존 행은 상태/진도 덮어씀)
+    """
+    if not levels:
+        return 0
+    skills = list(Skill.objects.values_list('id', 'difficulty_level'))
+    rows = []
+    for student_id, level in levels.items():
+        for skill_id, difficulty in skills:
+            st, prog = initial_skill_state(difficulty, level)
+            rows.append(StudentSkill(student_id=student_id, skill_id=skill_id, status=st, progress=prog))
+
+    StudentSkill.objects.bulk_create(
+        rows, batch_size=BATCH_SIZE,
+        update_conflicts=True, unique_fields=['student', 'skill'],
+        update_fields=['status', 'progress', 'updated_at'],
+    )
+    return len(rows)
+
+
+# ── CSV 일괄 진단 ──
+
+def import_placement_csv(fileobj, lecture=None, enroll=False):
+    """
+    코호트 진단 결과 CSV 일괄 등록
+    헤더: username (또는 email) + 문항 ID 열(값 = 선택 답) [+ level 열: 응답 없이 레벨만 지정할 때]
+      username,1,2,3,...
+      kim01,선택A,선택C,...
+    반환: {'imported', 'skills', 'errors': [{'row', 'error'}]}
+    """
+    text = fileobj.read()
+    if isinstance(text, bytes):
+        text = text.decode('utf-8-sig')
+    reader = csv.DictReader(io.StringIO(text))
+    fields = reader.fieldnames or []
+    id_field = 'username' if 'username' in fields else 'email' if 'email' in fields else None
+    if id_field is None:
+        raise ValueError('CSV 헤더에 username 또는 email 열이 필요합니다.')
+
+    question_ids = {str(item.id) for item in get_item_bank()}
+    answer_fields = [f for f in fields if f and f.strip() in question_ids]
+
+    rows = list(reader)
+    User = get_user_model()
+    keys = {(row.get(id_field) or '').strip() for row in rows} - {''}
+    users = {
+        getattr(u, id_field): u.id
+        for u in User.objects.filter(**{f'{id_field}__in': keys}).only('id', id_field)
+    }
+
+    results, levels, errors = [], {}, []
+    for line, row in enumerate(rows, start=2):  # 1행은 헤더
+        key = (row.get(id_field) or '').strip()
+        student_id = users.get(key)
+        if student_id is None:
+            errors.append({'row': line, 'error': f'사용자를 찾을 수 없습니다: {key}'})
+            continue
+
+        answers = {f.strip(): row[f].strip() for f in answer_fields if (row.get(f) or '').strip()}
+        if answers:
+            scored = score_placement(answers)
+        elif (row.get('level') or '').strip() in ('1', '2', '3'):
+            scored = {'score': 0, 'total': 0, 'level': int(row['level']), 'category_scores': {}}
+        else:
+            errors.append({'row': line, 'error': '응답 또는 level 값이 없습니다.'})
+            continue
+
+        results.append(PlacementResult(
+            student_id=student_id,
+            lecture=lecture,
+            level=scored['level'],
+            score=scored['score'],
+            total_questions=scored['total'],
+            answers=answers,
+            category_scores=scored['category_scores'],
+        ))
+        # 같은 학생이 여러 행이면 마지막 행 기준
+        levels[student_id] = scored['level']
+
+    with transaction.atomic():
+        PlacementResult.objects.bulk_create(results, batch_size=BATCH_SIZE)
+        skill_rows = initialize_gap_maps(levels)
+        if lecture is not None and enroll and levels:
+            lecture.students.add(*levels.keys())
+
+    return {'imported': len(results), 'skills': skill_rows, 'errors': errors}
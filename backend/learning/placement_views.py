@@ -9,6 +9,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.parsers import MultiPartParser, FormParser
 from django.shortcuts import get_object_or_404
 from django.db.models import Count, Avg, Q
 
@@ -16,6 +17,8 @@ from .models import (
     Skill, CareerGoal, PlacementQuestion, PlacementResult,
     StudentGoal, StudentSkill, Lecture
 )
+from .placement_utils import score_placement, initialize_gap_maps, import_placement_csv
+from .placement_irt import adaptive_step
 
 
 class PlacementViewSet(viewsets.ViewSet):
@@ -51,34 +54,11 @@ class PlacementViewSet(viewsets.ViewSet):
         if not answers:
             return Response({'error': 'answers는 필수입니다.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # 채점
-        questions = PlacementQuestion.objects.all()
-        total = questions.count()
-        correct = 0
-        category_scores = {'CONCEPT': 0, 'PRACTICE': 0, 'PATTERN': 0}
-        category_totals = {'CONCEPT': 0, 'PRACTICE': 0, 'PATTERN': 0}
-
-        from .utils_text import check_answer_match
-
-        for q in questions:
-            category_totals[q.category] = category_totals.get(q.category, 0) + 1
-            user_answer = answers.get(str(q.id), '')
-            if check_answer_match(user_answer, q.correct_answer):
-                correct += 1
-                category_scores[q.category] = category_scores.get(q.category, 0) + 1
-
-        # 레벨 판정
-        if total == 0:
-            ratio = 0
-        else:
-            ratio = correct / total
-
-        if ratio >= 0.7:
-            level = 3  # 실습 경험자
-        elif ratio >= 0.4:
-            level = 2  # 기초 이해자
-        else:
-            level = 1  # 완전 초보
+        # 채점 (정답 키는 프로세스 캐시, 문항 수정 시 무효화)
+        scored = score_placement(answers)
+        correct, total, ratio, level = scored['score'], scored['total'], scored['ratio'], scored['level']
+        category_scores = scored['category_scores']
+        category_totals = scored['category_totals']
 
         # 결과 저장
         result = PlacementResult.objects.create(
@@ -105,6 +85,69 @@ class PlacementViewSet(viewsets.ViewSet):
             'category_totals': category_totals,
         })
 
+    @action(detail=False, methods=['post'], url_path='adaptive')
+    def adaptive(self, request):
+        """
+        POST /api/learning/placement/adaptive/
+        적응형 진단 — 지금까지의 응답을 보내면 다음 문항 1개, 또는 종료 시 결과를 반환
+        Body: { "answers": { "3": "선택A", ... } (첫 호출은 빈 객체), "lecture_id": 1 (선택) }
+        """
+        answers = request.data.get('answers') or {}
+        lecture_id = request.data.get('lecture_id')
+        if not isinstance(answers, dict):
+            return Response({'error': 'answers는 객체여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        step = adaptive_step({str(k): v for k, v in answers.items()})
+
+        if not step['finished']:
+            q = step['next_item']
+            return Response({
+                'finished': False,
+                'answered': step['answered'],
+                'ability': step['ability'],
+                'se': step['se'],
+                'question': {
+                    'id': q.id,
+                    'question_text': q.question_text,
+                    'options': q.options,
+                    'category': q.category,
+                    'difficulty': q.difficulty,
+                },
+            })
+
+        if step['answered'] == 0:
+            return Response({'error': '진단 문항이 없습니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        level = step['level']
+        result = PlacementResult.objects.create(
+            student=request.user,
+            lecture_id=lecture_id,
+            level=level,
+            score=step['correct'],
+            total_questions=step['answered'],
+            answers=answers,
+            category_scores=step['category_scores'],
+            mode='ADAPTIVE',
+            ability=step['ability'],
+            ability_se=step['se'],
+        )
+
+        # 진단 결과 기반으로 초기 갭 맵 생성
+        _initialize_gap_map(request.user, level)
+
+        return Response({
+            'finished': True,
+            'id': result.id,
+            'level': level,
+            'level_label': dict(PlacementResult.LEVEL_CHOICES).get(level),
+            'score': step['correct'],
+            'total': step['answered'],
+            'ratio': round(step['correct'] / step['answered'] * 100, 1),
+            'ability': step['ability'],
+            'se': step['se'],
+            'category_scores': step['category_scores'],
+        })
+
     @action(detail=False, methods=['get'], url_path='my-result')
     def my_result(self, request):
         """GET /api/learning/placement/my-result/ → 내 최신 진단 결과"""
@@ -380,31 +423,41 @@ class ProfessorDiagnosticView(APIView):
         })
 
 
+class ProfessorPlacementImportView(APIView):
+    """교수자용: 코호트 진단 결과 CSV 일괄 등록"""
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request, lecture_id):
+        """
+        POST /api/learning/professor/{lecture_id}/placement-import/
+        multipart: file=CSV (username 또는 email + 문항 ID 열), enroll=true (선택: 수강생 등록)
+        """
+        lecture = get_object_or_404(Lecture, id=lecture_id, instructor=request.user)
+        file = request.FILES.get('file')
+        if not file:
+            return Response({'error': 'file은 필수입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        enroll = str(request.data.get('enroll', '')).lower() in ('1', 'true', 'yes')
+        try:
+            stats = import_placement_csv(file, lecture=lecture, enroll=enroll)
+        except (ValueError, UnicodeDecodeError) as e:
+            return Response({'error': f'CSV 형식 오류: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'imported': stats['imported'],
+            'skills_initialized': stats['skills'],
+            'errors': stats['errors'],
+        }, status=status.HTTP_201_CREATED if stats['imported'] else status.HTTP_200_OK)
+
+
 # ══════════════════════════════════════════════════════════
 # 헬퍼 함수
 # ══════════════════════════════════════════════════════════
 
 def _initialize_gap_map(user, level):
-    """진단 결과 기반으로 초기 갭 맵 생성"""
-    all_skills = Skill.objects.all()
-    for skill in all_skills:
-        # 레벨에 따라 초기 상태 결정
-        if skill.difficulty_level <= level:
-            # 내 레벨 이하의 스킬은 일부 보유로 간주
-            if skill.difficulty_level < level:
-                st = 'OWNED'
-                prog = 80 + (level - skill.difficulty_level) * 10  # 80~100%
-            else:
-                st = 'LEARNING'
-                prog = 30 + level * 10  # 40~60%
-        else:
-            st = 'GAP'
-            prog = 0
-
-        StudentSkill.objects.update_or_create(
-            student=user, skill=skill,
-            defaults={'status': st, 'progress': min(prog, 100)}
-        )
+    """진단 결과 기반으로 초기 갭 맵 생성 (전체 스킬 bulk upsert)"""
+    initialize_gap_maps({user.id: level})
 
 
 def _rebuild_gap_map(user, career_goal_id):
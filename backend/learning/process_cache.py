@@ -0,0 +1,40 @@
+"""
+버전 키 기반 프로세스 메모리 캐시 헬퍼 (View 아님)
+DB에서 컴파일한 읽기 전용 객체(스킬 태거, 역량 그래프, 진단 문항 뱅크)를 프로세스 메모리에 두고,
+Django 캐시의 버전 키가 바뀌면 다음 호출 때 builder로 재빌드한다.
+버전 키가 다른 워커까지 전파되려면 CACHES가 공유 백엔드(Redis 등)여야 한다.
+기본 LocMemCache에서는 무효화를 호출한 프로세스만 재빌드된다.
+"""
+import threading
+
+from django.core.cache import cache
+
+
+class VersionedProcessCache:
+    """key: Django 캐시 버전 키, builder: 인자 없이 새 객체를 만드는 함수"""
+
+    def __init__(self, key, builder):
+        self.key = key
+        self.builder = builder
+        self._lock = threading.Lock()
+        self._value = None
+        self._version = None
+
+    def get(self):
+        version = cache.get(self.key, 0)
+        value = self._value
+        if value is not None and self._version == version:
+            return value
+        with self._lock:
+            if self._value is None or self._version != version:
+                self._value = self.builder()
+                self._version = version
+            return self._value
+
+    def invalidate(self):
+        """캐시 버전 증가 + 로컬 객체 폐기"""
+        try:
+            cache.incr(self.key)
+        except ValueError:
+            cache.set(self.key, 1, None)
+        self._value = None
@@ -0,0 +1,197 @@
+"""
+B1: 라이브 Q&A 유사 질문 클러스터링 헬퍼 (View 아님)
+새 질문마다 기존 질문 전체를 GPT에 보내 비교하던 방식(질문 수에 비례해 비용/지연 증가)을 임베딩 기반으로 대체한다.
+- 질문은 한 번만 임베딩(text-embedding-3-small, RAGService.get_embedding)해 LiveQuestion.embedding에 저장
+- 세션별 클러스터 중심(centroid)을 메모리에 유지 → 가장 가까운 중심과의 코사인 유사도가
+  QUESTION_CLUSTER_SIMILARITY 이상이면 그 클러스터, 아니면 새 클러스터(cluster_id = 질문 id)
+  임베딩 이후 배정은 행렬 곱 1회 (서브 밀리초)
+- 메모리 상태는 DB(embedding, cluster_id)에서 아직 반영하지 않은 질문만 골라 동기화 → 재시작 후에도 이어짐
+  다른 워커가 배정한 질문은 이 워커의 다음 배정 때 반영 (그 사이 동시 배정은 서로 모를 수 있음)
+- 세션 상태는 최근 MAX_SESSIONS개만 유지(LRU), 세션 종료 시 forget_session으로 즉시 해제
+- 선택: 새 질문 QUESTION_CLUSTER_RELABEL_EVERY개마다 클러스터 라벨을 GPT로 재생성 (0이면 끔)
+  라벨은 Django 캐시에 보관, 질문 클러스터 API 응답의 label로 노출
+  (기본 LocMemCache는 워커 프로세스별 → 라벨을 만든 워커에서만 보임, 공유하려면 공유 캐시 백엔드)
+- 작업은 공유 스레드 풀에서 실행 (요청마다 스레드를 만들지 않음)
+"""
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from .models import LiveQuestion
+from .rag import RAGService
+
+POOL_WORKERS = 2
+LABEL_SAMPLE = 5              # 라벨 생성 시 클러스터당 질문 샘플 수
+LABEL_TIMEOUT = 6 * 3600
+MAX_SESSIONS = 64             # 메모리에 유지하는 세션 상태 수 (초과 시 가장 오래 안 쓴 세션부터 해제)
+
+_lock = threading.Lock()
+_executor = None
+_sessions = OrderedDict()
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=POOL_WORKERS, thread_name_prefix='question-cluster')
+    return _executor
+
+
+def _labels_key(session_id):
+    return f'learning:question_cluster:labels:{session_id}'
+
+
+def _unit(vector):
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class SessionClusters:
+    """한 세션의 클러스터 중심 (cluster_id → 임베딩 합, 방향만 쓰므로 정규화하면 평균과 같음)"""
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.sums = {}            # cluster_id → 임베딩 합
+        self.known = set()        # 중심에 반영한 질문 id (이 프로세스 배정 + DB 동기화)
+        self.since_relabel = 0
+        self.lock = threading.Lock()
+        self._ids, self._matrix = [], None
+
+    def sync(self):
+        """
+        다른 워커/재시작 전에 배정된 질문 중 아직 반영하지 않은 것만 DB에서 반영
+        id 순서로 끝나지 않으므로(낮은 id가 늦게 배정될 수 있음) 배정된 id 목록과 비교, 임베딩은 새 질문만 읽음
+        """
+        clustered = LiveQuestion.objects.filter(
+            live_session_id=self.session_id, embedding__isnull=False, cluster_id__isnull=False,
+        )
+        missing = set(clustered.values_list('id', flat=True)) - self.known
+        if not missing:
+            return
+        for question_id, cluster_id, embedding in clustered.filter(id__in=missing).values_list(
+            'id', 'cluster_id', 'embedding',
+        ):
+            self._add(cluster_id, _unit(embedding))
+            self.known.add(question_id)
+
+    def _add(self, cluster_id, vector):
+        self.sums[cluster_id] = self.sums.get(cluster_id, 0) + vector
+        self._matrix = None
+
+    def nearest(self, vector):
+        """(cluster_id, 유사도) — 클러스터가 없으면 (None, 0)"""
+        if not self.sums:
+            return None, 0.0
+        if self._matrix is None:
+            self._ids = list(self.sums)
+            self._matrix = np.stack([_unit(self.sums[cid]) for cid in self._ids])
+        scores = self._matrix @ vector
+        best = int(np.argmax(scores))
+        return self._ids[best], float(scores[best])
+
+    def assign(self, question_id, vector):
+        cluster_id, score = self.nearest(vector)
+        if cluster_id is None or score < settings.QUESTION_CLUSTER_SIMILARITY:
+            cluster_id = question_id  # 새 클러스터
+        self._add(cluster_id, vector)
+        self.known.add(question_id)
+        self.since_relabel += 1
+        return cluster_id, score
+
+
+def _session_clusters(session_id):
+    with _lock:
+        state = _sessions.get(session_id)
+        if state is None:
+            state = _sessions[session_id] = SessionClusters(session_id)
+            while len(_sessions) > MAX_SESSIONS:
+                _sessions.popitem(last=False)
+        else:
+            _sessions.move_to_end(session_id)
+        return state
+
+
+def forget_session(session_id):
+    """세션 종료 시 메모리 상태 해제 (이후 질문이 들어오면 DB에서 다시 동기화)"""
+    with _lock:
+        _sessions.pop(session_id, None)
+
+
+def cluster_question(question_id):
+    """질문 1개 임베딩 + 가장 가까운 클러스터 배정 → cluster_id"""
+    question = LiveQuestion.objects.get(id=question_id)
+    vector = _unit(RAGService().get_embedding(question.question_text))
+
+    state = _session_clusters(question.live_session_id)
+    with state.lock:
+        state.sync()
+        cluster_id, score = state.assign(question.id, vector)
+        relabel = 0 < settings.QUESTION_CLUSTER_RELABEL_EVERY <= state.since_relabel
+        if relabel:
+            state.since_relabel = 0
+
+    LiveQuestion.objects.filter(id=question.id).update(cluster_id=cluster_id, embedding=vector.tolist())
+    print(f"✅ [Cluster] 질문 #{question_id} → cluster {cluster_id} (유사도 {score:.2f})")
+    if relabel:
+        _get_executor().submit(_run, relabel_clusters, question.live_session_id)
+    return cluster_id
+
+
+def _run(func, *args):
+    try:
+        return func(*args)
+    except Exception as e:
+        print(f"⚠️ [Cluster] {func.__name__} 실패: {e}")
+    finally:
+        connection.close()
+
+
+def cluster_question_async(question_id):
+    return _get_executor().submit(_run, cluster_question, question_id)
+
+
+def relabel_clusters(session_id):
+    """질문 2개 이상인 클러스터마다 짧은 주제 라벨 생성 (GPT-4o-mini 1회) → {cluster_id: label}"""
+    groups = {}
+    for cluster_id, text in LiveQuestion.objects.filter(
+        live_session_id=session_id, cluster_id__isnull=False,
+    ).order_by('-upvotes', 'created_at').values_list('cluster_id', 'question_text'):
+        groups.setdefault(cluster_id, []).append(text)
+    groups = {cid: texts for cid, texts in groups.items() if len(texts) >= 2}
+    if not groups:
+        return {}
+
+    listing = '\n'.join(
+        f"[{cid}] " + ' / '.join(t[:80] for t in texts[:LABEL_SAMPLE]) for cid, texts in groups.items()
+    )
+    rag = RAGService()
+    response = rag.client.chat.completions.create(
+        model='gpt-4o-mini',
+        messages=[
+            {'role': 'system', 'content': (
+                '라이브 수업 중 학생 질문 묶음마다 공통 주제를 15자 이내 한국어 라벨로 붙이세요.\n'
+                '반드시 JSON 형식으로 응답하세요: {"labels": {"묶음 번호": "라벨"}}'
+            )},
+            {'role': 'user', 'content': listing},
+        ],
+        temperature=0,
+        max_tokens=400,
+        response_format={'type': 'json_object'},
+    )
+    raw = json.loads(response.choices[0].message.content).get('labels', {})
+    labels = {int(cid): str(label)[:30] for cid, label in raw.items() if str(cid).isdigit() and int(cid) in groups}
+    cache.set(_labels_key(session_id), labels, LABEL_TIMEOUT)
+    print(f"🏷️ [Cluster] 세션 #{session_id} 클러스터 라벨 {len(labels)}개 갱신")
+    return labels
+
+
+def cluster_labels(session_id):
+    return cache.get(_labels_key(session_id)) or {}
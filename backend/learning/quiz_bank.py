@@ -0,0 +1,283 @@
+"""
+라이브 퀴즈 은행 헬퍼 (View 아님)
+퀴즈 요청/키워드 트리거 때마다 GPT를 호출하면 퀴즈가 5~15초 늦게 도착한다
+→ 후보를 백그라운드에서 미리 만들어 두고(QuizBankItem), 요청 시 즉시 LiveQuiz로 꺼내 쓴다.
+- 수업 전: 세션 생성 직후 이번 주차 강의계획서 + 최근 교안 텍스트로 후보 몇 개 (build_preclass_async)
+- 수업 중: 새 STT 청크가 QUIZ_BANK_BUILD_EVERY개 쌓일 때마다 최근 STT 구간으로 후보 1개 (maybe_build_async)
+- 중복 제거: 문제+정답 임베딩이 기존 후보와 QUIZ_BANK_DEDUPE_SIMILARITY 이상 유사하면 버림
+- 꺼내기(take_quiz): 최근 STT 구간 임베딩(빌드 때 캐시)과 관련도가 가장 높은 미사용 후보, 비슷하면 최신 구간 우선
+  관련 있는 후보가 없으면 None → 호출자가 기존처럼 즉석 생성 (generate_quiz_data)
+빌드 잠금 / 빌드 위치 / 현재 구간 임베딩은 Django 캐시에 두므로 기본 LocMemCache에서는 워커 프로세스별이다.
+→ 다른 워커가 같은 구간을 따로 빌드할 수 있고(중복은 임베딩 dedupe로 걸러짐),
+  구간 임베딩이 없는 워커의 take_quiz는 관련도 대신 최신 순으로 꺼낸다. 워커 간 공유는 공유 캐시 백엔드일 때만.
+"""
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from .models import LiveSession, LiveSTTLog, LiveQuiz, QuizBankItem
+from .material_text import get_material_text
+from .prompts import LIVE_QUIZ
+from .quiz_close import close_active_quizzes
+from .rag import RAGService
+from .skill_tagger import tag_skills
+
+WINDOW_CHUNKS = 10          # 후보 생성에 쓰는 최근 STT 청크 수 (즉석 생성과 동일)
+PRECLASS_SOURCES = 4        # 수업 전 후보 상한 (강의계획서 주차 + 교안)
+PRECLASS_CHARS = 2000
+MIN_RELEVANCE = 0.3         # 현재 구간과 이보다 덜 관련된 후보는 꺼내지 않음
+RECENCY_WEIGHT = 0.002      # 현재 구간보다 STT 청크 1개 오래될 때마다 감점
+LOCK_TIMEOUT = 300
+STATE_TIMEOUT = 6 * 3600
+
+
+def _cache_key(kind, session_id):
+    return f'learning:quiz_bank:{kind}:{session_id}'
+
+
+def _similarity(a, b):
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    denom = np.linalg.norm(a) * np.linalg.norm(b)
+    return float(a @ b / denom) if denom else 0.0
+
+
+def generate_quiz_data(context_text, lecture_id=None, rag=None):
+    """강의 내용 → 퀴즈 dict {question, options, correct_answer, explanation} (GPT-4o-mini + RAG)"""
+    rag = rag or RAGService()
+
+    # [RAG] 공식 문서에서 관련 컨텍스트 검색
+    rag_context = ""
+    try:
+        related_docs = rag.search(query=context_text[:300], top_k=2, lecture_id=lecture_id)
+        if related_docs:
+            rag_context = "\n".join([f"- {doc.content[:200]}" for doc in related_docs])
+            print(f"✅ [RAG] 라이브 퀴즈 생성에 공식 문서 {len(related_docs)}건 참조")
+    except Exception as rag_err:
+        print(f"⚠️ [RAG] 라이브 퀴즈 검색 실패: {rag_err}")
+
+    response = rag.client.chat.completions.create(
+        model='gpt-4o-mini',
+        messages=LIVE_QUIZ.messages(rag_context=rag_context, content=context_text),
+        prompt_cache_key=LIVE_QUIZ.id,
+        temperature=0.7,
+        max_tokens=500,
+        response_format={'type': 'json_object'},
+    )
+    quiz_data = json.loads(response.choices[0].message.content.strip())
+    if not quiz_data.get('question') or not quiz_data.get('options') or not quiz_data.get('correct_answer'):
+        raise ValueError(f'퀴즈 형식 오류: {list(quiz_data)}')
+    return quiz_data
+
+
+def add_candidate(session, quiz_data, source, rag, from_seq=0, to_seq=0):
+    """후보 저장 (기존 후보와 임베딩이 거의 같으면 중복으로 버리고 None)"""
+    embedding = rag.get_embedding(f"{quiz_data['question']}\n정답: {quiz_data['correct_answer']}")
+    threshold = settings.QUIZ_BANK_DEDUPE_SIMILARITY
+    for existing in QuizBankItem.objects.filter(
+        live_session=session, embedding__isnull=False,
+    ).values_list('embedding', flat=True):
+        if _similarity(embedding, existing) >= threshold:
+            print(f"♻️ [QuizBank] 세션 #{session.id} 중복 후보 버림: {quiz_data['question'][:30]}")
+            return None
+
+    return QuizBankItem.objects.create(
+        live_session=session,
+        source=source,
+        from_seq=from_seq,
+        to_seq=to_seq,
+        question_text=quiz_data['question'],
+        options=quiz_data['options'],
+        correct_answer=quiz_data['correct_answer'],
+        explanation=quiz_data.get('explanation', ''),
+        skill_tags=tag_skills(quiz_data['question']),
+        embedding=embedding,
+    )
+
+
+# ── 수업 중: 최근 STT 구간 ──
+
+def build_from_stt(session_id, upto_seq):
+    session = LiveSession.objects.get(id=session_id)
+    logs = list(LiveSTTLog.objects.filter(
+        live_session=session, sequence_order__lte=upto_seq,
+    ).order_by('-sequence_order')[:WINDOW_CHUNKS])
+    if not logs:
+        return None
+    logs.reverse()
+    text = '\n'.join(log.text_chunk for log in logs)
+
+    rag = RAGService()
+    # 현재 구간 임베딩은 꺼낼 때 관련도 기준으로 재사용 (요청 경로에서 임베딩 호출 없음)
+    cache.set(_cache_key('window', session_id), {
+        'to_seq': logs[-1].sequence_order,
+        'embedding': rag.get_embedding(text[:PRECLASS_CHARS]),
+    }, STATE_TIMEOUT)
+
+    quiz_data = generate_quiz_data(text, session.lecture_id, rag)
+    item = add_candidate(
+        session, quiz_data, 'STT', rag,
+        from_seq=logs[0].sequence_order, to_seq=logs[-1].sequence_order,
+    )
+    if item:
+        print(f"🏦 [QuizBank] 세션 #{session_id} STT #{item.from_seq}~#{item.to_seq} 후보 추가")
+    return item
+
+
+def maybe_build_async(session_id, latest_seq):
+    """마지막 빌드 이후 새 STT 청크가 QUIZ_BANK_BUILD_EVERY개 이상이면 백그라운드 빌드 (세션당 1개씩)"""
+    built_until = cache.get(_cache_key('built', session_id), 0)
+    if latest_seq - built_until < settings.QUIZ_BANK_BUILD_EVERY:
+        return None
+    if not cache.add(_cache_key('lock', session_id), 1, LOCK_TIMEOUT):
+        return None
+    cache.set(_cache_key('built', session_id), latest_seq, STATE_TIMEOUT)
+
+    def _run():
+        try:
+            build_from_stt(session_id, latest_seq)
+        except Exception as e:
+            print(f"⚠️ [QuizBank] 세션 #{session_id} 후보 생성 실패: {e}")
+        finally:
+            cache.delete(_cache_key('lock', session_id))
+            connection.close()
+
+    thread = threading.Thread(target=_run)
+    thread.daemon = True
+    thread.start()
+    return thread
+
+
+# ── 수업 전: 교안 / 강의계획서 ──
+
+def _session_weeks(session):
+    """세션 제목에 주차 제목 / 'N주차' / 'Week N'이 들어간 강의계획서 주차 (없으면 빈 목록)"""
+    title = session.title or ''
+    if not title:
+        return []
+    return [
+        week for week in session.lecture.syllabi.prefetch_related('objectives')
+        if week.title in title or f'{week.week_number}주차' in title or f'Week {week.week_number}' in title
+    ]
+
+
+def _preclass_sources(session):
+    """(source, 텍스트) 목록: 이번 주차 강의계획서 → 최근 업로드 교안 순"""
+    sources = []
+    for week in _session_weeks(session):
+        objectives = '\n'.join(f"- {obj.content}" for obj in week.objectives.all())
+        text = f"[{week.week_number}주차: {week.title}]\n{week.description}\n{objectives}".strip()
+        sources.append(('SYLLABUS', text))
+    for material in session.lecture.materials.select_related('extract')[:PRECLASS_SOURCES]:
+        text = get_material_text(material, limit=PRECLASS_CHARS)
+        if text.strip():
+            sources.append(('MATERIAL', f"[교안: {material.title}]\n{text}"))
+    return sources[:PRECLASS_SOURCES]
+
+
+def _generate_in_worker(context_text, lecture_id):
+    try:
+        return generate_quiz_data(context_text, lecture_id)
+    finally:
+        connection.close()
+
+
+def build_preclass(session_id):
+    """교안/강의계획서 후보를 병렬 생성 (이미 수업 전 후보가 있으면 건너뜀)"""
+    session = LiveSession.objects.select_related('lecture').get(id=session_id)
+    if session.quiz_bank.exclude(source='STT').exists():
+        return 0
+    sources = _preclass_sources(session)
+    if not sources:
+        return 0
+
+    with ThreadPoolExecutor(max_workers=len(sources)) as pool:
+        futures = [
+            (source, pool.submit(_generate_in_worker, text, session.lecture_id))
+            for source, text in sources
+        ]
+    rag, added = RAGService(), 0
+    for source, future in futures:
+        try:
+            if add_candidate(session, future.result(), source, rag):
+                added += 1
+        except Exception as e:
+            print(f"⚠️ [QuizBank] 세션 #{session_id} 수업 전 후보 생성 실패 ({source}): {e}")
+    print(f"🏦 [QuizBank] 세션 #{session_id} 수업 전 후보 {added}개 준비")
+    return added
+
+
+def build_preclass_async(session_id):
+    def _run():
+        try:
+            build_preclass(session_id)
+        except Exception as e:
+            print(f"⚠️ [QuizBank] 세션 #{session_id} 수업 전 후보 생성 실패: {e}")
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=_run)
+    thread.daemon = True
+    thread.start()
+    return thread
+
+
+# ── 꺼내기 ──
+
+def _ranked_candidates(session):
+    candidates = list(session.quiz_bank.filter(used_quiz__isnull=True))
+    window = cache.get(_cache_key('window', session.id))
+    if not window:
+        return candidates  # STT 구간 전: 최신 순 (Meta.ordering)
+
+    scored = []
+    for item in candidates:
+        relevance = _similarity(item.embedding, window['embedding']) if item.embedding is not None else 0.0
+        if relevance < MIN_RELEVANCE:
+            continue
+        staleness = max(0, window['to_seq'] - item.to_seq)
+        scored.append((relevance - RECENCY_WEIGHT * staleness, item))
+    scored.sort(key=lambda pair: pair[0], reverse=True)
+    return [item for _, item in scored]
+
+
+def take_quiz(session, suggestion=False):
+    """
+    가장 최신·관련 높은 미사용 후보 → LiveQuiz (없으면 None)
+    suggestion=True: 교수자 승인 대기 제안, False: 기존 활성 퀴즈를 닫고 바로 발동
+    """
+    quiz = None
+    for candidate in _ranked_candidates(session):
+        with transaction.atomic():
+            item = QuizBankItem.objects.select_for_update().filter(
+                id=candidate.id, used_quiz__isnull=True,
+            ).first()
+            if item is None:
+                continue  # 동시에 다른 요청이 가져감
+            quiz = LiveQuiz.objects.create(
+                live_session=session,
+                question_text=item.question_text,
+                options=item.options,
+                correct_answer=item.correct_answer,
+                explanation=item.explanation,
+                is_ai_generated=True,
+                is_suggestion=suggestion,
+                is_active=False,
+                skill_tags=item.skill_tags,
+            )
+            item.used_quiz = quiz
+            item.save(update_fields=['used_quiz'])
+        break
+    if quiz is None:
+        return None
+
+    if not suggestion:
+        close_active_quizzes(session)
+        quiz.is_active = True
+        quiz.save(update_fields=['is_active'])
+    print(f"⚡ [QuizBank] 세션 #{session.id} 퀴즈 은행에서 즉시 {'제안' if suggestion else '발동'} (#{quiz.id})")
+    return quiz
@@ -0,0 +1,153 @@
+"""
+Phase 2-3: 라이브 퀴즈 종료 시 오답 일괄 처리 헬퍼 (View 아님)
+퀴즈가 닫히면 해당 퀴즈의 미처리 오답을 한 번에 모아
+  1) SR 항목: bulk_create(ignore_conflicts) — (student, concept_name) 유니크
+  2) GapMap(StudentSkill): 퀴즈 생성 시 기록된 스킬 태그(skill_tags)의 첫 스킬을 WEAK + progress 감소
+     — bulk_update / bulk_create
+처리한 응답은 redesign_processed=True 로 표시 (중복 반영 방지, 재실행 안전)
+"""
+import threading
+from collections import Counter
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (
+    LiveQuiz, LiveQuizResponse, SpacedRepetitionItem, SpacedRepetitionReview, Skill, StudentSkill,
+)
+from .spaced_repetition import new_sr_item, build_reviews
+
+SR_CONCEPT_LENGTH = 60      # 문제 앞 60자를 개념명으로 사용
+WEAK_PROGRESS_PENALTY = 10  # 오답 1건당 progress 감소량
+
+
+def sr_concept(question_text):
+    return (question_text or '')[:SR_CONCEPT_LENGTH][:200]
+
+
+def close_active_quizzes(session):
+    """세션의 활성 퀴즈 비활성화 + 닫힌 퀴즈 오답 일괄 처리(비동기). 닫힌 퀴즈 id 목록 반환"""
+    quiz_ids = list(session.quizzes.filter(is_active=True).values_list('id', flat=True))
+    if quiz_ids:
+        LiveQuiz.objects.filter(id__in=quiz_ids).update(is_active=False)
+        process_closed_quizzes_async(quiz_ids)
+    return quiz_ids
+
+
+def process_closed_quizzes_async(quiz_ids):
+    thread = threading.Thread(target=process_closed_quizzes, args=(list(quiz_ids),))
+    thread.daemon = True
+    thread.start()
+    return thread
+
+
+def process_closed_quizzes(quiz_ids, now=None):
+    """
+    닫힌 퀴즈들의 미처리 오답 일괄 반영
+    반환: {'responses', 'sr_created', 'skills_updated', 'skills_created'}
+    """
+    now = now or timezone.now()
+    stats = {'responses': 0, 'sr_created': 0, 'skills_updated': 0, 'skills_created': 0}
+    try:
+        with transaction.atomic():
+            responses = list(
+                LiveQuizResponse.objects.select_for_update(skip_locked=True, of=('self',))
+                .filter(quiz_id__in=quiz_ids, is_correct=False, redesign_processed=False)
+                .select_related('quiz')
+            )
+            if not responses:
+                return stats
+            stats['responses'] = len(responses)
+
+            stats['sr_created'] = _bulk_create_sr(responses, now)
+            stats['skills_updated'], stats['skills_created'] = _bulk_update_gap_map(responses)
+
+            LiveQuizResponse.objects.filter(
+                id__in=[r.id for r in responses],
+            ).update(redesign_processed=True)
+
+        print(f"📝 [QuizClose] 퀴즈 {list(quiz_ids)}: 오답 {stats['responses']}건 → "
+              f"SR {stats['sr_created']}개, GapMap 갱신 {stats['skills_updated']} / 신규 {stats['skills_created']}")
+    except Exception as e:
+        print(f"⚠️ [QuizClose] 오답 일괄 처리 실패 (퀴즈 {list(quiz_ids)}): {e}")
+    return stats
+
+
+def _bulk_create_sr(responses, now):
+    """오답 → SR 항목 + 첫 주기. 이미 있는 (student, concept)은 건너뜀"""
+    candidates = {}
+    for r in responses:
+        key = (r.student_id, sr_concept(r.quiz.question_text))
+        if key[1] and key not in candidates:
+            candidates[key] = r.quiz
+
+    student_ids = {sid for sid, _ in candidates}
+    concepts = {concept for _, concept in candidates}
+    existing = set(
+        SpacedRepetitionItem.objects.filter(student_id__in=student_ids, concept_name__in=concepts)
+        .values_list('student_id', 'concept_name')
+    )
+
+    items = [
+        new_sr_item(
+            now=now,
+            student_id=sid,
+            concept_name=concept,
+            source_session_id=quiz.live_session_id,
+            source_quiz=quiz,
+            review_question=quiz.question_text,
+            review_answer=quiz.correct_answer,
+            review_options=quiz.options or [],
+        )
+        for (sid, concept), quiz in candidates.items() if (sid, concept) not in existing
+    ]
+    if not items:
+        return 0
+    SpacedRepetitionItem.objects.bulk_create(items, ignore_conflicts=True)
+
+    # ignore_conflicts는 pk를 돌려주지 않으므로, 주기가 없는 신규 항목을 다시 조회
+    created = [
+        item for item in SpacedRepetitionItem.objects.filter(
+            student_id__in={i.student_id for i in items},
+            concept_name__in={i.concept_name for i in items},
+            reviews__isnull=True,
+        )
+        if (item.student_id, item.concept_name) not in existing
+    ]
+    SpacedRepetitionReview.objects.bulk_create(
+        [review for item in created for review in build_reviews(item)], ignore_conflicts=True,
+    )
+    return len(created)
+
+
+def _bulk_update_gap_map(responses):
+    """오답 퀴즈의 대표 스킬(skill_tags[0]) → StudentSkill WEAK + progress 감소 (오답 수만큼)"""
+    hits = Counter(
+        (r.student_id, r.quiz.skill_tags[0]) for r in responses if r.quiz.skill_tags
+    )
+    # 태그 이후 삭제된 스킬 제외
+    live_skills = set(Skill.objects.filter(id__in={kid for _, kid in hits}).values_list('id', flat=True))
+    hits = {key: count for key, count in hits.items() if key[1] in live_skills}
+    if not hits:
+        return 0, 0
+
+    rows = {
+        (ss.student_id, ss.skill_id): ss
+        for ss in StudentSkill.objects.filter(
+            student_id__in={sid for sid, _ in hits}, skill_id__in={kid for _, kid in hits},
+        )
+    }
+    to_update, to_create = [], []
+    for (sid, skill_id), count in hits.items():
+        ss = rows.get((sid, skill_id))
+        if ss is None:
+            to_create.append(StudentSkill(student_id=sid, skill_id=skill_id, status='WEAK', progress=0))
+            continue
+        ss.status = 'WEAK'
+        ss.progress = max(0, ss.progress - WEAK_PROGRESS_PENALTY * count)
+        ss.updated_at = timezone.now()
+        to_update.append(ss)
+
+    StudentSkill.objects.bulk_update(to_update, ['status', 'progress', 'updated_at'])
+    StudentSkill.objects.bulk_create(to_create, ignore_conflicts=True)
+    return len(to_update), len(to_create)
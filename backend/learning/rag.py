@@ -1,6 +1,8 @@
 import openai
 from django.conf import settings
 from .models import VectorStore, LearningSession, SessionSummary, STTLog, Lecture
+from .prompts import RAG_TUTOR, describe
+from .streaming import iter_tokens
 from pgvector.django import L2Distance, CosineDistance
 
 class RAGService:
@@ -82,12 +84,12 @@ class RAGService:
             
         return results
 
-    def generate_answer(self, query, session_id=None, lecture_id=None):
+    def build_answer_messages(self, query, session_id=None, lecture_id=None):
         """
-        [고도화된 RAG 답변 생성]
+        [고도화된 RAG 프롬프트 구성]
         1. Context Search: 질문과 관련된 학습 내용 검색
         2. Session Context: 현재 대화의 압축된 문맥 조회
-        3. Generative Answer: LLM을 통해 답변 생성
+        3. Augmented Prompt: 고정 시스템 프롬프트 → 대화 문맥 → 검색 지식 → 질문 순 (앞부분 프롬프트 캐시 적중)
         """
         # 1. 관련 지식 검색 (Retrieval)
         related_docs = self.search(query, top_k=3, lecture_id=lecture_id)
@@ -101,36 +103,36 @@ class RAGService:
             conversation_context = cm.get_full_context(session_id)
             
         # 3. 프롬프트 구성 (Augmented Generation)
-        system_prompt = (
-            "너는 IT 부트캠프의 친절한 'AI 튜터'야.\n"
-            "학생의 질문에 대해 [관련 학습 내용]과 [대화 문맥]을 바탕으로 명확하게 답변해줘.\n\n"
-            "[답변 규칙]\n"
-            "1. **반드시 [관련 학습 내용]에 근거가 있는 내용만 답변**할 것. 근거 없이 추측하거나 일반 상식으로 답변하지 말 것.\n"
-            "2. **현재 수업/강의 내용의 범위를 벗어나는 질문**에는 '이 내용은 현재 수업 범위에 포함되어 있지 않습니다. "
-            "수업 내용과 관련된 질문을 해주시면 더 정확한 답변을 드릴 수 있습니다.'라고 안내할 것.\n"
-            "3. 이전 대화 맥락을 고려하여 자연스럽게 이어갈 것.\n"
-            "4. 초보자도 이해할 수 있도록 비유와 예시를 활용할 것.\n"
-            "5. **중요 키워드**는 볼드로 강조할 것.\n"
-            "6. [관련 학습 내용]이 비어있거나 질문과 무관하면 '해당 내용은 현재 학습 자료에 없습니다'라고 솔직히 밝힐 것.\n"
-            "7. 한국어로 답변하되, 기술 용어는 영어 병기 (예: 반응성(Reactivity))\n"
-            "8. 수업과 완전히 무관한 잡담, 날씨, 음식 등 질문에는 답변하지 말고 수업 관련 질문으로 유도할 것."
-        )
-        
-        user_prompt = (
-            f"[관련 학습 내용 (Knowledge)]:\n{knowledge_context}\n\n"
-            f"[대화 문맥 (Current Context)]:\n{conversation_context}\n\n"
-            f"[학생의 질문]:\n{query}"
+        messages = RAG_TUTOR.messages(
+            context=conversation_context,
+            knowledge=knowledge_context,
+            question=query,
         )
-        
+        print(f"🧾 [RAG] 프롬프트 {describe(RAG_TUTOR, messages)}")
+        return messages
+
+    def generate_answer(self, query, session_id=None, lecture_id=None):
+        """[고도화된 RAG 답변 생성] 완성된 답변을 한 번에 반환"""
+        messages = self.build_answer_messages(query, session_id=session_id, lecture_id=lecture_id)
         try:
             response = self.client.chat.completions.create(
                 model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
+                messages=messages,
+                prompt_cache_key=RAG_TUTOR.id,
                 max_tokens=1500
             )
             return response.choices[0].message.content
         except Exception as e:
             return f"죄송합니다. 답변 생성 중 오류가 발생했습니다. ({str(e)})"
+
+    def stream_answer(self, query, session_id=None, lecture_id=None):
+        """[RAG 답변 스트리밍] 토큰 조각을 생성되는 즉시 yield (streaming.sse_stream에 연결)"""
+        messages = self.build_answer_messages(query, session_id=session_id, lecture_id=lecture_id)
+        stream = self.client.chat.completions.create(
+            model="gpt-4o",
+            messages=messages,
+            prompt_cache_key=RAG_TUTOR.id,
+            max_tokens=1500,
+            stream=True,
+        )
+        yield from iter_tokens(stream)
@@ -3,6 +3,8 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from .rag import RAGService
+from .streaming import sse_response, sse_stream
+from .question_cluster import cluster_question_async
 from .models import VectorStore, LiveQuestion, LiveParticipant, LiveSession
 
 class RAGViewSet(viewsets.ViewSet):
@@ -81,21 +83,67 @@ class RAGViewSet(viewsets.ViewSet):
         
         # 라이브 세션 중이면 → 자동으로 LiveQuestion에 저장 (교수자에게 익명 전달)
         live_question_id = None
-        if live_session_id and request.user.is_authenticated:
-            try:
-                live_session = LiveSession.objects.get(id=live_session_id, status='LIVE')
-                if live_session.participants.filter(student=request.user).exists():
-                    lq = LiveQuestion.objects.create(
-                        live_session=live_session,
-                        student=request.user,
-                        question_text=query,
-                        ai_answer=answer,
-                    )
-                    live_question_id = lq.id
-            except LiveSession.DoesNotExist:
-                pass  # 라이브 세션이 없거나 종료됨 → 무시, 기존 동작 유지
+        live_session = self._joined_live_session(request, live_session_id)
+        if live_session:
+            lq = LiveQuestion.objects.create(
+                live_session=live_session,
+                student=request.user,
+                question_text=query,
+                ai_answer=answer,
+            )
+            cluster_question_async(lq.id)
+            live_question_id = lq.id
         
         return Response({
             'answer': answer,
             'live_question_id': live_question_id,
         }, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], url_path='ask-stream')
+    def ask_stream(self, request):
+        """
+        [RAG 질문 — SSE 스트리밍]
+        Body: ask와 동일
+        이벤트: token* → done {live_question_id}
+        라이브 Q&A 질문은 스트림이 끝난 뒤 완성된 AI 답변과 함께 저장
+        """
+        query = request.data.get('q')
+        session_id = request.data.get('session_id')
+        lecture_id = request.data.get('lecture_id')
+        live_session_id = request.data.get('live_session_id')
+
+        if not query:
+            return Response({'error': 'Query is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        rag_service = RAGService()
+        live_session = self._joined_live_session(request, live_session_id)
+        student = request.user
+
+        def open_tokens():
+            return rag_service.stream_answer(query, session_id=session_id, lecture_id=lecture_id)
+
+        def save_answer(answer, failed):
+            if not live_session:
+                return {'live_question_id': None}
+            lq = LiveQuestion.objects.create(
+                live_session=live_session,
+                student=student,
+                question_text=query,
+                ai_answer=answer,
+            )
+            cluster_question_async(lq.id)
+            return {'live_question_id': lq.id}
+
+        return sse_response(sse_stream(
+            open_tokens, save_answer, error_text='죄송합니다. 답변 생성 중 오류가 발생했습니다',
+        ))
+
+    @staticmethod
+    def _joined_live_session(request, live_session_id):
+        """진행 중(LIVE)이고 요청자가 참가한 라이브 세션 (없거나 종료됐으면 None → 기존 동작 유지)"""
+        if not live_session_id or not request.user.is_authenticated:
+            return None
+        live_session = LiveSession.objects.filter(id=live_session_id, status='LIVE').first()
+        if live_session and live_session.participants.filter(student=request.user).exists():
+            return live_session
+        return None
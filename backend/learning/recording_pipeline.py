@@ -6,7 +6,7 @@
 1. 오디오 파일 수신 + 임시 저장
 2. pydub로 15분 단위 청크 분할 (Whisper 25MB 제한 대응)
 3. 각 청크를 Whisper API로 STT 변환
-4. 전체 텍스트 합산 → GPT-4o 요약
+4. 전체 텍스트 합산 → 구간별 병렬 정리 → GPT-4o 요약 (map-reduce)
 5. SessionSummary 저장 + RAG 인덱싱
 """
 
@@ -21,6 +21,7 @@ from django.utils import timezone
 from .models import (
     RecordingUpload, LearningSession, STTLog, SessionSummary
 )
+from .summarizer import condense_transcript
 
 
 # ─── 설정 상수 ───
@@ -221,14 +222,15 @@ def _is_hallucination(text: str) -> bool:
 def _generate_summary(client: OpenAI, full_text: str, duration_sec: int) -> str:
     """
     강의 전체 텍스트를 GPT-4o로 요약
-    1시간 분량의 텍스트도 처리 가능하도록 설계
+    긴 녹취는 구간별 병렬 정리(map) 후 한 번에 요약(reduce) → 수 시간 분량도 처리 (learning/summarizer.py)
     """
-    # 1시간 강의 ≒ 약 8,000~15,000 단어 (한국어) ≒ 약 20,000~40,000 토큰
-    # GPT-4o의 128K 컨텍스트 윈도우 안에 충분히 들어감
-    
     duration_min = duration_sec // 60
     
     try:
+        body, condensed = condense_transcript(client, full_text)
+        if condensed:
+            body = f"(아래는 녹취 전문을 시간 순 구간별로 정리한 노트입니다)\n\n{body}"
+
         response = client.chat.completions.create(
             model="gpt-4o",
             messages=[
@@ -248,7 +250,7 @@ def _generate_summary(client: OpenAI, full_text: str, duration_sec: int) -> str:
                 },
                 {
                     "role": "user",
-                    "content": f"[강의 시간: 약 {duration_min}분]\n\n{full_text}"
+                    "content": f"[강의 시간: 약 {duration_min}분]\n\n{body}"
                 }
             ],
             temperature=0.3,
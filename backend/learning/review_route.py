@@ -0,0 +1,127 @@
+"""
+Phase 2-3: 세션 종료 후 학생별 복습 루트 일괄 생성 헬퍼 (View 아님)
+참가자 전원의 오답을 쿼리 1회로 모아 학생별로 묶고,
+ReviewRoute를 배치 단위 bulk upsert(ON CONFLICT (live_session, student) DO UPDATE)로 기록한다.
+진행 상황은 LiveSessionNote.stage_status['review_routes']에 배치마다 갱신 (노트 조회 API로 노출)
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import LiveParticipant, LiveQuizResponse, LiveSessionNote, ReviewRoute
+from .quiz_close import SR_CONCEPT_LENGTH
+
+STAGE = 'review_routes'
+BATCH_SIZE = 200
+NOTE_MINUTES = 10
+CONCEPT_MINUTES = 5
+STAGE_STALE_AFTER = timedelta(minutes=10)  # 이 시간 넘게 갱신 없는 RUNNING은 죽은 작업으로 보고 재시도 허용
+
+
+def set_stage(note, stage, status, done=0, total=0, error=''):
+    """
+    노트의 후처리 단계 진행 상황 기록 (다른 필드는 건드리지 않음)
+    여러 단계가 동시에 기록하므로 DB의 최신 값을 잠그고 병합
+    """
+    entry = {'status': status, 'done': done, 'total': total, 'updated_at': timezone.now().isoformat()}
+    if error:
+        entry['error'] = error[:200]
+    with transaction.atomic():
+        current = LiveSessionNote.objects.select_for_update().values_list('stage_status', flat=True).get(id=note.id)
+        merged = {**(current or {}), stage: entry}
+        LiveSessionNote.objects.filter(id=note.id).update(stage_status=merged)
+    note.stage_status = merged
+
+
+def claim_stage(note, stage):
+    """
+    재시도할 단계를 RUNNING으로 선점 (행 잠금 안에서 확인 + 기록)
+    최근 갱신된 RUNNING이 있으면 False. 프로세스가 죽어 남은 오래된 RUNNING은 다시 선점 가능
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        current = LiveSessionNote.objects.select_for_update().values_list('stage_status', flat=True).get(id=note.id)
+        entry = (current or {}).get(stage) or {}
+        if entry.get('status') == 'RUNNING':
+            try:
+                updated_at = datetime.fromisoformat(entry.get('updated_at') or '')
+            except ValueError:
+                updated_at = None
+            if updated_at and updated_at > now - STAGE_STALE_AFTER:
+                return False
+        merged = {**(current or {}), stage: {'status': 'RUNNING', 'done': 0, 'total': 0, 'updated_at': now.isoformat()}}
+        LiveSessionNote.objects.filter(id=note.id).update(stage_status=merged)
+    note.stage_status = merged
+    return True
+
+
+def wrong_answers_by_student(session):
+    """세션 오답 → {student_id: [(question_text, correct_answer, explanation), ...]} (쿼리 1회, 출제 순)"""
+    grouped = defaultdict(list)
+    rows = LiveQuizResponse.objects.filter(
+        quiz__live_session=session, is_correct=False,
+    ).order_by('student_id', 'quiz__triggered_at', 'quiz_id').values_list(
+        'student_id', 'quiz__question_text', 'quiz__correct_answer', 'quiz__explanation',
+    )
+    for student_id, question, answer, explanation in rows:
+        grouped[student_id].append((question, answer, explanation))
+    return grouped
+
+
+def route_items(note_id, wrong):
+    """복습 항목: 1순위 통합 노트, 2순위 오답 개념"""
+    items = [{
+        'order': 1, 'type': 'note',
+        'title': '오늘 수업 통합 노트',
+        'note_id': note_id, 'est_minutes': NOTE_MINUTES,
+    }]
+    for question, answer, explanation in wrong:
+        items.append({
+            'order': len(items) + 1, 'type': 'concept',
+            'title': f'오답 복습: {question[:SR_CONCEPT_LENGTH]}',
+            'content': f"문제: {question}\n정답: {answer}\n{explanation or ''}",
+            'est_minutes': CONCEPT_MINUTES,
+        })
+    return items
+
+
+def build_review_routes(session, note, batch_size=BATCH_SIZE):
+    """
+    참가자 전원의 복습 루트 생성/갱신 (완료 기록 completed_items는 유지)
+    반환: 생성/갱신한 루트 수
+    """
+    student_ids = list(
+        LiveParticipant.objects.filter(live_session=session).order_by('id').values_list('student_id', flat=True)
+    )
+    total = len(student_ids)
+    done = 0
+    set_stage(note, STAGE, 'RUNNING', done, total)
+
+    try:
+        wrong = wrong_answers_by_student(session)
+        for start in range(0, total, batch_size):
+            routes = []
+            for student_id in student_ids[start:start + batch_size]:
+                items = route_items(note.id, wrong.get(student_id, []))
+                routes.append(ReviewRoute(
+                    live_session=session,
+                    student_id=student_id,
+                    items=items,
+                    total_est_minutes=sum(i.get('est_minutes', 0) for i in items),
+                    status='AUTO_APPROVED',
+                ))
+            ReviewRoute.objects.bulk_create(
+                routes,
+                update_conflicts=True, unique_fields=['live_session', 'student'],
+                update_fields=['items', 'total_est_minutes', 'status'],
+            )
+            done += len(routes)
+            set_stage(note, STAGE, 'RUNNING', done, total)
+    except Exception as e:
+        set_stage(note, STAGE, 'FAILED', done, total, error=str(e))
+        raise
+
+    set_stage(note, STAGE, 'DONE', total, total)
+    return total
@@ -2,18 +2,17 @@
 Phase 2-3: AI 복습 루트 + 간격 반복 API Views
 별도 APIView — urls.py에서 path 등록
 """
-from datetime import timedelta
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
-from django.utils import timezone
 
 from .models import (
     ReviewRoute, SpacedRepetitionItem, LiveSession,
     LiveQuizResponse, LiveSessionNote, LiveParticipant,
 )
+from .spaced_repetition import due_reviews, record_review
 
 
 class MyReviewRoutesView(APIView):
@@ -121,27 +120,18 @@ class SpacedRepetitionDueView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        now = timezone.now()
-        items = SpacedRepetitionItem.objects.filter(student=request.user)
-
-        due_items = []
-        for item in items:
-            schedule = item.schedule or []
-            for entry in schedule:
-                if entry.get('completed'):
-                    continue
-                due_at = entry.get('due_at', '')
-                if due_at and due_at <= now.isoformat():
-                    due_items.append({
-                        'id': item.id,
-                        'concept_name': item.concept_name,
-                        'review_num': entry['review_num'],
-                        'label': entry.get('label', ''),
-                        'review_question': item.review_question,
-                        'review_options': item.review_options,
-                        'due_at': due_at,
-                    })
-                    break  # 가장 이른 미완료 주기만
+        due_items = [
+            {
+                'id': review.item_id,
+                'concept_name': review.item.concept_name,
+                'review_num': review.review_num,
+                'label': review.label,
+                'review_question': review.item.review_question,
+                'review_options': review.item.review_options,
+                'due_at': review.due_at.isoformat(),
+            }
+            for review in due_reviews(request.user)
+        ]
 
         return Response({'due_items': due_items, 'total': len(due_items)})
 
@@ -166,19 +156,18 @@ class CompleteSpacedRepView(APIView):
             elif user_answer.replace(" ", "").startswith(f"{correct_ans}:"):
                 is_correct = True
 
-        # 정답이면 현재 주기 완료 처리
-        if is_correct:
-            schedule = item.schedule or []
-            for entry in schedule:
-                if not entry.get('completed'):
-                    entry['completed'] = True
-                    item.current_review = entry['review_num']
-                    break
-            item.schedule = schedule
-            item.save()
+        # 정오 + 응답 시간으로 스케줄러가 다음 복습 시점 계산 (오답은 10분 뒤 재학습)
+        try:
+            response_ms = int(request.data['response_ms']) if request.data.get('response_ms') is not None else None
+        except (TypeError, ValueError):
+            return Response({'error': 'response_ms는 정수(ms)여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        result = record_review(item, is_correct, response_ms=response_ms)
+        item.refresh_from_db(fields=['current_review'])
 
         return Response({
             'is_correct': is_correct,
             'correct_answer': item.review_answer,
             'current_review': item.current_review,
+            'rating': result['rating'] if result else None,
+            'next_due_at': result['next_due_at'] if result else None,
         })
@@ -0,0 +1,143 @@
+"""
+이탈 위험군 산출 헬퍼 (매니저 대시보드 / 알림 공용)
+학생 수와 무관하게 고정된 쿼리 수로 학생별 활동 지표를 집계한다.
+"""
+from datetime import timedelta
+from django.utils import timezone
+from django.db.models import Avg, Count, Max, Q, F, Subquery, OuterRef, Window
+from django.db.models.functions import Coalesce, RowNumber
+
+from .models import LearningSession, QuizAttempt, SkillBlock
+
+
+INACTIVE_DAYS_MEDIUM = 7
+INACTIVE_DAYS_HIGH = 14
+FAIL_SCORE = 60
+FAIL_COUNT_THRESHOLD = 3
+RECENT_QUIZ_WINDOW = 5
+NEVER_ACTIVE_DAYS = 999
+
+
+def _student_subquery(queryset, student_field, aggregate):
+    """학생별 집계를 상관 서브쿼리로 변환 (JOIN 팬아웃 없이 여러 집계 결합)"""
+    return Subquery(
+        queryset.filter(student_id=OuterRef(student_field))
+        .order_by()
+        .values('student_id')
+        .annotate(value=aggregate)
+        .values('value')[:1]
+    )
+
+
+def annotate_student_activity(queryset, student_field='student_id'):
+    """
+    학생을 가리키는 queryset(Enrollment, User 등)에 활동 지표를 annotate.
+    - avg_quiz_score, total_quiz_attempts, failed_quiz_count
+    - last_active (마지막 LearningSession 시작 시각)
+    - skill_blocks_earned, skill_blocks_total
+    """
+    quizzes = QuizAttempt.objects.all()
+    blocks = SkillBlock.objects.all()
+    return queryset.annotate(
+        avg_quiz_score=_student_subquery(quizzes, student_field, Avg('score')),
+        total_quiz_attempts=Coalesce(
+            _student_subquery(quizzes, student_field, Count('id')), 0
+        ),
+        failed_quiz_count=Coalesce(
+            _student_subquery(quizzes, student_field, Count('id', filter=Q(score__lt=FAIL_SCORE))), 0
+        ),
+        last_active=_student_subquery(
+            LearningSession.objects.all(), student_field, Max('start_time')
+        ),
+        skill_blocks_earned=Coalesce(
+            _student_subquery(blocks, student_field, Count('id', filter=Q(is_earned=True))), 0
+        ),
+        skill_blocks_total=Coalesce(
+            _student_subquery(blocks, student_field, Count('id')), 0
+        ),
+    )
+
+
+def recent_quiz_averages(student_ids, limit=RECENT_QUIZ_WINDOW):
+    """학생별 최근 N회 퀴즈 평균 (윈도우 함수 1회 쿼리) → {student_id: avg}"""
+    rows = (
+        QuizAttempt.objects.filter(student_id__in=student_ids)
+        .annotate(rn=Window(
+            expression=RowNumber(),
+            partition_by=[F('student_id')],
+            order_by=F('submitted_at').desc(),
+        ))
+        .filter(rn__lte=limit)
+        .values_list('student_id', 'score')
+    )
+    totals = {}
+    for sid, score in rows:
+        total, count = totals.get(sid, (0, 0))
+        totals[sid] = (total + score, count + 1)
+    return {sid: total / count for sid, (total, count) in totals.items()}
+
+
+def get_risk_factors(days_inactive, avg_score, failed_count):
+    """위험 요인 라벨 목록"""
+    factors = []
+    if days_inactive >= INACTIVE_DAYS_HIGH:
+        factors.append('2주 이상 미접속')
+    elif days_inactive >= INACTIVE_DAYS_MEDIUM:
+        factors.append('1주 이상 미접속')
+    if avg_score < FAIL_SCORE:
+        factors.append('퀴즈 평균 60점 미만')
+    if avg_score == 0:
+        factors.append('퀴즈 미응시')
+    if failed_count >= FAIL_COUNT_THRESHOLD:
+        factors.append(f'퀴즈 {failed_count}회 낙제')
+    return factors
+
+
+def score_at_risk_students(student_ids, now=None):
+    """
+    학생 집합의 이탈 위험도를 일괄 산출 (쿼리 2회).
+    알림 발송 등에서도 재사용할 수 있도록 View와 분리.
+
+    Returns:
+        {student_id: {
+            'last_active', 'days_inactive', 'recent_avg_score',
+            'failed_quiz_count', 'is_at_risk', 'risk_level', 'risk_factors',
+        }}
+    """
+    from users.models import User
+
+    now = now or timezone.now()
+    student_ids = list(student_ids)
+    if not student_ids:
+        return {}
+
+    students = annotate_student_activity(
+        User.objects.filter(id__in=student_ids), student_field='pk'
+    ).values_list('id', 'last_active', 'failed_quiz_count')
+    recent_avgs = recent_quiz_averages(student_ids)
+
+    scores = {}
+    for sid, last_active, failed_count in students:
+        days_inactive = (now - last_active).days if last_active else NEVER_ACTIVE_DAYS
+        avg_recent = recent_avgs.get(sid, 0)
+        scores[sid] = {
+            'last_active': last_active,
+            'days_inactive': days_inactive,
+            'recent_avg_score': round(avg_recent, 1),
+            'failed_quiz_count': failed_count,
+            'is_at_risk': days_inactive >= INACTIVE_DAYS_MEDIUM,
+            'risk_level': 'HIGH' if days_inactive >= INACTIVE_DAYS_HIGH else 'MEDIUM',
+            'risk_factors': get_risk_factors(days_inactive, avg_recent, failed_count),
+        }
+    return scores
+
+
+def at_risk_student_ids(student_ids, now=None):
+    """최근 7일 활동이 없는 학생 ID 집합 (쿼리 1회)"""
+    now = now or timezone.now()
+    student_ids = set(student_ids)
+    active = set(LearningSession.objects.filter(
+        student_id__in=student_ids,
+        start_time__gte=now - timedelta(days=INACTIVE_DAYS_MEDIUM),
+    ).values_list('student_id', flat=True).distinct())
+    return student_ids - active
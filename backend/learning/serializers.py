@@ -199,7 +199,7 @@ class CurriculumItemSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = CurriculumItem
-        fields = ['id', 'lecture', 'lecture_title', 'title', 'item_type',
+        fields = ['id', 'lecture', 'lecture_title', 'skill', 'title', 'item_type',
                   'order_index', 'is_completed', 'is_supplementary',
                   'completed_at', 'created_at']
 
@@ -212,7 +212,7 @@ class ReroutingLogSerializer(serializers.ModelSerializer):
     class Meta:
         model = ReroutingLog
         fields = ['id', 'reason', 'reason_display', 'reason_detail',
-                  'old_path', 'new_path', 'items_added', 'items_removed',
+                  'old_path', 'new_path', 'items_added', 'items_removed', 'diff',
                   'ai_recommendation', 'created_at']
 
 
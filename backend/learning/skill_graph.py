@@ -0,0 +1,152 @@
+"""
+Phase 3: 역량 선수관계 그래프 엔진 (View 아님)
+Skill / SkillPrerequisite / CareerGoal.required_skills를 메모리 그래프로 컴파일해 프로세스에 캐시하고,
+  - 위상 정렬 (선수 역량 먼저, 같은 단계는 난이도 → 카테고리 → 표시 순서)
+  - 목표 직무까지의 최단 학습 경로 (목표 필요 역량의 선수 폐포 − 보유 역량, 위상 순서)
+를 LLM 없이 결정적으로 계산한다. 선수관계는 모두 AND 조건이므로 폐포에서 보유분을 뺀 집합이 최소 경로.
+직무별 폐포는 그래프 객체 안에 메모이즈, Skill / 선수관계 / 직무 필요 역량 변경 시 캐시 버전 증가 → 재빌드 (process_cache)
+"""
+import heapq
+import threading
+
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from .models import Skill, SkillPrerequisite, CareerGoal
+from .process_cache import VersionedProcessCache
+
+
+class SkillGraph:
+    """
+    skills: [(id, name, category, difficulty_level, order)]
+    edges: [(skill_id, prerequisite_id)], goals: [(career_goal_id, skill_id)]
+    """
+
+    def __init__(self, skills, edges, goals):
+        self.names = {}
+        self.sort_key = {}
+        for skill_id, name, category, difficulty, order in skills:
+            self.names[skill_id] = name
+            self.sort_key[skill_id] = (difficulty, category, order, skill_id)
+
+        self.prereqs = {sid: set() for sid in self.names}
+        self.dependents = {sid: set() for sid in self.names}
+        for skill_id, prereq_id in edges:
+            if skill_id in self.names and prereq_id in self.names:
+                self.prereqs[skill_id].add(prereq_id)
+                self.dependents[prereq_id].add(skill_id)
+
+        self.goal_skills = {}
+        for goal_id, skill_id in goals:
+            if skill_id in self.names:
+                self.goal_skills.setdefault(goal_id, set()).add(skill_id)
+
+        self._closures = {}
+        self._closure_lock = threading.Lock()
+
+    def ancestors(self, skill_ids):
+        """skill_ids + 모든 (간접) 선수 역량"""
+        seen = set()
+        stack = [sid for sid in skill_ids if sid in self.names]
+        while stack:
+            sid = stack.pop()
+            if sid in seen:
+                continue
+            seen.add(sid)
+            stack.extend(self.prereqs[sid] - seen)
+        return seen
+
+    def goal_closure(self, goal_id):
+        """직무 필요 역량의 선수 폐포 (메모이즈)"""
+        closure = self._closures.get(goal_id)
+        if closure is None:
+            closure = frozenset(self.ancestors(self.goal_skills.get(goal_id, ())))
+            with self._closure_lock:
+                self._closures[goal_id] = closure
+        return closure
+
+    def topological_order(self, skill_ids):
+        """부분 집합 위상 정렬 (집합 밖 역량을 거치는 간접 선수관계도 반영, 순환 구간은 뒤에 정렬 순으로)"""
+        subset = set(skill_ids) & self.names.keys()
+        # 집합 밖 선수 역량을 건너뛰어 집합 내 선수만 남김
+        within = {sid: self._subset_prereqs(sid, subset) for sid in subset}
+        indegree = {sid: len(p) for sid, p in within.items()}
+        children = {sid: [] for sid in subset}
+        for sid, prereqs in within.items():
+            for p in prereqs:
+                children[p].append(sid)
+
+        heap = [(self.sort_key[sid], sid) for sid, d in indegree.items() if d == 0]
+        heapq.heapify(heap)
+        order = []
+        while heap:
+            _, sid = heapq.heappop(heap)
+            order.append(sid)
+            for child in children[sid]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    heapq.heappush(heap, (self.sort_key[child], child))
+        if len(order) < len(subset):
+            placed = set(order)
+            order.extend(sorted(subset - placed, key=self.sort_key.get))
+        return order
+
+    def _subset_prereqs(self, skill_id, subset):
+        found, seen = set(), set()
+        stack = list(self.prereqs[skill_id])
+        while stack:
+            sid = stack.pop()
+            if sid in seen or sid == skill_id:
+                continue
+            seen.add(sid)
+            if sid in subset:
+                found.add(sid)
+            else:
+                stack.extend(self.prereqs[sid])
+        return found
+
+    def learning_path(self, goal_id, owned_ids=()):
+        """목표 직무까지 배워야 할 역량 ID 목록 (위상 순서)"""
+        return self.topological_order(self.goal_closure(goal_id) - set(owned_ids))
+
+    def missing_prerequisites(self, skill_id, owned_ids=()):
+        """skill을 배우기 전에 필요한데 아직 없는 선수 역량 (위상 순서)"""
+        return self.topological_order(self.ancestors([skill_id]) - {skill_id} - set(owned_ids))
+
+    def would_create_cycle(self, skill_id, prerequisite_id):
+        """prerequisite → skill 간선 추가 시 순환 여부 (skill이 이미 prerequisite의 선수인지)"""
+        return skill_id == prerequisite_id or skill_id in self.ancestors([prerequisite_id])
+
+
+def _build_graph():
+    return SkillGraph(
+        list(Skill.objects.values_list('id', 'name', 'category', 'difficulty_level', 'order')),
+        list(SkillPrerequisite.objects.values_list('skill_id', 'prerequisite_id')),
+        list(CareerGoal.required_skills.through.objects.values_list('careergoal_id', 'skill_id')),
+    )
+
+
+_graph_cache = VersionedProcessCache('learning:skill_graph:version', _build_graph)
+
+
+def get_skill_graph():
+    """캐시된 그래프 (변경 시 자동 재빌드)"""
+    return _graph_cache.get()
+
+
+def invalidate_skill_graph():
+    _graph_cache.invalidate()
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=SkillPrerequisite)
+@receiver(post_delete, sender=SkillPrerequisite)
+def _graph_changed(sender, **kwargs):
+    invalidate_skill_graph()
+
+
+@receiver(m2m_changed, sender=CareerGoal.required_skills.through)
+def _goal_skills_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_skill_graph()
@@ -0,0 +1,153 @@
+"""
+Phase 3: 스킬 이름 사전 기반 개념 태거 (View 아님)
+Skill 테이블을 Aho-Corasick 오토마톤으로 컴파일해 프로세스 메모리에 캐시하고,
+퀴즈 문제 / 형성평가 concept_tag / Weak Zone 주제에서 등장하는 스킬 ID를 텍스트 길이에 비례하는 시간으로 찾는다.
+Skill 저장/삭제 시 캐시 버전을 올려 다음 호출 때 재빌드 (apps.ready에서 시그널 등록)
+(버전 키 캐시의 워커 간 전파 범위는 process_cache 참고)
+"""
+from collections import deque
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Skill
+from .process_cache import VersionedProcessCache
+
+
+class SkillTagger:
+    """
+    skills: [(skill_id, name), ...] — Skill 기본 정렬(category, order) 순서
+    결과 ID 목록도 이 순서를 따른다 (첫 번째 = 기존 '첫 매칭 스킬')
+    """
+
+    def __init__(self, skills):
+        self.rank = {}
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        names = []
+
+        for rank, (skill_id, name) in enumerate(skills):
+            key = (name or '').strip().lower()
+            if not key:
+                continue
+            self.rank[skill_id] = rank
+            names.append((key, skill_id))
+            node = 0
+            for ch in key:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    nxt = len(self._goto) - 1
+                    self._goto[node][ch] = nxt
+                node = nxt
+            self._out[node].append(skill_id)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+                queue.append(nxt)
+
+        # 역방향 조회(태그가 스킬 이름의 일부인 경우)용: 이름을 한 문자열로 이어 붙여 str.find로 스캔
+        self._haystack = '\n'.join(key for key, _ in names)
+        self._starts, self._ids = [], []
+        offset = 0
+        for key, skill_id in names:
+            self._starts.append(offset)
+            self._ids.append(skill_id)
+            offset += len(key) + 1
+
+    def _sorted(self, ids):
+        return sorted(ids, key=self.rank.get)
+
+    def tag(self, text):
+        """text 안에 이름이 등장하는 스킬 ID 목록"""
+        goto, fail, out = self._goto, self._fail, self._out
+        node, found = 0, set()
+        for ch in (text or '').lower():
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return self._sorted(found)
+
+    def containing(self, tag):
+        """이름에 tag가 포함된 스킬 ID 목록 (기존 name__icontains 동작)"""
+        tag = (tag or '').strip().lower()
+        if not tag or '\n' in tag:
+            return []
+        found, pos = set(), self._haystack.find(tag)
+        while pos != -1:
+            idx = self._bisect(pos)
+            found.add(self._ids[idx])
+            # 같은 이름 안의 중복 위치는 건너뛰고 다음 이름부터 재탐색
+            next_start = self._starts[idx + 1] if idx + 1 < len(self._starts) else len(self._haystack)
+            pos = self._haystack.find(tag, next_start)
+        return self._sorted(found)
+
+    def _bisect(self, pos):
+        lo, hi = 0, len(self._starts) - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self._starts[mid] <= pos:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo
+
+    def concept(self, tag):
+        """개념 태그 → 스킬 ID: 이름에 태그가 포함된 스킬 우선, 없으면 태그 안에 등장하는 스킬"""
+        return self.containing(tag) or self.tag(tag)
+
+
+def _build_tagger():
+    skills = Skill.objects.order_by('category', 'order', 'id').values_list('id', 'name')
+    return SkillTagger(list(skills))
+
+
+_tagger_cache = VersionedProcessCache('learning:skill_tagger:version', _build_tagger)
+
+
+def get_tagger():
+    """캐시된 태거 (Skill 변경 시 자동 재빌드)"""
+    return _tagger_cache.get()
+
+
+def invalidate_skill_tagger():
+    _tagger_cache.invalidate()
+
+
+def tag_skills(text):
+    """자유 텍스트(퀴즈 문제, Weak Zone 주제) → 스킬 ID 목록"""
+    return get_tagger().tag(text)
+
+
+def concept_skills(tag):
+    """형성평가 concept_tag → 스킬 ID 목록"""
+    return get_tagger().concept(tag)
+
+
+def tag_formative_questions(questions):
+    """형성평가 문항 목록 → {concept_tag: [스킬 ID, ...]} (매칭 없는 태그도 빈 목록으로 기록)"""
+    tagger = get_tagger()
+    tags = {}
+    for q in questions or []:
+        tag = q.get('concept_tag') if isinstance(q, dict) else None
+        if tag and tag not in tags:
+            tags[tag] = tagger.concept(tag)
+    return tags
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def _skill_changed(sender, **kwargs):
+    invalidate_skill_tagger()
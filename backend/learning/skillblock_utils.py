@@ -0,0 +1,208 @@
+"""
+스킬블록 일괄 계산/저장 헬퍼 (View 아님)
+학생 N명의 강의 단위 집계(체크포인트 정답률 / 형성평가 평균 / 펄스 이해도)를 학생별 GROUP BY 3회로 구하고,
+SkillBlock / StudentSkill을 bulk upsert(ON CONFLICT DO UPDATE)로 기록한다.
+SyncSkillBlocksView(학생 1명)와 recompute_skill_blocks 커맨드 / 세션 종료 후 작업(강의 전체)이 공용으로 사용.
+"""
+import threading
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, Q, Avg
+from django.utils import timezone
+
+from .models import (
+    SkillBlock, StudentSkill, Lecture, PlacementResult, StudentGoal, CareerGoal,
+    LiveSession, LiveParticipant, LiveQuizResponse, PulseLog, FormativeResponse,
+)
+
+LEVEL_MAP = {'BEGINNER': 1, 'INTERMEDIATE': 2, 'ADVANCED': 3}
+DEFAULT_LEVEL = 2
+EARN_THRESHOLD = 60  # 종합 60점 이상이면 블록 획득
+DEFAULT_UNDERSTAND = 50  # 펄스 기록이 없으면 중간값
+BATCH_SIZE = 500
+
+
+def placement_level(value):
+    """PlacementResult.level(1~3 또는 'BEGINNER' 등) → 블록 레벨"""
+    if value in (1, 2, 3):
+        return value
+    return LEVEL_MAP.get(value, DEFAULT_LEVEL)
+
+
+def lecture_student_ids(lecture):
+    """강의 수강생 + 라이브 세션 참가자"""
+    ids = set(lecture.students.values_list('id', flat=True))
+    ids.update(
+        LiveParticipant.objects.filter(live_session__lecture=lecture).values_list('student_id', flat=True)
+    )
+    return sorted(ids)
+
+
+def student_scores(lecture, student_ids):
+    """
+    학생별 (checkpoint, formative, understand) — 종료된 세션 기준, 쿼리 3회
+    """
+    ended = LiveSession.objects.filter(lecture=lecture, status='ENDED').values('id')
+
+    quiz = {
+        row['student']: row
+        for row in LiveQuizResponse.objects.filter(
+            student_id__in=student_ids, quiz__live_session__in=ended,
+        ).order_by().values('student').annotate(
+            total=Count('id'), correct=Count('id', filter=Q(is_correct=True)),
+        )
+    }
+    formative = dict(
+        FormativeResponse.objects.filter(
+            student_id__in=student_ids, assessment__live_session__in=ended,
+        ).order_by().values('student').annotate(avg=Avg('score')).values_list('student', 'avg')
+    )
+    pulse = {
+        row['student']: row
+        for row in PulseLog.objects.filter(
+            student_id__in=student_ids, live_session__in=ended,
+        ).order_by().values('student').annotate(
+            total=Count('id'), understand=Count('id', filter=Q(pulse_type='UNDERSTAND')),
+        )
+    }
+
+    scores = {}
+    for sid in student_ids:
+        q = quiz.get(sid)
+        p = pulse.get(sid)
+        checkpoint = (q['correct'] / q['total'] * 100) if q and q['total'] else 0
+        understand = (p['understand'] / p['total'] * 100) if p and p['total'] else DEFAULT_UNDERSTAND
+        scores[sid] = (checkpoint, formative.get(sid) or 0, understand)
+    return scores
+
+
+def student_levels(lecture, student_ids):
+    """학생별 최신 배치고사 레벨 (쿼리 1회)"""
+    levels = {}
+    for sid, level in PlacementResult.objects.filter(
+        student_id__in=student_ids, lecture=lecture,
+    ).order_by('student_id', '-created_at').values_list('student_id', 'level'):
+        levels.setdefault(sid, placement_level(level))
+    return levels
+
+
+def student_skill_ids(student_ids):
+    """
+    학생별 대상 스킬: 최신 목표 직무의 required_skills, 목표가 없으면 보유 StudentSkill의 스킬 (쿼리 3회)
+    """
+    goal_of = {}
+    for sid, goal_id in StudentGoal.objects.filter(
+        student_id__in=student_ids,
+    ).order_by('student_id', '-updated_at').values_list('student_id', 'career_goal_id'):
+        goal_of.setdefault(sid, goal_id)
+
+    goal_skills = defaultdict(list)
+    goal_ids = {gid for gid in goal_of.values() if gid}
+    if goal_ids:
+        for gid, skill_id in CareerGoal.required_skills.through.objects.filter(
+            careergoal_id__in=goal_ids,
+        ).values_list('careergoal_id', 'skill_id'):
+            goal_skills[gid].append(skill_id)
+
+    owned_skills = defaultdict(list)
+    for sid, skill_id in StudentSkill.objects.filter(
+        student_id__in=student_ids,
+    ).order_by().values_list('student_id', 'skill_id'):
+        owned_skills[sid].append(skill_id)
+
+    result = {}
+    for sid in student_ids:
+        gid = goal_of.get(sid)
+        # 목표 직무가 있으면 (스킬이 비어 있더라도) 목표 기준
+        result[sid] = goal_skills.get(gid, []) if gid else owned_skills.get(sid, [])
+    return result
+
+
+def sync_skill_blocks(lecture, student_ids, now=None):
+    """
+    학생 목록의 스킬블록 재계산 + bulk upsert
+    반환: {student_id: {'level': int, 'blocks': [{skill_id, checkpoint_score, ..., is_earned}]}}
+    """
+    now = now or timezone.now()
+    student_ids = list(student_ids)
+    scores = student_scores(lecture, student_ids)
+    levels = student_levels(lecture, student_ids)
+    skills_of = student_skill_ids(student_ids)
+
+    # 이미 획득한 블록의 earned_at 유지
+    earned_at = dict(
+        ((sid, skill_id), at)
+        for sid, skill_id, at in SkillBlock.objects.filter(
+            lecture=lecture, student_id__in=student_ids, is_earned=True,
+        ).values_list('student_id', 'skill_id', 'earned_at')
+    )
+
+    blocks, owned, result = [], [], {}
+    for sid in student_ids:
+        checkpoint, formative, understand = scores[sid]
+        # 종합 점수 (가중 평균: 체크포인트 40% + 형성평가 35% + 이해도 25%)
+        total = checkpoint * 0.4 + formative * 0.35 + understand * 0.25
+        is_earned = total >= EARN_THRESHOLD
+        level = levels.get(sid, DEFAULT_LEVEL)
+        row = {
+            'level': level,
+            'checkpoint_score': round(checkpoint, 1),
+            'formative_score': round(formative, 1),
+            'understand_score': round(understand, 1),
+            'total_score': round(total, 1),
+            'is_earned': is_earned,
+        }
+
+        result[sid] = {'level': level, 'blocks': []}
+        for skill_id in dict.fromkeys(skills_of.get(sid, [])):
+            blocks.append(SkillBlock(
+                student_id=sid, skill_id=skill_id, lecture=lecture,
+                earned_at=(earned_at.get((sid, skill_id)) or now) if is_earned else None,
+                **row,
+            ))
+            if is_earned:
+                # StudentSkill 연동 → OWNED
+                owned.append(StudentSkill(
+                    student_id=sid, skill_id=skill_id, status='OWNED', progress=min(int(total), 100),
+                ))
+            result[sid]['blocks'].append({'skill_id': skill_id, **row})
+
+    with transaction.atomic():
+        SkillBlock.objects.bulk_create(
+            blocks, batch_size=BATCH_SIZE,
+            update_conflicts=True, unique_fields=['student', 'skill', 'lecture'],
+            update_fields=['level', 'checkpoint_score', 'formative_score', 'understand_score',
+                           'total_score', 'is_earned', 'earned_at'],
+        )
+        StudentSkill.objects.bulk_create(
+            owned, batch_size=BATCH_SIZE,
+            update_conflicts=True, unique_fields=['student', 'skill'],
+            update_fields=['status', 'progress', 'updated_at'],
+        )
+    return result
+
+
+def recompute_lecture_blocks(lecture_id, batch_size=BATCH_SIZE):
+    """강의 전체 학생 스킬블록 재계산 (세션 종료 후 작업 / 커맨드). 처리 학생 수, 블록 수 반환"""
+    lecture = Lecture.objects.get(id=lecture_id)
+    student_ids = lecture_student_ids(lecture)
+    block_count = 0
+    for start in range(0, len(student_ids), batch_size):
+        result = sync_skill_blocks(lecture, student_ids[start:start + batch_size])
+        block_count += sum(len(r['blocks']) for r in result.values())
+    return len(student_ids), block_count
+
+
+def recompute_lecture_blocks_async(lecture_id):
+    def _run():
+        try:
+            students, blocks = recompute_lecture_blocks(lecture_id)
+            print(f"🧱 [SkillBlock] 강의 #{lecture_id} 스킬블록 재계산: 학생 {students}명, 블록 {blocks}개")
+        except Exception as e:
+            print(f"⚠️ [SkillBlock] 강의 #{lecture_id} 스킬블록 재계산 실패: {e}")
+
+    thread = threading.Thread(target=_run)
+    thread.daemon = True
+    thread.start()
+    return thread
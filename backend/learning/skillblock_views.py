@@ -8,20 +8,18 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
-from django.db.models import Count, Q, Avg
+from django.db.models import Count, Q
 from django.utils import timezone
 
 from .models import (
-    SkillBlock, Skill, StudentSkill, Lecture, PlacementResult,
-    LiveSession, LiveQuizResponse, PulseLog, FormativeResponse,
+    SkillBlock, StudentSkill, Lecture, PlacementResult,
     FormativeAssessment, StudentChecklist, LearningObjective,
 )
+from .skillblock_utils import sync_skill_blocks, placement_level, LEVEL_MAP
 
 
-LEVEL_MAP = {'BEGINNER': 1, 'INTERMEDIATE': 2, 'ADVANCED': 3}
 LEVEL_EMOJIS = {1: '🌱', 2: '🌿', 3: '🌸'}
 LEVEL_NAMES = {1: '씨앗', 2: '새싹', 3: '꽃'}
-EARN_THRESHOLD = 60  # 종합 60점 이상이면 블록 획득
 
 
 class SyncSkillBlocksView(APIView):
@@ -34,94 +32,34 @@ class SyncSkillBlocksView(APIView):
         lecture = get_object_or_404(Lecture, id=lecture_id)
         student = request.user
 
-        # 현재 레벨
-        pr = PlacementResult.objects.filter(
-            student=student, lecture=lecture
-        ).order_by('-created_at').first()
-        level = LEVEL_MAP.get(pr.level, 2) if pr else 2
-
-        # 강의에 연결된 스킬 (CareerGoal → required_skills)
-        from .models import CareerGoal, StudentGoal
-        student_goal = StudentGoal.objects.filter(student=student).first()
-        if student_goal and student_goal.career_goal:
-            skills = student_goal.career_goal.required_skills.all()
-        else:
-            # 강의에 관련된 StudentSkill에서 역추적
-            skills = Skill.objects.filter(
-                student_records__student=student
-            ).distinct()
-
-        if not skills.exists():
+        # 학생별 집계(퀴즈/형성평가/펄스)는 스킬 수와 무관하게 한 번씩만 계산, 블록은 bulk upsert
+        result = sync_skill_blocks(lecture, [student.id])[student.id]
+        level = result['level']
+        if not result['blocks']:
             return Response({'message': '연결된 스킬이 없습니다.', 'blocks': []})
 
-        ended_sessions = LiveSession.objects.filter(lecture=lecture, status='ENDED')
+        blocks = {
+            b.skill_id: b for b in SkillBlock.objects.filter(
+                student=student, lecture=lecture, skill_id__in=[r['skill_id'] for r in result['blocks']],
+            ).select_related('skill')
+        }
         blocks_data = []
-        earned_count = 0
-
-        for skill in skills:
-            # 1. 체크포인트 통과율 (퀴즈 정답률)
-            qr = LiveQuizResponse.objects.filter(
-                student=student, quiz__live_session__in=ended_sessions
-            )
-            qt = qr.count()
-            qc = qr.filter(is_correct=True).count()
-            checkpoint = (qc / qt * 100) if qt > 0 else 0
-
-            # 2. 형성평가 점수
-            fa_resps = FormativeResponse.objects.filter(
-                student=student, assessment__live_session__in=ended_sessions
-            )
-            fa_avg = 0
-            if fa_resps.exists():
-                agg = fa_resps.aggregate(avg=Avg('score'))
-                fa_avg = agg['avg'] or 0
-
-            # 3. 이해도 (펄스)
-            pulses = PulseLog.objects.filter(
-                student=student, live_session__in=ended_sessions
-            )
-            pt = pulses.count()
-            pu = pulses.filter(pulse_type='UNDERSTAND').count()
-            understand = (pu / pt * 100) if pt > 0 else 50
-
-            # 종합 점수 (가중 평균: 체크포인트 40% + 형성평가 35% + 이해도 25%)
-            total = checkpoint * 0.4 + fa_avg * 0.35 + understand * 0.25
-            is_earned = total >= EARN_THRESHOLD
-
-            block, _ = SkillBlock.objects.update_or_create(
-                student=student, skill=skill, lecture=lecture,
-                defaults={
-                    'level': level,
-                    'checkpoint_score': round(checkpoint, 1),
-                    'formative_score': round(fa_avg, 1),
-                    'understand_score': round(understand, 1),
-                    'total_score': round(total, 1),
-                    'is_earned': is_earned,
-                    'earned_at': timezone.now() if is_earned else None,
-                }
-            )
-
-            if is_earned:
-                earned_count += 1
-                # StudentSkill 연동 → OWNED
-                StudentSkill.objects.update_or_create(
-                    student=student, skill=skill,
-                    defaults={'status': 'OWNED', 'progress': min(int(total), 100)}
-                )
-
+        for r in result['blocks']:
+            block = blocks[r['skill_id']]
             blocks_data.append({
                 'id': block.id,
-                'skill_name': skill.name,
-                'skill_category': skill.get_category_display(),
+                'skill_name': block.skill.name,
+                'skill_category': block.skill.get_category_display(),
                 'level': level,
                 'emoji': LEVEL_EMOJIS[level],
                 'level_name': LEVEL_NAMES[level],
-                'checkpoint_score': round(checkpoint, 1),
-                'formative_score': round(fa_avg, 1),
-                'understand_score': round(understand, 1),
-                'total_score': round(total, 1),
-                'is_earned': is_earned,
+                'checkpoint_score': r['checkpoint_score'],
+                'formative_score': r['formative_score'],
+                'understand_score': r['understand_score'],
+                'total_score': r['total_score'],
+                'is_earned': r['is_earned'],
             })
+        earned_count = sum(1 for b in blocks_data if b['is_earned'])
 
         return Response({
             'blocks': blocks_data,
@@ -209,7 +147,7 @@ class MockInterviewDataView(APIView):
 
         # 현재 레벨
         pr = PlacementResult.objects.filter(student=student).order_by('-created_at').first()
-        level = LEVEL_MAP.get(pr.level, 2) if pr else 2
+        level = placement_level(pr.level) if pr else 2
 
         # 모의면접 멘트 생성
         remaining_count = remaining.count()
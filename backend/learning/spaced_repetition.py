@@ -0,0 +1,213 @@
+"""
+Phase 2-3: 간격 반복(SR) 주기 테이블 헬퍼
+SpacedRepetitionItem.schedule(JSON)과 SpacedRepetitionReview(정규화 테이블)를 함께 기록하고,
+due 조회를 인덱스 범위 스캔으로 처리한다. 다음 복습 시점은 sr_scheduler가 계산 (View 아님)
+"""
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import SpacedRepetitionItem, SpacedRepetitionReview
+from .sr_scheduler import GOOD, LEARNING_STEP, get_scheduler, interval_label, rate_answer
+
+
+def parse_due_at(value):
+    """schedule JSON의 due_at(ISO 문자열) → naive datetime (USE_TZ=False). 파싱 불가면 None"""
+    if not value:
+        return None
+    try:
+        due_at = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    if timezone.is_aware(due_at):
+        due_at = timezone.make_naive(due_at)
+    return due_at
+
+
+def build_reviews(item):
+    """item.schedule → 저장 전 SpacedRepetitionReview 목록 (due_at 없는 항목은 제외)"""
+    reviews = []
+    for entry in item.schedule or []:
+        due_at = parse_due_at(entry.get('due_at'))
+        if due_at is None or entry.get('review_num') is None:
+            continue
+        reviews.append(SpacedRepetitionReview(
+            item=item,
+            student_id=item.student_id,
+            review_num=entry['review_num'],
+            label=(entry.get('label') or '')[:50],
+            due_at=due_at,
+            # JSON에는 완료 시각이 없으므로 예정 시각으로 대체
+            completed_at=due_at if entry.get('completed') else None,
+        ))
+    return reviews
+
+
+def _schedule_entry(review):
+    return {
+        'review_num': review.review_num,
+        'label': review.label,
+        'due_at': review.due_at.isoformat(),
+        'completed': review.completed_at is not None,
+    }
+
+
+def new_sr_item(now=None, **fields):
+    """
+    저장 전 SpacedRepetitionItem (bulk_create용)
+    schedule을 넘기지 않으면 스케줄러 첫 주기(LEARNING_STEP 후) 1개로 시작
+    """
+    now = now or timezone.now()
+    scheduler = get_scheduler(fields.get('scheduler'))
+    fields['scheduler'] = scheduler.name
+    fields.setdefault('scheduler_state', scheduler.initial_state())
+    if 'schedule' not in fields:
+        fields['schedule'] = [{
+            'review_num': 1,
+            'label': interval_label(LEARNING_STEP),
+            'due_at': (now + LEARNING_STEP).isoformat(),
+            'completed': False,
+        }]
+    return SpacedRepetitionItem(**fields)
+
+
+def create_sr_item(now=None, **fields):
+    """SpacedRepetitionItem 생성 + 주기 테이블 동시 기록"""
+    with transaction.atomic():
+        item = new_sr_item(now=now, **fields)
+        item.save()
+        SpacedRepetitionReview.objects.bulk_create(build_reviews(item))
+    return item
+
+
+def due_reviews(student, now=None):
+    """
+    학생의 지금 복습할 주기 (항목별 가장 이른 미완료 주기만)
+    (student, due_at) 부분 인덱스 범위 스캔 1회
+    """
+    now = now or timezone.now()
+    rows = SpacedRepetitionReview.objects.filter(
+        student=student, completed_at__isnull=True, due_at__lte=now,
+    ).select_related('item').order_by('due_at', 'review_num')
+
+    seen = set()
+    due = []
+    for review in rows:
+        if review.item_id in seen:
+            continue
+        seen.add(review.item_id)
+        due.append(review)
+    return due
+
+
+def reviews_due_within(window=timedelta(hours=1), now=None):
+    """
+    전체 학생 대상: [now, now + window) 사이에 도래하는 미완료 주기 (푸시 리마인더용)
+    due_at 부분 인덱스 범위 스캔
+    """
+    now = now or timezone.now()
+    return SpacedRepetitionReview.objects.filter(
+        completed_at__isnull=True, due_at__gte=now, due_at__lt=now + window,
+    ).select_related('item', 'student')
+
+
+def record_review(item, is_correct, response_ms=None, now=None):
+    """
+    가장 이른 미완료 주기에 응답 기록 → 스케줄러로 다음 주기 1개 생성 (테이블 + JSON 동시 갱신)
+    오답(AGAIN)은 LEARNING_STEP 뒤 재학습, 간격이 MAX_INTERVAL_DAYS를 넘으면 졸업(다음 주기 없음)
+    반환: {review_num, rating, next_due_at} / 미완료 주기가 없으면 None
+    """
+    now = now or timezone.now()
+    rating = rate_answer(is_correct, response_ms)
+
+    with transaction.atomic():
+        item = SpacedRepetitionItem.objects.select_for_update().get(pk=item.pk)
+        open_reviews = list(item.reviews.filter(completed_at__isnull=True).order_by('review_num'))
+        if not open_reviews:
+            return None
+        current = open_reviews[0]
+
+        scheduler = get_scheduler(item.scheduler)
+        last = item.last_reviewed_at or item.created_at
+        elapsed_days = max(0.0, (now - last).total_seconds() / 86400)
+        state, interval_days = scheduler.review(item.scheduler_state, rating, elapsed_days)
+        delay = scheduler.next_delay(interval_days)
+
+        current.completed_at = now
+        current.rating = rating
+        current.response_ms = response_ms
+        current.save(update_fields=['completed_at', 'rating', 'response_ms'])
+
+        # 미리 잡혀 있던 이후 주기(고정 스케줄 시절 데이터)는 스케줄러 결과로 대체
+        stale_nums = {r.review_num for r in open_reviews[1:]}
+        if stale_nums:
+            item.reviews.filter(review_num__in=stale_nums).delete()
+
+        next_review = None
+        if delay is not None:
+            last_num = item.reviews.aggregate(m=Max('review_num'))['m'] or current.review_num
+            next_review = SpacedRepetitionReview.objects.create(
+                item=item, student_id=item.student_id, review_num=last_num + 1,
+                label=interval_label(delay), due_at=now + delay,
+            )
+
+        schedule = [e for e in (item.schedule or []) if e.get('review_num') not in stale_nums]
+        entry = next((e for e in schedule if e.get('review_num') == current.review_num), None)
+        if entry is None:
+            schedule.append(_schedule_entry(current))
+        else:
+            entry['completed'] = True
+        if next_review:
+            schedule.append(_schedule_entry(next_review))
+
+        item.schedule = schedule
+        item.scheduler_state = state
+        item.scheduler = scheduler.name
+        item.last_reviewed_at = now
+        item.current_review = current.review_num
+        item.save(update_fields=['schedule', 'scheduler_state', 'scheduler', 'last_reviewed_at', 'current_review'])
+
+    return {
+        'review_num': current.review_num,
+        'rating': rating,
+        'next_due_at': next_review.due_at if next_review else None,
+    }
+
+
+def plan_reschedule(item, reviews, scheduler):
+    """
+    응답 이력을 스케줄러로 재생해 다음 주기를 다시 계산 (일괄 재스케줄용, DB 쓰기 없음)
+    reviews: item의 전체 주기 목록. 이력이 없는 항목은 가장 이른 미완료 주기만 남긴다.
+    반환: (keep_review | None, 삭제할 review id 목록) — item 필드와 keep_review는 메모리에서 수정됨
+    """
+    done = sorted((r for r in reviews if r.completed_at), key=lambda r: (r.completed_at, r.review_num))
+    pending = sorted((r for r in reviews if not r.completed_at), key=lambda r: r.review_num)
+
+    history, last = [], item.created_at
+    for r in done:
+        # 평점이 없는 과거 완료 기록(고정 스케줄 시절)은 정답(GOOD)으로 간주
+        history.append((r.rating or GOOD, max(0.0, (r.completed_at - last).total_seconds() / 86400)))
+        last = r.completed_at
+    state, interval_days = scheduler.replay(history)
+
+    item.scheduler = scheduler.name
+    item.scheduler_state = state
+    item.last_reviewed_at = done[-1].completed_at if done else None
+
+    keep = pending[0] if pending else None
+    if done:
+        delay = scheduler.next_delay(interval_days)
+        if delay is None:
+            keep = None
+        elif keep is None:
+            keep = SpacedRepetitionReview(item=item, student_id=item.student_id,
+                                          review_num=max(r.review_num for r in reviews) + 1)
+        if keep is not None:
+            keep.due_at = last + delay
+            keep.label = interval_label(delay)
+
+    delete_ids = [r.id for r in pending if keep is None or r.id != keep.id]
+    item.schedule = [_schedule_entry(r) for r in done] + ([_schedule_entry(keep)] if keep else [])
+    return keep, delete_ids
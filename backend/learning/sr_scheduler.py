@@ -0,0 +1,156 @@
+"""
+Phase 2-3: 간격 반복(SR) 스케줄러 엔진 (SM-2 / FSRS)
+응답 정오 + 응답 시간으로 평점(1~4)을 매기고, 항목별 상태(scheduler_state)로 다음 간격을 계산한다.
+모델/DB에 의존하지 않는 순수 계산 모듈 — 기록은 spaced_repetition.py 담당 (View 아님)
+
+설정: settings.SR_SCHEDULER = 'sm2' | 'fsrs'
+"""
+import math
+from datetime import timedelta
+
+from django.conf import settings
+
+# 평점 (FSRS 기준 4단계, SM-2는 quality 0~5로 변환)
+AGAIN, HARD, GOOD, EASY = 1, 2, 3, 4
+
+FAST_RESPONSE_MS = 5000     # 이보다 빠른 정답 → EASY
+SLOW_RESPONSE_MS = 20000    # 이보다 느린 정답 → HARD
+
+LEARNING_STEP = timedelta(minutes=10)   # 첫 복습 / 오답 재학습 간격
+MAX_INTERVAL_DAYS = 180                 # 이 간격을 넘으면 졸업 (더 이상 복습 없음)
+
+
+def rate_answer(is_correct, response_ms=None):
+    """정오 + 응답 시간(ms) → 평점. 응답 시간이 없으면 정답은 GOOD"""
+    if not is_correct:
+        return AGAIN
+    if response_ms is None:
+        return GOOD
+    if response_ms <= FAST_RESPONSE_MS:
+        return EASY
+    if response_ms >= SLOW_RESPONSE_MS:
+        return HARD
+    return GOOD
+
+
+def interval_label(delta):
+    """timedelta → '10분 후' / '3시간 후' / '2일 후' / '3주 후' / '2개월 후'"""
+    minutes = delta.total_seconds() / 60
+    if minutes < 60:
+        return f'{max(1, round(minutes))}분 후'
+    hours = minutes / 60
+    if hours < 24:
+        return f'{round(hours)}시간 후'
+    days = hours / 24
+    if days < 14:
+        return f'{round(days)}일 후'
+    if days < 60:
+        return f'{round(days / 7)}주 후'
+    return f'{round(days / 30)}개월 후'
+
+
+class BaseScheduler:
+    """
+    스케줄러 인터페이스
+    review(state, rating, elapsed_days) → (new_state, interval_days)
+    interval_days가 0 이하이면 LEARNING_STEP 뒤 재학습
+    """
+    name = ''
+
+    def initial_state(self):
+        return {}
+
+    def review(self, state, rating, elapsed_days):
+        raise NotImplementedError
+
+    def next_delay(self, interval_days):
+        """간격(일) → 실제 지연 (최소 LEARNING_STEP), 졸업이면 None"""
+        if interval_days > MAX_INTERVAL_DAYS:
+            return None
+        return max(LEARNING_STEP, timedelta(days=interval_days))
+
+    def replay(self, history):
+        """평점 이력 [(rating, elapsed_days), ...] 재생 → (state, 마지막 interval_days)"""
+        state, interval = self.initial_state(), 0
+        for rating, elapsed_days in history:
+            state, interval = self.review(state, rating, elapsed_days)
+        return state, interval
+
+
+class SM2Scheduler(BaseScheduler):
+    """SuperMemo SM-2: 난이도 계수(EF) × 이전 간격"""
+    name = 'sm2'
+    MIN_EASE = 1.3
+    QUALITY = {AGAIN: 1, HARD: 3, GOOD: 4, EASY: 5}
+
+    def initial_state(self):
+        return {'ease': 2.5, 'reps': 0, 'interval': 0.0}
+
+    def review(self, state, rating, elapsed_days):
+        state = {**self.initial_state(), **(state or {})}
+        q = self.QUALITY[rating]
+        ease = max(self.MIN_EASE, state['ease'] + 0.1 - (5 - q) * (0.08 + (5 - q) * 0.02))
+
+        if q < 3:
+            reps, interval = 0, 0.0
+        else:
+            reps = state['reps'] + 1
+            if reps == 1:
+                interval = 1.0
+            elif reps == 2:
+                interval = 6.0
+            else:
+                interval = state['interval'] * ease
+
+        return {'ease': round(ease, 4), 'reps': reps, 'interval': round(interval, 4)}, interval
+
+
+class FSRSScheduler(BaseScheduler):
+    """FSRS v4: 안정도(S) / 난이도(D) 기반, 목표 기억 유지율 90%"""
+    name = 'fsrs'
+    W = (0.4, 0.6, 2.4, 5.8, 4.93, 0.94, 0.86, 0.01, 1.49, 0.14, 0.94, 2.18, 0.05, 0.34, 1.26, 0.29, 2.61)
+    DESIRED_RETENTION = 0.9
+
+    def initial_state(self):
+        return {'stability': None, 'difficulty': None, 'lapses': 0}
+
+    def _init_difficulty(self, rating):
+        return min(10.0, max(1.0, self.W[4] - (rating - 3) * self.W[5]))
+
+    def _retrievability(self, elapsed_days, stability):
+        return (1 + elapsed_days / (9 * stability)) ** -1
+
+    def review(self, state, rating, elapsed_days):
+        w = self.W
+        state = {**self.initial_state(), **(state or {})}
+        s, d, lapses = state['stability'], state['difficulty'], state['lapses']
+
+        if s is None:
+            s, d = w[rating - 1], self._init_difficulty(rating)
+        else:
+            r = self._retrievability(max(0.0, elapsed_days), s)
+            d = d - w[6] * (rating - 3)
+            d = min(10.0, max(1.0, w[7] * self._init_difficulty(GOOD) + (1 - w[7]) * d))
+            if rating == AGAIN:
+                lapses += 1
+                s = w[11] * d ** -w[12] * ((s + 1) ** w[13] - 1) * math.exp(w[14] * (1 - r))
+            else:
+                hard_penalty = w[15] if rating == HARD else 1
+                easy_bonus = w[16] if rating == EASY else 1
+                s = s * (1 + math.exp(w[8]) * (11 - d) * s ** -w[9]
+                         * (math.exp(w[10] * (1 - r)) - 1) * hard_penalty * easy_bonus)
+
+        interval = 0.0 if rating == AGAIN else 9 * s * (1 / self.DESIRED_RETENTION - 1)
+        return {'stability': round(s, 4), 'difficulty': round(d, 4), 'lapses': lapses}, interval
+
+
+SCHEDULERS = {
+    SM2Scheduler.name: SM2Scheduler,
+    FSRSScheduler.name: FSRSScheduler,
+}
+
+
+def get_scheduler(name=None):
+    """이름 → 스케줄러 인스턴스 (없으면 settings.SR_SCHEDULER, 알 수 없는 이름은 SM-2)"""
+    name = name or getattr(settings, 'SR_SCHEDULER', SM2Scheduler.name)
+    return SCHEDULERS.get(name, SM2Scheduler)()
@@ -0,0 +1,53 @@
+"""
+SSE(Server-Sent Events) 스트리밍 응답 공용 헬퍼 (View 아님)
+LLM 토큰을 받는 즉시 클라이언트로 흘려보내 체감 지연을 첫 토큰 시간(TTFT)으로 줄인다.
+이벤트 형식 (AI 튜터 ask-stream과 동일):
+  data: {"type": "sources" | "token" | "error" | "done", ...}
+- 스트림이 끝나면(실패 포함) on_complete(전체 텍스트, 실패 여부)를 한 번 호출해 DB 저장
+  → 반환한 dict를 done 이벤트에 실어 보냄 (예: message_id)
+"""
+import json
+
+from django.http import StreamingHttpResponse
+
+
+def sse_event(event_type, **data):
+    return f"data: {json.dumps({'type': event_type, **data}, ensure_ascii=False, default=str)}\n\n"
+
+
+def iter_tokens(stream):
+    """OpenAI chat.completions 스트림 → 텍스트 조각"""
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+def sse_stream(open_tokens, on_complete, preface=(), error_text='답변 생성 중 오류가 발생했습니다'):
+    """
+    open_tokens: 토큰 iterable을 반환하는 callable (제너레이터 안에서 호출 → 연결 실패도 error 이벤트로 전달)
+    preface: 토큰보다 먼저 보낼 이벤트 문자열들 (예: 참고 문서)
+    """
+    yield from preface
+    parts, failed = [], False
+    try:
+        for token in open_tokens():
+            parts.append(token)
+            yield sse_event('token', content=token)
+    except Exception as e:
+        failed = True
+        parts = [f"{error_text}: {str(e)}"]
+        yield sse_event('error', content=parts[0])
+
+    try:
+        extra = on_complete(''.join(parts), failed) or {}
+    except Exception as e:
+        print(f"⚠️ [SSE] 스트림 종료 후 저장 실패: {e}")
+        extra = {'error': str(e)}
+    yield sse_event('done', **extra)
+
+
+def sse_response(events):
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
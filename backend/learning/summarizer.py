@@ -0,0 +1,121 @@
+"""
+긴 강의 녹취 map-reduce 요약 헬퍼 (View 아님)
+녹취 전체를 한 번에 GPT-4o에 보내면 프리필이 길고 단일 스트림이라 느리고, 수 시간 분량은 컨텍스트를 넘어 실패한다.
+- 분할: 문장 단위로 모아 구간(window)을 만들되, 경계는 내용 해시로 정함(content-defined)
+  → 앞부분을 고쳐도 뒤 구간 경계가 밀리지 않아 바뀐 구간만 캐시 미스
+- map: 구간별 핵심 정리를 스레드 풀에서 병렬 생성 (gpt-4o-mini), 구간 텍스트 해시로 캐시
+  (Django 캐시 사용: 기본 LocMemCache는 워커 프로세스별이라, 워커 간 재사용은 공유 캐시 백엔드일 때만)
+- reduce: 구간 정리를 이어 붙여 호출자의 최종 프롬프트로 한 번 요약 (gpt-4o)
+짧은 녹취(구간 1개)는 map 없이 원문을 바로 reduce → 기존 동작과 동일
+총 지연 ≈ 가장 느린 구간 1개 + reduce 1회
+"""
+import hashlib
+import re
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+
+WINDOW_MIN_CHARS = 4000
+WINDOW_MAX_CHARS = 8000
+BOUNDARY_MOD = 8              # 최소 길이 이후 문장 해시 % 8 == 0 이면 구간 종료
+MAP_MODEL = 'gpt-4o-mini'
+MAP_MAX_TOKENS = 900
+CACHE_TIMEOUT = 7 * 24 * 3600
+FAILED_WINDOW_CHARS = 1500    # map 실패 구간은 원문 앞부분으로 대체 (캐시하지 않음)
+
+MAP_PROMPT = (
+    "너는 강의 녹취 구간을 정리하는 조교야.\n"
+    "아래는 긴 강의 녹취(STT)의 한 구간이야. 이 구간에서 강의자가 설명한 내용만 빠짐없이 불렛으로 정리해줘.\n"
+    "- 개념 정의, 설명 흐름, 예시, 코드, 수치, 강조한 주의사항은 최대한 원문 그대로 보존\n"
+    "- 잡담, 추임새, 소음, 학생의 단순 질문은 제외\n"
+    "- 구간 밖 내용을 추측하거나 서론/결론을 덧붙이지 말 것"
+)
+_CACHE_PREFIX = 'learning:summary_window:' + hashlib.sha256(f'{MAP_MODEL}|{MAP_PROMPT}'.encode()).hexdigest()[:12]
+
+_SENTENCE_RE = re.compile(r'(?<=[.!?。])\s+|\n+')
+
+
+def _units(text):
+    """문장 단위 (너무 긴 문장은 최대 길이로 자름)"""
+    for sentence in _SENTENCE_RE.split(text):
+        sentence = sentence.strip()
+        while len(sentence) > WINDOW_MAX_CHARS:
+            yield sentence[:WINDOW_MAX_CHARS]
+            sentence = sentence[WINDOW_MAX_CHARS:]
+        if sentence:
+            yield sentence
+
+
+def split_windows(text):
+    """녹취 → 구간 목록 (경계는 문장 내용으로 결정)"""
+    windows, current, size = [], [], 0
+    for unit in _units(text):
+        if current and size + len(unit) > WINDOW_MAX_CHARS:
+            windows.append(' '.join(current))
+            current, size = [], 0
+        current.append(unit)
+        size += len(unit) + 1
+        if size >= WINDOW_MIN_CHARS and zlib.crc32(unit.encode()) % BOUNDARY_MOD == 0:
+            windows.append(' '.join(current))
+            current, size = [], 0
+    if current:
+        windows.append(' '.join(current))
+    return windows
+
+
+def _window_key(window):
+    return f"{_CACHE_PREFIX}:{hashlib.sha256(window.encode()).hexdigest()}"
+
+
+def _summarize_window(client, window):
+    response = client.chat.completions.create(
+        model=MAP_MODEL,
+        messages=[
+            {"role": "system", "content": MAP_PROMPT},
+            {"role": "user", "content": window},
+        ],
+        temperature=0.2,
+        max_tokens=MAP_MAX_TOKENS,
+    )
+    return response.choices[0].message.content.strip()
+
+
+def map_windows(client, windows):
+    """구간별 정리 (캐시 적중 구간은 건너뜀) → (정리 목록, 새로 생성한 구간 수)"""
+    keys = [_window_key(w) for w in windows]
+    cached = cache.get_many(keys)
+    missing = [idx for idx, key in enumerate(keys) if key not in cached]
+
+    fresh = {}
+    if missing:
+        workers = min(settings.SUMMARY_MAP_CONCURRENCY, len(missing))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {idx: pool.submit(_summarize_window, client, windows[idx]) for idx in missing}
+        for idx, future in futures.items():
+            try:
+                fresh[keys[idx]] = future.result()
+            except Exception as e:
+                print(f"⚠️ [Summary] 구간 {idx + 1}/{len(windows)} 정리 실패 (원문 일부로 대체): {e}")
+        if fresh:
+            cache.set_many(fresh, CACHE_TIMEOUT)
+
+    notes = []
+    for idx, (key, window) in enumerate(zip(keys, windows)):
+        note = cached.get(key) or fresh.get(key) or window[:FAILED_WINDOW_CHARS]
+        notes.append(f"[구간 {idx + 1}/{len(windows)}]\n{note}")
+    return notes, len(fresh)
+
+
+def condense_transcript(client, text):
+    """
+    reduce 단계에 넣을 본문 → (본문, 축약 여부)
+    구간이 1개면 원문 그대로, 여러 개면 구간 정리(시간 순)를 이어 붙임
+    """
+    windows = split_windows(text)
+    if len(windows) <= 1:
+        return text, False
+    notes, generated = map_windows(client, windows)
+    print(f"📝 [Summary] 녹취 {len(text)}자 → 구간 {len(windows)}개 (새로 정리 {generated}개, 캐시 {len(windows) - generated}개)")
+    return '\n\n'.join(notes), True
@@ -4,16 +4,20 @@ from .views import LearningSessionViewSet, EnrollLectureView, PublicLectureListV
 from .views_assessment import AssessmentViewSet
 from .professor_views import LectureViewSet
 from .rag_views import RAGViewSet
-from .live_views import LiveSessionViewSet, JoinLiveSessionView, LectureMaterialViewSet, LiveNoteView, NoteApproveView, NoteMaterialLinkView, AbsentNoteListView, StudentSessionSummaryView, LectureQuizHistoryView
-from .note_views import AbsentSelfTestView
-from .placement_views import PlacementViewSet, GoalViewSet, GapMapViewSet, ProfessorDiagnosticView
+from .live_views import LiveSessionViewSet, JoinLiveSessionView, LectureMaterialViewSet, LiveNoteView, NoteStageRetryView, NoteApproveView, NoteMaterialLinkView, AbsentNoteListView, StudentSessionSummaryView, LectureQuizHistoryView
+from .note_views import AbsentSelfTestView, AbsentSelfTestStreamView
+from .placement_views import (
+    PlacementViewSet, GoalViewSet, GapMapViewSet, ProfessorDiagnosticView, ProfessorPlacementImportView,
+)
 from .review_views import (
     MyReviewRoutesView, CompleteReviewItemView, PendingReviewRoutesView,
     ApproveReviewRouteView, EditReviewRouteView,
     SpacedRepetitionDueView, CompleteSpacedRepView,
 )
 from .formative_views import GenerateFormativeView, GetFormativeView, SubmitFormativeView, MyPendingFormativeView
-from .adaptive_views import GenerateAdaptiveView, ListAdaptiveView, ApproveAdaptiveView, MyContentView
+from .adaptive_views import (
+    GenerateAdaptiveView, LectureGenerateAdaptiveView, ListAdaptiveView, ApproveAdaptiveView, MyContentView,
+)
 from .analytics_views import (
     AnalyticsOverviewView, SendMessageView, WeakInsightsView,
     AISuggestionsView, SuggestionActionView, SendGroupMessageView,
@@ -59,6 +63,7 @@ urlpatterns = [
     # 라이브 세션 입장 (학생용)
     path('live/join/', JoinLiveSessionView.as_view(), name='live-join'),
     path('live/<int:pk>/note/', LiveNoteView.as_view(), name='live-note'),
+    path('live/<int:pk>/note/retry/', NoteStageRetryView.as_view(), name='live-note-retry'),
     path('live/<int:pk>/note/approve/', NoteApproveView.as_view(), name='note-approve'),
     path('live/<int:pk>/note/materials/', NoteMaterialLinkView.as_view(), name='note-materials'),
     path('absent-notes/<int:lecture_id>/', AbsentNoteListView.as_view(), name='absent-notes'),
@@ -66,8 +71,10 @@ urlpatterns = [
     path('live/<int:session_id>/my-summary/', StudentSessionSummaryView.as_view(), name='student-session-summary'),
     # C1: 결석생 셀프 테스트
     path('absent-notes/<int:note_id>/self-test/', AbsentSelfTestView.as_view(), name='absent-self-test'),
+    path('absent-notes/<int:note_id>/self-test/stream/', AbsentSelfTestStreamView.as_view(), name='absent-self-test-stream'),
     # Phase 1: 교수자 진단 분석
     path('professor/<int:lecture_id>/diagnostics/', ProfessorDiagnosticView.as_view(), name='professor-diagnostics'),
+    path('professor/<int:lecture_id>/placement-import/', ProfessorPlacementImportView.as_view(), name='professor-placement-import'),
     # Phase 2-3: 복습 루트 + 간격 반복
     path('review-routes/my/', MyReviewRoutesView.as_view(), name='my-review-routes'),
     path('review-routes/<int:pk>/complete-item/', CompleteReviewItemView.as_view(), name='complete-review-item'),
@@ -90,6 +97,7 @@ urlpatterns = [
     path('objectives/<int:obj_id>/', ObjectiveDeleteView.as_view(), name='objective-delete'),
     # Phase 2-2: 적응형 콘텐츠
     path('materials/<int:pk>/generate-adaptive/', GenerateAdaptiveView.as_view(), name='generate-adaptive'),
+    path('lectures/<int:lecture_id>/generate-adaptive/', LectureGenerateAdaptiveView.as_view(), name='lecture-generate-adaptive'),
     path('materials/<int:pk>/adaptive/', ListAdaptiveView.as_view(), name='list-adaptive'),
     path('adaptive/<int:pk>/approve/', ApproveAdaptiveView.as_view(), name='approve-adaptive'),
     path('live/<int:pk>/my-content/', MyContentView.as_view(), name='my-content'),
@@ -1015,8 +1015,14 @@ class LearningSessionViewSet(viewsets.ModelViewSet):
                 "4. **공식 문서 참조**: [공식 문서 참조]가 제공되면, 전문 용어의 정확한 정의와 올바른 코드 예시를 반영할 것."
             )
 
+            # 긴 녹취는 구간별 병렬 정리 후 최종 정리 (map-reduce, 구간 정리는 캐시)
+            from .summarizer import condense_transcript
+            body, condensed = condense_transcript(client, text)
+            if condensed:
+                body = f"(아래는 STT 스크립트 전문을 시간 순 구간별로 정리한 노트입니다)\n\n{body}"
+
             # 사용자 프롬프트 구성 (RAG 컨텍스트 포함)
-            user_content = f"다음 수업 내용을 학습 자료로 정리해줘:\n\n{text}"
+            user_content = f"다음 수업 내용을 학습 자료로 정리해줘:\n\n{body}"
             if rag_context:
                 user_content += f"\n\n[공식 문서 참조 (정확한 정의 및 예시)]:\n{rag_context}"
 
@@ -1,10 +1,24 @@
 """
 Phase 2-1: Weak Zone 감지 + AI 보충 설명 헬퍼 함수
 LiveSessionViewSet의 @action에서 호출됨 (View 아님)
+AI 보충 설명은 (세션, 주제) 단위로 묶어 요청 경로 밖에서 1회만 생성:
+- 같은 주제 알림이 몰리면 첫 알림이 WEAK_ZONE_SUPPLEMENT_DEBOUNCE초 뒤 생성을 예약, 그 사이 알림은 같은 배치에 합류
+- 생성 결과는 해당 주제의 빈 알림 전체에 일괄 반영하고 WEAK_ZONE_SUPPLEMENT_TTL초 동안 캐시
+  → 이후 같은 주제 알림은 LLM 호출 없이 즉시 채움
+- 예약 표시와 생성 결과는 Django 캐시에 두므로 기본 LocMemCache에서는 워커 프로세스별로 묶임
+  (워커가 여럿이면 주제당 워커 수만큼 생성될 수 있음, 워커 간 1회로 묶으려면 공유 캐시 백엔드)
 """
+import hashlib
+import threading
 from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
 from django.utils import timezone
 from .models import WeakZoneAlert, PulseLog, LiveQuizResponse
+from .concept_index import record_weak_zone
+from .skill_tagger import tag_skills
+from .prompts import WEAK_ZONE_SUPPLEMENT, describe
 
 
 def check_quiz_weak_zone(session, student, current_quiz_response):
@@ -45,10 +59,12 @@ def check_quiz_weak_zone(session, student, current_quiz_response):
             trigger_detail={
                 'quiz_ids': [r.quiz.id for r in recent_responses],
                 'recent_topic': recent_topic,
+                'skill_ids': list(dict.fromkeys(sid for r in recent_responses for sid in (r.quiz.skill_tags or []))),
             },
         )
-        # AI 보충 설명 비동기 생성 (간단하면 동기도 가능)
-        _generate_ai_supplement(alert)
+        record_weak_zone(alert)
+        # AI 보충 설명: 같은 주제끼리 묶어 백그라운드 생성
+        request_supplement(alert)
         return alert
 
     return None
@@ -104,55 +120,98 @@ def check_pulse_weak_zone(session, student):
         trigger_detail={
             'confused_count': confused_count,
             'recent_topic': recent_topic,
+            'skill_ids': tag_skills(recent_topic),
         },
     )
-    _generate_ai_supplement(alert)
+    record_weak_zone(alert)
+    request_supplement(alert)
     return alert
 
 
-def _generate_ai_supplement(alert):
-    """AI 보충 설명 생성 (GPT-4o-mini + RAG)"""
-    try:
-        import openai
-        topic = alert.trigger_detail.get('recent_topic', '현재 수업 내용')
+def _supplement_key(kind, session_id, topic):
+    digest = hashlib.sha256(topic.encode()).hexdigest()[:16]
+    return f'learning:weak_zone_supplement:{kind}:{session_id}:{digest}'
 
-        # [RAG] 공식 문서에서 관련 컨텍스트 검색
-        rag_context = ""
-        try:
-            from .rag import RAGService
-            rag = RAGService()
-            lecture_id = None
-            if alert.live_session and alert.live_session.lecture:
-                lecture_id = alert.live_session.lecture_id
-            related_docs = rag.search(query=topic, top_k=2, lecture_id=lecture_id)
-            if related_docs:
-                rag_context = "\n".join([f"- {doc.content[:200]}" for doc in related_docs])
-                print(f"✅ [RAG] Weak Zone 보충 설명에 공식 문서 {len(related_docs)}건 참조")
-        except Exception as rag_err:
-            print(f"⚠️ [RAG] Weak Zone 검색 실패 (일반 설명으로 대체): {rag_err}")
-
-        user_content = f"""학생이 '{topic}' 부분에서 어려움을 겪고 있습니다.
-
-다음 형식으로 200자 이내의 보충 설명을 작성하세요:
-1. 핵심 개념 한 줄 정리
-2. 쉬운 비유 또는 예시 1개
-3. "이것만 기억하세요" 한 줄"""
-        if rag_context:
-            user_content += f"\n\n[공식 문서 참조 (정확한 정의 근거)]:\n{rag_context}"
-
-        response = openai.chat.completions.create(
-            model='gpt-4o-mini',
-            messages=[
-                {'role': 'system', 'content': '당신은 친절한 교육 보조 AI입니다. 학생이 어려워하는 개념을 공식 문서에 근거하여 쉽게 설명해주세요.'},
-                {'role': 'user', 'content': user_content},
-            ],
-            max_tokens=300,
-            temperature=0.5,
-        )
 
-        alert.ai_suggested_content = response.choices[0].message.content.strip()
-        alert.save()
+def _fallback_supplement(topic):
+    return f"📌 '{topic}' 부분을 다시 한번 살펴보세요."
+
+
+def request_supplement(alert):
+    """
+    알림에 AI 보충 설명 연결 (요청 경로에서는 LLM 호출 없음)
+    최근 같은 주제 설명이 있으면 바로 채우고, 없으면 (세션, 주제) 배치 생성을 예약하거나 진행 중인 배치에 합류
+    """
+    topic = alert.trigger_detail.get('recent_topic', '현재 수업 내용')
+    session_id = alert.live_session_id
+
+    content = cache.get(_supplement_key('content', session_id, topic))
+    if content:
+        WeakZoneAlert.objects.filter(id=alert.id).update(ai_suggested_content=content)
+        alert.ai_suggested_content = content
+        return None
+
+    debounce = settings.WEAK_ZONE_SUPPLEMENT_DEBOUNCE
+    if not cache.add(_supplement_key('pending', session_id, topic), 1, debounce + 120):
+        return None  # 이미 예약된 배치가 이 알림까지 채움
+
+    timer = threading.Timer(debounce, _flush_supplement, args=(session_id, topic))
+    timer.daemon = True
+    timer.start()
+    return timer
+
+
+def _flush_supplement(session_id, topic):
+    """주제당 1회 생성 → 해당 주제의 빈 알림 전체에 일괄 반영"""
+    try:
+        try:
+            content = _generate_ai_supplement(session_id, topic)
+            # 캐시를 먼저 채워야 반영 직후 들어온 알림도 캐시에서 바로 채워짐
+            cache.set(_supplement_key('content', session_id, topic), content, settings.WEAK_ZONE_SUPPLEMENT_TTL)
+        except Exception as e:
+            print(f"⚠️ [WeakZone] AI 보충 생성 실패: {e}")
+            content = _fallback_supplement(topic)  # 실패는 캐시하지 않음 → 다음 알림에서 재시도
+
+        updated = WeakZoneAlert.objects.filter(
+            live_session_id=session_id,
+            trigger_detail__recent_topic=topic,
+            ai_suggested_content='',
+        ).update(ai_suggested_content=content)
+        print(f"✅ [WeakZone] 세션 #{session_id} '{topic[:20]}' 보충 설명 1회 생성 → 알림 {updated}건에 반영")
     except Exception as e:
-        print(f"⚠️ [WeakZone] AI 보충 생성 실패: {e}")
-        alert.ai_suggested_content = f"📌 '{alert.trigger_detail.get('recent_topic', '')}' 부분을 다시 한번 살펴보세요."
-        alert.save()
+        print(f"⚠️ [WeakZone] 보충 설명 반영 실패: {e}")
+    finally:
+        cache.delete(_supplement_key('pending', session_id, topic))
+        connection.close()
+
+
+def _generate_ai_supplement(session_id, topic):
+    """AI 보충 설명 생성 (GPT-4o-mini + RAG)"""
+    import openai
+    from .models import LiveSession
+
+    # [RAG] 공식 문서에서 관련 컨텍스트 검색
+    rag_context = ""
+    try:
+        from .rag import RAGService
+        rag = RAGService()
+        lecture_id = LiveSession.objects.filter(id=session_id).values_list('lecture_id', flat=True).first()
+        related_docs = rag.search(query=topic, top_k=2, lecture_id=lecture_id)
+        if related_docs:
+            rag_context = "\n".join([f"- {doc.content[:200]}" for doc in related_docs])
+            print(f"✅ [RAG] Weak Zone 보충 설명에 공식 문서 {len(related_docs)}건 참조")
+    except Exception as rag_err:
+        print(f"⚠️ [RAG] Weak Zone 검색 실패 (일반 설명으로 대체): {rag_err}")
+
+    prompt = WEAK_ZONE_SUPPLEMENT
+    messages = prompt.messages(rag_context=rag_context, topic=topic)
+    print(f"🧾 [WeakZone] 보충 설명 프롬프트 {describe(prompt, messages)}")
+
+    response = openai.chat.completions.create(
+        model='gpt-4o-mini',
+        messages=messages,
+        prompt_cache_key=prompt.id,
+        max_tokens=300,
+        temperature=0.5,
+    )
+    return response.choices[0].message.content.strip()
@@ -106,6 +106,32 @@ SIMPLE_JWT = {
 # OpenAI API Key
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 
+# 간격 반복(SR) 스케줄러: 'sm2' | 'fsrs' (learning/sr_scheduler.py)
+SR_SCHEDULER = os.getenv('SR_SCHEDULER', 'sm2')
+
+# 적응형 진단 테스트(IRT): 능력 추정 표준오차 목표 / 최대 출제 문항 수 (learning/placement_irt.py)
+# 미보정 문항(a=1)만으로는 SE 0.4에 거의 도달하지 못해 대부분 최대 문항 수에서 종료 → 상한이 평균 문항 수를 결정
+PLACEMENT_SE_TARGET = float(os.getenv('PLACEMENT_SE_TARGET', '0.4'))
+PLACEMENT_MAX_ITEMS = int(os.getenv('PLACEMENT_MAX_ITEMS', '12'))
+
+# 적응형 콘텐츠 레벨 생성 동시 실행 수 (learning/adaptive_gen.py)
+ADAPTIVE_GEN_CONCURRENCY = int(os.getenv('ADAPTIVE_GEN_CONCURRENCY', '4'))
+
+# 긴 녹취 요약: 구간 정리(map) 동시 실행 수 (learning/summarizer.py)
+SUMMARY_MAP_CONCURRENCY = int(os.getenv('SUMMARY_MAP_CONCURRENCY', '8'))
+
+# 라이브 퀴즈 은행 (learning/quiz_bank.py): 새 STT 청크 N개마다 후보 생성, 임베딩 유사도 이상이면 중복으로 버림
+QUIZ_BANK_BUILD_EVERY = int(os.getenv('QUIZ_BANK_BUILD_EVERY', '8'))
+QUIZ_BANK_DEDUPE_SIMILARITY = float(os.getenv('QUIZ_BANK_DEDUPE_SIMILARITY', '0.92'))
+
+# 라이브 Q&A 유사 질문 클러스터링 (learning/question_cluster.py): 중심과의 코사인 유사도 기준, 새 질문 N개마다 라벨 재생성 (0이면 끔)
+QUESTION_CLUSTER_SIMILARITY = float(os.getenv('QUESTION_CLUSTER_SIMILARITY', '0.82'))
+QUESTION_CLUSTER_RELABEL_EVERY = int(os.getenv('QUESTION_CLUSTER_RELABEL_EVERY', '10'))
+
+# Weak Zone AI 보충 설명 (learning/weak_zone_utils.py): 같은 (세션, 주제) 알림을 N초 모아 1회 생성, 생성 결과 재사용 시간(초)
+WEAK_ZONE_SUPPLEMENT_DEBOUNCE = float(os.getenv('WEAK_ZONE_SUPPLEMENT_DEBOUNCE', '3'))
+WEAK_ZONE_SUPPLEMENT_TTL = int(os.getenv('WEAK_ZONE_SUPPLEMENT_TTL', '300'))
+
 # Internationalization
 LANGUAGE_CODE = 'ko-kr'
 TIME_ZONE = 'Asia/Seoul'